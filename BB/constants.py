@@ -12,6 +12,11 @@ FONT_PATH = os.path.join(BASE_DATA_PATH, "onepiece.ttf")
 # Ensure directory exists
 os.makedirs(BASE_DATA_PATH, exist_ok=True)
 
+# Fight card rendering
+FIGHT_CARD_AVATAR_CACHE_SIZE = 256  # Decoded avatars kept in memory, keyed by avatar hash
+FIGHT_CARD_RENDER_WORKERS = 2       # Max fight cards composited at the same time
+FIGHT_CARD_AVATAR_TIMEOUT = 5       # seconds to wait for an avatar download
+
 # Custom emoji IDs for health bars
 HEALTH_EMOJIS = {
     "full": "<:full:1379318858279551027>",
@@ -6,9 +6,6 @@ from redbot.core import commands
 import asyncio
 import random
 from datetime import datetime
-import io
-from PIL import Image, ImageDraw, ImageFont
-import requests
 from typing import Optional, Tuple, Dict, Any
 
 # Handle imports more robustly
@@ -24,6 +21,7 @@ try:
     from .devil_fruit_manager import DevilFruitManager
     from .starter_system import StarterSystem
     from .fruit_manager import FruitManager
+    from .fight_card import FightCardRenderer
 except ImportError:
     # Fallback for when the cog is loaded through CogManager
     import sys
@@ -48,6 +46,7 @@ except ImportError:
         from devil_fruit_manager import DevilFruitManager
         from starter_system import StarterSystem
         from fruit_manager import FruitManager
+        from fight_card import FightCardRenderer
     finally:
         # Clean up the path
         if current_dir in sys.path:
@@ -64,68 +63,14 @@ class BattleSystem:
         # Initialize managers for enhanced battle system
         self.status_manager = StatusEffectManager()
         self.devil_fruit_manager = DevilFruitManager(self.status_manager)
+        self.fight_card_renderer = FightCardRenderer()
     
-    def generate_fight_card(self, user1, user2):
+    async def generate_fight_card(self, user1, user2):
         """
         Generates a dynamic fight card image with avatars and usernames.
-        Uses asyncio-friendly approach for image processing.
+        Avatar downloads are async and rendering runs in a worker pool.
         """
-        # Open the local template image
-        try:
-            template = Image.open(TEMPLATE_PATH)
-            draw = ImageDraw.Draw(template)
-        except (FileNotFoundError, IOError):
-            self.log.error(f"Template image not found at {TEMPLATE_PATH}")
-            # Create a fallback blank image
-            template = Image.new('RGBA', (650, 500), color=(255, 255, 255, 255))
-            draw = ImageDraw.Draw(template)
-            draw.text((50, 200), "Fight Card Template Missing", fill="black")
-
-        # Load font
-        try:
-            username_font = ImageFont.truetype(FONT_PATH, 25)
-        except (OSError, IOError):
-            self.log.warning(f"Font file not found at {FONT_PATH}, using default")
-            username_font = ImageFont.load_default()
-
-        # Avatar dimensions and positions
-        avatar_size = (250, 260)  # Adjust as needed
-        avatar_positions = [(15, 130), (358, 130)]  # Positions for avatars
-        username_positions = [(75, 410), (430, 410)]  # Positions for usernames
-
-        # Fetch and paste avatars
-        for i, user in enumerate((user1, user2)):
-            try:
-                # Use a more efficient, direct approach to fetch avatars
-                avatar_url = user.display_avatar.url
-                
-                # Use requests with a timeout
-                avatar_response = requests.get(avatar_url, timeout=2)
-                avatar = Image.open(io.BytesIO(avatar_response.content)).convert("RGBA")
-                avatar = avatar.resize(avatar_size)
-                
-                # Paste avatar onto the template
-                template.paste(avatar, avatar_positions[i], avatar)
-                
-                # Draw username
-                username = user.display_name[:20]  # Limit username length
-                draw.text(username_positions[i], username, font=username_font, fill="black")
-            except Exception as e:
-                self.log.error(f"Error processing avatar for {user.display_name}: {e}")
-                # Add a placeholder text instead
-                draw.rectangle([avatar_positions[i], 
-                            (avatar_positions[i][0] + avatar_size[0], 
-                            avatar_positions[i][1] + avatar_size[1])], 
-                            outline="black", fill="gray")
-                draw.text((avatar_positions[i][0] + 50, avatar_positions[i][1] + 130), 
-                        "Avatar Error", fill="black")
-
-        # Save the image to a BytesIO object
-        output = io.BytesIO()
-        template.save(output, format="PNG", optimize=True)
-        output.seek(0)
-
-        return output
+        return await self.fight_card_renderer.render(user1, user2)
     
     async def get_user_devil_fruit(self, user: discord.Member) -> Optional[str]:
         """Get a user's devil fruit if they have one."""
@@ -166,7 +111,7 @@ class BattleSystem:
         
         try:
             # Generate fight card
-            fight_card = self.generate_fight_card(player1, player2)
+            fight_card = await self.generate_fight_card(player1, player2)
             fight_file = discord.File(fp=fight_card, filename="fight_card.png")
             
             # Send fight card
@@ -616,6 +561,10 @@ class BattleCommands(commands.Cog):
         self.fruit_manager = FruitManager(config)
         self.log = setup_logger("battle_commands")
     
+    async def cog_unload(self):
+        """Release the fight card renderer's session and workers."""
+        await self.battle_system.fight_card_renderer.close()
+    
     @commands.command(name="start")
     async def start_journey(self, ctx):
         """Begin your pirate journey and receive your first Devil Fruit!"""
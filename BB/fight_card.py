@@ -0,0 +1,170 @@
+"""
+Asynchronous fight card renderer for the DeathBattle cog.
+
+Avatars are downloaded over a shared aiohttp session and kept in a small
+LRU cache keyed by avatar hash, the template and font are decoded once, and
+compositing/encoding runs on a bounded thread pool so rendering never blocks
+the event loop.
+"""
+import asyncio
+import io
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import aiohttp
+import discord
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    from .constants import (
+        TEMPLATE_PATH, FONT_PATH, FIGHT_CARD_AVATAR_CACHE_SIZE,
+        FIGHT_CARD_RENDER_WORKERS, FIGHT_CARD_AVATAR_TIMEOUT
+    )
+    from .utils import setup_logger
+except ImportError:
+    from constants import (
+        TEMPLATE_PATH, FONT_PATH, FIGHT_CARD_AVATAR_CACHE_SIZE,
+        FIGHT_CARD_RENDER_WORKERS, FIGHT_CARD_AVATAR_TIMEOUT
+    )
+    from utils import setup_logger
+
+# Layout of the fight card template
+AVATAR_SIZE = (250, 260)
+AVATAR_POSITIONS = [(15, 130), (358, 130)]
+USERNAME_POSITIONS = [(75, 410), (430, 410)]
+FALLBACK_TEMPLATE_SIZE = (650, 500)
+
+
+class FightCardRenderer:
+    """Renders fight cards off the event loop with cached assets."""
+
+    def __init__(
+        self,
+        cache_size: int = FIGHT_CARD_AVATAR_CACHE_SIZE,
+        workers: int = FIGHT_CARD_RENDER_WORKERS,
+    ):
+        self.log = setup_logger("fight_card")
+        self.cache_size = cache_size
+        self._avatars: "OrderedDict[str, Image.Image]" = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fightcard")
+        self._render_slots = asyncio.Semaphore(workers)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._template: Optional[Image.Image] = None
+        self._font = None
+        self._assets_lock = asyncio.Lock()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session, created on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=FIGHT_CARD_AVATAR_TIMEOUT)
+            )
+        return self._session
+
+    async def close(self):
+        """Release the HTTP session and worker threads."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._executor.shutdown(wait=False)
+        self._avatars.clear()
+
+    async def render(self, user1: discord.Member, user2: discord.Member) -> io.BytesIO:
+        """Render a fight card for two users and return it as a PNG buffer."""
+        await self._ensure_assets()
+        avatars = await asyncio.gather(self._get_avatar(user1), self._get_avatar(user2))
+        names = (user1.display_name[:20], user2.display_name[:20])
+
+        loop = asyncio.get_running_loop()
+        async with self._render_slots:
+            return await loop.run_in_executor(
+                self._executor, self._compose, avatars, names
+            )
+
+    async def _ensure_assets(self):
+        """Decode the template and font once, off the event loop."""
+        if self._template is not None:
+            return
+        async with self._assets_lock:
+            if self._template is None:
+                loop = asyncio.get_running_loop()
+                self._template, self._font = await loop.run_in_executor(
+                    self._executor, self._load_assets
+                )
+
+    def _load_assets(self) -> Tuple[Image.Image, ImageFont.ImageFont]:
+        """Load the template image and username font (runs in a worker)."""
+        try:
+            with Image.open(TEMPLATE_PATH) as img:
+                template = img.convert("RGBA")
+        except (FileNotFoundError, IOError):
+            self.log.error(f"Template image not found at {TEMPLATE_PATH}")
+            template = Image.new("RGBA", FALLBACK_TEMPLATE_SIZE, color=(255, 255, 255, 255))
+            ImageDraw.Draw(template).text((50, 200), "Fight Card Template Missing", fill="black")
+
+        try:
+            font = ImageFont.truetype(FONT_PATH, 25)
+        except (OSError, IOError):
+            self.log.warning(f"Font file not found at {FONT_PATH}, using default")
+            font = ImageFont.load_default()
+
+        return template, font
+
+    async def _get_avatar(self, user: discord.Member) -> Optional[Image.Image]:
+        """Return a resized avatar for a user, using the LRU cache when possible."""
+        asset = user.display_avatar
+        key = asset.key
+
+        cached = self._avatars.get(key)
+        if cached is not None:
+            self._avatars.move_to_end(key)
+            return cached
+
+        try:
+            async with self.session.get(asset.replace(size=256).url) as resp:
+                if resp.status != 200:
+                    self.log.error(f"Failed to fetch avatar for {user.display_name}: {resp.status}")
+                    return None
+                data = await resp.read()
+
+            loop = asyncio.get_running_loop()
+            avatar = await loop.run_in_executor(self._executor, self._decode_avatar, data)
+        except Exception as e:
+            self.log.error(f"Error processing avatar for {user.display_name}: {e}")
+            return None
+
+        self._avatars[key] = avatar
+        self._avatars.move_to_end(key)
+        while len(self._avatars) > self.cache_size:
+            self._avatars.popitem(last=False)
+        return avatar
+
+    @staticmethod
+    def _decode_avatar(data: bytes) -> Image.Image:
+        """Decode and resize raw avatar bytes (runs in a worker)."""
+        with Image.open(io.BytesIO(data)) as img:
+            return img.convert("RGBA").resize(AVATAR_SIZE)
+
+    def _compose(self, avatars, names) -> io.BytesIO:
+        """Paste avatars and names onto a copy of the template (runs in a worker)."""
+        card = self._template.copy()
+        draw = ImageDraw.Draw(card)
+
+        for i, (avatar, name) in enumerate(zip(avatars, names)):
+            x, y = AVATAR_POSITIONS[i]
+            if avatar is not None:
+                card.paste(avatar, (x, y), avatar)
+                draw.text(USERNAME_POSITIONS[i], name, font=self._font, fill="black")
+            else:
+                draw.rectangle(
+                    [(x, y), (x + AVATAR_SIZE[0], y + AVATAR_SIZE[1])],
+                    outline="black", fill="gray"
+                )
+                draw.text((x + 50, y + 130), "Avatar Error", fill="black")
+
+        # optimize=True costs far more CPU than the bytes it saves for a one-off card
+        output = io.BytesIO()
+        card.save(output, format="PNG", compress_level=6)
+        output.seek(0)
+        return output
@@ -16,9 +16,10 @@ Mixins loaded:
 
 from redbot.core import commands, Config
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
 from redbot.core.utils.chat_formatting import humanize_number
 import discord
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from .casino import Casino
 from .games import Games
@@ -43,6 +44,9 @@ class BeriCog(Casino, Games, Work, Income, XKCD, Treasure, commands.Cog):
         "currency_name": "Beri",
         "currency_icon": "🪙",
         "audit_channel": None,
+        # Audit log retention; whole segments are dropped once past either limit
+        "audit_retention_days": 90,
+        "audit_max_entries": 100_000,
         "income": {
             "message_enabled": True,
             "message_cooldown": 60,
@@ -74,7 +78,7 @@ class BeriCog(Casino, Games, Work, Income, XKCD, Treasure, commands.Cog):
     }
 
     DEFAULT_GLOBAL = {
-        "audit_log": [],
+        "audit_log": [],  # Legacy; migrated into the segmented audit store on load
     }
 
     def __init__(self, bot: Red):
@@ -88,15 +92,17 @@ class BeriCog(Casino, Games, Work, Income, XKCD, Treasure, commands.Cog):
         self.config.register_member(**self.DEFAULT_MEMBER)
         self.config.register_global(**self.DEFAULT_GLOBAL)
 
-        self._audit = AuditLog(bot, self.config)
+        self._audit = AuditLog(bot, self.config, cog_data_path(self) / "audit")
 
     # ── Lifecycle hooks (required for Treasure's background task) ──────────
 
-    def cog_load(self):
+    async def cog_load(self):
         Treasure.cog_load(self)
+        await self._audit.start()
 
-    def cog_unload(self):
+    async def cog_unload(self):
         Treasure.cog_unload(self)
+        await self._audit.close()
 
     # ══════════════════════════════════════════════════════════════════════
     # BeriCore bridge — ALL balance ops flow through here
@@ -167,6 +173,54 @@ class BeriCog(Casino, Games, Work, Income, XKCD, Treasure, commands.Cog):
 
         return new_balance
 
+    async def _modify_many(
+        self,
+        guild: discord.Guild,
+        payouts: List[Tuple[discord.Member, int]],
+        *,
+        reason: str = "bericog:unknown",
+        actor=None,
+        metadata: Optional[dict] = None,
+    ) -> Dict[int, int]:
+        """
+        Pay several members through a single BeriCore transaction, so either
+        every payout lands or none does.
+        Falls back to one _modify_balance per member on BeriCore versions
+        without payout_beri. Returns {member_id: new_balance}.
+        """
+        core = self._bericore()
+        if not core:
+            raise RuntimeError("BeriCore is not loaded. Ask an admin to load it.")
+
+        if not hasattr(core, "payout_beri"):
+            return {
+                member.id: await self._modify_balance(
+                    guild, member, amount,
+                    reason=reason, actor=actor, metadata=metadata,
+                )
+                for member, amount in payouts
+            }
+
+        balances = await core.payout_beri(
+            payouts, reason=reason, actor=actor, metadata=metadata
+        )
+
+        # Mirror to local audit log as well
+        for member, amount in payouts:
+            try:
+                await self._audit.log(
+                    guild=guild,
+                    target=member,
+                    actor=actor or "System",
+                    delta=amount,
+                    new_balance=balances.get(member.id, 0),
+                    reason=reason,
+                )
+            except Exception:
+                pass  # Never let audit failure block a transaction
+
+        return balances
+
     async def _safe_modify(
         self,
         ctx: commands.Context,
@@ -289,25 +343,16 @@ class BeriCog(Casino, Games, Work, Income, XKCD, Treasure, commands.Cog):
             return await ctx.send("❌ BeriCore is not loaded.")
 
         async with ctx.typing():
-            all_members = await core.config.all_members(ctx.guild)
-
-        entries = []
-        for uid, data in all_members.items():
-            bal = data.get("balance", 0)
-            if bal > 0:
-                entries.append((int(uid), bal))
-
-        if not entries:
+            ranking = await core.get_ranking(ctx.guild)
+        if not len(ranking):
             return await ctx.send("No one has any Beri yet!")
 
-        entries.sort(key=lambda x: x[1], reverse=True)
-
         per_page = 10
         page = max(1, page)
-        total_pages = max(1, (len(entries) + per_page - 1) // per_page)
+        total_pages = max(1, (len(ranking) + per_page - 1) // per_page)
         page = min(page, total_pages)
         start = (page - 1) * per_page
-        chunk = entries[start:start + per_page]
+        chunk = ranking.page(start, per_page)
 
         lines = []
         medals = {1: "🥇", 2: "🥈", 3: "🥉"}
@@ -318,8 +363,8 @@ class BeriCog(Casino, Games, Work, Income, XKCD, Treasure, commands.Cog):
             you = " ◀" if uid == ctx.author.id else ""
             lines.append(f"{prefix} **{display}** — {humanize_number(bal)} {icon}{you}")
 
-        caller_rank = next((i + 1 for i, (uid, _) in enumerate(entries) if uid == ctx.author.id), None)
-        caller_bal = next((bal for uid, bal in entries if uid == ctx.author.id), 0)
+        caller_rank = ranking.rank(ctx.author.id)
+        caller_bal = ranking.balance_of(ctx.author.id)
 
         embed = discord.Embed(
             title=f"{icon} {name} Leaderboard",
@@ -363,6 +408,20 @@ class BeriCog(Casino, Games, Work, Income, XKCD, Treasure, commands.Cog):
         else:
             await ctx.send("✅ Audit channel cleared.")
 
+    @berisettings.command(name="auditretention")
+    async def cfg_auditretention(self, ctx: commands.Context, days: int, max_entries: int = 100_000):
+        """Set how long audit entries are kept (0 days = no age limit) and the most kept per server."""
+        days = max(0, days)
+        max_entries = max(1000, max_entries)
+        await self.config.guild(ctx.guild).audit_retention_days.set(days)
+        await self.config.guild(ctx.guild).audit_max_entries.set(max_entries)
+        removed = await self._audit.apply_retention(ctx.guild)
+        age = f"{days} day(s)" if days else "no age limit"
+        await ctx.send(
+            f"✅ Audit log keeps {age}, up to **{humanize_number(max_entries)}** entries. "
+            f"Removed **{humanize_number(removed)}** old entries."
+        )
+
     @berisettings.command(name="award")
     async def cfg_award(self, ctx: commands.Context, member: discord.Member, amount: int, *, reason: str = "admin award"):
         """Award Beri to a user (bypasses cap)."""
@@ -406,6 +465,12 @@ class BeriCog(Casino, Games, Work, Income, XKCD, Treasure, commands.Cog):
         embed.add_field(name="BeriCore", value="✅ Loaded" if core else "❌ Not loaded", inline=True)
         embed.add_field(name="Daily Cap", value="🚫 Disabled (bypass_cap=True always)", inline=True)
         embed.add_field(name="Audit Channel", value=audit_ch.mention if audit_ch else "Not set", inline=True)
+        audit_entries, audit_segments = await self._audit.stats(ctx.guild.id)
+        embed.add_field(
+            name="Audit Log",
+            value=f"{humanize_number(audit_entries)} entries in {audit_segments} segment(s)",
+            inline=True,
+        )
         embed.add_field(name="Lottery Schedule", value=lottery.get("schedule", "daily").capitalize(), inline=True)
         embed.add_field(name="Lottery Channel", value=lotto_ch.mention if lotto_ch else "System channel", inline=True)
         await ctx.send(embed=embed)
@@ -417,13 +482,15 @@ class BeriCog(Casino, Games, Work, Income, XKCD, Treasure, commands.Cog):
     @commands.command(name="auditlog", aliases=["txlog"])
     @commands.admin_or_permissions(manage_guild=True)
     @commands.guild_only()
-    async def auditlog(self, ctx: commands.Context, member: Optional[discord.Member] = None, limit: int = 10):
-        """View recent Beri transactions. Optionally filter by user."""
-        limit = min(max(1, limit), 25)
-        entries = await self._audit.get_entries(
-            guild_id=ctx.guild.id,
-            user_id=member.id if member else None,
-            limit=limit,
+    async def auditlog(self, ctx: commands.Context, member: Optional[discord.Member] = None, page: int = 1):
+        """View Beri transactions, newest first (10 per page). Optionally filter by user."""
+        per_page = 10
+        page = max(1, page)
+        entries, total = await self._audit.query(
+            ctx.guild.id,
+            target_id=member.id if member else None,
+            offset=(page - 1) * per_page,
+            limit=per_page,
         )
 
         if not entries:
@@ -431,7 +498,7 @@ class BeriCog(Casino, Games, Work, Income, XKCD, Treasure, commands.Cog):
 
         name, icon = await self._currency_fmt(ctx.guild)
         lines = []
-        for e in reversed(entries):
+        for e in entries:
             sign = "+" if e["delta"] >= 0 else ""
             lines.append(
                 f"`{e['ts'][:16]}` <@{e['target_id']}> "
@@ -439,11 +506,13 @@ class BeriCog(Casino, Games, Work, Income, XKCD, Treasure, commands.Cog):
                 f"— `{e['reason']}`"
             )
 
+        total_pages = max(1, (total + per_page - 1) // per_page)
         embed = discord.Embed(
             title=f"{icon} Recent Transactions" + (f" — {member.display_name}" if member else ""),
             description="\n".join(lines),
             color=discord.Color.blurple(),
         )
+        embed.set_footer(text=f"Page {page}/{total_pages} • {humanize_number(total)} entries")
         await ctx.send(embed=embed)
 
 
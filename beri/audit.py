@@ -1,23 +1,251 @@
 """
 Audit log system for the Beri economy cog.
 Every balance change is recorded with actor, reason, delta, and timestamp.
+
+Entries are appended to per-guild JSONL segments in the cog's data folder
+(``audit/<guild_id>/segment-<first entry number>.jsonl``). A segment is
+closed once it passes SEGMENT_MAX_BYTES or SEGMENT_MAX_AGE; whole segments
+are dropped by the guild's retention settings. Each segment keeps an
+in-memory index of line offsets by target and actor, so queries seek
+straight to the matching lines instead of reading the log.
+
+Audit channel posts are batched: each guild keeps a running count and net
+change plus its newest entries, sent as one digest embed every
+DIGEST_INTERVAL seconds.
 """
 
+import asyncio
 import datetime
-from typing import Union
+import json
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, IO, List, Optional, Sequence, Tuple
 
 import discord
 from redbot.core import Config
 from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import humanize_number
 
+log = logging.getLogger("red.beri.audit")
 
-class AuditLog:
-    MAX_ENTRIES = 5000
+SEGMENT_MAX_BYTES = 1024 * 1024
+SEGMENT_MAX_AGE = 24 * 60 * 60
+DIGEST_INTERVAL = 60
+# Lines listed in one digest embed; the rest are only counted
+DIGEST_MAX_LINES = 20
+
+
+def _timestamp(entry: dict) -> float:
+    return datetime.datetime.fromisoformat(entry["ts"]).timestamp()
+
+
+class Segment:
+    """One JSONL file of entries with offset indexes by target and actor"""
+
+    __slots__ = ("path", "start", "offsets", "targets", "actors", "first_ts", "last_ts", "size", "sealed")
+
+    def __init__(self, path: Path, start: int):
+        self.path = path
+        self.start = start  # Number of the segment's first entry in the guild log
+        self.offsets: List[int] = []  # Byte offset of each line
+        self.targets: Dict[int, List[int]] = {}  # target_id -> line numbers
+        self.actors: Dict[int, List[int]] = {}  # actor_id -> line numbers
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.size = 0
+        self.sealed = False  # Torn or corrupt on disk, so nothing more is appended to it
+
+    def add(self, entry: dict, length: int):
+        ts = _timestamp(entry)  # First, so a malformed entry leaves the indexes untouched
+        line = len(self.offsets)
+        self.offsets.append(self.size)
+        self.targets.setdefault(entry.get("target_id"), []).append(line)
+        self.actors.setdefault(entry.get("actor_id"), []).append(line)
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.last_ts = ts
+        self.size += length
+
+    def lines(self, target_id: Optional[int], actor_id: Optional[int]) -> Sequence[int]:
+        """Line numbers matching the filters, oldest first."""
+        if target_id is None and actor_id is None:
+            return range(len(self.offsets))
+        if actor_id is None:
+            return self.targets.get(target_id, [])
+        if target_id is None:
+            return self.actors.get(actor_id, [])
+        actor_lines = set(self.actors.get(actor_id, []))
+        return [line for line in self.targets.get(target_id, []) if line in actor_lines]
+
+    @classmethod
+    def load(cls, path: Path) -> "Segment":
+        segment = cls(path, int(path.stem.split("-")[1]))
+        corrupt = 0
+        with open(path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    # Torn final line from a crash mid-write
+                    segment.sealed = True
+                    break
+                try:
+                    segment.add(json.loads(raw), len(raw))
+                except (ValueError, KeyError, TypeError):
+                    # Skip the line but keep later offsets pointing at the right bytes
+                    segment.size += len(raw)
+                    corrupt += 1
+        if corrupt:
+            segment.sealed = True
+            log.warning(f"Skipped {corrupt} corrupt line(s) in audit segment {path}")
+        return segment
+
+    def read(self, lines: List[int]) -> List[dict]:
+        entries = []
+        with open(self.path, "rb") as f:
+            for line in lines:
+                f.seek(self.offsets[line])
+                entries.append(json.loads(f.readline()))
+        return entries
+
+
+class Digest:
+    """A guild's transactions since its last audit channel post"""
+
+    __slots__ = ("count", "net", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.net = 0
+        self.recent: Deque[dict] = deque(maxlen=DIGEST_MAX_LINES)  # Newest entries, listed in the embed
+
+    def add(self, entry: dict):
+        self.count += 1
+        self.net += entry["delta"]
+        self.recent.append(entry)
+
+
+class GuildLog:
+    """A guild's segments, oldest first, and the open tail segment"""
+
+    def __init__(self, directory: Path, segments: List[Segment]):
+        self.directory = directory
+        self.segments = segments
+        self._file: Optional[IO[bytes]] = None
+
+    @property
+    def count(self) -> int:
+        return sum(len(segment.offsets) for segment in self.segments)
+
+    def append(self, entry: dict) -> bool:
+        """Append an entry; returns True if a new segment had to be started."""
+        tail = self.segments[-1] if self.segments else None
+        rotated = tail is None or tail.sealed or tail.size >= SEGMENT_MAX_BYTES or (
+            tail.first_ts is not None and _timestamp(entry) - tail.first_ts >= SEGMENT_MAX_AGE
+        )
+        if rotated:
+            tail = self._rotate()
+
+        if self._file is None:
+            if tail.sealed:
+                raise RuntimeError(f"Refusing to append to sealed audit segment {tail.path}")
+            self._file = open(tail.path, "ab")
+        raw = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        self._file.write(raw)
+        self._file.flush()
+        tail.add(entry, len(raw))
+        return rotated
 
-    def __init__(self, bot: Red, config: Config):
+    def _rotate(self) -> Segment:
+        self.close()
+        start = 0
+        if self.segments:
+            last = self.segments[-1]
+            # Always past the last segment, even one left empty by a torn first line
+            start = last.start + max(len(last.offsets), 1)
+        while (self.directory / f"segment-{start:012d}.jsonl").exists():
+            start += 1  # Never reopen a file that is already on disk
+        segment = Segment(self.directory / f"segment-{start:012d}.jsonl", start)
+        self.segments.append(segment)
+        return segment
+
+    def apply_retention(self, retention_days: int, max_entries: int) -> int:
+        """Drop closed segments past the retention limits; returns entries removed."""
+        cutoff = datetime.datetime.now(tz=datetime.timezone.utc).timestamp() - retention_days * 86400
+        total = self.count
+        removed = 0
+        # The tail segment is always kept, so retention is per whole segment
+        while len(self.segments) > 1:
+            oldest = self.segments[0]
+            expired = retention_days > 0 and oldest.last_ts is not None and oldest.last_ts < cutoff
+            if not expired and total - removed <= max_entries:
+                break
+            oldest.path.unlink(missing_ok=True)
+            removed += len(oldest.offsets)
+            self.segments.pop(0)
+        return removed
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class AuditLog:
+    def __init__(self, bot: Red, config: Config, data_path: Path):
         self.bot = bot
         self.config = config
+        self.data_path = data_path
+
+        self._guilds: Dict[int, GuildLog] = {}
+        self._load_lock = asyncio.Lock()
+        self._digests: Dict[int, Digest] = {}
+        self._digest_task: Optional[asyncio.Task] = None
+
+    # ══════════════════════════════════════════════════════════════════════
+    # Lifecycle
+    # ══════════════════════════════════════════════════════════════════════
+
+    async def start(self):
+        self.data_path.mkdir(parents=True, exist_ok=True)
+        await self._migrate_legacy()
+        self._digest_task = asyncio.create_task(self._digest_loop())
+
+    async def close(self):
+        if self._digest_task:
+            self._digest_task.cancel()
+            self._digest_task = None
+        await self.post_digests()
+        for guild_log in self._guilds.values():
+            guild_log.close()
+
+    async def _migrate_legacy(self):
+        """Move entries from the old global ``audit_log`` list into guild segments."""
+        legacy = await self.config.audit_log()
+        if not legacy:
+            return
+        for entry in legacy:
+            guild_log = await self._guild_log(entry["guild_id"])
+            guild_log.append(entry)
+        await self.config.audit_log.set([])
+        log.info(f"Migrated {len(legacy)} audit entries to the segmented store")
+
+    async def _guild_log(self, guild_id: int) -> GuildLog:
+        guild_log = self._guilds.get(guild_id)
+        if guild_log is None:
+            async with self._load_lock:
+                guild_log = self._guilds.get(guild_id)
+                if guild_log is None:
+                    directory = self.data_path / str(guild_id)
+                    directory.mkdir(exist_ok=True)
+                    segments = await asyncio.to_thread(
+                        lambda: [Segment.load(path) for path in sorted(directory.glob("segment-*.jsonl"))]
+                    )
+                    guild_log = self._guilds[guild_id] = GuildLog(directory, segments)
+        return guild_log
+
+    # ══════════════════════════════════════════════════════════════════════
+    # Writing
+    # ══════════════════════════════════════════════════════════════════════
 
     async def log(self, *, guild, target, actor, delta, new_balance, reason):
         now = datetime.datetime.now(tz=datetime.timezone.utc)
@@ -36,45 +264,124 @@ class AuditLog:
             "reason": reason,
         }
 
-        async with self.config.audit_log() as log:
-            log.append(entry)
-            if len(log) > self.MAX_ENTRIES:
-                del log[: len(log) - self.MAX_ENTRIES]
+        guild_log = await self._guild_log(guild.id)
+        if guild_log.append(entry):
+            # A segment was just closed; a good moment to enforce retention
+            await self.apply_retention(guild)
+
+        digest = self._digests.get(guild.id)
+        if digest is None:
+            digest = self._digests[guild.id] = Digest()
+        digest.add(entry)
 
-        audit_ch_id = await self.config.guild(guild).audit_channel()
-        if audit_ch_id:
-            channel = guild.get_channel(audit_ch_id)
+    # ══════════════════════════════════════════════════════════════════════
+    # Queries
+    # ══════════════════════════════════════════════════════════════════════
+
+    async def query(
+        self,
+        guild_id: int,
+        *,
+        target_id: Optional[int] = None,
+        actor_id: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> Tuple[List[dict], int]:
+        """
+        Return ``(entries, total)``: up to ``limit`` matching entries, newest
+        first, skipping the ``offset`` newest, plus the number of matches.
+        """
+        guild_log = await self._guild_log(guild_id)
+        matches = [(segment, segment.lines(target_id, actor_id)) for segment in guild_log.segments]
+        total = sum(len(lines) for _, lines in matches)
+
+        picks = []
+        skip, need = offset, limit
+        for segment, lines in reversed(matches):
+            if need <= 0:
+                break
+            if skip >= len(lines):
+                skip -= len(lines)
+                continue
+            end = len(lines) - skip
+            chosen = list(lines[max(0, end - need):end])
+            picks.append((segment, chosen[::-1]))
+            need -= len(chosen)
+            skip = 0
+
+        def read():
+            return [entry for segment, lines in picks for entry in segment.read(lines)]
+
+        return await asyncio.to_thread(read), total
+
+    async def get_entries(self, *, guild_id, user_id=None, limit=20):
+        """The newest ``limit`` entries for a guild, optionally for one target, newest first."""
+        entries, _ = await self.query(guild_id, target_id=user_id, limit=limit)
+        return entries
+
+    async def stats(self, guild_id: int) -> Tuple[int, int]:
+        """``(entries, segments)`` currently stored for a guild."""
+        guild_log = await self._guild_log(guild_id)
+        return guild_log.count, len(guild_log.segments)
+
+    async def apply_retention(self, guild: discord.Guild) -> int:
+        guild_log = await self._guild_log(guild.id)
+        settings = await self.config.guild(guild).all()
+        return guild_log.apply_retention(settings["audit_retention_days"], settings["audit_max_entries"])
+
+    # ══════════════════════════════════════════════════════════════════════
+    # Audit channel digests
+    # ══════════════════════════════════════════════════════════════════════
+
+    async def _digest_loop(self):
+        while True:
+            await asyncio.sleep(DIGEST_INTERVAL)
+            try:
+                await self.post_digests()
+            except Exception:
+                log.exception("Failed to post audit digests")
+
+    async def post_digests(self):
+        """Send every queued guild's transactions to its audit channel as one embed."""
+        digests, self._digests = self._digests, {}
+        for guild_id, digest in digests.items():
+            guild = self.bot.get_guild(guild_id)
+            if not guild or not digest.count:
+                continue
+            audit_ch_id = await self.config.guild(guild).audit_channel()
+            channel = guild.get_channel(audit_ch_id) if audit_ch_id else None
             if channel:
-                await self._post_embed(channel, entry)
+                await self._post_digest(channel, digest)
 
-    async def _post_embed(self, channel, entry):
+    async def _post_digest(self, channel, digest: Digest):
         icon = await self.config.guild(channel.guild).currency_icon()
         name = await self.config.guild(channel.guild).currency_name()
-        sign = "+" if entry["delta"] >= 0 else ""
-        color = discord.Color.green() if entry["delta"] >= 0 else discord.Color.red()
+        net = digest.net
+        color = discord.Color.green() if net >= 0 else discord.Color.red()
+
+        lines = []
+        for entry in digest.recent:
+            sign = "+" if entry["delta"] >= 0 else ""
+            lines.append(
+                f"<t:{int(_timestamp(entry))}:T> <@{entry['target_id']}> "
+                f"`{sign}{humanize_number(entry['delta'])}` {icon} → {humanize_number(entry['new_balance'])} "
+                f"— `{entry['reason']}` ({entry['actor_name']})"
+            )
+        if digest.count > len(digest.recent):
+            lines.insert(0, f"*…and {digest.count - len(digest.recent)} earlier transaction(s)*")
 
         embed = discord.Embed(
-            title=f"{icon} {name} Transaction",
+            title=f"{icon} {name} Transactions",
+            description="\n".join(lines)[:4096],
             color=color,
-            timestamp=datetime.datetime.fromisoformat(entry["ts"]),
+            timestamp=datetime.datetime.fromisoformat(digest.recent[-1]["ts"]),
         )
-        embed.add_field(name="User", value=f"<@{entry['target_id']}> ({entry['target_name']})", inline=True)
-        embed.add_field(name="Actor", value=entry["actor_name"], inline=True)
-        embed.add_field(name="Change", value=f"`{sign}{humanize_number(entry['delta'])}` {icon}", inline=True)
-        embed.add_field(name="New Balance", value=f"{humanize_number(entry['new_balance'])} {icon}", inline=True)
-        embed.add_field(name="Reason", value=f"`{entry['reason']}`", inline=True)
+        sign = "+" if net >= 0 else ""
+        embed.add_field(name="Transactions", value=str(digest.count), inline=True)
+        embed.add_field(name="Net Change", value=f"`{sign}{humanize_number(net)}` {icon}", inline=True)
         embed.set_footer(text="Beri Audit Log")
 
         try:
             await channel.send(embed=embed)
         except discord.HTTPException:
             pass
-
-    async def get_entries(self, *, guild_id=None, user_id=None, limit=20):
-        all_entries = await self.config.audit_log()
-        results = all_entries
-        if guild_id:
-            results = [e for e in results if e.get("guild_id") == guild_id]
-        if user_id:
-            results = [e for e in results if e.get("target_id") == user_id]
-        return results[-limit:]
@@ -103,6 +103,7 @@ class Treasure(commands.Cog):
       self.config
       self._get_balance(guild, member)
       self._modify_balance(guild, member, delta, *, reason, actor, metadata=None)
+      self._modify_many(guild, payouts, *, reason, actor, metadata=None)
       self._safe_modify(ctx, guild, member, delta, *, reason, actor, metadata=None)
       self._currency_fmt(guild)
     """
@@ -656,20 +657,21 @@ class Treasure(commands.Cog):
             price = cfg.get("ticket_price", LOTTERY_DEFAULTS["ticket_price"])
             if not tickets:
                 return await ctx.send("❌ No active lottery to reset.")
-            refunded = 0
+            refunds = []
             for uid, count in tickets.items():
                 member = ctx.guild.get_member(int(uid))
                 if member:
-                    amt = count * price
-                    try:
-                        await self._modify_balance(
-                            ctx.guild, member, amt,
-                            reason="lottery:refund",
-                            actor=ctx.author,
-                        )
-                        refunded += 1
-                    except RuntimeError:
-                        pass
+                    refunds.append((member, count * price))
+            # All holders are refunded in one transaction
+            try:
+                await self._modify_many(
+                    ctx.guild, refunds,
+                    reason="lottery:refund",
+                    actor=ctx.author,
+                )
+                refunded = len(refunds)
+            except RuntimeError:
+                refunded = 0
             cfg["tickets"] = {}
             cfg["pot"] = 0
         await ctx.send(f"✅ Lottery cancelled. Refunded **{refunded}** ticket holder(s).")
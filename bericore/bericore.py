@@ -6,20 +6,27 @@ Provides:
   - get_beri(member)                          → int
   - add_beri(member, delta, *, reason, ...)   → int  (new balance)
   - transfer_beri(src, dst, amount, *, ...)   → (bool, str)
+  - payout_beri(payouts, *, reason, ...)      → dict  (member id → new balance)
   - get_user_stats(member)                    → dict
+  - get_ranking(guild)                        → BalanceIndex (top/page/rank)
+  - get_rank(member)                          → int | None
 
 Balances are stored per-guild-member so the same user can have independent
-balances in different servers.
+balances in different servers. Reads and writes go through an in-memory,
+journaled ledger (see ledger.py) that writes changed members back in batches.
 """
 
-import datetime
-from typing import Any, Optional, Union
+from typing import Iterable, Optional, Tuple, Union
 
 import discord
 from redbot.core import Config, checks, commands
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
 from redbot.core.utils.chat_formatting import humanize_number
 
+from .ledger import BalanceLedger, InsufficientFunds, Leg
+from .ranking import BalanceIndex
+
 
 class BeriCore(commands.Cog):
     """
@@ -50,6 +57,8 @@ class BeriCore(commands.Cog):
             "lifetime_spent": 0,
             # Transaction history (last N entries, kept trimmed)
             "history": [],               # list of {ts, delta, reason, actor}
+            # Journal sequence this record was last flushed at
+            "ledger_seq": 0,
         }
 
         # Per-guild defaults (reserved for future global settings)
@@ -59,53 +68,28 @@ class BeriCore(commands.Cog):
 
         self.config.register_member(**default_member)
         self.config.register_guild(**default_guild)
+        # Highest journal sequence fully written to Config
+        self.config.register_global(ledger_seq=0)
+
+        self.ledger = BalanceLedger(self.config, cog_data_path(self))
+
+    async def cog_load(self):
+        await self.ledger.start()
+
+    async def cog_unload(self):
+        await self.ledger.close()
 
     # ══════════════════════════════════════════════════════════════════════
     # Internal helpers
     # ══════════════════════════════════════════════════════════════════════
 
-    def _today(self) -> str:
-        return datetime.date.today().isoformat()
-
-    async def _reset_daily_if_needed(self, member: discord.Member):
-        """Reset earned_today if the stored date is in the past."""
-        today = self._today()
-        stored_date = await self.config.member(member).earned_today_date()
-        if stored_date != today:
-            await self.config.member(member).earned_today.set(0)
-            await self.config.member(member).earned_today_date.set(today)
-
-    async def _append_history(
-        self,
-        member: discord.Member,
-        *,
-        delta: int,
-        new_balance: int,
-        reason: str,
-        actor: Optional[Union[discord.Member, str]] = None,
-        metadata: Optional[dict] = None,
-    ):
-        """Append a transaction to the member's history, trimming if needed."""
-        limit = await self.config.guild(member.guild).history_limit()
-        actor_name = (
+    @staticmethod
+    def _actor_name(actor: Optional[Union[discord.Member, str]]) -> str:
+        return (
             actor.display_name
             if isinstance(actor, discord.Member)
             else str(actor or "system")
         )
-        entry: dict[str, Any] = {
-            "ts": int(datetime.datetime.now(tz=datetime.timezone.utc).timestamp()),
-            "delta": delta,
-            "new_balance": new_balance,
-            "reason": reason,
-            "actor_name": actor_name,
-        }
-        if metadata:
-            entry["metadata"] = metadata
-
-        async with self.config.member(member).history() as hist:
-            hist.append(entry)
-            if len(hist) > limit:
-                del hist[: len(hist) - limit]
 
     # ══════════════════════════════════════════════════════════════════════
     # Public API — called by the Beri cog
@@ -113,7 +97,8 @@ class BeriCore(commands.Cog):
 
     async def get_beri(self, member: discord.Member) -> int:
         """Return the current Beri balance for a guild member."""
-        return await self.config.member(member).balance()
+        data = await self.ledger.account(member.guild.id, member.id)
+        return data["balance"]
 
     async def add_beri(
         self,
@@ -131,33 +116,15 @@ class BeriCore(commands.Cog):
         Balance is clamped to a minimum of 0 — members can never go negative.
         Returns the new balance.
         """
-        await self._reset_daily_if_needed(member)
-
-        async with self.config.member(member).all() as data:
-            current = data["balance"]
-            new_balance = max(0, current + delta)
-            actual_delta = new_balance - current  # may differ if clamped to 0
-
-            data["balance"] = new_balance
-
-            # Stat tracking
-            if actual_delta > 0:
-                data["earned_today"] = data.get("earned_today", 0) + actual_delta
-                data["lifetime_earned"] = data.get("lifetime_earned", 0) + actual_delta
-            elif actual_delta < 0:
-                data["lifetime_spent"] = data.get("lifetime_spent", 0) + abs(actual_delta)
-
-        await self._append_history(
-            member,
-            delta=actual_delta,
-            new_balance=new_balance,
+        return await self.ledger.add(
+            member.guild.id,
+            member.id,
+            delta,
             reason=reason,
-            actor=actor,
+            actor_name=self._actor_name(actor),
             metadata=metadata,
         )
 
-        return new_balance
-
     async def transfer_beri(
         self,
         source: discord.Member,
@@ -178,30 +145,72 @@ class BeriCore(commands.Cog):
         if amount <= 0:
             return False, "Amount must be positive."
 
-        src_balance = await self.get_beri(source)
-        if amount > src_balance:
+        received = int(amount * (1.0 - tax_rate))
+        actor_name = self._actor_name(source)
+        legs = [
+            Leg(
+                source.id,
+                -amount,
+                f"{reason}:sent",
+                actor_name,
+                {"to": destination.id, "amount": amount, "tax_rate": tax_rate},
+            ),
+            Leg(
+                destination.id,
+                received,
+                f"{reason}:received",
+                actor_name,
+                {"from": source.id, "amount": amount, "tax_rate": tax_rate},
+            ),
+        ]
+
+        try:
+            await self.ledger.commit(source.guild.id, legs)
+        except InsufficientFunds as e:
             return False, (
-                f"Insufficient funds. You have **{humanize_number(src_balance)}** Beri."
+                f"Insufficient funds. You have **{humanize_number(e.balance)}** Beri."
             )
 
-        received = int(amount * (1.0 - tax_rate))
+        return True, ""
 
-        await self.add_beri(
-            source,
-            -amount,
-            reason=f"{reason}:sent",
-            actor=source,
-            metadata={"to": destination.id, "amount": amount, "tax_rate": tax_rate},
-        )
-        await self.add_beri(
-            destination,
-            received,
-            reason=f"{reason}:received",
-            actor=source,
-            metadata={"from": source.id, "amount": amount, "tax_rate": tax_rate},
-        )
+    async def payout_beri(
+        self,
+        payouts: Iterable[Tuple[discord.Member, int]],
+        *,
+        reason: str = "payout",
+        actor: Optional[Union[discord.Member, str]] = None,
+        source: Optional[discord.Member] = None,
+        metadata: Optional[dict] = None,
+    ) -> dict[int, int]:
+        """
+        Credit several members of one guild in a single transaction.
 
-        return True, ""
+        ``payouts`` is an iterable of ``(member, amount)``. If ``source`` is
+        given, the total is debited from them in the same transaction and
+        ``InsufficientFunds`` is raised (with nothing paid) if they can't cover
+        it. Returns ``{member_id: new_balance}`` for everyone involved.
+        """
+        payouts = [(member, amount) for member, amount in payouts if amount]
+        if not payouts:
+            return {}
+
+        guild = payouts[0][0].guild
+        actor_name = self._actor_name(actor)
+        legs = [
+            Leg(member.id, amount, reason, actor_name, metadata)
+            for member, amount in payouts
+        ]
+        if source is not None:
+            total = sum(amount for _, amount in payouts)
+            legs.insert(0, Leg(
+                source.id,
+                -total,
+                f"{reason}:sent",
+                actor_name,
+                {**(metadata or {}), "recipients": len(payouts), "amount": total},
+            ))
+
+        return await self.ledger.commit(guild.id, legs)
 
     async def get_user_stats(self, member: discord.Member) -> dict:
         """
@@ -213,8 +222,7 @@ class BeriCore(commands.Cog):
             "lifetime_spent":   int,
           }
         """
-        await self._reset_daily_if_needed(member)
-        data = await self.config.member(member).all()
+        data = await self.ledger.account(member.guild.id, member.id)
         return {
             "balance": data.get("balance", 0),
             "earned_today": data.get("earned_today", 0),
@@ -222,6 +230,18 @@ class BeriCore(commands.Cog):
             "lifetime_spent": data.get("lifetime_spent", 0),
         }
 
+    async def get_ranking(self, guild: discord.Guild) -> BalanceIndex:
+        """
+        Return the guild's live balance ranking. Treat it as read-only; it
+        answers ``top(n)``, ``page(start, count)``, ``rank(member_id)`` and
+        ``len()`` without loading member records.
+        """
+        return await self.ledger.ranking(guild.id)
+
+    async def get_rank(self, member: discord.Member) -> Optional[int]:
+        """Return the member's 1-based balance rank, or None if they have no Beri."""
+        return (await self.ledger.ranking(member.guild.id)).rank(member.id)
+
     # ══════════════════════════════════════════════════════════════════════
     # Admin / owner commands
     # ══════════════════════════════════════════════════════════════════════
@@ -248,13 +268,14 @@ class BeriCore(commands.Cog):
         )
         limit = await self.config.guild(ctx.guild).history_limit()
         embed.add_field(name="History Limit", value=f"{limit} entries/member", inline=True)
+        embed.add_field(name="Pending Writes", value=f"{self.ledger.pending} member(s)", inline=True)
         await ctx.send(embed=embed)
 
     @bericoreinfo.command(name="member")
     async def bcinfo_member(self, ctx: commands.Context, member: discord.Member):
         """Show raw BeriCore data for a specific member."""
         stats = await self.get_user_stats(member)
-        history = await self.config.member(member).history()
+        history = (await self.ledger.account(member.guild.id, member.id))["history"]
 
         embed = discord.Embed(
             title=f"🏦 BeriCore — {member.display_name}",
@@ -300,6 +321,7 @@ class BeriCore(commands.Cog):
         """Set the per-member transaction history limit (default: 50)."""
         limit = max(10, min(limit, 500))
         await self.config.guild(ctx.guild).history_limit.set(limit)
+        self.ledger.set_history_limit(ctx.guild.id, limit)
         await ctx.send(f"✅ History limit set to **{limit}** entries per member.")
 
     # ══════════════════════════════════════════════════════════════════════
@@ -311,7 +333,10 @@ class BeriCore(commands.Cog):
     @commands.guild_only()
     async def bericorewipe(self, ctx: commands.Context, member: discord.Member):
         """[Owner] Completely wipe a member's BeriCore data in this guild."""
+        # Flush first so no journaled change can resurrect the record after a crash
+        await self.ledger.flush()
         await self.config.member(member).clear()
+        self.ledger.discard(ctx.guild.id, member.id)
         await ctx.send(f"✅ Wiped all BeriCore data for {member.mention} in this server.")
 
     @commands.command(name="bericorewipeguild")
@@ -335,5 +360,7 @@ class BeriCore(commands.Cog):
         if msg.content.strip() != "CONFIRM":
             return await ctx.send("❌ Wipe cancelled.")
 
+        await self.ledger.flush()
         await self.config.clear_all_members(ctx.guild)
+        self.ledger.discard(ctx.guild.id)
         await ctx.send(f"✅ All BeriCore member data wiped for **{ctx.guild.name}**.")
@@ -0,0 +1,416 @@
+"""
+bericore/ledger.py
+Write-behind balance ledger for BeriCore
+
+Member records are loaded from Config once and then kept in memory. Every
+transaction is applied immediately, appended to the current journal segment
+(``ledger/ledger-<seq>.jsonl`` in the cog's data folder) and the member is
+marked dirty. Dirty members are written back to Config in one batch every
+FLUSH_INTERVAL seconds and on unload, after which the old segments are
+deleted.
+
+Each journal line is one transaction: a global sequence number plus, for
+every member involved, their full balance/stat state and history entry.
+Each flushed record stores the sequence it was saved at (``ledger_seq``). Replaying the journal after a crash is therefore
+idempotent: lines at or below a member's stored ``ledger_seq`` are skipped.
+"""
+
+import asyncio
+import contextlib
+import datetime
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional, Set, Tuple
+
+import discord
+from redbot.core import Config
+
+from .ranking import BalanceIndex
+
+log = logging.getLogger("red.bericore.ledger")
+
+# Seconds between batched Config writes
+FLUSH_INTERVAL = 5
+
+# Member fields mirrored into every journal line
+STATE_FIELDS = ("balance", "earned_today", "earned_today_date", "lifetime_earned", "lifetime_spent")
+
+MemberKey = Tuple[int, int]  # (guild_id, member_id)
+
+
+def today() -> str:
+    return datetime.date.today().isoformat()
+
+
+class InsufficientFunds(ValueError):
+    """A transaction would take a member's balance below zero"""
+
+    def __init__(self, member_id: int, balance: int, needed: int):
+        super().__init__(f"Member {member_id} has {balance} but needs {needed}")
+        self.member_id = member_id
+        self.balance = balance
+        self.needed = needed
+
+
+@dataclass
+class Leg:
+    """One balance change within a multi-party transaction"""
+    member_id: int
+    delta: int
+    reason: str
+    actor_name: str
+    metadata: Optional[dict] = None
+
+
+class BalanceLedger:
+    """In-memory member records with journaled, batched persistence"""
+
+    def __init__(self, config: Config, data_path: Path):
+        self.config = config
+        self.journal_dir = data_path / "ledger"
+
+        self._accounts: Dict[MemberKey, dict] = {}
+        self._locks: Dict[MemberKey, asyncio.Lock] = {}
+        self._dirty: Set[MemberKey] = set()
+        self._history_limits: Dict[int, int] = {}
+        # Built on first use per guild, then kept current by _record
+        self._rankings: Dict[int, BalanceIndex] = {}
+        self._ranking_lock = asyncio.Lock()
+
+        self._seq = 0
+        self._journal: Optional[IO[str]] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    # ══════════════════════════════════════════════════════════════════════
+    # Lifecycle
+    # ══════════════════════════════════════════════════════════════════════
+
+    async def start(self):
+        """Replay any journal left by a crash, then start the flush loop."""
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        await self._replay()
+        self._open_segment()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Stop the flush loop and write everything that is pending."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Ledger flush failed")
+
+    # ══════════════════════════════════════════════════════════════════════
+    # Records
+    # ══════════════════════════════════════════════════════════════════════
+
+    def lock(self, guild_id: int, member_id: int) -> asyncio.Lock:
+        """Per-member lock for multi-step operations on one record."""
+        key = (guild_id, member_id)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def account(self, guild_id: int, member_id: int) -> dict:
+        """Return the live record for a member, loading it from Config on first use."""
+        key = (guild_id, member_id)
+        data = self._accounts.get(key)
+        if data is None:
+            async with self.lock(guild_id, member_id):
+                data = self._accounts.get(key)
+                if data is None:
+                    data = self._accounts[key] = await self.config.member_from_ids(guild_id, member_id).all()
+
+        # Reset earned_today if the stored date is in the past
+        if data["earned_today_date"] != today():
+            data["earned_today"] = 0
+            data["earned_today_date"] = today()
+            self._dirty.add(key)
+        return data
+
+    async def history_limit(self, guild_id: int) -> int:
+        limit = self._history_limits.get(guild_id)
+        if limit is None:
+            limit = self._history_limits[guild_id] = await self.config.guild_from_id(guild_id).history_limit()
+        return limit
+
+    def set_history_limit(self, guild_id: int, limit: int):
+        self._history_limits[guild_id] = limit
+
+    @property
+    def pending(self) -> int:
+        """Members with changes not yet written to Config."""
+        return len(self._dirty)
+
+    async def add(
+        self,
+        guild_id: int,
+        member_id: int,
+        delta: int,
+        *,
+        reason: str,
+        actor_name: str,
+        metadata: Optional[dict] = None,
+    ) -> int:
+        """
+        Apply ``delta`` to a member's balance (clamped at 0), update their
+        stats and history, and journal the change. Returns the new balance.
+        """
+        data = await self.account(guild_id, member_id)
+        limit = await self.history_limit(guild_id)
+
+        async with self.lock(guild_id, member_id):
+            entry = self._apply(data, delta, limit, reason, actor_name, metadata)
+            self._record(guild_id, [(member_id, data, entry)])
+        return data["balance"]
+
+    async def commit(self, guild_id: int, legs: List[Leg]) -> Dict[int, int]:
+        """
+        Apply several balance changes in one guild as a single transaction.
+
+        Prepare: load every record involved and take their locks in member ID
+        order, so overlapping transactions can't deadlock. If any leg would
+        take a balance below zero, InsufficientFunds is raised and nothing
+        changes. Commit: apply all legs
+        and journal them as one line, so they are replayed all together or
+        not at all. Returns each member's new balance.
+        """
+        member_ids = sorted({leg.member_id for leg in legs})
+        accounts = {member_id: await self.account(guild_id, member_id) for member_id in member_ids}
+        limit = await self.history_limit(guild_id)
+
+        async with contextlib.AsyncExitStack() as stack:
+            for member_id in member_ids:
+                await stack.enter_async_context(self.lock(guild_id, member_id))
+
+            # Check legs in order so no leg would need clamping
+            running = {member_id: accounts[member_id]["balance"] for member_id in member_ids}
+            for leg in legs:
+                running[leg.member_id] += leg.delta
+                if running[leg.member_id] < 0:
+                    balance = accounts[leg.member_id]["balance"]
+                    raise InsufficientFunds(leg.member_id, balance, balance - running[leg.member_id])
+
+            # Nothing below awaits: all legs land in memory and in the journal together
+            changes = [
+                (leg.member_id, accounts[leg.member_id],
+                 self._apply(accounts[leg.member_id], leg.delta, limit, leg.reason, leg.actor_name, leg.metadata))
+                for leg in legs
+            ]
+            self._record(guild_id, changes)
+
+        return {member_id: accounts[member_id]["balance"] for member_id in member_ids}
+
+    @staticmethod
+    def _apply(
+        data: dict,
+        delta: int,
+        limit: int,
+        reason: str,
+        actor_name: str,
+        metadata: Optional[dict],
+    ) -> dict:
+        """Change a record's balance and stats and append the history entry, which is returned."""
+        current = data["balance"]
+        new_balance = max(0, current + delta)
+        actual_delta = new_balance - current  # may differ if clamped to 0
+
+        data["balance"] = new_balance
+        if actual_delta > 0:
+            data["earned_today"] += actual_delta
+            data["lifetime_earned"] += actual_delta
+        elif actual_delta < 0:
+            data["lifetime_spent"] += abs(actual_delta)
+
+        entry: Dict[str, Any] = {
+            "ts": int(datetime.datetime.now(tz=datetime.timezone.utc).timestamp()),
+            "delta": actual_delta,
+            "new_balance": new_balance,
+            "reason": reason,
+            "actor_name": actor_name,
+        }
+        if metadata:
+            entry["metadata"] = metadata
+
+        history = data["history"]
+        history.append(entry)
+        if len(history) > limit:
+            del history[: len(history) - limit]
+        return entry
+
+    def discard(self, guild_id: int, member_id: Optional[int] = None):
+        """Forget cached records for one member, or a whole guild if ``member_id`` is None."""
+        for key in list(self._accounts):
+            if key[0] == guild_id and (member_id is None or key[1] == member_id):
+                del self._accounts[key]
+                self._dirty.discard(key)
+
+        if member_id is None:
+            self._rankings.pop(guild_id, None)
+        elif guild_id in self._rankings:
+            self._rankings[guild_id].update(member_id, 0)
+
+    async def ranking(self, guild_id: int) -> BalanceIndex:
+        """The guild's balance index, built from Config plus unflushed records on first use."""
+        index = self._rankings.get(guild_id)
+        if index is not None:
+            return index
+
+        async with self._ranking_lock:
+            index = self._rankings.get(guild_id)
+            if index is None:
+                # One full read per guild per load; afterwards every change updates the index
+                members = await self.config.all_members(discord.Object(id=guild_id))
+                balances = {int(member_id): data.get("balance", 0) for member_id, data in members.items()}
+                for (gid, member_id), data in self._accounts.items():
+                    if gid == guild_id:
+                        balances[member_id] = data["balance"]
+                index = self._rankings[guild_id] = BalanceIndex(balances)
+        return index
+
+    # ══════════════════════════════════════════════════════════════════════
+    # Journal
+    # ══════════════════════════════════════════════════════════════════════
+
+    def _record(self, guild_id: int, changes: List[Tuple[int, dict, dict]]):
+        """Journal one transaction as a single line and mark its members dirty.
+
+        ``changes`` holds (member_id, record, history entry) for each leg.
+        """
+        self._seq += 1
+        legs = []
+        for member_id, data, entry in changes:
+            data["ledger_seq"] = self._seq
+            leg = {"member": member_id, "entry": entry}
+            leg.update((field, data[field]) for field in STATE_FIELDS)
+            legs.append(leg)
+            self._dirty.add((guild_id, member_id))
+
+        index = self._rankings.get(guild_id)
+        if index is not None:
+            for member_id, data, _ in changes:
+                index.update(member_id, data["balance"])
+
+        # A single short append; flushed to the OS so a process crash can't lose it
+        line = {"seq": self._seq, "guild": guild_id, "legs": legs}
+        self._journal.write(json.dumps(line, separators=(",", ":")) + "\n")
+        self._journal.flush()
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.journal_dir.glob("ledger-*.jsonl"))
+
+    def _open_segment(self):
+        path = self.journal_dir / f"ledger-{self._seq + 1:015d}.jsonl"
+        self._journal = open(path, "a", encoding="utf-8")
+
+    def _rotate(self):
+        """Sync and close the current segment and start a new one."""
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._journal.close()
+        self._open_segment()
+
+    async def flush(self):
+        """Write every dirty member to Config and drop the journal segments that covered them."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+
+            # Copy the dirty records and rotate the journal in one step: everything in
+            # the old segments is covered by these copies
+            dirty, self._dirty = self._dirty, set()
+            batch = {
+                key: {**self._accounts[key], "history": list(self._accounts[key]["history"])}
+                for key in dirty
+                if key in self._accounts
+            }
+            flushed_seq = self._seq
+            if self._journal.tell():
+                self._rotate()
+
+            keys = list(batch)
+            results = await asyncio.gather(
+                *(self.config.member_from_ids(*key).set(batch[key]) for key in keys),
+                return_exceptions=True,
+            )
+            failed = [key for key, result in zip(keys, results) if isinstance(result, Exception)]
+            if failed:
+                # Keep the segments so a crash can still replay these members
+                log.error(f"Ledger flush failed for {len(failed)} member(s); retrying next cycle")
+                self._dirty.update(key for key in failed if key in self._accounts)
+                return
+
+            await self.config.ledger_seq.set(flushed_seq)
+            current = Path(self._journal.name)
+            for path in self._segments():
+                if path != current:
+                    path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _read_segments(paths: List[Path]) -> List[dict]:
+        lines = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                for raw in f:
+                    try:
+                        lines.append(json.loads(raw))
+                    except json.JSONDecodeError:
+                        # Torn final line from a crash mid-write
+                        log.warning(f"Stopped replaying {path.name} at a damaged line")
+                        break
+        return lines
+
+    async def _replay(self):
+        """Apply journal lines that never reached Config."""
+        self._seq = await self.config.ledger_seq()
+        segments = self._segments()
+        if not segments:
+            return
+
+        # Per member: (seq, leg) in journal order
+        pending: Dict[MemberKey, List[Tuple[int, dict]]] = {}
+        for line in await asyncio.to_thread(self._read_segments, segments):
+            for leg in line["legs"]:
+                pending.setdefault((line["guild"], leg["member"]), []).append((line["seq"], leg))
+            self._seq = max(self._seq, line["seq"])
+
+        replayed = 0
+        for (guild_id, member_id), legs in pending.items():
+            group = self.config.member_from_ids(guild_id, member_id)
+            data = await group.all()
+            legs = [(seq, leg) for seq, leg in legs if seq > data.get("ledger_seq", 0)]
+            if not legs:
+                continue
+
+            limit = await self.history_limit(guild_id)
+            for seq, leg in legs:
+                for field in STATE_FIELDS:
+                    data[field] = leg[field]
+                data["history"].append(leg["entry"])
+                data["ledger_seq"] = seq
+            if len(data["history"]) > limit:
+                del data["history"][: len(data["history"]) - limit]
+
+            await group.set(data)
+            replayed += len(legs)
+
+        await self.config.ledger_seq.set(self._seq)
+        for path in segments:
+            path.unlink(missing_ok=True)
+        if replayed:
+            log.info(f"Replayed {replayed} journaled balance change(s) for {len(pending)} member(s)")
@@ -0,0 +1,61 @@
+"""
+bericore/ranking.py
+Sorted balance index for Beri leaderboards
+
+One BalanceIndex per guild keeps every positive balance in a list sorted by
+(balance descending, member ID), kept current by the ledger on each
+transaction. Rank, page and top-N lookups are bisections and slices; an
+update is a bisection plus a list insert/delete.
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+
+class BalanceIndex:
+    """Members of one guild ranked by balance"""
+
+    __slots__ = ("_keys", "_balances")
+
+    def __init__(self, balances: Optional[Dict[int, int]] = None):
+        self._balances: Dict[int, int] = {}
+        self._keys: List[Tuple[int, int]] = []  # (-balance, member_id), ascending
+        if balances:
+            self._balances = {member_id: bal for member_id, bal in balances.items() if bal > 0}
+            self._keys = sorted((-bal, member_id) for member_id, bal in self._balances.items())
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, member_id: int) -> bool:
+        return member_id in self._balances
+
+    def update(self, member_id: int, balance: int):
+        """Set a member's balance; members at 0 drop out of the ranking."""
+        old = self._balances.get(member_id)
+        if old == balance or (old is None and balance <= 0):
+            return
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old, member_id))]
+        if balance > 0:
+            self._balances[member_id] = balance
+            insort(self._keys, (-balance, member_id))
+        else:
+            del self._balances[member_id]
+
+    def balance_of(self, member_id: int) -> int:
+        return self._balances.get(member_id, 0)
+
+    def rank(self, member_id: int) -> Optional[int]:
+        """1-based rank, or None for members without Beri."""
+        balance = self._balances.get(member_id)
+        if balance is None:
+            return None
+        return bisect_left(self._keys, (-balance, member_id)) + 1
+
+    def page(self, start: int, count: int) -> List[Tuple[int, int]]:
+        """``count`` entries of ``(member_id, balance)`` from 0-based position ``start``."""
+        return [(member_id, -neg) for neg, member_id in self._keys[start:start + count]]
+
+    def top(self, count: int = 10) -> List[Tuple[int, int]]:
+        return self.page(0, count)
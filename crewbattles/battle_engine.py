@@ -0,0 +1,195 @@
+"""
+crewbattles/battle_engine.py
+Pure, seeded simulation of crew battles and tournament brackets
+
+Matches and brackets are resolved here without any Discord I/O; the
+tournament cog replays the resulting event streams at display speed.
+"""
+
+from __future__ import annotations
+import random
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+STARTING_HP = 100
+MAX_TURNS = 25  # Prevent infinite battles
+BURN_DAMAGE_PER_STACK = 5
+
+# Battle moves
+MOVES = [
+    {"name": "Strike", "type": "regular", "description": "A basic attack", "effect": None},
+    {"name": "Slash", "type": "regular", "description": "A quick sword slash", "effect": None},
+    {"name": "Punch", "type": "regular", "description": "A direct hit", "effect": None},
+    {"name": "Fireball", "type": "strong", "description": "A ball of fire", "effect": "burn", "burn_chance": 0.5},
+    {"name": "Thunder Strike", "type": "strong", "description": "A bolt of lightning", "effect": "stun", "stun_chance": 0.3},
+    {"name": "Heavy Blow", "type": "strong", "description": "A powerful attack", "effect": None},
+    {"name": "Critical Smash", "type": "critical", "description": "A devastating attack", "effect": None},
+    {"name": "Ultimate Strike", "type": "critical", "description": "An ultimate power move", "effect": None},
+    {"name": "Gum-Gum Pistol", "type": "strong", "description": "Luffy's signature attack", "effect": None},
+    {"name": "Three-Sword Style", "type": "critical", "description": "Zoro's powerful technique", "effect": None},
+    {"name": "Black Leg", "type": "regular", "description": "Sanji's kick technique", "effect": None}
+]
+
+
+@dataclass
+class BattleEvent:
+    """One step of a match: a burn tick, a stunned turn or an attack"""
+    kind: str  # "burn", "stun" or "attack"
+    actor: int  # Side index (0/1) the event happens to or is performed by
+    hp: Tuple[int, int]  # Health of both sides after the event
+    damage: int = 0
+    move: Optional[int] = None  # Index into MOVES for attacks
+    effect: Optional[str] = None  # "burn"/"stun" if the attack applied one
+
+
+@dataclass
+class MatchResult:
+    """Outcome of a simulated match"""
+    winner: int
+    outcome: str  # "ko", "double_ko", "health" or "tie"
+    hp: Tuple[int, int]
+    turns: int
+    events: List[BattleEvent] = field(default_factory=list)
+
+
+@dataclass
+class BracketMatch:
+    """A match inside a bracket, referring to entrants by index"""
+    sides: Tuple[int, int]
+    result: MatchResult
+
+    @property
+    def winner(self) -> int:
+        return self.sides[self.result.winner]
+
+    @property
+    def loser(self) -> int:
+        return self.sides[1 - self.result.winner]
+
+
+@dataclass
+class BracketRound:
+    number: int
+    matches: List[BracketMatch] = field(default_factory=list)
+    byes: List[int] = field(default_factory=list)
+    advancing: List[int] = field(default_factory=list)
+
+
+@dataclass
+class TournamentResult:
+    """A fully resolved single-elimination bracket"""
+    seed_order: List[int]  # Entrant indices after the opening shuffle
+    rounds: List[BracketRound]
+    champion: int
+
+
+def calculate_damage(move_type: str, rng: random.Random) -> int:
+    """Calculate damage based on move type."""
+    if move_type == "regular":
+        return rng.randint(8, 15)  # Regular attacks: 8-15 damage
+    elif move_type == "strong":
+        return rng.randint(12, 20)  # Strong attacks: 12-20 damage
+    elif move_type == "critical":
+        damage = rng.randint(18, 28)  # Critical attacks: 18-28 damage
+        if rng.random() < 0.25:  # 25% chance of critical hit
+            damage = int(damage * 1.5)  # Critical hit multiplier
+        return damage
+    else:
+        return 5  # Default damage
+
+
+def simulate_match(rng: random.Random, record_events: bool = True, max_turns: int = MAX_TURNS) -> MatchResult:
+    """Resolve a match between side 0 (moving first) and side 1."""
+    hp = [STARTING_HP, STARTING_HP]
+    burn = [0, 0]
+    stun = [False, False]
+    events: List[BattleEvent] = []
+
+    turn_index = 0
+    turn_count = 0
+
+    while hp[0] > 0 and hp[1] > 0 and turn_count < max_turns:
+        turn_count += 1
+        attacker = turn_index
+        defender = 1 - turn_index
+
+        # Apply burn damage at start of turn
+        if burn[defender] > 0:
+            burn_damage = BURN_DAMAGE_PER_STACK * burn[defender]
+            hp[defender] = max(0, hp[defender] - burn_damage)
+            burn[defender] -= 1
+            if record_events:
+                events.append(BattleEvent("burn", defender, (hp[0], hp[1]), damage=burn_damage))
+
+            # Check if defender died from burn
+            if hp[defender] <= 0:
+                break
+
+        # Skip turn if stunned
+        if stun[attacker]:
+            stun[attacker] = False
+            if record_events:
+                events.append(BattleEvent("stun", attacker, (hp[0], hp[1])))
+            turn_index = defender
+            continue
+
+        move_index = rng.randrange(len(MOVES))
+        move = MOVES[move_index]
+        damage = calculate_damage(move["type"], rng)
+
+        # Apply special effects
+        effect = None
+        if move["effect"] == "burn" and rng.random() < move.get("burn_chance", 0):
+            burn[defender] += 1
+            effect = "burn"
+        elif move["effect"] == "stun" and rng.random() < move.get("stun_chance", 0):
+            stun[defender] = True
+            effect = "stun"
+
+        hp[defender] = max(0, hp[defender] - damage)
+        if record_events:
+            events.append(BattleEvent("attack", attacker, (hp[0], hp[1]), damage=damage, move=move_index, effect=effect))
+
+        turn_index = defender
+
+    # Determine the winner
+    if hp[0] <= 0 and hp[1] <= 0:
+        winner, outcome = rng.randint(0, 1), "double_ko"
+    elif hp[0] <= 0:
+        winner, outcome = 1, "ko"
+    elif hp[1] <= 0:
+        winner, outcome = 0, "ko"
+    elif hp[0] != hp[1]:
+        winner, outcome = (0 if hp[0] > hp[1] else 1), "health"
+    else:
+        winner, outcome = rng.randint(0, 1), "tie"
+
+    return MatchResult(winner, outcome, (hp[0], hp[1]), turn_count, events)
+
+
+def simulate_tournament(entrants: int, rng: random.Random, record_events: bool = True) -> TournamentResult:
+    """Shuffle entrants 0..n-1 and resolve a single-elimination bracket (odd entrant out gets a bye)."""
+    if entrants < 1:
+        raise ValueError("A tournament needs at least one entrant")
+
+    remaining = list(range(entrants))
+    rng.shuffle(remaining)
+    seed_order = remaining.copy()
+
+    rounds: List[BracketRound] = []
+    while len(remaining) > 1:
+        bracket_round = BracketRound(number=len(rounds) + 1)
+        for i in range(0, len(remaining), 2):
+            if i + 1 < len(remaining):
+                sides = (remaining[i], remaining[i + 1])
+                bracket_round.matches.append(BracketMatch(sides, simulate_match(rng, record_events)))
+            else:
+                bracket_round.byes.append(remaining[i])
+
+        # Byes are announced first and advance ahead of the match winners
+        bracket_round.advancing = bracket_round.byes + [match.winner for match in bracket_round.matches]
+        remaining = bracket_round.advancing
+        rounds.append(bracket_round)
+
+    return TournamentResult(seed_order, rounds, remaining[0])
@@ -0,0 +1,115 @@
+"""
+crewbattles/benchmark.py
+Balance statistics for the crew battle engine
+
+Simulates many matches and brackets without Discord and reports who wins,
+how matches end and how fast the engine runs:
+
+    python crewbattles/benchmark.py --matches 100000 --bracket-size 8
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+try:
+    from .battle_engine import MOVES, MAX_TURNS, simulate_match, simulate_tournament
+except ImportError:
+    from battle_engine import MOVES, MAX_TURNS, simulate_match, simulate_tournament
+
+
+def match_statistics(matches: int, seed: int) -> dict:
+    """Play ``matches`` matches and collect balance numbers"""
+    rng = random.Random(seed)
+    first_mover_wins = 0
+    outcomes = Counter()
+    turns = Counter()
+    move_use = Counter()
+    move_damage = Counter()
+    effects = Counter()
+    winner_hp = 0
+
+    start = time.perf_counter()
+    for _ in range(matches):
+        result = simulate_match(rng)
+        first_mover_wins += result.winner == 0
+        outcomes[result.outcome] += 1
+        turns[result.turns] += 1
+        winner_hp += result.hp[result.winner]
+        for event in result.events:
+            if event.kind == "attack":
+                move_use[event.move] += 1
+                move_damage[event.move] += event.damage
+                if event.effect:
+                    effects[f"{event.effect} applied"] += 1
+            else:
+                effects[f"{event.kind} turn"] += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "matches": matches,
+        "elapsed": elapsed,
+        "first_mover_rate": first_mover_wins / matches,
+        "outcomes": outcomes,
+        "turns": turns,
+        "avg_turns": sum(t * n for t, n in turns.items()) / matches,
+        "avg_winner_hp": winner_hp / matches,
+        "move_use": move_use,
+        "move_damage": move_damage,
+        "effects": effects,
+    }
+
+
+def bracket_statistics(brackets: int, size: int, seed: int) -> dict:
+    """Resolve ``brackets`` tournaments and count titles per starting slot"""
+    rng = random.Random(seed)
+    titles = Counter()
+    start = time.perf_counter()
+    for _ in range(brackets):
+        titles[simulate_tournament(size, rng, record_events=False).champion] += 1
+    return {"brackets": brackets, "elapsed": time.perf_counter() - start, "titles": titles}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crew battle balance benchmark")
+    parser.add_argument("--matches", type=int, default=100_000)
+    parser.add_argument("--brackets", type=int, default=10_000)
+    parser.add_argument("--bracket-size", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    stats = match_statistics(args.matches, args.seed)
+    print(f"{stats['matches']:,} matches in {stats['elapsed']:.2f}s "
+          f"({stats['matches'] / stats['elapsed']:,.0f} matches/sec, "
+          f"{stats['elapsed'] / stats['matches'] * 1e6:.1f} µs/match)")
+    print(f"First mover win rate: {stats['first_mover_rate']:.2%}")
+    print(f"Average turns: {stats['avg_turns']:.1f} (cap {MAX_TURNS}), "
+          f"hit cap: {stats['turns'][MAX_TURNS] / stats['matches']:.2%}")
+    print(f"Average winner HP: {stats['avg_winner_hp']:.1f}")
+
+    print("Outcomes:")
+    for outcome, count in stats["outcomes"].most_common():
+        print(f"  {outcome:<10} {count / stats['matches']:7.2%}")
+
+    print("Moves:")
+    total_uses = sum(stats["move_use"].values()) or 1
+    for index, move in enumerate(MOVES):
+        uses = stats["move_use"][index]
+        avg = stats["move_damage"][index] / uses if uses else 0
+        print(f"  {move['name']:<18} {uses / total_uses:6.2%} used, {avg:5.1f} avg damage")
+
+    print("Effects per match:")
+    for effect, count in stats["effects"].most_common():
+        print(f"  {effect:<13} {count / stats['matches']:.2f}")
+
+    brackets = bracket_statistics(args.brackets, args.bracket_size, args.seed)
+    print(f"{brackets['brackets']:,} brackets of {args.bracket_size} in {brackets['elapsed']:.2f}s "
+          f"({brackets['elapsed'] / brackets['brackets'] * 1e6:.0f} µs/bracket)")
+    print("Title share by entrant (should be flat):")
+    for entrant in range(args.bracket_size):
+        print(f"  #{entrant:<3} {brackets['titles'][entrant] / brackets['brackets']:6.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,11 @@ class CrewSettings:
     MAX_CREW_SIZE = 50
     DEFAULT_EMOJI = "🏴‍☠️"
     BACKUP_RETENTION_DAYS = 30
+    BACKUP_INTERVAL_HOURS = 6
+    BACKUP_EVERY_CHANGES = 100
+    
+    # Storage settings
+    JOURNAL_COMPACT_RECORDS = 200  # Fold the change journal into the snapshot after this many records
     
     # Logging settings
     LOG_MAX_BYTES = 5 * 1024 * 1024  # 5MB
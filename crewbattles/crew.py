@@ -20,7 +20,7 @@ from .constants import CrewRole, CrewSettings, EMBED_COLORS, CREW_COLORS
 from .exceptions import *
 from .models import CrewData, CrewStats, CrewMember, InviteData
 from .logger import EnhancedCrewLogger
-from .utils import NicknameManager, EmbedBuilder, ValidationUtils, PermissionUtils
+from .utils import NicknameManager, EmbedBuilder, ValidationUtils, PermissionUtils, CrewIndex
 from .data_manager import DataManager
 from .ui import CrewManagementView, CrewInviteView, CrewButton, CrewView
 
@@ -49,6 +49,7 @@ class CrewManagement(commands.Cog):
         self.active_invites: Dict[int, InviteData] = {}
         self.guild_locks: Dict[str, asyncio.Lock] = {}
         self.crews: Dict[str, Dict[str, Any]] = {}  # Preserved for compatibility
+        self.crew_index = CrewIndex()  # Role/member -> crew lookups, kept in sync with self.crews
         
         # Configuration
         default_guild = {
@@ -188,6 +189,7 @@ class CrewManagement(commands.Cog):
             # Ensure member is in the list (in case of data sync issues)
             if member.id not in crew.get("members", []):
                 crew["members"].append(member.id)
+            self.crew_index.add_member(guild_id, member.id, crew_name)
             
             # Assign crew role
             crew_role = ctx.guild.get_role(crew.get("crew_role"))
@@ -297,6 +299,7 @@ class CrewManagement(commands.Cog):
             
             # Load data into memory
             self.crews[guild_id] = crews_data
+            self.crew_index.rebuild(guild_id, crews_data, guild)
             
             self.enhanced_logger.info(f"Loaded {len(crews_data)} crews for guild {guild.name}")
             return True
@@ -875,6 +878,7 @@ class CrewManagement(commands.Cog):
             # Ensure member is in the list (in case of data sync issues)
             if member.id not in crew.get("members", []):
                 crew["members"].append(member.id)
+            self.crew_index.add_member(guild_id, member.id, crew_name)
             
             # Assign crew role
             crew_role = guild.get_role(crew.get("crew_role"))
@@ -928,20 +932,34 @@ class CrewManagement(commands.Cog):
         return True
 
     async def _get_member_current_crew(self, member: discord.Member, crews: Dict[str, Dict[str, Any]]) -> Optional[str]:
-        """Get the crew a member is currently in by checking their Discord roles"""
-        for crew_name, crew_data in crews.items():
-            # Check all crew roles (captain, vice captain, regular crew)
-            crew_roles = [
-                crew_data.get("captain_role"),
-                crew_data.get("vice_captain_role"), 
-                crew_data.get("crew_role")
-            ]
-            
-            for role_id in crew_roles:
-                if role_id and any(role.id == role_id for role in member.roles):
-                    return crew_name
-        
-        return None
+        """Get the crew a member is currently in from the membership index (lists and Discord roles)"""
+        crew_name = self.crew_index.get_member_crew(str(member.guild.id), member)
+        return crew_name if crew_name in crews else None
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Keep the membership index in step with crew role changes"""
+        if before.roles == after.roles:
+            return
+        
+        guild_id = str(after.guild.id)
+        crews = self.crews.get(guild_id)
+        if not crews:
+            return
+        
+        crew_name = None
+        for role in after.roles:
+            crew_name = self.crew_index.crew_for_role(guild_id, role.id)
+            if crew_name:
+                break
+        
+        if crew_name:
+            self.crew_index.add_member(guild_id, after.id, crew_name)
+        else:
+            # Lost every crew role; the membership list still counts if they are on it
+            current = self.crew_index.members.get(guild_id, {}).get(after.id)
+            if current and after.id not in crews.get(current, {}).get("members", []):
+                self.crew_index.remove_member(guild_id, after.id)
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild):
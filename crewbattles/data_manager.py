@@ -1,11 +1,21 @@
 """
 crewbattles/data_manager.py
 Enhanced data management with validation, backup, and atomic operations
+
+Each guild is stored as a snapshot (``Crews/<guild_id>.json``) plus an
+append-only journal of changed crews (``Crews/<guild_id>.journal.jsonl``).
+Saves only validate and journal the crews whose serialized form changed;
+the journal is folded back into the snapshot every few hundred records, and
+backups are taken at compaction time on a schedule instead of per save.
+Integrity is checked with checksums, and all file I/O runs off the event loop.
 """
 
+import asyncio
 import json
+import os
 import shutil
 import datetime
+import zlib
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 
@@ -17,6 +27,23 @@ from .logger import EnhancedCrewLogger
 from .exceptions import DataCorruptionError, BackupError, CrewValidationError
 
 
+DATA_VERSION = "enhanced_v1.1"
+
+
+def serialize_crew(crew_data: Dict[str, Any]) -> str:
+    """Canonical compact JSON for a crew (used for change detection and storage)"""
+    return json.dumps(crew_data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def checksum(text: str) -> str:
+    return f"{zlib.crc32(text.encode('utf-8')):08x}"
+
+
+def crews_checksum(texts: Dict[str, str]) -> str:
+    """Checksum over a whole guild's crews, independent of key order"""
+    return checksum("\n".join(f"{name}\t{texts[name]}" for name in sorted(texts)))
+
+
 class DataManager:
     """Enhanced data management with validation, backup, and atomic operations"""
     
@@ -27,64 +54,91 @@ class DataManager:
         self.temp_dir = data_path / "Temp"
         self.logger = logger
         
+        # Serialized crews as last written, per guild (None/missing = unknown, next save rewrites the snapshot)
+        self._saved: Dict[int, Dict[str, str]] = {}
+        self._journal_records: Dict[int, int] = {}
+        self._changes_since_backup: Dict[int, int] = {}
+        self._last_backup: Dict[int, datetime.datetime] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        
         # Ensure directories exist
         self.crews_dir.mkdir(exist_ok=True)
         self.backup_dir.mkdir(exist_ok=True)
         self.temp_dir.mkdir(exist_ok=True)
     
+    def _lock(self, guild_id: int) -> asyncio.Lock:
+        if guild_id not in self._locks:
+            self._locks[guild_id] = asyncio.Lock()
+        return self._locks[guild_id]
+    
+    def _snapshot_path(self, guild_id: int) -> Path:
+        return self.crews_dir / f"{guild_id}.json"
+    
+    def _journal_path(self, guild_id: int) -> Path:
+        return self.crews_dir / f"{guild_id}.journal.jsonl"
+    
     async def save_crew_data(self, guild: discord.Guild, crews: Dict[str, Dict[str, Any]]) -> bool:
         """
-        Save crew data with backup, validation, and atomic operations
+        Save crew data, writing only crews that changed since the last save
         Returns True if successful, False otherwise
         """
         start_time = datetime.datetime.now()
         
         try:
-            # Create backup first
-            backup_success = await self.create_backup(guild)
-            if not backup_success:
-                self.logger.warning(f"Backup failed for guild {guild.id}, proceeding with save anyway")
-            
-            # Validate all crew data before saving
-            validation_errors = []
-            for crew_name, crew_data in crews.items():
-                is_valid, errors = self.validate_crew_data(crew_data)
-                if not is_valid:
-                    validation_errors.extend([f"{crew_name}: {error}" for error in errors])
-            
-            if validation_errors:
-                self.logger.error(f"Validation failed for guild {guild.id}: {validation_errors}")
-                raise CrewValidationError("Multiple crews", validation_errors)
-            
-            # Prepare data structure
-            data = {
-                "crews": crews,
-                "metadata": {
-                    "version": "enhanced_v1.1",
-                    "last_modified": datetime.datetime.now().isoformat(),
-                    "guild_id": guild.id,
-                    "guild_name": guild.name,
-                    "crew_count": len(crews),
-                    "backup_created": backup_success
-                }
-            }
-            
-            # Atomic save operation
-            success = await self._atomic_save(guild.id, data)
-            
-            if success:
-                duration = (datetime.datetime.now() - start_time).total_seconds()
-                file_path = self.crews_dir / f"{guild.id}.json"
-                file_size = file_path.stat().st_size if file_path.exists() else 0
+            # Serializing up front freezes this save's view of the crews, so callers
+            # can keep mutating their dicts while the write runs in a thread
+            texts = {name: serialize_crew(crew) for name, crew in crews.items()}
+            
+            async with self._lock(guild.id):
+                saved = self._saved.get(guild.id)
+                if saved is None:
+                    changed = list(texts)
+                    deleted = []
+                else:
+                    changed = [name for name, text in texts.items() if saved.get(name) != text]
+                    deleted = [name for name in saved if name not in texts]
+                    if not changed and not deleted:
+                        return True
                 
-                self.logger.log_data_operation(
-                    "save_crew_data", guild.id, True,
-                    crew_count=len(crews),
-                    file_size=file_size,
-                    duration=duration
+                # Validate only what is being written
+                validation_errors = []
+                for crew_name in changed:
+                    is_valid, errors = self.validate_crew_data(crews[crew_name])
+                    if not is_valid:
+                        validation_errors.extend([f"{crew_name}: {error}" for error in errors])
+                
+                if validation_errors:
+                    self.logger.error(f"Validation failed for guild {guild.id}: {validation_errors}")
+                    raise CrewValidationError("Multiple crews", validation_errors)
+                
+                records = self._journal_records.get(guild.id, 0) + len(changed) + len(deleted)
+                self._changes_since_backup[guild.id] = (
+                    self._changes_since_backup.get(guild.id, 0) + len(changed) + len(deleted)
                 )
+                
+                if (saved is None or records >= CrewSettings.JOURNAL_COMPACT_RECORDS
+                        or self._backup_due(guild.id)):
+                    await self._compact(guild, texts)
+                    mode = "snapshot"
+                else:
+                    lines = [self._journal_line(name, texts[name]) for name in changed]
+                    lines.extend(json.dumps({"op": "del", "name": name}, ensure_ascii=False) for name in deleted)
+                    await asyncio.to_thread(self._append_journal, guild.id, lines)
+                    self._journal_records[guild.id] = records
+                    self._saved[guild.id] = texts
+                    mode = "journal"
+            
+            duration = (datetime.datetime.now() - start_time).total_seconds()
+            self.logger.log_data_operation(
+                "save_crew_data", guild.id, True,
+                crew_count=len(crews),
+                changed=len(changed),
+                deleted=len(deleted),
+                mode=mode,
+                duration=duration
+            )
             
-            return success
+            return True
             
         except Exception as e:
             duration = (datetime.datetime.now() - start_time).total_seconds()
@@ -103,20 +157,24 @@ class DataManager:
         start_time = datetime.datetime.now()
         
         try:
-            file_path = self.crews_dir / f"{guild.id}.json"
-            
-            if not file_path.exists():
+            if not self._snapshot_path(guild.id).exists() and not self._journal_path(guild.id).exists():
                 self.logger.info(f"No data file found for guild {guild.name} ({guild.id})")
                 return {}
             
-            # Load data
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Extract metadata and crews
-            metadata = data.get("metadata", {})
-            version = metadata.get("version", "legacy")
-            crew_data = data.get("crews", {})
+            async with self._lock(guild.id):
+                metadata, crew_data, journal_records = await asyncio.to_thread(self._read_guild, guild.id)
+                version = metadata.get("version", "legacy")
+                if version == DATA_VERSION:
+                    texts = {name: serialize_crew(crew) for name, crew in crew_data.items()}
+                    self._saved[guild.id] = texts
+                    self._journal_records[guild.id] = journal_records
+                    if self._journal_path(guild.id).exists():
+                        # Start from a clean snapshot so a torn journal tail can't hide later records
+                        await self._compact(guild, texts, allow_backup=False)
+                else:
+                    # Older formats are rewritten in full by the first save
+                    self._saved.pop(guild.id, None)
+                    self._journal_records[guild.id] = 0
             
             # Validate and migrate data
             crews = {}
@@ -150,6 +208,7 @@ class DataManager:
                 crew_count=len(crews),
                 data_version=version,
                 migrations=migration_count,
+                journal_records=journal_records,
                 duration=duration
             )
             
@@ -168,34 +227,147 @@ class DataManager:
             )
             return {}
     
+    async def flush_journal(self, guild: discord.Guild) -> bool:
+        """
+        Fold any pending journal records into the snapshot file
+        Returns True if the snapshot is up to date afterwards
+        """
+        try:
+            async with self._lock(guild.id):
+                await self._flush_journal(guild)
+            return True
+        except Exception as e:
+            self.logger.log_error_with_context(e, "flush_journal", guild.id)
+            return False
+    
+    async def _flush_journal(self, guild: discord.Guild):
+        """Compact the journal if one exists (caller holds the guild lock)"""
+        if not self._journal_path(guild.id).exists():
+            return
+        texts = self._saved.get(guild.id)
+        if texts is None:
+            _, crew_data, _ = await asyncio.to_thread(self._read_guild, guild.id)
+            texts = {name: serialize_crew(crew) for name, crew in crew_data.items()}
+        await self._compact(guild, texts, allow_backup=False)
+    
+    async def _compact(self, guild: discord.Guild, texts: Dict[str, str], allow_backup: bool = True):
+        """Write a fresh snapshot, drop the journal and take a backup if one is due (caller holds the lock)"""
+        backup_due = allow_backup and self._backup_due(guild.id)
+        metadata = {
+            "version": DATA_VERSION,
+            "last_modified": datetime.datetime.now().isoformat(),
+            "guild_id": guild.id,
+            "guild_name": guild.name,
+            "crew_count": len(texts),
+            "checksum": crews_checksum(texts),
+            "backup_created": backup_due
+        }
+        
+        await self._atomic_save(guild.id, texts, metadata)
+        self._saved[guild.id] = texts
+        self._journal_records[guild.id] = 0
+        
+        if backup_due:
+            await self._write_backup(guild)
+    
+    def _backup_due(self, guild_id: int) -> bool:
+        changes = self._changes_since_backup.get(guild_id, 0)
+        if changes <= 0:
+            return False
+        if changes >= CrewSettings.BACKUP_EVERY_CHANGES:
+            return True
+        last = self._last_backup.get(guild_id)
+        if last is None:
+            return True
+        return datetime.datetime.now() - last >= datetime.timedelta(hours=CrewSettings.BACKUP_INTERVAL_HOURS)
+    
+    @staticmethod
+    def _journal_line(name: str, text: str) -> str:
+        # The crew text is already canonical JSON, so it is embedded as-is
+        return f'{{"op":"put","name":{json.dumps(name, ensure_ascii=False)},"crc":"{checksum(text)}","crew":{text}}}'
+    
+    def _append_journal(self, guild_id: int, lines: List[str]):
+        """Append journal records (runs in a worker thread)"""
+        with open(self._journal_path(guild_id), 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+    
+    def _read_guild(self, guild_id: int) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]], int]:
+        """
+        Read the snapshot and replay the journal on top of it (runs in a worker thread)
+        Returns (metadata, crews, journal_records)
+        """
+        metadata: Dict[str, Any] = {}
+        crews: Dict[str, Dict[str, Any]] = {}
+        
+        snapshot = self._snapshot_path(guild_id)
+        if snapshot.exists():
+            with open(snapshot, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            metadata = data.get("metadata", {})
+            crews = data.get("crews", {})
+            
+            expected = metadata.get("checksum")
+            if expected:
+                actual = crews_checksum({name: serialize_crew(crew) for name, crew in crews.items()})
+                if actual != expected:
+                    self.logger.log_error_with_context(
+                        DataCorruptionError(f"Snapshot checksum mismatch ({actual} != {expected})"),
+                        "read_guild", guild_id
+                    )
+        
+        records = 0
+        journal = self._journal_path(guild_id)
+        if journal.exists():
+            with open(journal, 'r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                        if record["op"] == "put":
+                            if checksum(serialize_crew(record["crew"])) != record["crc"]:
+                                raise DataCorruptionError("journal record checksum mismatch")
+                            crews[record["name"]] = record["crew"]
+                        elif record["op"] == "del":
+                            crews.pop(record["name"], None)
+                    except (ValueError, KeyError, DataCorruptionError) as e:
+                        # A torn or damaged record: keep everything before it
+                        self.logger.warning(f"Stopping journal replay for guild {guild_id} at line {line_no}: {e}")
+                        break
+                    records += 1
+        
+        return metadata, crews, records
+    
     async def create_backup(self, guild: discord.Guild) -> bool:
         """
         Create a timestamped backup of current crew data
         Returns True if successful, False otherwise
         """
+        async with self._lock(guild.id):
+            await self._flush_journal(guild)
+            return await self._write_backup(guild)
+    
+    async def _write_backup(self, guild: discord.Guild) -> bool:
+        """Copy the snapshot into the backup directory (caller holds the lock)"""
         try:
-            source_file = self.crews_dir / f"{guild.id}.json"
+            source_file = self._snapshot_path(guild.id)
             if not source_file.exists():
                 return True  # No data to backup
             
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_file = self.backup_dir / f"{guild.id}_{timestamp}.json"
             
-            # Copy file with metadata
-            shutil.copy2(source_file, backup_file)
-            
             # Add backup metadata
             backup_metadata = {
                 "original_file": str(source_file),
                 "backup_created": datetime.datetime.now().isoformat(),
                 "guild_id": guild.id,
                 "guild_name": guild.name,
-                "file_size": source_file.stat().st_size
             }
+            file_size = await asyncio.to_thread(self._copy_backup, source_file, backup_file, backup_metadata)
             
-            metadata_file = backup_file.with_suffix('.meta.json')
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(backup_metadata, f, indent=2)
+            self._changes_since_backup[guild.id] = 0
+            self._last_backup[guild.id] = datetime.datetime.now()
             
             # Clean up old backups
             await self._cleanup_old_backups(guild.id)
@@ -203,7 +375,7 @@ class DataManager:
             self.logger.log_data_operation(
                 "create_backup", guild.id, True,
                 backup_file=backup_file.name,
-                file_size=source_file.stat().st_size
+                file_size=file_size
             )
             
             return True
@@ -214,6 +386,17 @@ class DataManager:
             )
             raise BackupError("create", str(e))
     
+    @staticmethod
+    def _copy_backup(source_file: Path, backup_file: Path, backup_metadata: Dict[str, Any]) -> int:
+        """Copy a snapshot and write its metadata file (runs in a worker thread)"""
+        shutil.copy2(source_file, backup_file)
+        backup_metadata["file_size"] = backup_file.stat().st_size
+        
+        metadata_file = backup_file.with_suffix('.meta.json')
+        with open(metadata_file, 'w', encoding='utf-8') as f:
+            json.dump(backup_metadata, f, indent=2)
+        return backup_metadata["file_size"]
+    
     async def restore_backup(self, guild: discord.Guild, backup_timestamp: str) -> bool:
         """
         Restore crew data from a specific backup
@@ -225,14 +408,19 @@ class DataManager:
             if not backup_file.exists():
                 raise BackupError("restore", f"Backup file not found: {backup_file}")
             
-            # Create backup of current data first
-            current_backup = await self.create_backup(guild)
-            if not current_backup:
-                self.logger.warning("Failed to backup current data before restore")
-            
-            # Copy backup to main location
-            target_file = self.crews_dir / f"{guild.id}.json"
-            shutil.copy2(backup_file, target_file)
+            async with self._lock(guild.id):
+                # Create backup of current data first
+                await self._flush_journal(guild)
+                current_backup = await self._write_backup(guild)
+                if not current_backup:
+                    self.logger.warning("Failed to backup current data before restore")
+                
+                # Copy backup to main location; the next save rewrites the snapshot in full
+                target_file = self._snapshot_path(guild.id)
+                await asyncio.to_thread(shutil.copy2, backup_file, target_file)
+                self._journal_path(guild.id).unlink(missing_ok=True)
+                self._saved.pop(guild.id, None)
+                self._journal_records[guild.id] = 0
             
             self.logger.log_data_operation(
                 "restore_backup", guild.id, True,
@@ -358,35 +546,34 @@ class DataManager:
         
         return len(errors) == 0, errors
     
-    async def _atomic_save(self, guild_id: int, data: Dict[str, Any]) -> bool:
+    async def _atomic_save(self, guild_id: int, texts: Dict[str, str], metadata: Dict[str, Any]) -> bool:
         """
-        Perform atomic save operation using temporary file
-        Returns True if successful, False otherwise
+        Write a snapshot through a temporary file and swap it in atomically
+        Returns True if successful, raises otherwise
         """
+        temp_file = self.temp_dir / f"{guild_id}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S%f')}.tmp"
+        await asyncio.to_thread(self._write_snapshot, guild_id, temp_file, texts, metadata)
+        return True
+    
+    def _write_snapshot(self, guild_id: int, temp_file: Path, texts: Dict[str, str], metadata: Dict[str, Any]):
+        """Write, fsync and rename the snapshot, then drop the journal (runs in a worker thread)"""
         try:
-            target_file = self.crews_dir / f"{guild_id}.json"
-            temp_file = self.temp_dir / f"{guild_id}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.tmp"
-            
-            # Write to temporary file first
+            # Crews are already serialized, so the snapshot is assembled rather than re-encoded
+            body = ",".join(f"{json.dumps(name, ensure_ascii=False)}:{text}" for name, text in texts.items())
             with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            # Verify the temporary file was written correctly
-            with open(temp_file, 'r', encoding='utf-8') as f:
-                verification_data = json.load(f)
-                if verification_data != data:
-                    raise DataCorruptionError("Data verification failed after write")
+                f.write(f'{{"crews":{{{body}}},"metadata":{json.dumps(metadata, ensure_ascii=False)}}}')
+                f.flush()
+                os.fsync(f.fileno())
             
             # Atomic rename operation
-            temp_file.rename(target_file)
-            
-            return True
+            os.replace(temp_file, self._snapshot_path(guild_id))
+            self._journal_path(guild_id).unlink(missing_ok=True)
             
-        except Exception as e:
+        except Exception:
             # Clean up temporary file if it exists
             if temp_file.exists():
                 temp_file.unlink()
-            raise e
+            raise
     
     def _migrate_crew_data(self, crew_dict: Dict[str, Any], version: str) -> Dict[str, Any]:
         """
@@ -498,7 +685,7 @@ class DataManager:
                     "crews": crews,
                     "export_metadata": {
                         "format": "json",
-                        "version": "enhanced_v1.1",
+                        "version": DATA_VERSION,
                         "crew_count": len(crews),
                         "total_members": sum(len(crew.get('members', [])) for crew in crews.values())
                     }
@@ -628,13 +815,15 @@ class DataManager:
     def get_data_statistics(self, guild: discord.Guild) -> Dict[str, Any]:
         """Get comprehensive statistics about stored data"""
         try:
-            file_path = self.crews_dir / f"{guild.id}.json"
+            file_path = self._snapshot_path(guild.id)
+            journal_path = self._journal_path(guild.id)
             
             stats = {
                 "guild_id": guild.id,
                 "guild_name": guild.name,
                 "data_file_exists": file_path.exists(),
                 "file_size": 0,
+                "journal_size": 0,
                 "last_modified": None,
                 "backup_count": 0,
                 "crew_count": 0,
@@ -648,14 +837,18 @@ class DataManager:
                 stats["last_modified"] = datetime.datetime.fromtimestamp(
                     file_stat.st_mtime
                 ).isoformat()
-                
+            
+            if journal_path.exists():
+                journal_stat = journal_path.stat()
+                stats["journal_size"] = journal_stat.st_size
+                stats["last_modified"] = datetime.datetime.fromtimestamp(
+                    journal_stat.st_mtime
+                ).isoformat()
+            
+            if file_path.exists() or journal_path.exists():
                 # Try to load basic data info
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    metadata = data.get("metadata", {})
-                    crews = data.get("crews", {})
+                    metadata, crews, _ = self._read_guild(guild.id)
                     
                     stats["data_version"] = metadata.get("version", "legacy")
                     stats["crew_count"] = len(crews)
@@ -76,6 +76,7 @@ class CrewDataMigrator:
             
             # Update in-memory data
             self.cog.crews[guild_id] = migrated_data
+            self.cog.crew_index.rebuild(guild_id, migrated_data, guild)
             
             # Save migrated data
             save_success = await self.data_manager.save_crew_data(guild, migrated_data)
@@ -113,6 +114,8 @@ class CrewDataMigrator:
     async def _load_legacy_data(self, guild) -> Dict[str, Any]:
         """Load legacy crew data from file"""
         try:
+            # Fold pending journal records into the file first so it is complete
+            await self.data_manager.flush_journal(guild)
             file_path = self.data_manager.crews_dir / f"{guild.id}.json"
             
             if not file_path.exists():
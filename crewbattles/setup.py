@@ -146,6 +146,7 @@ def setup_commands(cog_class):
             # Clear data
             if guild_id in self.crews:
                 self.crews[guild_id] = {}
+            self.crew_index.clear(guild_id)
             
             # Reset configuration
             await self.config.guild(ctx.guild).finished_setup.set(False)
@@ -9,7 +9,7 @@ import json
 import os
 import random
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 import discord
 from redbot.core import commands, Config
@@ -20,6 +20,7 @@ from .constants import CrewSettings, EMBED_COLORS
 from .utils import EmbedBuilder, PermissionUtils
 from .logger import EnhancedCrewLogger
 from .exceptions import CrewError
+from .battle_engine import MOVES, STARTING_HP, MatchResult, simulate_match, simulate_tournament
 
 
 class TournamentSystem(commands.Cog):
@@ -49,20 +50,8 @@ class TournamentSystem(commands.Cog):
         self.data_path = cog_data_path(self)
         self.enhanced_logger = EnhancedCrewLogger("TournamentSystem", self.data_path)
         
-        # Define enhanced battle moves
-        self.MOVES = [
-            {"name": "Strike", "type": "regular", "description": "A basic attack", "effect": None},
-            {"name": "Slash", "type": "regular", "description": "A quick sword slash", "effect": None},
-            {"name": "Punch", "type": "regular", "description": "A direct hit", "effect": None},
-            {"name": "Fireball", "type": "strong", "description": "A ball of fire", "effect": "burn", "burn_chance": 0.5},
-            {"name": "Thunder Strike", "type": "strong", "description": "A bolt of lightning", "effect": "stun", "stun_chance": 0.3},
-            {"name": "Heavy Blow", "type": "strong", "description": "A powerful attack", "effect": None},
-            {"name": "Critical Smash", "type": "critical", "description": "A devastating attack", "effect": None},
-            {"name": "Ultimate Strike", "type": "critical", "description": "An ultimate power move", "effect": None},
-            {"name": "Gum-Gum Pistol", "type": "strong", "description": "Luffy's signature attack", "effect": None},
-            {"name": "Three-Sword Style", "type": "critical", "description": "Zoro's powerful technique", "effect": None},
-            {"name": "Black Leg", "type": "regular", "description": "Sanji's kick technique", "effect": None}
-        ]
+        # Battle moves (shared with the headless simulation engine)
+        self.MOVES = MOVES
         
         # Initialize on startup
         self.bot.loop.create_task(self.initialize())
@@ -915,11 +904,19 @@ class TournamentSystem(commands.Cog):
                         crew["stats"] = {"wins": 0, "losses": 0, "tournaments_won": 0, "tournaments_participated": 0}
                     crew["stats"]["tournaments_participated"] = crew["stats"].get("tournaments_participated", 0) + 1
             
-            # Shuffle participating crews
-            random.shuffle(participating_crews)
+            # Resolve the whole bracket up front (seeded, so it can be reproduced), then replay it
+            seed = random.randrange(2 ** 32)
+            bracket = simulate_tournament(len(participating_crews), random.Random(seed))
+            self.enhanced_logger.log_crew_action(
+                "tournament_bracket_simulated", guild.id,
+                tournament_name=name, seed=seed, rounds=len(bracket.rounds)
+            )
             
             # Send tournament start message
-            crew_list = "\n".join([f"• {crew.get('emoji', '🏴‍☠️')} **{crew['name']}**" for crew in participating_crews])
+            crew_list = "\n".join([
+                f"• {participating_crews[i].get('emoji', '🏴‍☠️')} **{participating_crews[i]['name']}**"
+                for i in bracket.seed_order
+            ])
             
             embed = EmbedBuilder.create_info_embed(
                 f"🏆 Tournament: {name}",
@@ -935,11 +932,10 @@ class TournamentSystem(commands.Cog):
             await channel.send(embed=embed)
             await asyncio.sleep(3)
             
-            # Run tournament rounds
-            round_number = 1
-            remaining_crews = participating_crews.copy()
-            
-            while len(remaining_crews) > 1:
+            # Replay tournament rounds
+            for bracket_round in bracket.rounds:
+                round_number = bracket_round.number
+                
                 # Announce the round
                 round_embed = EmbedBuilder.create_info_embed(
                     f"🔥 Round {round_number}",
@@ -948,25 +944,19 @@ class TournamentSystem(commands.Cog):
                 await channel.send(embed=round_embed)
                 await asyncio.sleep(2)
                 
-                # Pair crews and run matches
-                new_remaining_crews = []
-                pairs = []
-                
-                # Create pairs
-                for i in range(0, len(remaining_crews), 2):
-                    if i + 1 < len(remaining_crews):
-                        pairs.append((remaining_crews[i], remaining_crews[i+1]))
-                    else:
-                        # If odd number of crews, give a bye to the last crew
-                        new_remaining_crews.append(remaining_crews[i])
-                        bye_embed = EmbedBuilder.create_info_embed(
-                            "🎯 Bye Round",
-                            f"{remaining_crews[i].get('emoji', '🏴‍☠️')} **{remaining_crews[i]['name']}** advances to the next round with a bye!"
-                        )
-                        await channel.send(embed=bye_embed)
+                # If odd number of crews, the last crew gets a bye
+                for crew_index in bracket_round.byes:
+                    bye_crew = participating_crews[crew_index]
+                    bye_embed = EmbedBuilder.create_info_embed(
+                        "🎯 Bye Round",
+                        f"{bye_crew.get('emoji', '🏴‍☠️')} **{bye_crew['name']}** advances to the next round with a bye!"
+                    )
+                    await channel.send(embed=bye_embed)
                 
-                # Run each match in the round
-                for crew1, crew2 in pairs:
+                # Replay each match in the round
+                for match in bracket_round.matches:
+                    crew1 = participating_crews[match.sides[0]]
+                    crew2 = participating_crews[match.sides[1]]
                     await asyncio.sleep(2)
                     
                     # Announce match
@@ -976,22 +966,11 @@ class TournamentSystem(commands.Cog):
                     )
                     await channel.send(embed=match_embed)
                     
-                    # Run the match
-                    winner = await self.run_match(channel, crew1, crew2)
-                    
-                    if not winner:
-                        self.enhanced_logger.error(f"Match between {crew1['name']} and {crew2['name']} failed to return a winner")
-                        winner = crew1  # Default fallback
-                        await channel.send(embed=EmbedBuilder.create_warning_embed(
-                            "Match Error",
-                            f"Error determining winner, defaulting to {crew1.get('emoji', '🏴‍☠️')} **{crew1['name']}**"
-                        ))
-                    
-                    # Add winner to next round
-                    new_remaining_crews.append(winner)
+                    await self.replay_match(channel, crew1, crew2, match.result)
                     
                     # Update stats
-                    loser = crew2 if winner == crew1 else crew1
+                    winner = participating_crews[match.winner]
+                    loser = participating_crews[match.loser]
                     
                     # Ensure stats dictionaries exist
                     for crew in [winner, loser]:
@@ -1001,17 +980,16 @@ class TournamentSystem(commands.Cog):
                     winner["stats"]["wins"] = winner["stats"].get("wins", 0) + 1
                     loser["stats"]["losses"] = loser["stats"].get("losses", 0) + 1
                 
-                # Update remaining crews for next round
-                remaining_crews = new_remaining_crews
-                round_number += 1
-                
                 # Announce advancing crews
-                if len(remaining_crews) > 1:
-                    next_round_crews = "\n".join([f"• {crew.get('emoji', '🏴‍☠️')} **{crew['name']}**" for crew in remaining_crews])
+                if len(bracket_round.advancing) > 1:
+                    next_round_crews = "\n".join([
+                        f"• {participating_crews[i].get('emoji', '🏴‍☠️')} **{participating_crews[i]['name']}**"
+                        for i in bracket_round.advancing
+                    ])
                     
                     advance_embed = EmbedBuilder.create_success_embed(
-                        f"Round {round_number-1} Complete",
-                        f"The following crews advance to Round {round_number}:"
+                        f"Round {round_number} Complete",
+                        f"The following crews advance to Round {round_number + 1}:"
                     )
                     advance_embed.add_field(
                         name="🏃‍♂️ Advancing Crews",
@@ -1023,49 +1001,43 @@ class TournamentSystem(commands.Cog):
                     await asyncio.sleep(3)
             
             # Tournament complete - we have a winner!
-            if remaining_crews:
-                winner = remaining_crews[0]
-                
-                # Update tournament win stats
-                if "stats" not in winner:
-                    winner["stats"] = {"wins": 0, "losses": 0, "tournaments_won": 0, "tournaments_participated": 0}
-                
-                winner["stats"]["tournaments_won"] = winner["stats"].get("tournaments_won", 0) + 1
-                
-                # Final announcement
-                final_embed = discord.Embed(
-                    title=f"🏆 TOURNAMENT CHAMPION 🏆",
-                    description=f"{winner.get('emoji', '🏴‍☠️')} **{winner['name']}** has conquered the tournament!",
-                    color=0xFFD700
-                )
-                
-                # Show champion stats
-                stats = winner['stats']
-                final_embed.add_field(
-                    name="🎯 Champion Statistics",
-                    value=(
-                        f"**Total Wins:** {stats.get('wins', 0)}\n"
-                        f"**Total Losses:** {stats.get('losses', 0)}\n"
-                        f"**Tournaments Won:** {stats.get('tournaments_won', 0)}\n"
-                        f"**Tournaments Entered:** {stats.get('tournaments_participated', 0)}"
-                    ),
-                    inline=False
-                )
-                
-                await channel.send(embed=final_embed)
-                
-                # Save updated crew statistics
-                await crew_manager.save_crews(guild)
-                
-                self.enhanced_logger.log_crew_action(
-                    "tournament_completed", guild.id,
-                    tournament_name=name, winner_crew=winner['name']
-                )
-            else:
-                await channel.send(embed=EmbedBuilder.create_error_embed(
-                    "Tournament Error",
-                    "No winner could be determined for the tournament."
-                ))
+            winner = participating_crews[bracket.champion]
+            
+            # Update tournament win stats
+            if "stats" not in winner:
+                winner["stats"] = {"wins": 0, "losses": 0, "tournaments_won": 0, "tournaments_participated": 0}
+            
+            winner["stats"]["tournaments_won"] = winner["stats"].get("tournaments_won", 0) + 1
+            
+            # Final announcement
+            final_embed = discord.Embed(
+                title=f"🏆 TOURNAMENT CHAMPION 🏆",
+                description=f"{winner.get('emoji', '🏴‍☠️')} **{winner['name']}** has conquered the tournament!",
+                color=0xFFD700
+            )
+            
+            # Show champion stats
+            stats = winner['stats']
+            final_embed.add_field(
+                name="🎯 Champion Statistics",
+                value=(
+                    f"**Total Wins:** {stats.get('wins', 0)}\n"
+                    f"**Total Losses:** {stats.get('losses', 0)}\n"
+                    f"**Tournaments Won:** {stats.get('tournaments_won', 0)}\n"
+                    f"**Tournaments Entered:** {stats.get('tournaments_participated', 0)}"
+                ),
+                inline=False
+            )
+            
+            await channel.send(embed=final_embed)
+            
+            # Save updated crew statistics
+            await crew_manager.save_crews(guild)
+            
+            self.enhanced_logger.log_crew_action(
+                "tournament_completed", guild.id,
+                tournament_name=name, winner_crew=winner['name']
+            )
             
             # Clean up tournament
             if name in tournaments:
@@ -1086,27 +1058,30 @@ class TournamentSystem(commands.Cog):
             if channel.id in self.active_channels:
                 self.active_channels.remove(channel.id)
 
+    def _health_field(self, crew1: Dict[str, Any], crew2: Dict[str, Any], hp: Tuple[int, int], bars: bool = True) -> str:
+        """Health status lines for both crews"""
+        lines = []
+        for crew, crew_hp in ((crew1, hp[0]), (crew2, hp[1])):
+            bar = f"{self.generate_health_bar(crew_hp)} " if bars else ""
+            lines.append(f"**{crew['emoji']} {crew['name']}:** {bar}{crew_hp}/{STARTING_HP}")
+        return "\n".join(lines)
+
     async def run_match(self, channel: discord.TextChannel, crew1: Dict[str, Any], crew2: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Run an enhanced battle between two crews."""
+        """Simulate a battle between two crews and play it out in the channel."""
+        result = simulate_match(random.Random())
+        return await self.replay_match(channel, crew1, crew2, result)
+
+    async def replay_match(
+        self,
+        channel: discord.TextChannel,
+        crew1: Dict[str, Any],
+        crew2: Dict[str, Any],
+        result: MatchResult
+    ) -> Dict[str, Any]:
+        """Replay a simulated match's events at display speed and return the winning crew."""
+        crews = [crew1, crew2]
+        winner = crews[result.winner]
         try:
-            # Initialize battle data
-            crews = [
-                {
-                    "name": crew1["name"], 
-                    "emoji": crew1["emoji"], 
-                    "hp": 100, 
-                    "status": {"burn": 0, "stun": False}, 
-                    "data": crew1
-                },
-                {
-                    "name": crew2["name"], 
-                    "emoji": crew2["emoji"], 
-                    "hp": 100, 
-                    "status": {"burn": 0, "stun": False}, 
-                    "data": crew2
-                },
-            ]
-            
             # Create the initial battle embed
             embed = EmbedBuilder.create_info_embed(
                 "🏴‍☠️ Crew Battle ⚔️",
@@ -1114,172 +1089,87 @@ class TournamentSystem(commands.Cog):
             )
             embed.add_field(
                 name="❤️ Health Status",
-                value=(
-                    f"**{crew1['emoji']} {crew1['name']}:** {self.generate_health_bar(100)} 100/100\n"
-                    f"**{crew2['emoji']} {crew2['name']}:** {self.generate_health_bar(100)} 100/100"
-                ),
+                value=self._health_field(crew1, crew2, (STARTING_HP, STARTING_HP)),
                 inline=False,
             )
             embed.color = 0xFF4444  # Red for battle
             
             message = await channel.send(embed=embed)
             
-            turn_index = 0
-            turn_count = 0
-            max_turns = 25  # Prevent infinite battles
-            
-            # Battle loop
-            while crews[0]["hp"] > 0 and crews[1]["hp"] > 0 and turn_count < max_turns:
-                turn_count += 1
-                attacker = crews[turn_index]
-                defender = crews[1 - turn_index]
+            for event in result.events:
+                crew = crews[event.actor]
                 
-                # Apply burn damage at start of turn
-                if defender["status"]["burn"] > 0:
-                    burn_damage = 5 * defender["status"]["burn"]
-                    defender["hp"] = max(0, defender["hp"] - burn_damage)
-                    defender["status"]["burn"] -= 1
-                    
-                    burn_embed = EmbedBuilder.create_warning_embed(
+                if event.kind == "burn":
+                    event_embed = EmbedBuilder.create_warning_embed(
                         "🔥 Burn Damage",
-                        f"**{defender['emoji']} {defender['name']}** takes {burn_damage} burn damage!"
+                        f"**{crew['emoji']} {crew['name']}** takes {event.damage} burn damage!"
                     )
-                    burn_embed.add_field(
+                    event_embed.add_field(
                         name="❤️ Health Status",
-                        value=(
-                            f"**{crews[0]['emoji']} {crews[0]['name']}:** {self.generate_health_bar(crews[0]['hp'])} {crews[0]['hp']}/100\n"
-                            f"**{crews[1]['emoji']} {crews[1]['name']}:** {self.generate_health_bar(crews[1]['hp'])} {crews[1]['hp']}/100"
-                        ),
+                        value=self._health_field(crew1, crew2, event.hp),
                         inline=False,
                     )
-                    
-                    await message.edit(embed=burn_embed)
-                    await asyncio.sleep(2)
-                    
-                    # Check if defender died from burn
-                    if defender["hp"] <= 0:
-                        break
+                    delay = 2
                 
-                # Skip turn if stunned
-                if attacker["status"]["stun"]:
-                    attacker["status"]["stun"] = False
-                    
-                    stun_embed = EmbedBuilder.create_warning_embed(
+                elif event.kind == "stun":
+                    event_embed = EmbedBuilder.create_warning_embed(
                         "⚡ Stunned",
-                        f"**{attacker['emoji']} {attacker['name']}** is stunned and cannot act!"
+                        f"**{crew['emoji']} {crew['name']}** is stunned and cannot act!"
                     )
-                    await message.edit(embed=stun_embed)
-                    await asyncio.sleep(2)
-                    turn_index = 1 - turn_index
-                    continue
-                
-                # Select a random move
-                move = random.choice(self.MOVES)
-                
-                # Calculate damage
-                damage = self.calculate_damage(move["type"])
-                
-                # Apply special effects
-                effect_text = ""
-                if move["effect"] == "burn" and random.random() < move.get("burn_chance", 0):
-                    defender["status"]["burn"] += 1
-                    effect_text = f"🔥 **{defender['emoji']} {defender['name']}** is set on fire!"
-                elif move["effect"] == "stun" and random.random() < move.get("stun_chance", 0):
-                    defender["status"]["stun"] = True
-                    effect_text = f"⚡ **{defender['emoji']} {defender['name']}** is stunned!"
-                    
-                # Apply damage
-                defender["hp"] = max(0, defender["hp"] - damage)
+                    delay = 2
                 
-                # Create attack embed
-                attack_embed = EmbedBuilder.create_info_embed(
-                    f"⚔️ {move['name']}",
-                    f"**{attacker['emoji']} {attacker['name']}** used **{move['name']}**!\n"
-                    f"{move['description']} - **{damage}** damage dealt!"
-                )
-                
-                if effect_text:
-                    attack_embed.description += f"\n\n{effect_text}"
-                    
-                attack_embed.add_field(
-                    name="❤️ Health Status",
-                    value=(
-                        f"**{crews[0]['emoji']} {crews[0]['name']}:** {self.generate_health_bar(crews[0]['hp'])} {crews[0]['hp']}/100\n"
-                        f"**{crews[1]['emoji']} {crews[1]['name']}:** {self.generate_health_bar(crews[1]['hp'])} {crews[1]['hp']}/100"
-                    ),
-                    inline=False,
-                )
-                
-                await message.edit(embed=attack_embed)
-                await asyncio.sleep(3)
-                
-                # Switch turns
-                turn_index = 1 - turn_index
-            
-            # Determine the winner
-            winner = None
-            if crews[0]["hp"] <= 0 and crews[1]["hp"] <= 0:
-                # Both died - coin flip
-                winner_index = random.randint(0, 1)
-                winner = crews[winner_index]["data"]
-                result_text = f"Both crews fall! 🎲 **{crews[winner_index]['emoji']} {crews[winner_index]['name']}** wins by luck!"
-            elif crews[0]["hp"] <= 0:
-                winner = crews[1]["data"]
-                result_text = f"🏆 **{crews[1]['emoji']} {crews[1]['name']}** emerges victorious!"
-            elif crews[1]["hp"] <= 0:
-                winner = crews[0]["data"]
-                result_text = f"🏆 **{crews[0]['emoji']} {crews[0]['name']}** emerges victorious!"
-            else:
-                # Time limit reached - higher HP wins
-                if crews[0]["hp"] > crews[1]["hp"]:
-                    winner = crews[0]["data"]
-                    result_text = f"🏆 **{crews[0]['emoji']} {crews[0]['name']}** wins with superior health!"
-                elif crews[1]["hp"] > crews[0]["hp"]:
-                    winner = crews[1]["data"]
-                    result_text = f"🏆 **{crews[1]['emoji']} {crews[1]['name']}** wins with superior health!"
                 else:
-                    # Equal HP - coin flip
-                    winner_index = random.randint(0, 1)
-                    winner = crews[winner_index]["data"]
-                    result_text = f"Equal health! 🎲 **{crews[winner_index]['emoji']} {crews[winner_index]['name']}** wins by chance!"
+                    move = MOVES[event.move]
+                    target = crews[1 - event.actor]
+                    event_embed = EmbedBuilder.create_info_embed(
+                        f"⚔️ {move['name']}",
+                        f"**{crew['emoji']} {crew['name']}** used **{move['name']}**!\n"
+                        f"{move['description']} - **{event.damage}** damage dealt!"
+                    )
+                    if event.effect == "burn":
+                        event_embed.description += f"\n\n🔥 **{target['emoji']} {target['name']}** is set on fire!"
+                    elif event.effect == "stun":
+                        event_embed.description += f"\n\n⚡ **{target['emoji']} {target['name']}** is stunned!"
+                    event_embed.add_field(
+                        name="❤️ Health Status",
+                        value=self._health_field(crew1, crew2, event.hp),
+                        inline=False,
+                    )
+                    delay = 3
+                
+                await message.edit(embed=event_embed)
+                await asyncio.sleep(delay)
             
             # Final result embed
+            if result.outcome == "double_ko":
+                result_text = f"Both crews fall! 🎲 **{winner['emoji']} {winner['name']}** wins by luck!"
+            elif result.outcome == "ko":
+                result_text = f"🏆 **{winner['emoji']} {winner['name']}** emerges victorious!"
+            elif result.outcome == "health":
+                result_text = f"🏆 **{winner['emoji']} {winner['name']}** wins with superior health!"
+            else:
+                result_text = f"Equal health! 🎲 **{winner['emoji']} {winner['name']}** wins by chance!"
+            
             final_embed = EmbedBuilder.create_success_embed(
                 "🏆 Battle Complete!",
                 result_text
             )
             final_embed.add_field(
                 name="📊 Final Health",
-                value=(
-                    f"**{crews[0]['emoji']} {crews[0]['name']}:** {crews[0]['hp']}/100\n"
-                    f"**{crews[1]['emoji']} {crews[1]['name']}:** {crews[1]['hp']}/100"
-                ),
+                value=self._health_field(crew1, crew2, result.hp, bars=False),
                 inline=False,
             )
             
             await message.edit(embed=final_embed)
-            return winner
             
         except Exception as e:
+            # The outcome is already decided; only the display failed
             self.enhanced_logger.log_error_with_context(
-                e, "run_match", channel.guild.id,
+                e, "replay_match", channel.guild.id,
                 crew1_name=crew1['name'], crew2_name=crew2['name']
             )
-            return crew1  # Default fallback
-
-    def calculate_damage(self, move_type: str) -> int:
-        """Calculate damage based on move type with enhanced logic."""
-        if move_type == "regular":
-            return random.randint(8, 15)  # Regular attacks: 8-15 damage
-        elif move_type == "strong":
-            return random.randint(12, 20)  # Strong attacks: 12-20 damage
-        elif move_type == "critical":
-            damage = random.randint(18, 28)  # Critical attacks: 18-28 damage
-            if random.random() < 0.25:  # 25% chance of critical hit
-                damage = int(damage * 1.5)  # Critical hit multiplier
-            return damage
-        else:
-            return 5  # Default damage
+        
+        return winner
 
     # Additional tournament commands...
     @tournament_commands.command(name="stats")
@@ -63,19 +63,20 @@ class EnhancedCrewButton(discord.ui.Button):
                     return
         
                 # Check if already in another crew
-                for other_name, other_crew in self.cog.crews.get(guild_id, {}).items():
-                    if member.id in other_crew["members"]:
-                        await interaction.followup.send(
-                            embed=EmbedBuilder.create_warning_embed(
-                                "Already in a Crew", 
-                                f"You are already in the crew `{other_name}`. You cannot switch crews once you join one."
-                            ),
-                            ephemeral=True
-                        )
-                        return
-        
+                other_name = self.cog.crew_index.get_member_crew(guild_id, member)
+                if other_name:
+                    await interaction.followup.send(
+                        embed=EmbedBuilder.create_warning_embed(
+                            "Already in a Crew",
+                            f"You are already in the crew `{other_name}`. You cannot switch crews once you join one."
+                        ),
+                        ephemeral=True
+                    )
+                    return
+
                 # Add to crew
                 crew["members"].append(member.id)
+                self.cog.crew_index.add_member(guild_id, member.id, self.crew_name)
                 
                 # Log the action
                 self.cog.enhanced_logger.log_user_action(
@@ -334,20 +335,21 @@ class CrewInviteView(discord.ui.View):
             crew = crews[crew_name]
             
             # Check if user is already in a crew
-            for other_crew_name, other_crew in crews.items():
-                if member.id in other_crew["members"]:
-                    await interaction.followup.send(
-                        embed=EmbedBuilder.create_warning_embed(
-                            "Already in a Crew",
-                            f"You are already in the crew `{other_crew_name}`."
-                        ),
-                        ephemeral=True
-                    )
-                    return False
+            other_crew_name = self.cog.crew_index.get_member_crew(str(guild_id), member)
+            if other_crew_name:
+                await interaction.followup.send(
+                    embed=EmbedBuilder.create_warning_embed(
+                        "Already in a Crew",
+                        f"You are already in the crew `{other_crew_name}`."
+                    ),
+                    ephemeral=True
+                )
+                return False
             
             # Add to crew
             async with self.cog.get_guild_lock(guild_id):
                 crew["members"].append(member.id)
+                self.cog.crew_index.add_member(str(guild_id), member.id, crew_name)
                 
                 # Assign crew role
                 crew_role = interaction.guild.get_role(crew["crew_role"])
@@ -435,15 +437,15 @@ class CrewButton(discord.ui.Button):
             return
     
         # Check if already in another crew
-        for other_name, other_crew in self.cog.crews.get(guild_id, {}).items():
-            if member.id in other_crew["members"]:
-                await interaction.response.send_message(
-                    "❌ You cannot switch crews once you join one.", ephemeral=True
-                )
-                return
+        if self.cog.crew_index.get_member_crew(guild_id, member):
+            await interaction.response.send_message(
+                "❌ You cannot switch crews once you join one.", ephemeral=True
+            )
+            return
     
         # Add to crew
         crew["members"].append(member.id)
+        self.cog.crew_index.add_member(guild_id, member.id, self.crew_name)
         
         # Assign crew role
         crew_role = interaction.guild.get_role(crew["crew_role"])
@@ -218,6 +218,75 @@ class NicknameManager:
             return False
 
 
+class CrewIndex:
+    """Reverse lookups from role ID and member ID to crew name, per guild"""
+    
+    ROLE_FIELDS = ("captain_role", "vice_captain_role", "crew_role")
+    
+    def __init__(self):
+        self.roles: Dict[str, Dict[int, str]] = {}
+        self.members: Dict[str, Dict[int, str]] = {}
+    
+    def rebuild(self, guild_id: str, crews: Dict[str, Dict], guild: Optional[discord.Guild] = None):
+        """Rebuild a guild's index from its crews (and current role holders when the guild is given)"""
+        self.roles[guild_id] = {}
+        self.members[guild_id] = {}
+        for crew_name, crew_data in crews.items():
+            self.add_crew(guild_id, crew_name, crew_data, guild)
+    
+    def clear(self, guild_id: str):
+        self.roles.pop(guild_id, None)
+        self.members.pop(guild_id, None)
+    
+    def add_crew(self, guild_id: str, crew_name: str, crew_data: Dict, guild: Optional[discord.Guild] = None):
+        """Index a crew's roles and members"""
+        roles = self.roles.setdefault(guild_id, {})
+        members = self.members.setdefault(guild_id, {})
+        
+        for field in self.ROLE_FIELDS:
+            role_id = crew_data.get(field)
+            if not role_id:
+                continue
+            roles[role_id] = crew_name
+            role = guild.get_role(role_id) if guild else None
+            if role:
+                for member in role.members:
+                    members[member.id] = crew_name
+        
+        for member_id in crew_data.get("members", []):
+            members[member_id] = crew_name
+    
+    def remove_crew(self, guild_id: str, crew_name: str):
+        """Drop every role and member entry pointing at a crew"""
+        for index in (self.roles.get(guild_id, {}), self.members.get(guild_id, {})):
+            for key in [k for k, name in index.items() if name == crew_name]:
+                del index[key]
+    
+    def add_member(self, guild_id: str, member_id: int, crew_name: str):
+        self.members.setdefault(guild_id, {})[member_id] = crew_name
+    
+    def remove_member(self, guild_id: str, member_id: int):
+        self.members.get(guild_id, {}).pop(member_id, None)
+    
+    def crew_for_role(self, guild_id: str, role_id: int) -> Optional[str]:
+        return self.roles.get(guild_id, {}).get(role_id)
+    
+    def get_member_crew(self, guild_id: str, member: discord.Member) -> Optional[str]:
+        """Crew a member belongs to, by membership list or by holding one of its roles"""
+        crew_name = self.members.get(guild_id, {}).get(member.id)
+        if crew_name:
+            return crew_name
+        
+        roles = self.roles.get(guild_id)
+        if roles:
+            for role in member.roles:
+                crew_name = roles.get(role.id)
+                if crew_name:
+                    self.add_member(guild_id, member.id, crew_name)
+                    return crew_name
+        return None
+
+
 class EmbedBuilder:
     """Helper class for building consistent Discord embeds"""
     
@@ -1,8 +1,9 @@
 import asyncio
 import logging
 import discord
-from typing import Dict, Optional, List, Union
-from datetime import datetime, timedelta
+from collections import deque
+from typing import Deque, Dict, Optional, List, Set, Tuple, Union
+from datetime import datetime, timedelta, timezone
 
 from redbot.core import Config, commands, checks
 from redbot.core.bot import Red
@@ -12,6 +13,91 @@ from redbot.core.utils.menus import menu
 
 log = logging.getLogger("red.consecutivefilter")
 
+# How many recent messages are remembered per filtered channel
+HISTORY_SIZE = 50
+# How many of those are persisted so a restart needs no history fetch
+SNAPSHOT_SIZE = 20
+# Seconds between snapshot saves
+SNAPSHOT_INTERVAL = 300
+# Channels fetching history at the same time during startup (discord.py still handles rate limits)
+WARMUP_CONCURRENCY = 5
+
+
+class ChannelHistory:
+    """
+    Recent (author_id, timestamp, message_id) entries for one channel.
+
+    The length of the newest author's run is kept up to date on every append,
+    so checking a message never walks the history.
+    """
+
+    __slots__ = ("entries", "streak_author", "streak_length")
+
+    def __init__(self):
+        self.entries: Deque[Tuple[int, datetime, int]] = deque(maxlen=HISTORY_SIZE)
+        self.streak_author: Optional[int] = None
+        self.streak_length = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def append(self, author_id: int, timestamp: datetime, message_id: int):
+        self.entries.append((author_id, timestamp, message_id))
+        if author_id == self.streak_author:
+            self.streak_length = min(self.streak_length + 1, len(self.entries))
+        else:
+            self.streak_author = author_id
+            self.streak_length = 1
+
+    def streak_of(self, author_id: int) -> int:
+        """Number of messages at the end of the history posted by ``author_id``"""
+        return self.streak_length if author_id == self.streak_author else 0
+
+    def last_timestamp(self) -> Optional[datetime]:
+        return self.entries[-1][1] if self.entries else None
+
+    def remove(self, message_id: int) -> bool:
+        """Drop a deleted message and recount the current streak"""
+        for index, entry in enumerate(self.entries):
+            if entry[2] == message_id:
+                del self.entries[index]
+                break
+        else:
+            return False
+
+        self.streak_author = self.entries[-1][0] if self.entries else None
+        self.streak_length = 0
+        for author_id, _, _ in reversed(self.entries):
+            if author_id != self.streak_author:
+                break
+            self.streak_length += 1
+        return True
+
+    def clear(self):
+        self.entries.clear()
+        self.streak_author = None
+        self.streak_length = 0
+
+    def remove_author(self, author_id: int):
+        for message_id in [entry[2] for entry in self.entries if entry[0] == author_id]:
+            self.remove(message_id)
+
+    def to_snapshot(self) -> List[List]:
+        """The newest SNAPSHOT_SIZE entries as JSON-friendly lists"""
+        entries = list(self.entries)[-SNAPSHOT_SIZE:]
+        return [[author_id, timestamp.timestamp(), message_id] for author_id, timestamp, message_id in entries]
+
+    @classmethod
+    def from_snapshot(cls, snapshot: List[List]) -> "ChannelHistory":
+        history = cls()
+        for author_id, timestamp, message_id in snapshot:
+            history.append(author_id, datetime.fromtimestamp(timestamp, tz=timezone.utc), message_id)
+        return history
+
+    def last_message_id(self) -> Optional[int]:
+        return self.entries[-1][2] if self.entries else None
+
+
 class ConsecutiveFilter(commands.Cog):
     """
     Filter consecutive messages from the same user in specific channels.
@@ -37,49 +123,132 @@ class ConsecutiveFilter(commands.Cog):
         }
         
         self.config.register_guild(**default_guild)
+        # Snapshot of the newest cached messages, restored on startup
+        self.config.register_channel(recent_messages=[])
         # Maintain a simple cache of last message authors per channel
-        self.last_message_cache: Dict[int, Dict[int, List[Dict]]] = {}
-        
-    async def red_delete_data_for_user(self, **kwargs):
-        """Nothing to delete"""
-        pass
+        self.last_message_cache: Dict[int, Dict[int, ChannelHistory]] = {}
+        # Guild settings as read from config; dropped whenever a setter command changes them
+        self.settings_cache: Dict[int, Dict] = {}
+        # Channels still loading their history; the filter skips them until they are ready
+        self.warming_channels: Set[int] = set()
+        # (guild_id, channel_id) pairs whose cache changed since the last snapshot
+        self.dirty_channels: Set[Tuple[int, int]] = set()
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
+        
+    async def red_delete_data_for_user(self, *, requester, user_id: int):
+        """Forget a user's recent messages in filtered channels"""
+        for guild_id, channels in self.last_message_cache.items():
+            for channel_id, history in channels.items():
+                history.remove_author(user_id)
+        
+        all_channels = await self.config.all_channels()
+        for channel_id, data in all_channels.items():
+            snapshot = data.get("recent_messages", [])
+            kept = [entry for entry in snapshot if entry[0] != user_id]
+            if len(kept) != len(snapshot):
+                await self.config.channel_from_id(channel_id).recent_messages.set(kept)
         
     async def initialize(self):
-        """Initialize the cog by loading data and setting up channels"""
+        """Start warming the message cache in the background"""
         log.info("ConsecutiveFilter is initializing...")
-        # We need to load the cache from all configured guilds
+        self._warmup_task = asyncio.create_task(self._warm_up())
+        self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+
+    async def _warm_up(self):
+        """Load every filtered channel's history concurrently"""
+        await self.bot.wait_until_red_ready()
+        semaphore = asyncio.Semaphore(WARMUP_CONCURRENCY)
+        snapshots = await self.config.all_channels()
+        jobs = []
+        
         for guild in self.bot.guilds:
-            self.last_message_cache[guild.id] = {}
+            self.last_message_cache.setdefault(guild.id, {})
             try:
-                guild_data = await self.config.guild(guild).all()
-                for channel_id in guild_data.get("filtered_channels", []):
-                    # Initialize empty list for each filtered channel
-                    self.last_message_cache[guild.id][channel_id] = []
-                    
-                    # Seed the cache with some recent messages
-                    channel = guild.get_channel(channel_id)
-                    if channel:
-                        try:
-                            # Get the most recent messages in the channel to initiate our cache
-                            async for message in channel.history(limit=20):
-                                if not message.author.bot or not guild_data.get("bot_bypass", True):
-                                    self.last_message_cache[guild.id][channel_id].append({
-                                        "author_id": message.author.id,
-                                        "timestamp": message.created_at,
-                                        "message_id": message.id,
-                                        "content": message.content[:100]  # Store a preview of content for debugging
-                                    })
-                        except (discord.Forbidden, discord.HTTPException) as e:
-                            log.warning(f"Could not retrieve message history for channel {channel_id} in guild {guild.id}: {e}")
+                guild_data = await self.get_settings(guild)
             except Exception as e:
                 log.error(f"Error initializing ConsecutiveFilter for guild {guild.id}: {e}", exc_info=True)
+                continue
+            
+            for channel_id in guild_data["filtered_channels"]:
+                channel = guild.get_channel(channel_id)
+                if channel and channel_id not in self.last_message_cache[guild.id]:
+                    snapshot = snapshots.get(channel_id, {}).get("recent_messages", [])
+                    self.warming_channels.add(channel_id)
+                    jobs.append(self._warm_channel(channel, guild_data, snapshot, semaphore))
+        
+        await asyncio.gather(*jobs)
+        log.info(f"ConsecutiveFilter initialized successfully ({len(jobs)} channels).")
+
+    async def _warm_channel(self, channel: discord.TextChannel, guild_data: Dict,
+                            snapshot: List[List], semaphore: asyncio.Semaphore):
+        """Restore a channel's cache from its snapshot, fetching only messages newer than it"""
+        history = ChannelHistory.from_snapshot(snapshot)
+        last_seen = history.last_message_id()
         
-        log.info("ConsecutiveFilter initialized successfully.")
+        try:
+            if last_seen is None or channel.last_message_id != last_seen:
+                async with semaphore:
+                    recent = []
+                    after = discord.Object(id=last_seen) if last_seen else None
+                    # Get the most recent messages in the channel to initiate our cache
+                    async for message in channel.history(limit=20, after=after, oldest_first=False):
+                        recent.append(message)
+                
+                # A full page means there may be a gap after the snapshot, so start over
+                if len(recent) == 20:
+                    history.clear()
+                for message in reversed(recent):
+                    if not message.author.bot or not guild_data.get("bot_bypass", True):
+                        history.append(message.author.id, message.created_at, message.id)
+                self.dirty_channels.add((channel.guild.id, channel.id))
+        except (discord.Forbidden, discord.HTTPException) as e:
+            log.warning(f"Could not retrieve message history for channel {channel.id} in guild {channel.guild.id}: {e}")
+        except Exception as e:
+            log.error(f"Error warming up channel {channel.id} in guild {channel.guild.id}: {e}", exc_info=True)
+        finally:
+            # The channel is filtered from now on, even if only the snapshot could be loaded
+            self.last_message_cache.setdefault(channel.guild.id, {}).setdefault(channel.id, history)
+            self.warming_channels.discard(channel.id)
+
+    async def save_snapshots(self):
+        """Persist the newest cached messages of channels that changed"""
+        dirty, self.dirty_channels = self.dirty_channels, set()
+        for guild_id, channel_id in dirty:
+            history = self.last_message_cache.get(guild_id, {}).get(channel_id)
+            try:
+                if history is None:
+                    await self.config.channel_from_id(channel_id).clear()
+                else:
+                    await self.config.channel_from_id(channel_id).recent_messages.set(history.to_snapshot())
+            except Exception as e:
+                log.error(f"Failed to save message snapshot for channel {channel_id}: {e}", exc_info=True)
 
-    def cog_unload(self):
+    async def _snapshot_loop(self):
+        while True:
+            await asyncio.sleep(SNAPSHOT_INTERVAL)
+            await self.save_snapshots()
+
+    async def get_settings(self, guild: discord.Guild) -> Dict:
+        """Guild settings from the in-memory cache, loading them from config on first use"""
+        settings = self.settings_cache.get(guild.id)
+        if settings is None:
+            settings = await self.config.guild(guild).all()
+            settings["filtered_channels"] = set(settings["filtered_channels"])
+            self.settings_cache[guild.id] = settings
+        return settings
+
+    def invalidate_settings(self, guild: discord.Guild):
+        """Forget cached settings after a setter command changed them"""
+        self.settings_cache.pop(guild.id, None)
+
+    async def cog_unload(self):
         """Clean up on cog unload"""
         log.info("ConsecutiveFilter is being unloaded...")
-        # Nothing to clean up here, but good practice to include this method
+        for task in (self._warmup_task, self._snapshot_task):
+            if task:
+                task.cancel()
+        await self.save_snapshots()
         
     @commands.group(name="consecutivefilter", aliases=["cf"])
     @checks.admin_or_permissions(manage_guild=True)
@@ -100,6 +269,7 @@ class ConsecutiveFilter(commands.Cog):
             state = not current
             
         await self.config.guild(ctx.guild).enabled.set(state)
+        self.invalidate_settings(ctx.guild)
         
         if state:
             await ctx.send("Consecutive message filtering is now **enabled**.")
@@ -130,18 +300,21 @@ class ConsecutiveFilter(commands.Cog):
                     # Initialize the cache for this channel
                     if ctx.guild.id not in self.last_message_cache:
                         self.last_message_cache[ctx.guild.id] = {}
-                    self.last_message_cache[ctx.guild.id][channel.id] = []
+                    self.last_message_cache[ctx.guild.id][channel.id] = ChannelHistory()
+                    self.dirty_channels.add((ctx.guild.id, channel.id))
             
-            message = ""
-            if added:
-                message += f"The following channels have been added to the filter: {', '.join(added)}\n"
-            if already_added:
-                message += f"The following channels were already filtered: {', '.join(already_added)}"
-                
-            if message:
-                await ctx.send(message)
-            else:
-                await ctx.send("No channels were added to the filter.")
+        self.invalidate_settings(ctx.guild)
+
+        message = ""
+        if added:
+            message += f"The following channels have been added to the filter: {', '.join(added)}\n"
+        if already_added:
+            message += f"The following channels were already filtered: {', '.join(already_added)}"
+            
+        if message:
+            await ctx.send(message)
+        else:
+            await ctx.send("No channels were added to the filter.")
     
     @consecutivefilter.command(name="removechannel")
     async def remove_channel(self, ctx: commands.Context, *channels: discord.TextChannel):
@@ -165,19 +338,22 @@ class ConsecutiveFilter(commands.Cog):
                     # Remove from cache
                     if ctx.guild.id in self.last_message_cache and channel.id in self.last_message_cache[ctx.guild.id]:
                         del self.last_message_cache[ctx.guild.id][channel.id]
+                    self.dirty_channels.add((ctx.guild.id, channel.id))
                 else:
                     not_filtered.append(channel.mention)
             
-            message = ""
-            if removed:
-                message += f"The following channels have been removed from the filter: {', '.join(removed)}\n"
-            if not_filtered:
-                message += f"The following channels were not being filtered: {', '.join(not_filtered)}"
-                
-            if message:
-                await ctx.send(message)
-            else:
-                await ctx.send("No channels were removed from the filter.")
+        self.invalidate_settings(ctx.guild)
+
+        message = ""
+        if removed:
+            message += f"The following channels have been removed from the filter: {', '.join(removed)}\n"
+        if not_filtered:
+            message += f"The following channels were not being filtered: {', '.join(not_filtered)}"
+            
+        if message:
+            await ctx.send(message)
+        else:
+            await ctx.send("No channels were removed from the filter.")
     
     @consecutivefilter.command(name="notificationchannel", aliases=["notification", "alerts"])
     async def set_notification_channel(self, ctx: commands.Context, channel: discord.TextChannel = None):
@@ -188,9 +364,11 @@ class ConsecutiveFilter(commands.Cog):
         """
         if channel:
             await self.config.guild(ctx.guild).notification_channel.set(channel.id)
+            self.invalidate_settings(ctx.guild)
             await ctx.send(f"Notifications will now be sent to {channel.mention}.")
         else:
             await self.config.guild(ctx.guild).notification_channel.set(None)
+            self.invalidate_settings(ctx.guild)
             await ctx.send("Notification channel has been disabled.")
     
     @consecutivefilter.command(name="cooldown")
@@ -205,6 +383,7 @@ class ConsecutiveFilter(commands.Cog):
             return await ctx.send("Cooldown must be 0 or a positive number of minutes.")
             
         await self.config.guild(ctx.guild).cooldown_minutes.set(minutes)
+        self.invalidate_settings(ctx.guild)
         
         if minutes == 0:
             await ctx.send("Cooldown set to 0. Users will need to wait for another user to post before posting again.")
@@ -222,6 +401,7 @@ class ConsecutiveFilter(commands.Cog):
             return await ctx.send("Message count must be at least 2.")
             
         await self.config.guild(ctx.guild).message_count.set(count)
+        self.invalidate_settings(ctx.guild)
         await ctx.send(f"Message count set to {count}. The filter will trigger on the {count}th consecutive message.")
     
     @consecutivefilter.command(name="modbypass")
@@ -236,6 +416,7 @@ class ConsecutiveFilter(commands.Cog):
             state = not current
             
         await self.config.guild(ctx.guild).mod_bypass.set(state)
+        self.invalidate_settings(ctx.guild)
         
         if state:
             await ctx.send("Moderators can now bypass the consecutive message filter.")
@@ -254,6 +435,7 @@ class ConsecutiveFilter(commands.Cog):
             state = not current
             
         await self.config.guild(ctx.guild).bot_bypass.set(state)
+        self.invalidate_settings(ctx.guild)
         
         if state:
             await ctx.send("Bots can now bypass the consecutive message filter.")
@@ -276,10 +458,12 @@ class ConsecutiveFilter(commands.Cog):
         if message.lower() == "default":
             default = self.config.defaults["GUILD"]["delete_message"]
             await self.config.guild(ctx.guild).delete_message.set(default)
+            self.invalidate_settings(ctx.guild)
             await ctx.send(f"Delete message reset to default:\n{box(default)}")
             return
             
         await self.config.guild(ctx.guild).delete_message.set(message)
+        self.invalidate_settings(ctx.guild)
         await ctx.send(f"Delete message updated to:\n{box(message)}")
     
     @consecutivefilter.command(name="notificationmessage", aliases=["notifymessage"])
@@ -300,10 +484,12 @@ class ConsecutiveFilter(commands.Cog):
         if message.lower() == "default":
             default = self.config.defaults["GUILD"]["delete_notification"]
             await self.config.guild(ctx.guild).delete_notification.set(default)
+            self.invalidate_settings(ctx.guild)
             await ctx.send(f"Notification message reset to default:\n{box(default)}")
             return
             
         await self.config.guild(ctx.guild).delete_notification.set(message)
+        self.invalidate_settings(ctx.guild)
         await ctx.send(f"Notification message updated to:\n{box(message)}")
     
     @consecutivefilter.command(name="settings")
@@ -364,12 +550,12 @@ class ConsecutiveFilter(commands.Cog):
             
         # Format cache entries
         formatted = []
-        for i, entry in enumerate(cache):
-            user = ctx.guild.get_member(entry["author_id"])
-            username = user.display_name if user else f"User ID: {entry['author_id']}"
-            time_str = discord.utils.format_dt(entry["timestamp"], style='R')
-            content = entry.get("content", "<No content stored>")
-            formatted.append(f"{i+1}. {username} ({time_str}): {content}")
+        for i, (author_id, timestamp, message_id) in enumerate(cache.entries):
+            user = ctx.guild.get_member(author_id)
+            username = user.display_name if user else f"User ID: {author_id}"
+            time_str = discord.utils.format_dt(timestamp, style='R')
+            formatted.append(f"{i+1}. {username} ({time_str}): message {message_id}")
+        formatted.append(f"Current streak: {cache.streak_length} message(s) from user ID {cache.streak_author}")
             
         # Send as pages
         pages = []
@@ -391,7 +577,8 @@ class ConsecutiveFilter(commands.Cog):
         channel = channel or ctx.channel
         
         if ctx.guild.id in self.last_message_cache and channel.id in self.last_message_cache[ctx.guild.id]:
-            self.last_message_cache[ctx.guild.id][channel.id] = []
+            self.last_message_cache[ctx.guild.id][channel.id].clear()
+            self.dirty_channels.add((ctx.guild.id, channel.id))
             await ctx.send(f"Cache cleared for {channel.mention}.")
         else:
             await ctx.send("No cache exists for this channel.")
@@ -404,10 +591,8 @@ class ConsecutiveFilter(commands.Cog):
             
         if message.guild.id in self.last_message_cache and message.channel.id in self.last_message_cache[message.guild.id]:
             # Remove the message from our cache
-            cache = self.last_message_cache[message.guild.id][message.channel.id]
-            self.last_message_cache[message.guild.id][message.channel.id] = [
-                msg for msg in cache if msg["message_id"] != message.id
-            ]
+            self.last_message_cache[message.guild.id][message.channel.id].remove(message.id)
+            self.dirty_channels.add((message.guild.id, message.channel.id))
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -416,12 +601,8 @@ class ConsecutiveFilter(commands.Cog):
         if not message.guild:
             return
             
-        # Check if cog is disabled in the guild
-        if await self.bot.cog_disabled_in_guild(self, message.guild):
-            return
-            
         # Skip if filter is not enabled in this guild
-        guild_settings = await self.config.guild(message.guild).all()
+        guild_settings = await self.get_settings(message.guild)
         if not guild_settings["enabled"]:
             return
             
@@ -429,85 +610,68 @@ class ConsecutiveFilter(commands.Cog):
         if message.channel.id not in guild_settings["filtered_channels"]:
             return
             
-        # Skip if this is a command
-        try:
-            context = await self.bot.get_context(message)
-            if context.valid or await self.bot.is_command(message):
-                return
-        except Exception:
-            # If there's any error checking for commands, err on the side of caution
-            log.warning("Error checking if message is a command, continuing with filter check", exc_info=True)
+        # Check if cog is disabled in the guild
+        if await self.bot.cog_disabled_in_guild(self, message.guild):
+            return
             
         # Skip if bot bypass is enabled and this is a bot
         if guild_settings["bot_bypass"] and message.author.bot:
             return
             
-        # Skip if mod bypass is enabled and author is a mod
-        if guild_settings["mod_bypass"]:
-            try:
-                if await self.bot.is_mod(message.author):
-                    return
-            except Exception:
-                log.warning(f"Error checking mod status for {message.author}", exc_info=True)
+        # Skip channels whose history is still loading at startup
+        if message.channel.id in self.warming_channels:
+            return
             
         # Initialize cache if needed
-        if message.guild.id not in self.last_message_cache:
-            self.last_message_cache[message.guild.id] = {}
-        if message.channel.id not in self.last_message_cache[message.guild.id]:
-            self.last_message_cache[message.guild.id][message.channel.id] = []
+        channel_cache = self.last_message_cache.setdefault(message.guild.id, {})
+        history = channel_cache.get(message.channel.id)
+        if history is None:
+            history = channel_cache[message.channel.id] = ChannelHistory()
         
         # IMPORTANT: We must check BEFORE we add this message to the cache
         # since we're determining if THIS message should be filtered
-
-        # Check if we should filter this message
-        should_filter = False
         consecutive_count = 0
+        streak = history.streak_of(message.author.id)
         
         if guild_settings["cooldown_minutes"] > 0:
-            # Time-based cooldown
-            consecutive_msgs = []
-            for msg in reversed(self.last_message_cache[message.guild.id][message.channel.id]):
-                if msg["author_id"] == message.author.id:
-                    consecutive_msgs.append(msg)
-                else:
-                    break
-                    
-            if consecutive_msgs:
-                last_message_time = consecutive_msgs[0]["timestamp"]
+            # Time-based cooldown, measured from the author's latest message
+            if streak:
                 cooldown_delta = timedelta(minutes=guild_settings["cooldown_minutes"])
-                if (message.created_at - last_message_time) < cooldown_delta:
-                    consecutive_count = len(consecutive_msgs) + 1  # +1 for current message
+                if (message.created_at - history.last_timestamp()) < cooldown_delta:
+                    consecutive_count = streak + 1  # +1 for current message
         else:
             # Message-based cooldown (another user must post in between)
-            # Count consecutive messages from the same author
-            for msg in reversed(self.last_message_cache[message.guild.id][message.channel.id]):
-                if msg["author_id"] == message.author.id:
-                    consecutive_count += 1
-                else:
-                    break
-                    
-            # Include the current message in the count
-            consecutive_count += 1
+            consecutive_count = streak + 1
             
         # Debug log
         log.debug(f"Message from {message.author} in {message.channel.name}: consecutive count = {consecutive_count}, threshold = {guild_settings['message_count']}")
             
         # Determine if we should filter based on the message count threshold
-        if consecutive_count >= guild_settings["message_count"]:
-            should_filter = True
+        should_filter = consecutive_count >= guild_settings["message_count"]
+        
+        # Commands and moderators are only checked once the streak crosses the threshold
+        if should_filter:
+            # Skip if this is a command
+            try:
+                context = await self.bot.get_context(message)
+                if context.valid or await self.bot.is_command(message):
+                    return
+            except Exception:
+                # If there's any error checking for commands, err on the side of caution
+                log.warning("Error checking if message is a command, continuing with filter check", exc_info=True)
+                
+            # Skip if mod bypass is enabled and author is a mod
+            if guild_settings["mod_bypass"]:
+                try:
+                    if await self.bot.is_mod(message.author):
+                        return
+                except Exception:
+                    log.warning(f"Error checking mod status for {message.author}", exc_info=True)
         
         # Add this message to the cache regardless if we'll filter it or not
         # (This ensures we still count filtered messages)
-        self.last_message_cache[message.guild.id][message.channel.id].append({
-            "author_id": message.author.id,
-            "timestamp": message.created_at,
-            "message_id": message.id,
-            "content": message.content[:100]  # Store a preview of content for debugging
-        })
-        
-        # Trim cache to last 50 messages
-        if len(self.last_message_cache[message.guild.id][message.channel.id]) > 50:
-            self.last_message_cache[message.guild.id][message.channel.id] = self.last_message_cache[message.guild.id][message.channel.id][-50:]
+        history.append(message.author.id, message.created_at, message.id)
+        self.dirty_channels.add((message.guild.id, message.channel.id))
         
         # If filtering is needed, delete the message and notify
         if should_filter:
@@ -565,4 +729,7 @@ class ConsecutiveFilter(commands.Cog):
     async def on_guild_remove(self, guild: discord.Guild):
         """Clean up when the bot leaves a guild."""
         if guild.id in self.last_message_cache:
+            for channel_id in self.last_message_cache[guild.id]:
+                self.dirty_channels.add((guild.id, channel_id))
             del self.last_message_cache[guild.id]
+        self.settings_cache.pop(guild.id, None)
@@ -11,7 +11,7 @@ import random
 import logging
 from typing import Dict
 
-from .constants import DEFAULT_GUILD_CONFIG, DEFAULT_MEMBER_CONFIG
+from .constants import DEFAULT_GLOBAL_CONFIG, DEFAULT_GUILD_CONFIG, DEFAULT_MEMBER_CONFIG
 from .game_logic import GameEngine
 from .commands import CommandHandler
 from .poll_system import PollSystem
@@ -44,6 +44,7 @@ class HungerGames(discord_commands.Cog):
         self.bot = bot
         self.config = Config.get_conf(self, identifier=1234567890)
         
+        self.config.register_global(**DEFAULT_GLOBAL_CONFIG)
         self.config.register_guild(**DEFAULT_GUILD_CONFIG)
         self.config.register_member(**DEFAULT_MEMBER_CONFIG)
         
@@ -59,18 +60,8 @@ class HungerGames(discord_commands.Cog):
         self._setup_optional_systems()
     
     def _setup_optional_systems(self):
-        """Set up optional image and GIF systems"""
-        # Image system
-        if IMAGE_SYSTEM_AVAILABLE:
-            try:
-                image_base_path = "/home/adam/.local/share/Red-DiscordBot/data/sunny/cogs/CogManager/cogs/hg/Images"
-                self.image_handler = ImageRoundHandler(self.bot, image_base_path)
-                logger.info("Image handler initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize image handler: {e}")
-                self.image_handler = None
-        else:
-            self.image_handler = None
+        """Set up the optional GIF system (the image system needs Config, see cog_load)"""
+        self.image_handler = None
         
         # GIF system  
         if GIF_SYSTEM_AVAILABLE:
@@ -85,11 +76,32 @@ class HungerGames(discord_commands.Cog):
         else:
             self.gif_manager = None
     
+    async def _setup_image_system(self):
+        """Create the image handler with the configured encoder"""
+        if not IMAGE_SYSTEM_AVAILABLE:
+            return
+        try:
+            image_base_path = "/home/adam/.local/share/Red-DiscordBot/data/sunny/cogs/CogManager/cogs/hg/Images"
+            image_format = await self.config.image_format()
+            self.image_handler = ImageRoundHandler(self.bot, image_base_path, image_format=image_format)
+            logger.info(f"Image handler initialized successfully ({self.image_handler.image_format})")
+        except Exception as e:
+            logger.error(f"Failed to initialize image handler: {e}")
+            self.image_handler = None
+    
+    async def cog_load(self):
+        """Set up the image handler and build the GIF catalog off the event loop"""
+        await self._setup_image_system()
+        if self.gif_manager:
+            await self.gif_manager.load_catalog()
+    
     def cog_unload(self):
         """Cancel all running games when cog is unloaded"""
         for guild_id in list(self.active_games.keys()):
             if "task" in self.active_games[guild_id]:
                 self.active_games[guild_id]["task"].cancel()
+        if self.image_handler:
+            self.image_handler.close()
         logger.info("Hunger Games cog unloaded, all games cancelled")
     
     # Add the missing game_loop method
@@ -129,7 +141,8 @@ class HungerGames(discord_commands.Cog):
                 
                 # Execute events for this round
                 try:
-                    event_messages = await self.game_engine.execute_combined_events(game, channel)
+                    table, events = await self.game_engine.simulate_round(game)
+                    event_messages = self.game_engine.render_events(game, table, events)
                     
                     # Combine all events into a single embed
                     if event_messages:
@@ -166,6 +179,9 @@ class HungerGames(discord_commands.Cog):
                     logger.error(f"Error in game loop round {game['round']}: {e}")
                     await channel.send("⚠️ The Grand Line experienced technical difficulties, but the pirate battle continues...")
                 
+                # Persist this round's stat changes in one batch
+                await self.game_engine.flush_stats(channel.guild, game)
+                
                 # Calculate sleep time based on player count and conditions
                 alive_count = len(self.game_engine.get_alive_players(game))
                 
@@ -381,6 +397,12 @@ class HungerGames(discord_commands.Cog):
         """Set the event interval (10-120 seconds)"""
         await self.command_handler.handle_set_interval(ctx, seconds)
 
+    @hg_set.command(name="imageformat")
+    @discord_commands.is_owner()
+    async def hg_set_image_format(self, ctx, image_format: str = None):
+        """Set the round image encoder: png, png_fast or webp (Bot owner only)"""
+        await self.command_handler.handle_set_image_format(ctx, image_format)
+
     @hg_set.command(name="testping")
     @discord_commands.has_permissions(manage_guild=True)
     async def hg_test_ping(self, ctx):
@@ -258,8 +258,10 @@ class ArenaConditionManager:
         self.condition_duration = 0
         self.condition_effects = {}
     
-    def select_condition(self, game_round: int, alive_count: int, force_condition: str = None) -> str:
+    def select_condition(self, game_round: int, alive_count: int, force_condition: str = None,
+                         rng: random.Random = None) -> str:
         """Select appropriate condition based on game state"""
+        rng = rng or random
         try:
             if force_condition and force_condition in GRAND_LINE_CONDITIONS:
                 self.current_condition = force_condition
@@ -284,21 +286,21 @@ class ArenaConditionManager:
             # Default selection for other cases
             else:
                 all_conditions = list(GRAND_LINE_CONDITIONS.keys())
-                condition = random.choice(all_conditions)
+                condition = rng.choice(all_conditions)
                 self.current_condition = condition
                 return condition
             
             # Select based on weights for each phase
             if game_round <= 5:
-                condition = random.choices(early_conditions, weights=weights)[0]
+                condition = rng.choices(early_conditions, weights=weights)[0]
             elif game_round <= 15:
-                condition = random.choices(mid_conditions, weights=weights)[0]
+                condition = rng.choices(mid_conditions, weights=weights)[0]
             else:
-                condition = random.choices(end_conditions, weights=weights)[0]
+                condition = rng.choices(end_conditions, weights=weights)[0]
             
             self.current_condition = condition
             self.condition_effects = GRAND_LINE_CONDITIONS[condition]["effects"]
-            self.condition_duration = random.randint(3, 6)  # Lasts 3-6 rounds
+            self.condition_duration = rng.randint(3, 6)  # Lasts 3-6 rounds
             
             logger.info(f"Selected arena condition: {condition} for {self.condition_duration} rounds")
             return condition
@@ -0,0 +1,138 @@
+# benchmark.py
+"""
+Headless throughput and balance benchmark for Hunger Games rounds
+
+Plays whole games on the pure simulator, cycling arena conditions the way
+the game loop does, without Discord:
+
+    python hg/benchmark.py --games 5000 --players 100
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+try:
+    from .arena_conditions import ArenaConditionManager
+    from .constants import DEFAULT_GUILD_CONFIG, get_event_weights
+    from .simulation import PlayerTable, simulate_round
+except ImportError:
+    from arena_conditions import ArenaConditionManager
+    from constants import DEFAULT_GUILD_CONFIG, get_event_weights
+    from simulation import PlayerTable, simulate_round
+
+
+def play_game(players: int, rng: random.Random, sponsor_chance: int, max_rounds: int, stats: dict) -> int:
+    """Play one game to the end, accumulating into ``stats``; returns the winner slot or -1"""
+    table = PlayerTable([str(slot) for slot in range(players)])
+    manager = ArenaConditionManager()
+    manager.select_condition(0, players, rng=rng)
+
+    round_num = 0
+    while table.alive_count > 1 and round_num < max_rounds:
+        round_num += 1
+
+        # Same cadence as HungerGames.game_loop / GameEngine.check_condition_change
+        if round_num % 6 == 0 or rng.random() < 0.15:
+            should_change = manager.update_condition_duration()
+            if round_num % 8 == 0 and rng.random() < 0.3:
+                should_change = True
+            if should_change:
+                manager.select_condition(round_num, table.alive_count, rng=rng)
+                stats["condition_changes"] += 1
+
+        weights = manager.apply_condition_to_event_weights(get_event_weights())
+        effects = manager.condition_effects
+        modifier = effects.get("sponsor_chance_modifier", 0) if effects else 0
+
+        alive_before = table.alive_count
+        events = simulate_round(table, rng, round_num, weights, int(sponsor_chance * (1 + modifier)))
+
+        condition = manager.current_condition
+        stats["condition_rounds"][condition] += 1
+        stats["condition_deaths"][condition] += alive_before - table.alive_count
+        stats["events"] += len(events)
+        for event in events:
+            stats["event_kinds"][event.kind] += 1
+
+    stats["rounds"][round_num] += 1
+    stats["revives"] += sum(table.revives)
+    if table.alive_count != 1:
+        return -1
+
+    winner = table.alive_slots()[0]
+    stats["winner_kills"] += table.kills[winner]
+    return winner
+
+
+def run_benchmark(games: int, players: int, seed: int, sponsor_chance: int, max_rounds: int) -> dict:
+    rng = random.Random(seed)
+    stats = {
+        "rounds": Counter(),
+        "events": 0,
+        "event_kinds": Counter(),
+        "condition_rounds": Counter(),
+        "condition_deaths": Counter(),
+        "condition_changes": 0,
+        "revives": 0,
+        "winner_kills": 0,
+        "winners": Counter(),
+        "no_winner": 0,
+    }
+
+    start = time.perf_counter()
+    for _ in range(games):
+        winner = play_game(players, rng, sponsor_chance, max_rounds, stats)
+        if winner < 0:
+            stats["no_winner"] += 1
+        else:
+            stats["winners"][winner] += 1
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hunger Games simulation benchmark")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--sponsor-chance", type=int, default=DEFAULT_GUILD_CONFIG["sponsor_chance"])
+    parser.add_argument("--max-rounds", type=int, default=1000, help="Safety cap on rounds per game")
+    args = parser.parse_args(argv)
+
+    stats = run_benchmark(args.games, args.players, args.seed, args.sponsor_chance, args.max_rounds)
+    games = args.games
+    total_rounds = sum(rounds * count for rounds, count in stats["rounds"].items())
+    elapsed = stats["elapsed"]
+
+    print(f"{games:,} games of {args.players} players in {elapsed:.2f}s "
+          f"({games / elapsed:,.0f} games/sec, {total_rounds / elapsed:,.0f} rounds/sec, "
+          f"{stats['events'] / elapsed:,.0f} events/sec)")
+    print(f"Rounds per game: avg {total_rounds / games:.1f}, "
+          f"min {min(stats['rounds'])}, max {max(stats['rounds'])}")
+    print(f"No survivor: {stats['no_winner'] / games:.2%}, "
+          f"revives per game: {stats['revives'] / games:.2f}, "
+          f"condition changes per game: {stats['condition_changes'] / games:.2f}")
+    winners = games - stats["no_winner"]
+    if winners:
+        print(f"Average winner eliminations: {stats['winner_kills'] / winners:.2f}")
+
+    print("Events:")
+    for kind, count in stats["event_kinds"].most_common():
+        print(f"  {kind:<22} {count / games:7.2f} per game")
+
+    print("Arena conditions:")
+    for condition, rounds in stats["condition_rounds"].most_common():
+        deaths = stats["condition_deaths"][condition]
+        print(f"  {str(condition):<22} {rounds / total_rounds:6.2%} of rounds, "
+              f"{deaths / rounds:.2f} deaths/round")
+
+    if winners:
+        expected = winners / args.players
+        spread = max(abs(stats["winners"][slot] - expected) for slot in range(args.players)) / expected
+        print(f"Win share by slot (should be flat): max deviation {spread:.1%} from {1 / args.players:.2%}")
+
+
+if __name__ == "__main__":
+    main()
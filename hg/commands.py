@@ -218,6 +218,7 @@ class CommandHandler:
                     if not user.bot and user.id not in game["reactions"]:
                         game["reactions"].add(user.id)
                         game["players"][str(user.id)] = {
+                            "id": str(user.id),
                             "name": user.display_name,
                             "title": get_random_player_title(),
                             "alive": True,
@@ -450,6 +451,9 @@ class CommandHandler:
             if "task" in game:
                 game["task"].cancel()
             
+            # Keep stats from the rounds that were already played
+            await self.cog.game_engine.flush_stats(ctx.guild, game)
+            
             # Clean up
             if guild_id in self.cog.active_games:
                 del self.cog.active_games[guild_id]
@@ -474,6 +478,7 @@ class CommandHandler:
             test_game = {
                 "players": {
                     str(ctx.author.id): {
+                        "id": str(ctx.author.id),
                         "name": ctx.author.display_name,
                         "title": "the Tester",
                         "alive": True,
@@ -482,6 +487,7 @@ class CommandHandler:
                         "district": 1
                     },
                     "123456789": {
+                        "id": "123456789",
                         "name": "TestBot",
                         "title": "the Dummy",
                         "alive": True,
@@ -490,6 +496,7 @@ class CommandHandler:
                         "district": 2
                     },
                     "987654321": {
+                        "id": "987654321",
                         "name": "TestBot2", 
                         "title": "the Mock",
                         "alive": True,
@@ -683,7 +690,7 @@ class CommandHandler:
             image_status = "❌ Disabled"
             if images_enabled:
                 if hasattr(self.cog, 'image_handler') and self.cog.image_handler and self.cog.image_handler.is_available():
-                    image_status = "✅ Active"
+                    image_status = f"✅ Active ({self.cog.image_handler.image_format})"
                 else:
                     image_status = "⚠️ Enabled (No Template)"
             
@@ -930,6 +937,29 @@ class CommandHandler:
             logger.error(f"Error setting sponsor chance: {e}")
             await ctx.send("❌ Error updating sponsor chance.")
     
+    async def handle_set_image_format(self, ctx, image_format: str = None):
+        """Set the encoder used for round images (bot-wide)"""
+        try:
+            handler = self.cog.image_handler
+            if handler is None:
+                return await ctx.send("❌ The image system is not available.")
+            
+            from .image_handler import IMAGE_FORMATS
+            formats = ", ".join(f"`{name}`" for name in IMAGE_FORMATS)
+            if image_format is None:
+                return await ctx.send(f"🖼️ Round images use `{handler.image_format}`. Options: {formats}")
+            
+            image_format = image_format.lower()
+            if not handler.set_image_format(image_format):
+                return await ctx.send(f"❌ Unknown image format! Options: {formats}")
+            
+            await self.config.image_format.set(image_format)
+            await ctx.send(f"✅ Round images will be encoded as `{image_format}`!")
+            
+        except Exception as e:
+            logger.error(f"Error setting image format: {e}")
+            await ctx.send("❌ Error updating image format.")
+    
     async def handle_set_interval(self, ctx, seconds: int):
         """Set the event interval (10-120 seconds)"""
         try:
@@ -15,6 +15,11 @@ DEFAULT_GUILD_CONFIG = {
     "blacklisted_roles": [],  # Roles that can't participate
 }
 
+# The image handler is shared by every guild, so its encoder is a bot-wide setting
+DEFAULT_GLOBAL_CONFIG = {
+    "image_format": "png",  # Key of image_handler.IMAGE_FORMATS
+}
+
 DEFAULT_MEMBER_CONFIG = {
     "wins": 0,
     "deaths": 0,
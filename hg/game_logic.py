@@ -7,14 +7,24 @@ import discord
 import asyncio
 import random
 import logging
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from redbot.core import bank
 
 from .constants import (
     DEATH_EVENTS, SURVIVAL_EVENTS, SPONSOR_EVENTS, ALLIANCE_EVENTS, CRATE_EVENTS,
-    VICTORY_PHRASES, VICTORY_SCENARIOS, EMOJIS
+    VICTORY_PHRASES, VICTORY_SCENARIOS, EMOJIS, PLAYER_DEATH_EVENTS, ENVIRONMENTAL_DEATH_EVENTS,
+    CANNON_DEATH_EVENTS, CANNON_SCARE_EVENTS, TOXIC_FOG_SINGLE_DEATH, TOXIC_FOG_MULTI_DEATH,
+    TOXIC_FOG_SURVIVAL, TRACKER_JACKER_DEATHS, TRACKER_JACKER_HALLUCINATION, TRACKER_JACKER_AVOIDANCE,
+    ARENA_TRAP_TYPES, ARENA_TRAP_DEATH, ARENA_TRAP_ESCAPE, MUTTATION_TYPES, MUTTATION_DEATH,
+    MUTTATION_ESCAPE, ENVIRONMENTAL_HAZARDS, ENVIRONMENTAL_SINGLE_DEATH, ENVIRONMENTAL_SURVIVAL,
+    GAMEMAKER_COURAGE_DEATH, GAMEMAKER_COURAGE_SURVIVAL, GAMEMAKER_TEST_ANNOUNCEMENT,
+    GAMEMAKER_LOYALTY_TEST, get_event_weights
 )
 from .arena_conditions import arena_condition_manager, CONDITION_DEATH_EVENTS
+from .simulation import (
+    PlayerTable, RoundEvent, simulate_round, death_event, survival_event, sponsor_event,
+    alliance_event, crate_event
+)
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +55,43 @@ class GameEngine:
         """Get list of dead players"""
         return [player for player in game["players"].values() if not player["alive"]]
     
+    def record_stat(self, game: Dict, player: Dict, stat: str, amount: int = 1):
+        """Accumulate a stat change in memory until the next flush"""
+        deltas = game.setdefault("stat_deltas", {}).setdefault(player["id"], {})
+        deltas[stat] = deltas.get(stat, 0) + amount
+    
+    def eliminate_player(self, game: Dict, player: Dict):
+        """Mark a player as dead and record the death"""
+        player['alive'] = False
+        game['eliminated'].append(player['id'])
+        self.record_stat(game, player, "deaths")
+    
+    async def flush_stats(self, guild: discord.Guild, game: Dict):
+        """Write all pending stat deltas for a game, one config update per changed member"""
+        pending = game.get("stat_deltas")
+        if not pending:
+            return
+        game["stat_deltas"] = {}
+        
+        async def apply(member_id: str, deltas: Dict[str, int]):
+            async with self.config.member_from_ids(guild.id, int(member_id)).all() as stats:
+                for stat, amount in deltas.items():
+                    stats[stat] = stats.get(stat, 0) + amount
+        
+        member_ids = list(pending)
+        results = await asyncio.gather(
+            *(apply(member_id, pending[member_id]) for member_id in member_ids),
+            return_exceptions=True
+        )
+        
+        # Keep failed deltas so the next flush retries them
+        for member_id, result in zip(member_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error flushing stats for member {member_id}: {result}")
+                retry = game["stat_deltas"].setdefault(member_id, {})
+                for stat, amount in pending[member_id].items():
+                    retry[stat] = retry.get(stat, 0) + amount
+    
     async def check_game_end(self, game: Dict, channel: discord.TextChannel) -> bool:
         """Check if game should end and handle victory"""
         alive_players = self.get_alive_players(game)
@@ -58,8 +105,12 @@ class GameEngine:
     async def _handle_game_victory(self, game: Dict, channel: discord.TextChannel, alive_players: List[Dict]):
         """Handle game victory and rewards"""
         try:
+            for player in game["players"].values():
+                self.record_stat(game, player, "games_played")
+            
             if len(alive_players) == 1:
                 winner = alive_players[0]
+                self.record_stat(game, winner, "wins")
                 await self._announce_winner(channel, winner, game)
                 await self._award_victory_rewards(channel.guild, winner, game)
             else:
@@ -72,6 +123,7 @@ class GameEngine:
                 await channel.send(embed=embed)
             
             game["status"] = "finished"
+            await self.flush_stats(channel.guild, game)
             
         except Exception as e:
             logger.error(f"Error handling game victory: {e}")
@@ -117,14 +169,9 @@ class GameEngine:
         await channel.send(embed=embed)
     
     async def _award_victory_rewards(self, guild: discord.Guild, winner: Dict, game: Dict):
-        """Award credits and update stats for winner"""
+        """Award credits to the winner"""
         try:
-            # Get winner member object
-            winner_member = None
-            for member_id, player_data in game["players"].items():
-                if player_data == winner:
-                    winner_member = guild.get_member(int(member_id))
-                    break
+            winner_member = guild.get_member(int(winner["id"]))
             
             if not winner_member:
                 logger.warning("Could not find winner member for rewards")
@@ -142,31 +189,11 @@ class GameEngine:
             except Exception as e:
                 logger.error(f"Failed to award credits: {e}")
             
-            # Update stats
-            await self._update_winner_stats(winner_member, winner, game)
-            
             logger.info(f"Awarded {total_reward} credits to winner {winner_member.id} in guild {guild.id}")
             
         except Exception as e:
             logger.error(f"Error awarding victory rewards: {e}")
     
-    async def _update_winner_stats(self, member: discord.Member, winner_data: Dict, game: Dict):
-        """Update winner's statistics"""
-        try:
-            current_stats = await self.config.member(member).all()
-            
-            # Update stats
-            current_stats["wins"] += 1
-            current_stats["kills"] += winner_data['kills']
-            current_stats["revives"] += winner_data.get('revives', 0)
-            current_stats["games_played"] += 1
-            
-            # Save updated stats
-            await self.config.member(member).set(current_stats)
-            
-        except Exception as e:
-            logger.error(f"Error updating winner stats: {e}")
-    
     async def select_arena_condition(self, game: Dict, channel: discord.TextChannel) -> bool:
         """Select and announce new arena condition"""
         try:
@@ -200,232 +227,212 @@ class GameEngine:
             logger.error(f"Error selecting arena condition: {e}")
             return False
     
-    async def execute_death_event(self, game: Dict, channel: discord.TextChannel) -> Optional[str]:
-        """Execute a death event with condition awareness - FIXED"""
-        alive_players = self.get_alive_players(game)
-        
-        if len(alive_players) < 2:
+    def game_rng(self, game: Dict) -> random.Random:
+        """Seeded RNG driving a game's simulation, created (and logged) on first use"""
+        if "rng" not in game:
+            game["seed"] = random.getrandbits(32)
+            game["rng"] = random.Random(game["seed"])
+            logger.info(f"Hunger Games simulation seed: {game['seed']}")
+        return game["rng"]
+
+    async def get_sponsor_chance(self, game: Dict) -> int:
+        """Guild sponsor chance adjusted by the current arena condition"""
+        base_sponsor_chance = await self.config.guild_from_id(game["channel"].guild.id).sponsor_chance()
+        condition_effects = self.condition_manager.condition_effects
+        modifier = condition_effects.get("sponsor_chance_modifier", 0) if condition_effects else 0
+        return int(base_sponsor_chance * (1 + modifier))
+
+    async def simulate_round(self, game: Dict) -> Tuple[PlayerTable, List[RoundEvent]]:
+        """Resolve the current round without touching the game dict"""
+        table = PlayerTable.from_game(game)
+        weights = self.condition_manager.apply_condition_to_event_weights(get_event_weights())
+        sponsor_chance = await self.get_sponsor_chance(game)
+        events = simulate_round(table, self.game_rng(game), game["round"], weights, sponsor_chance)
+        return table, events
+
+    def render_events(self, game: Dict, table: PlayerTable, events: List[RoundEvent]) -> List[str]:
+        """Apply simulated events to the game and return their messages"""
+        messages = []
+        for event in events:
+            self._apply_event(game, table, event)
+            message = self._format_event(game, table, event)
+            if message:
+                messages.append(message)
+        return messages
+
+    def _run_single_event(self, game: Dict, resolve) -> Optional[str]:
+        """Simulate and render one event; ``resolve`` is a simulation event function"""
+        table = PlayerTable.from_game(game)
+        event = resolve(table, self.game_rng(game))
+        if not event:
             return None
-        
-        # Choose victim(s)
-        if len(alive_players) >= 6 and random.random() < 0.15:
-            # Multi-kill event
-            num_victims = min(random.randint(2, 3), len(alive_players) - 1)
-            victims = random.sample(alive_players, num_victims)
+        self._apply_event(game, table, event)
+        return self._format_event(game, table, event)
+
+    async def execute_death_event(self, game: Dict, channel: discord.TextChannel) -> Optional[str]:
+        """Execute a death event with condition awareness"""
+        return self._run_single_event(game, death_event)
+
+    async def execute_survival_event(self, game: Dict) -> Optional[str]:
+        """Execute a survival event with condition awareness"""
+        return self._run_single_event(game, survival_event)
+
+    async def execute_sponsor_event(self, game: Dict) -> Optional[str]:
+        """Execute a sponsor revival event with condition awareness"""
+        sponsor_chance = await self.get_sponsor_chance(game)
+        return self._run_single_event(game, lambda table, rng: sponsor_event(table, rng, sponsor_chance))
+
+    async def execute_alliance_event(self, game: Dict) -> Optional[str]:
+        """Execute an alliance event with proper formatting"""
+        return self._run_single_event(game, alliance_event)
+
+    async def execute_crate_event(self, game: Dict) -> Optional[str]:
+        """Execute a supply crate event"""
+        return self._run_single_event(game, crate_event)
+
+    def _apply_event(self, game: Dict, table: PlayerTable, event: RoundEvent):
+        """Mirror a simulated event onto the game's player records and pending stats"""
+        players = game["players"]
+
+        if event.killer is not None:
+            killer = players[table.ids[event.killer]]
+            killer['kills'] += len(event.victims)
+            self.record_stat(game, killer, "kills", len(event.victims))
+
+        for slot in event.victims:
+            self.eliminate_player(game, players[table.ids[slot]])
+
+        if event.revived is not None:
+            revived_player = players[table.ids[event.revived]]
+            revived_player['alive'] = True
+            revived_player['revives'] = revived_player.get('revives', 0) + 1
+            game['sponsor_used'].append(revived_player['id'])
+            self.record_stat(game, revived_player, "revives")
+
+    @staticmethod
+    def _player_name(player: Dict) -> str:
+        return f"{player['name']} {player['title']}"
+
+    def _join_names(self, players: List[Dict]) -> str:
+        """Format player names as "A", "A and B" or "A, B, and C" """
+        names = [self._player_name(p) for p in players]
+        if len(names) == 1:
+            return names[0]
+        if len(names) == 2:
+            return f"{names[0]} and {names[1]}"
+        return f"{', '.join(names[:-1])}, and {names[-1]}"
+
+    def _format_event(self, game: Dict, table: PlayerTable, event: RoundEvent) -> Optional[str]:
+        """Turn a simulated event into its announcement"""
+        players = [game["players"][table.ids[slot]] for slot in event.players]
+        victims = [game["players"][table.ids[slot]] for slot in event.victims]
+
+        if event.kind == "death":
+            killer = game["players"][table.ids[event.killer]] if event.killer is not None else None
+            message = self._format_death(victims, killer)
+        elif event.kind == "survival":
+            message = random.choice(SURVIVAL_EVENTS).format(player=self._join_names(players))
+        elif event.kind == "sponsor":
+            revived_player = game["players"][table.ids[event.revived]]
+            message = random.choice(SPONSOR_EVENTS).format(player=self._player_name(revived_player))
+        elif event.kind == "alliance":
+            message = random.choice(ALLIANCE_EVENTS).format(
+                player1=self._player_name(players[0]),
+                player2=self._player_name(players[1])
+            )
+        elif event.kind == "crate":
+            message = random.choice(CRATE_EVENTS).format(player=self._join_names(players))
         else:
-            # Single kill
-            victims = [random.choice(alive_players)]
-        
-        # Choose killer (can be environment or another player)
-        killer = None
-        killer_name = None
-        
-        if random.random() < 0.6 and len(alive_players) > len(victims):
-            # Player vs player
-            potential_killers = [p for p in alive_players if p not in victims]
-            if potential_killers:  # Make sure we have potential killers
-                killer = random.choice(potential_killers)
-                killer_name = f"{killer['name']} {killer['title']}"
-                killer['kills'] += len(victims)
-        
-        # Execute the deaths
-        for victim in victims:
-            victim['alive'] = False
-            game['eliminated'].append(victim['name'])
-        
-        # Choose death event based on whether we have a killer
+            # Midgame special events carry their own flavor
+            return self._format_special_event(event, players, victims)
+
+        # Apply condition flavor
+        return self.condition_manager.apply_flavor_to_message(message)
+
+    def _format_death(self, victims: List[Dict], killer: Optional[Dict]) -> str:
+        """Pick and fill a death message, preferring condition-specific ones for kills"""
+        killer_name = self._player_name(killer) if killer else None
         condition_events = self.condition_manager.get_condition_death_events()
-        
+
         if killer_name and condition_events and random.random() < 0.4:
             # Use condition-specific death event (these always have killers)
-            death_event = random.choice(condition_events)
+            death_event_text = random.choice(condition_events)
         elif killer_name:
-            # Use player vs player death event
-            from .constants import PLAYER_DEATH_EVENTS
-            death_event = random.choice(PLAYER_DEATH_EVENTS)
-        else:
-            # Use environmental death event (no killer)
-            from .constants import ENVIRONMENTAL_DEATH_EVENTS
-            death_event = random.choice(ENVIRONMENTAL_DEATH_EVENTS)
-        
-        # Format victim names
-        if len(victims) == 1:
-            victim_names = f"{victims[0]['name']} {victims[0]['title']}"
+            death_event_text = random.choice(PLAYER_DEATH_EVENTS)
         else:
-            victim_list = [f"{v['name']} {v['title']}" for v in victims]
-            if len(victims) == 2:
-                victim_names = f"{victim_list[0]} and {victim_list[1]}"
-            else:
-                victim_names = f"{', '.join(victim_list[:-1])}, and {victim_list[-1]}"
-        
-        # Format the event message
+            death_event_text = random.choice(ENVIRONMENTAL_DEATH_EVENTS)
+
+        victim_names = self._join_names(victims)
         try:
             if killer_name:
-                message = death_event.format(player=victim_names, killer=killer_name)
-            else:
-                message = death_event.format(player=victim_names)
+                return death_event_text.format(player=victim_names, killer=killer_name)
+            return death_event_text.format(player=victim_names)
         except KeyError as e:
             # Fallback if formatting fails
-            logger.error(f"Death event formatting error: {e}, event: {death_event}")
+            logger.error(f"Death event formatting error: {e}, event: {death_event_text}")
             if killer_name:
-                message = f"💀 | **{killer_name}** eliminated ~~**{victim_names}**~~ in brutal combat!"
-            else:
-                message = f"💀 | ~~**{victim_names}**~~ met their end in the Grand Line!"
-        
-        # Apply condition flavor
-        message = self.condition_manager.apply_flavor_to_message(message)
-        
-        # Update stats for eliminated players
-        await self._update_death_stats(channel.guild, victims)
-        
-        return message
-    
-    async def _update_death_stats(self, guild: discord.Guild, victims: List[Dict]):
-        """Update stats for eliminated players"""
-        try:
-            for victim in victims:
-                # Find the member
-                victim_member = None
-                for member in guild.members:
-                    if member.display_name == victim['name']:
-                        victim_member = member
-                        break
-                
-                if victim_member:
-                    current_stats = await self.config.member(victim_member).all()
-                    current_stats["deaths"] += 1
-                    current_stats["kills"] += victim['kills']
-                    current_stats["revives"] += victim.get('revives', 0)
-                    current_stats["games_played"] += 1
-                    await self.config.member(victim_member).set(current_stats)
-                    
-        except Exception as e:
-            logger.error(f"Error updating death stats: {e}")
-    
-    async def execute_survival_event(self, game: Dict) -> Optional[str]:
-        """Execute a survival event with condition awareness"""
-        alive_players = self.get_alive_players(game)
-        
-        if not alive_players:
-            return None
-        
-        # Choose 1-3 players for survival event
-        num_players = min(random.randint(1, 3), len(alive_players))
-        players = random.sample(alive_players, num_players)
-        
-        survival_event = random.choice(SURVIVAL_EVENTS)
-        
-        if len(players) == 1:
-            player_names = f"{players[0]['name']} {players[0]['title']}"
-        else:
-            player_list = [f"{p['name']} {p['title']}" for p in players]
-            if len(players) == 2:
-                player_names = f"{player_list[0]} and {player_list[1]}"
-            else:
-                player_names = f"{', '.join(player_list[:-1])}, and {player_list[-1]}"
-        
-        message = survival_event.format(player=player_names)
-        
-        # Apply condition flavor
-        message = self.condition_manager.apply_flavor_to_message(message)
-        
-        return message
-    
-    async def execute_sponsor_event(self, game: Dict) -> Optional[str]:
-        """Execute a sponsor revival event with condition awareness"""
-        dead_players = self.get_dead_players(game)
-        
-        if not dead_players:
-            return None
-        
-        # Check sponsor chance (modified by conditions)
-        base_sponsor_chance = await self.config.guild_from_id(game["channel"].guild.id).sponsor_chance()
-        
-        # Apply condition modifiers
-        condition_effects = self.condition_manager.condition_effects
-        modifier = condition_effects.get("sponsor_chance_modifier", 0) if condition_effects else 0
-        final_chance = int(base_sponsor_chance * (1 + modifier))
-        
-        if random.randint(1, 100) > final_chance:
-            return None
-        
-        # Choose a recently eliminated player
-        if len(game['eliminated']) == 0:
-            return None
-        
-        # Find the most recently eliminated player
-        last_eliminated_name = game['eliminated'][-1]
-        revived_player = None
-        
-        for player in dead_players:
-            if player['name'] == last_eliminated_name and player['name'] not in game.get('sponsor_used', []):
-                revived_player = player
-                break
-        
-        if not revived_player:
-            return None
-        
-        # Revive the player
-        revived_player['alive'] = True
-        revived_player['revives'] = revived_player.get('revives', 0) + 1
-        game['sponsor_used'].append(revived_player['name'])
-        
-        sponsor_event = random.choice(SPONSOR_EVENTS)
-        message = sponsor_event.format(player=f"{revived_player['name']} {revived_player['title']}")
-        
-        # Apply condition flavor
-        message = self.condition_manager.apply_flavor_to_message(message)
-        
-        return message
-    
-    async def execute_alliance_event(self, game: Dict) -> Optional[str]:
-        """Execute an alliance event with proper formatting"""
-        alive_players = self.get_alive_players(game)
-        
-        if len(alive_players) < 2:
-            return None
-        
-        # Choose 2 players for alliance
-        players = random.sample(alive_players, 2)
-        
-        alliance_event = random.choice(ALLIANCE_EVENTS)
-        
-        # Format with player1 and player2
-        message = alliance_event.format(
-            player1=f"{players[0]['name']} {players[0]['title']}",
-            player2=f"{players[1]['name']} {players[1]['title']}"
-        )
-        
-        # Apply condition flavor
-        message = self.condition_manager.apply_flavor_to_message(message)
-        
-        return message
-    
-    async def execute_crate_event(self, game: Dict) -> Optional[str]:
-        """Execute a supply crate event"""
-        alive_players = self.get_alive_players(game)
-        
-        if not alive_players:
-            return None
-        
-        # Choose 1-2 players
-        num_players = min(random.randint(1, 2), len(alive_players))
-        players = random.sample(alive_players, num_players)
-        
-        crate_event = random.choice(CRATE_EVENTS)
-        
-        if len(players) == 1:
-            player_names = f"{players[0]['name']} {players[0]['title']}"
-        else:
-            player_names = f"{players[0]['name']} {players[0]['title']} and {players[1]['name']} {players[1]['title']}"
-        
-        message = crate_event.format(player=player_names)
-        
-        # Apply condition flavor
-        message = self.condition_manager.apply_flavor_to_message(message)
-        
-        return message
-    
+                return f"💀 | **{killer_name}** eliminated ~~**{victim_names}**~~ in brutal combat!"
+            return f"💀 | ~~**{victim_names}**~~ met their end in the Grand Line!"
+
+    def _format_special_event(self, event: RoundEvent, players: List[Dict], victims: List[Dict]) -> Optional[str]:
+        """Announcement for one of the midgame deadly event types"""
+        kind, outcome = event.kind, event.outcome
+        victim = self._player_name(victims[0]) if victims else None
+        player = self._player_name(players[0]) if players else None
+
+        if kind == "cannon_malfunction":
+            if victim:
+                return random.choice(CANNON_DEATH_EVENTS).format(player=victim)
+            return random.choice(CANNON_SCARE_EVENTS)
+
+        if kind == "toxic_fog":
+            if outcome == "multi_death":
+                victim_names = ", ".join([f"~~**{self._player_name(v)}**~~" for v in victims])
+                return TOXIC_FOG_MULTI_DEATH.format(players=victim_names)
+            if victim:
+                return random.choice(TOXIC_FOG_SINGLE_DEATH).format(player=victim)
+            return TOXIC_FOG_SURVIVAL
+
+        if kind == "tracker_jackers":
+            if victim:
+                return random.choice(TRACKER_JACKER_DEATHS).format(player=victim)
+            if outcome == "hallucination":
+                return TRACKER_JACKER_HALLUCINATION.format(player=player)
+            return TRACKER_JACKER_AVOIDANCE
+
+        if kind == "arena_trap":
+            trap_name, emoji, description = random.choice(ARENA_TRAP_TYPES)
+            if victim:
+                return ARENA_TRAP_DEATH.format(emoji=emoji, player=victim, description=description)
+            return ARENA_TRAP_ESCAPE.format(emoji=emoji, player=player, trap_name=trap_name)
+
+        if kind == "muttation_attack":
+            creature_name, emoji, death_verb = random.choice(MUTTATION_TYPES)
+            if victim:
+                return MUTTATION_DEATH.format(
+                    emoji=emoji, player=victim, death_verb=death_verb, creature_name=creature_name
+                )
+            return MUTTATION_ESCAPE.format(emoji=emoji, creature_name=creature_name)
+
+        if kind == "environmental_hazard":
+            hazard_name, emoji, death_description = random.choice(ENVIRONMENTAL_HAZARDS)
+            if victim:
+                return ENVIRONMENTAL_SINGLE_DEATH.format(
+                    emoji=emoji, player=victim, death_description=death_description, hazard_name=hazard_name
+                )
+            return ENVIRONMENTAL_SURVIVAL.format(emoji=emoji, hazard_name=hazard_name)
+
+        if kind == "gamemaker_test":
+            if victim:
+                return GAMEMAKER_COURAGE_DEATH.format(player=victim)
+            if outcome == "announcement":
+                return GAMEMAKER_TEST_ANNOUNCEMENT
+            if outcome == "loyalty":
+                return GAMEMAKER_LOYALTY_TEST
+            return GAMEMAKER_COURAGE_SURVIVAL.format(player=player)
+
+        return None
+
     async def check_special_events(self, game: Dict, channel: discord.TextChannel, alive_players: List[Dict]) -> Optional[str]:
         """Check for and generate special arena events"""
         alive_count = len(alive_players)
@@ -589,323 +596,3 @@ class GameEngine:
         
         embed.set_footer(text="🌊 Battle rages across the Grand Line...")
         return embed
-    
-    async def execute_combined_events(self, game: Dict, channel: discord.TextChannel, event_count: int = None):
-        """Execute multiple events in one round with condition awareness and special events"""
-        alive_count = len(self.get_alive_players(game))
-        
-        # Determine number of events if not specified
-        if event_count is None:
-            if alive_count <= 3:
-                event_count = random.randint(1, 2)
-            elif alive_count <= 6:
-                event_count = random.randint(2, 3)
-            elif alive_count <= 12:
-                event_count = random.randint(2, 4)
-            else:
-                event_count = random.randint(3, 5)
-        
-        # Execute events
-        event_messages = []
-        
-        from .constants import get_event_weights
-        base_weights = get_event_weights()
-        
-        # Apply condition effects to weights (but don't let them dominate)
-        weights = self.condition_manager.apply_condition_to_event_weights(base_weights)
-        
-        # Ensure minimum chances for non-death events so conditions don't prevent them
-        weights["survival"] = max(weights["survival"], 15)
-        weights["sponsor"] = max(weights["sponsor"], 10)
-        weights["alliance"] = max(weights["alliance"], 10)
-        weights["crate"] = max(weights["crate"], 10)
-        
-        # Check for special midgame events first (these are additional to normal events)
-        special_event = await self._check_special_midgame_events(game, channel, alive_count)
-        if special_event:
-            event_messages.append(special_event)
-        
-        for i in range(event_count):
-            if len(self.get_alive_players(game)) <= 1:
-                break
-            
-            # Adjust weights based on game state
-            current_alive = len(self.get_alive_players(game))
-            if current_alive <= 2:
-                weights.update({"death": 70, "survival": 10, "sponsor": 10, "alliance": 5, "crate": 5})
-            elif current_alive <= 5:
-                weights.update({"death": 45, "survival": 20, "sponsor": 15, "alliance": 10, "crate": 10})
-            
-            # Choose event type
-            event_types = list(weights.keys())
-            event_weights = list(weights.values())
-            event_type = random.choices(event_types, weights=event_weights)[0]
-            
-            # Execute event
-            message = None
-            if event_type == "death":
-                message = await self.execute_death_event(game, channel)
-            elif event_type == "survival":
-                message = await self.execute_survival_event(game)
-            elif event_type == "sponsor":
-                message = await self.execute_sponsor_event(game)
-            elif event_type == "alliance":
-                message = await self.execute_alliance_event(game)
-            elif event_type == "crate":
-                message = await self.execute_crate_event(game)
-            
-            if message:
-                event_messages.append(message)
-            
-            await asyncio.sleep(0.1)  # Small delay between events
-        
-        return event_messages
-    
-    async def _check_special_midgame_events(self, game: Dict, channel: discord.TextChannel, alive_count: int) -> Optional[str]:
-        """Check for and execute special midgame events"""
-        try:
-            round_num = game["round"]
-            
-            # Only trigger special events in midgame (not too early, not too late)
-            if round_num < 3 or alive_count <= 3:
-                return None
-            
-            # 15% chance for special events in midgame
-            if random.random() > 0.15:
-                return None
-            
-            # Choose random special event type
-            from .constants import MIDGAME_DEADLY_EVENT_TYPES
-            event_type = random.choice(MIDGAME_DEADLY_EVENT_TYPES)
-            
-            if event_type == "cannon_malfunction":
-                return await self._execute_cannon_event(game)
-            elif event_type == "toxic_fog":
-                return await self._execute_toxic_fog_event(game)
-            elif event_type == "tracker_jackers":
-                return await self._execute_sea_king_event(game)
-            elif event_type == "arena_trap":
-                return await self._execute_arena_trap_event(game)
-            elif event_type == "muttation_attack":
-                return await self._execute_muttation_event(game)
-            elif event_type == "environmental_hazard":
-                return await self._execute_environmental_hazard_event(game)
-            elif event_type == "gamemaker_test":
-                return await self._execute_gamemaker_event(game)
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error in special midgame events: {e}")
-            return None
-    
-    async def _execute_cannon_event(self, game: Dict) -> Optional[str]:
-        """Execute cannon malfunction event"""
-        try:
-            alive_players = self.get_alive_players(game)
-            if not alive_players:
-                return None
-            
-            from .constants import CANNON_DEATH_EVENTS, CANNON_SCARE_EVENTS
-            
-            if random.random() < 0.3:  # 30% chance for death
-                victim = random.choice(alive_players)
-                victim['alive'] = False
-                game['eliminated'].append(victim['name'])
-                
-                death_event = random.choice(CANNON_DEATH_EVENTS)
-                return death_event.format(player=f"{victim['name']} {victim['title']}")
-            else:
-                return random.choice(CANNON_SCARE_EVENTS)
-                
-        except Exception as e:
-            logger.error(f"Error in cannon event: {e}")
-            return None
-    
-    async def _execute_toxic_fog_event(self, game: Dict) -> Optional[str]:
-        """Execute toxic fog event"""
-        try:
-            alive_players = self.get_alive_players(game)
-            if not alive_players:
-                return None
-            
-            from .constants import TOXIC_FOG_SINGLE_DEATH, TOXIC_FOG_MULTI_DEATH, TOXIC_FOG_SURVIVAL
-            
-            if random.random() < 0.4:  # 40% chance for deaths
-                if len(alive_players) >= 4 and random.random() < 0.3:
-                    # Multi-death
-                    num_victims = min(random.randint(2, 3), len(alive_players) - 1)
-                    victims = random.sample(alive_players, num_victims)
-                    
-                    for victim in victims:
-                        victim['alive'] = False
-                        game['eliminated'].append(victim['name'])
-                    
-                    victim_names = ", ".join([f"~~**{v['name']} {v['title']}**~~" for v in victims])
-                    return TOXIC_FOG_MULTI_DEATH.format(players=victim_names)
-                else:
-                    # Single death
-                    victim = random.choice(alive_players)
-                    victim['alive'] = False
-                    game['eliminated'].append(victim['name'])
-                    
-                    death_event = random.choice(TOXIC_FOG_SINGLE_DEATH)
-                    return death_event.format(player=f"{victim['name']} {victim['title']}")
-            else:
-                return TOXIC_FOG_SURVIVAL
-                
-        except Exception as e:
-            logger.error(f"Error in toxic fog event: {e}")
-            return None
-    
-    async def _execute_sea_king_event(self, game: Dict) -> Optional[str]:
-        """Execute Sea King attack event"""
-        try:
-            alive_players = self.get_alive_players(game)
-            if not alive_players:
-                return None
-            
-            from .constants import TRACKER_JACKER_DEATHS, TRACKER_JACKER_HALLUCINATION, TRACKER_JACKER_AVOIDANCE
-            
-            if random.random() < 0.35:  # 35% chance for death
-                victim = random.choice(alive_players)
-                victim['alive'] = False
-                game['eliminated'].append(victim['name'])
-                
-                death_event = random.choice(TRACKER_JACKER_DEATHS)
-                return death_event.format(player=f"{victim['name']} {victim['title']}")
-            elif random.random() < 0.6:
-                # Hallucination event
-                survivor = random.choice(alive_players)
-                return TRACKER_JACKER_HALLUCINATION.format(player=f"{survivor['name']} {survivor['title']}")
-            else:
-                return TRACKER_JACKER_AVOIDANCE
-                
-        except Exception as e:
-            logger.error(f"Error in sea king event: {e}")
-            return None
-    
-    async def _execute_arena_trap_event(self, game: Dict) -> Optional[str]:
-        """Execute arena trap event"""
-        try:
-            alive_players = self.get_alive_players(game)
-            if not alive_players:
-                return None
-            
-            from .constants import ARENA_TRAP_TYPES, ARENA_TRAP_DEATH, ARENA_TRAP_ESCAPE
-            
-            trap_name, emoji, description = random.choice(ARENA_TRAP_TYPES)
-            player = random.choice(alive_players)
-            
-            if random.random() < 0.4:  # 40% chance for death
-                player['alive'] = False
-                game['eliminated'].append(player['name'])
-                
-                return ARENA_TRAP_DEATH.format(
-                    emoji=emoji,
-                    player=f"{player['name']} {player['title']}",
-                    description=description
-                )
-            else:
-                return ARENA_TRAP_ESCAPE.format(
-                    emoji=emoji,
-                    player=f"{player['name']} {player['title']}",
-                    trap_name=trap_name
-                )
-                
-        except Exception as e:
-            logger.error(f"Error in arena trap event: {e}")
-            return None
-    
-    async def _execute_muttation_event(self, game: Dict) -> Optional[str]:
-        """Execute muttation/creature attack event"""
-        try:
-            alive_players = self.get_alive_players(game)
-            if not alive_players:
-                return None
-            
-            from .constants import MUTTATION_TYPES, MUTTATION_DEATH, MUTTATION_ESCAPE
-            
-            creature_name, emoji, death_verb = random.choice(MUTTATION_TYPES)
-            
-            if random.random() < 0.3:  # 30% chance for death
-                victim = random.choice(alive_players)
-                victim['alive'] = False
-                game['eliminated'].append(victim['name'])
-                
-                return MUTTATION_DEATH.format(
-                    emoji=emoji,
-                    player=f"{victim['name']} {victim['title']}",
-                    death_verb=death_verb,
-                    creature_name=creature_name
-                )
-            else:
-                return MUTTATION_ESCAPE.format(
-                    emoji=emoji,
-                    creature_name=creature_name
-                )
-                
-        except Exception as e:
-            logger.error(f"Error in muttation event: {e}")
-            return None
-    
-    async def _execute_environmental_hazard_event(self, game: Dict) -> Optional[str]:
-        """Execute environmental hazard event"""
-        try:
-            alive_players = self.get_alive_players(game)
-            if not alive_players:
-                return None
-            
-            from .constants import ENVIRONMENTAL_HAZARDS, ENVIRONMENTAL_SINGLE_DEATH, ENVIRONMENTAL_SURVIVAL
-            
-            hazard_name, emoji, death_description = random.choice(ENVIRONMENTAL_HAZARDS)
-            
-            if random.random() < 0.35:  # 35% chance for death
-                victim = random.choice(alive_players)
-                victim['alive'] = False
-                game['eliminated'].append(victim['name'])
-                
-                return ENVIRONMENTAL_SINGLE_DEATH.format(
-                    emoji=emoji,
-                    player=f"{victim['name']} {victim['title']}",
-                    death_description=death_description,
-                    hazard_name=hazard_name
-                )
-            else:
-                return ENVIRONMENTAL_SURVIVAL.format(
-                    emoji=emoji,
-                    hazard_name=hazard_name
-                )
-                
-        except Exception as e:
-            logger.error(f"Error in environmental hazard event: {e}")
-            return None
-    
-    async def _execute_gamemaker_event(self, game: Dict) -> Optional[str]:
-        """Execute World Government test event"""
-        try:
-            alive_players = self.get_alive_players(game)
-            if not alive_players:
-                return None
-            
-            from .constants import (GAMEMAKER_COURAGE_DEATH, GAMEMAKER_COURAGE_SURVIVAL, 
-                                   GAMEMAKER_TEST_ANNOUNCEMENT, GAMEMAKER_LOYALTY_TEST)
-            
-            event_type = random.choice(["courage", "announcement", "loyalty"])
-            
-            if event_type == "courage":
-                player = random.choice(alive_players)
-                if random.random() < 0.2:  # 20% chance for death
-                    player['alive'] = False
-                    game['eliminated'].append(player['name'])
-                    return GAMEMAKER_COURAGE_DEATH.format(player=f"{player['name']} {player['title']}")
-                else:
-                    return GAMEMAKER_COURAGE_SURVIVAL.format(player=f"{player['name']} {player['title']}")
-            elif event_type == "announcement":
-                return GAMEMAKER_TEST_ANNOUNCEMENT
-            else:
-                return GAMEMAKER_LOYALTY_TEST
-                
-        except Exception as e:
-            logger.error(f"Error in gamemaker event: {e}")
-            return None
@@ -5,6 +5,8 @@ Handles GIF selection, loading, and integration with Discord embeds
 """
 
 import os
+import json
+import time
 import random
 import logging
 import asyncio
@@ -15,6 +17,10 @@ from redbot.core import commands, Config
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_FORMATS = ('.gif', '.webp', '.mp4', '.mov')
+CATALOG_FILE = ".catalog.json"
+CATALOG_VERSION = 1
+
 class GifManager:
     """Handles all GIF-related functionality for the Hunger Games bot"""
     
@@ -29,9 +35,15 @@ class GifManager:
             # Default to a subdirectory in the current directory
             self.base_path = Path("data") / "gifs"
         
-        self.gif_cache = {}
+        self.gif_cache: Dict[str, Dict[str, List[str]]] = {}
+        self.gif_flat: Dict[str, List[str]] = {}  # Every GIF per category, for "any GIF" fallbacks
         self.last_cache_update = 0
-        self.cache_timeout = 300  # 5 minutes
+        self.cache_timeout = 300  # 5 minutes between background mtime checks
+        
+        # Directory listings keyed by path relative to base_path: (mtime_ns, entry names)
+        self._listings: Dict[str, Tuple[int, List[str]]] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.catalog_path = self.base_path / CATALOG_FILE
         
         # Initialize GIF categories and their subdirectories FIRST
         self.gif_structure = {
@@ -168,49 +180,125 @@ This directory contains GIFs that are automatically selected during Hunger Games
         except Exception as e:
             logger.error(f"Error creating GIF directory structure: {e}")
     
+    def _list_dir(self, rel: str, want_dirs: bool) -> List[str]:
+        """List subdirectories or GIF files of a directory, reusing the cached listing if its mtime is unchanged"""
+        path = self.base_path / rel if rel else self.base_path
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._listings.get(rel)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        names = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if want_dirs and entry.is_dir():
+                    names.append(entry.name)
+                elif (not want_dirs and entry.is_file() and
+                      os.path.splitext(entry.name)[1].lower() in SUPPORTED_FORMATS):
+                    names.append(entry.name)
+        names.sort()
+        
+        self._listings[rel] = (mtime, names)
+        return names
+    
     def _scan_gifs(self) -> Dict[str, Dict[str, List[str]]]:
-        """Scan the GIF directories and return available GIFs"""
+        """Build the catalog, re-listing only directories whose mtime changed"""
         try:
             gif_files = {}
-            supported_formats = ['.gif', '.webp', '.mp4', '.mov']
             
             # Check if base directory exists
             if not self.base_path.exists():
                 logger.warning(f"GIF base directory does not exist: {self.base_path}")
                 return {}
             
-            for category_dir in self.base_path.iterdir():
-                if category_dir.is_dir() and not category_dir.name.startswith('.'):
-                    category = category_dir.name
-                    gif_files[category] = {}
-                    
-                    for subcategory_dir in category_dir.iterdir():
-                        if subcategory_dir.is_dir() and not subcategory_dir.name.startswith('.'):
-                            subcategory = subcategory_dir.name
-                            files = []
-                            
-                            for file_path in subcategory_dir.iterdir():
-                                if (file_path.is_file() and 
-                                    file_path.suffix.lower() in supported_formats and
-                                    not file_path.name.startswith('.')):
-                                    files.append(str(file_path))
-                            
-                            if files:
-                                gif_files[category][subcategory] = files
+            seen = {""}
+            for category in self._list_dir("", want_dirs=True):
+                seen.add(category)
+                gif_files[category] = {}
+                
+                for subcategory in self._list_dir(category, want_dirs=True):
+                    rel = f"{category}/{subcategory}"
+                    seen.add(rel)
+                    files = self._list_dir(rel, want_dirs=False)
+                    if files:
+                        directory = self.base_path / category / subcategory
+                        gif_files[category][subcategory] = [str(directory / name) for name in files]
+            
+            # Forget listings of directories that no longer exist
+            for rel in set(self._listings) - seen:
+                del self._listings[rel]
             
             return gif_files
         except Exception as e:
             logger.error(f"Error scanning GIFs: {e}")
-            return {}
+            return self.gif_cache
     
-    def _get_cached_gifs(self) -> Dict[str, Dict[str, List[str]]]:
-        """Get GIFs from cache or rescan if cache is stale"""
-        current_time = asyncio.get_event_loop().time()
+    def _load_catalog_file(self):
+        """Seed directory listings from the catalog saved by the previous run"""
+        try:
+            with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CATALOG_VERSION:
+                self._listings = {rel: (mtime, names) for rel, (mtime, names) in data["listings"].items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable GIF catalog {self.catalog_path}: {e}")
+    
+    def _save_catalog_file(self):
+        """Persist directory listings so the next load only re-lists changed directories"""
+        try:
+            tmp_path = self.catalog_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": CATALOG_VERSION, "listings": self._listings}, f)
+            os.replace(tmp_path, self.catalog_path)
+        except Exception as e:
+            logger.warning(f"Could not save GIF catalog: {e}")
+    
+    def _refresh_catalog(self):
+        """Blocking refresh: re-list changed directories and swap in the new catalog"""
+        if not self.last_cache_update:
+            self._load_catalog_file()
+        before = dict(self._listings)
         
-        if (not self.gif_cache or 
-            current_time - self.last_cache_update > self.cache_timeout):
-            self.gif_cache = self._scan_gifs()
-            self.last_cache_update = current_time
+        gif_cache = self._scan_gifs()
+        gif_flat = {
+            category: [gif for gifs in subcategories.values() for gif in gifs]
+            for category, subcategories in gif_cache.items()
+        }
+        self.gif_cache, self.gif_flat = gif_cache, gif_flat
+        self.last_cache_update = time.monotonic()
+        
+        if self._listings != before:
+            self._save_catalog_file()
+            logger.debug(f"GIF catalog refreshed: {sum(len(g) for g in gif_flat.values())} files")
+    
+    async def load_catalog(self):
+        """Load and refresh the catalog in a worker thread"""
+        self._schedule_refresh()
+        await self._refresh_task
+    
+    def _schedule_refresh(self):
+        """Start a background refresh unless one is already running"""
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+            self._refresh_task = loop.create_task(asyncio.to_thread(self._refresh_catalog))
+        except RuntimeError:
+            # No running loop (e.g. called from a script), refresh inline
+            self._refresh_catalog()
+    
+    def _get_cached_gifs(self) -> Dict[str, Dict[str, List[str]]]:
+        """Get the in-memory catalog, checking for changes in the background once it is stale"""
+        if not self.last_cache_update:
+            # Catalog not loaded yet; only happens if load_catalog was never awaited
+            if not self._refresh_task:
+                self._refresh_catalog()
+        elif time.monotonic() - self.last_cache_update > self.cache_timeout:
+            self._schedule_refresh()
         
         return self.gif_cache
     
@@ -258,9 +346,7 @@ This directory contains GIFs that are automatically selected during Hunger Games
                     return selected_gif
             
             # Final fallback - any victory GIF
-            all_victory_gifs = []
-            for category_gifs in victory_gifs.values():
-                all_victory_gifs.extend(category_gifs)
+            all_victory_gifs = self.gif_flat.get("victory")
             
             if all_victory_gifs:
                 selected_gif = random.choice(all_victory_gifs)
@@ -295,9 +381,7 @@ This directory contains GIFs that are automatically selected during Hunger Games
                 return selected_gif
             
             # Final fallback - any death GIF
-            all_death_gifs = []
-            for category_gifs in death_gifs.values():
-                all_death_gifs.extend(category_gifs)
+            all_death_gifs = self.gif_flat.get("death")
             
             if all_death_gifs:
                 selected_gif = random.choice(all_death_gifs)
@@ -332,9 +416,7 @@ This directory contains GIFs that are automatically selected during Hunger Games
                 return selected_gif
             
             # Final fallback - any sponsor GIF
-            all_sponsor_gifs = []
-            for category_gifs in sponsor_gifs.values():
-                all_sponsor_gifs.extend(category_gifs)
+            all_sponsor_gifs = self.gif_flat.get("sponsor")
             
             if all_sponsor_gifs:
                 selected_gif = random.choice(all_sponsor_gifs)
@@ -384,9 +466,9 @@ This directory contains GIFs that are automatically selected during Hunger Games
             return {}
     
     def clear_cache(self):
-        """Clear the GIF cache to force rescan"""
-        self.gif_cache = {}
-        self.last_cache_update = 0
+        """Forget all directory listings and rescan in the background"""
+        self._listings = {}
+        self._schedule_refresh()
         logger.debug("GIF cache cleared")
     
     def get_base_path(self) -> str:
@@ -417,8 +499,8 @@ This directory contains GIFs that are automatically selected during Hunger Games
                             async for chunk in response.content.iter_chunked(8192):
                                 f.write(chunk)
                         
-                        # Clear cache to include new GIF
-                        self.clear_cache()
+                        # Pick up the new GIF (only this directory's listing changed)
+                        self._schedule_refresh()
                         logger.info(f"Successfully uploaded GIF: {file_path}")
                         return True
             
@@ -8,20 +8,36 @@ import discord
 import logging
 import asyncio
 import textwrap
-from typing import Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 import io
 
 logger = logging.getLogger(__name__)
 
+# Encoder presets: (PIL format, file extension, save options)
+IMAGE_FORMATS = {
+    "png": ("PNG", "png", {"optimize": True}),               # Smallest PNG, slowest to encode
+    "png_fast": ("PNG", "png", {"compress_level": 1}),        # Larger file, about twice as fast
+    "webp": ("WEBP", "webp", {"quality": 90, "method": 0}),  # Fast lossy encoder, small files
+}
+
+TEXT_MEASURE_CACHE_SIZE = 4096
+
 class ImageRoundHandler:
     """Handles creation of custom round display images"""
     
-    def __init__(self, bot, base_path: str = None, enable_emojis: bool = True):
+    def __init__(self, bot, base_path: str = None, enable_emojis: bool = True,
+                 image_format: str = "png", render_workers: int = 2):
         self.bot = bot
         self.enable_emojis = enable_emojis  # Allow emoji rendering to be toggled
         
+        self.image_format = "png"
+        if not self.set_image_format(image_format):
+            logger.warning(f"Unknown image format '{image_format}', using png")
+        
         # Set up paths - use the specific path provided
         if base_path:
             self.base_path = Path(base_path)
@@ -52,28 +68,81 @@ class ImageRoundHandler:
         self.players_color = (0, 0, 0)             # Black for the white box area
         self.outline_color = (0, 0, 0)             # Black outline
         
+        # Decoded template, reloaded only when the file on disk changes
+        self._template: Optional[Image.Image] = None
+        self._template_mtime: Optional[float] = None
+        self._template_lock = threading.Lock()
+        
+        # FreeType faces are not safe to share between threads, so each render
+        # worker keeps its own fonts; resolved font files are shared
+        self._local = threading.local()
+        self._font_files: Dict[Tuple[int, bool], Optional[str]] = {}
+        self._text_boxes: Dict[Tuple[str, Optional[str], Optional[int]], Tuple[int, int, int, int]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, render_workers), thread_name_prefix="hg-render")
+        
         self._setup_fonts()
         
         # Log initialization
         logger.info(f"ImageRoundHandler initialized with template path: {self.template_path}")
         logger.info(f"Emoji rendering {'enabled' if self.enable_emojis else 'disabled'}")
     
+    def set_image_format(self, image_format: str) -> bool:
+        """Switch the encoder preset used for new images; False if unknown"""
+        if image_format not in IMAGE_FORMATS:
+            return False
+        self.image_format = image_format
+        return True
+    
     def _setup_fonts(self):
-        """Set up fonts with fallbacks"""
+        """Set up fonts with fallbacks for the calling thread"""
+        local = self._local
+        local.fonts = {}
         try:
             # Try to load custom fonts, fall back to default
-            self.round_font = self._load_font(self.round_font_size, bold=True)
-            self.event_font = self._load_font(self.event_font_size)
-            self.players_font = self._load_font(self.players_font_size, bold=True)
+            local.round_font = self._load_font(self.round_font_size, bold=True)
+            local.event_font = self._load_font(self.event_font_size)
+            local.players_font = self._load_font(self.players_font_size, bold=True)
         except Exception as e:
             logger.warning(f"Font setup error: {e}")
             # Use PIL's default font as fallback
-            self.round_font = ImageFont.load_default()
-            self.event_font = ImageFont.load_default()
-            self.players_font = ImageFont.load_default()
+            local.round_font = ImageFont.load_default()
+            local.event_font = ImageFont.load_default()
+            local.players_font = ImageFont.load_default()
+    
+    def _thread_fonts(self):
+        """Fonts belonging to the current thread, loaded on first use"""
+        if not hasattr(self._local, "round_font"):
+            self._setup_fonts()
+        return self._local
+    
+    @property
+    def round_font(self) -> ImageFont.ImageFont:
+        return self._thread_fonts().round_font
+    
+    @property
+    def event_font(self) -> ImageFont.ImageFont:
+        return self._thread_fonts().event_font
+    
+    @property
+    def players_font(self) -> ImageFont.ImageFont:
+        return self._thread_fonts().players_font
+    
+    def _load_font(self, size: int, bold: bool = False) -> ImageFont.ImageFont:
+        """Load font for the current thread, resolving the font file only once"""
+        if not hasattr(self._local, "fonts"):
+            self._setup_fonts()
+        fonts = self._local.fonts
+        
+        key = (size, bold)
+        if key not in fonts:
+            if key not in self._font_files:
+                self._font_files[key] = self._find_font_file(size, bold)
+            font_file = self._font_files[key]
+            fonts[key] = ImageFont.truetype(font_file, size) if font_file else ImageFont.load_default()
+        return fonts[key]
     
-    def _load_font(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
-        """Load font with fallbacks including emoji support"""
+    def _find_font_file(self, size: int, bold: bool = False) -> Optional[str]:
+        """Find a loadable font file with fallbacks including emoji support"""
         font_options = [
             # Try emoji-capable fonts first
             "/System/Library/Fonts/Apple Color Emoji.ttc",  # macOS
@@ -96,80 +165,139 @@ class ImageRoundHandler:
         for font_path in font_options:
             try:
                 if Path(font_path).exists() or isinstance(font_path, str):
-                    font = ImageFont.truetype(str(font_path), size)
+                    ImageFont.truetype(str(font_path), size)
                     logger.debug(f"Successfully loaded font: {font_path}")
-                    return font
+                    return str(font_path)
             except Exception:
                 continue
         
         # Final fallback to default font
         logger.warning(f"Could not load any custom fonts, using default for size {size}")
-        return ImageFont.load_default()
+        return None
+    
+    def _get_template(self) -> Optional[Image.Image]:
+        """Return the decoded template, re-reading it only if the file changed"""
+        try:
+            mtime = self.template_path.stat().st_mtime
+        except FileNotFoundError:
+            logger.warning(f"Template image not found at {self.template_path}")
+            return None
+        
+        with self._template_lock:
+            if self._template is None or self._template_mtime != mtime:
+                with Image.open(self.template_path) as image:
+                    self._template = image.convert("RGBA")
+                self._template_mtime = mtime
+                logger.debug(f"Loaded template image: {self._template.size}")
+            return self._template
+    
+    def _text_bbox(self, text: str, font: ImageFont.ImageFont) -> Tuple[int, int, int, int]:
+        """Measure text, caching the result per (text, font)"""
+        key = (text, getattr(font, "path", None), getattr(font, "size", None))
+        bbox = self._text_boxes.get(key)
+        if bbox is None:
+            if len(self._text_boxes) >= TEXT_MEASURE_CACHE_SIZE:
+                self._text_boxes.clear()
+            bbox = self._text_boxes[key] = tuple(font.getbbox(text))
+        return bbox
+    
+    def _encode(self, image: Image.Image) -> Tuple[bytes, str]:
+        """Encode an image with the configured encoder, returning data and file extension"""
+        pil_format, extension, options = IMAGE_FORMATS[self.image_format]
+        if pil_format == "WEBP" and image.mode == "RGBA":
+            image = image.convert("RGB")
+        img_buffer = io.BytesIO()
+        image.save(img_buffer, format=pil_format, **options)
+        return img_buffer.getvalue(), extension
+    
+    async def _run_in_worker(self, func, *args):
+        """Run a blocking render in the worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    def close(self):
+        """Stop the render workers"""
+        self._executor.shutdown(wait=False)
     
     def save_template_image(self, image_data: bytes) -> bool:
         """Save the uploaded template image"""
         try:
             with open(self.template_path, 'wb') as f:
                 f.write(image_data)
+            with self._template_lock:
+                self._template = None
             logger.info(f"Template image saved to {self.template_path}")
             return True
         except Exception as e:
             logger.error(f"Error saving template image: {e}")
             return False
     
+    async def render_round_image(self, round_num: int, event_text: str,
+                                 remaining_players: int) -> Optional[discord.File]:
+        """Create the round display image in the worker pool without blocking the event loop"""
+        try:
+            rendered = await self._run_in_worker(self._render_round_bytes, round_num, event_text, remaining_players)
+        except Exception as e:
+            logger.error(f"Error creating round image: {e}")
+            return None
+        return self._to_file(rendered, "round_display")
+    
     def create_round_image(self, round_num: int, event_text: str, 
                           remaining_players: int) -> Optional[discord.File]:
-        """Create round display image with overlaid text"""
+        """Create round display image with overlaid text (blocking)"""
         try:
-            # Check if template exists
-            if not self.template_path.exists():
-                logger.warning(f"Template image not found at {self.template_path}")
-                return None
-            
-            # Load template image
-            template = Image.open(self.template_path).convert("RGBA")
-            logger.debug(f"Loaded template image: {template.size}")
-            
-            # Create drawing context
-            draw = ImageDraw.Draw(template)
-            
-            # Clean event text first
-            clean_event_text = self._clean_event_text(event_text)
-            logger.debug(f"Cleaned event text: {clean_event_text}")
-            
-            # Draw round number (positioned right after "Round :")
-            round_text = str(round_num)
-            self._draw_centered_text(
-                draw, round_text, self.round_position, 
-                self.round_font, self.round_color
-            )
-            logger.debug(f"Drew round number '{round_text}' at {self.round_position}")
-            
-            # Draw event text (in the orange horizontal bar)
-            self._draw_wrapped_text(
-                draw, clean_event_text, self.event_area, 
-                self.event_font, self.event_color
-            )
-            logger.debug(f"Drew event text in area {self.event_area}")
-            
-            # Draw remaining players (in the white box at bottom)
-            players_text = str(remaining_players)
-            self._draw_centered_text(
-                draw, players_text, self.players_position,
-                self.players_font, self.players_color, use_outline=False  # No outline for black text on white
-            )
-            logger.debug(f"Drew players count '{players_text}' at {self.players_position}")
-            
-            # Convert to Discord file
-            img_buffer = io.BytesIO()
-            template.save(img_buffer, format='PNG', optimize=True)
-            img_buffer.seek(0)
-            
-            return discord.File(img_buffer, filename="round_display.png")
-            
+            rendered = self._render_round_bytes(round_num, event_text, remaining_players)
         except Exception as e:
             logger.error(f"Error creating round image: {e}")
             return None
+        return self._to_file(rendered, "round_display")
+    
+    def _to_file(self, rendered: Optional[Tuple[bytes, str]], name: str) -> Optional[discord.File]:
+        """Wrap encoded image data in a Discord file"""
+        if rendered is None:
+            return None
+        data, extension = rendered
+        return discord.File(io.BytesIO(data), filename=f"{name}.{extension}")
+    
+    def _render_round_bytes(self, round_num: int, event_text: str,
+                            remaining_players: int) -> Optional[Tuple[bytes, str]]:
+        """Draw the round image on a copy of the cached template and encode it"""
+        base = self._get_template()
+        if base is None:
+            return None
+        template = base.copy()
+        
+        # Create drawing context
+        draw = ImageDraw.Draw(template)
+        
+        # Clean event text first
+        clean_event_text = self._clean_event_text(event_text)
+        logger.debug(f"Cleaned event text: {clean_event_text}")
+        
+        # Draw round number (positioned right after "Round :")
+        round_text = str(round_num)
+        self._draw_centered_text(
+            draw, round_text, self.round_position, 
+            self.round_font, self.round_color
+        )
+        logger.debug(f"Drew round number '{round_text}' at {self.round_position}")
+        
+        # Draw event text (in the orange horizontal bar)
+        self._draw_wrapped_text(
+            draw, clean_event_text, self.event_area, 
+            self.event_font, self.event_color
+        )
+        logger.debug(f"Drew event text in area {self.event_area}")
+        
+        # Draw remaining players (in the white box at bottom)
+        players_text = str(remaining_players)
+        self._draw_centered_text(
+            draw, players_text, self.players_position,
+            self.players_font, self.players_color, use_outline=False  # No outline for black text on white
+        )
+        logger.debug(f"Drew players count '{players_text}' at {self.players_position}")
+        
+        return self._encode(template)
     
     def _draw_centered_text(self, draw: ImageDraw.Draw, text: str, 
                            position: Tuple[int, int], font: ImageFont.ImageFont, 
@@ -177,7 +305,7 @@ class ImageRoundHandler:
         """Draw text centered at position"""
         try:
             # Get text dimensions
-            bbox = draw.textbbox((0, 0), text, font=font)
+            bbox = self._text_bbox(text, font)
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
             
@@ -242,7 +370,7 @@ class ImageRoundHandler:
                     break
                 
                 # Center line horizontally
-                line_bbox = draw.textbbox((0, 0), line, font=font)
+                line_bbox = self._text_bbox(line, font)
                 line_width = line_bbox[2] - line_bbox[0]
                 line_x = x1 + (area_width - line_width) // 2
                 
@@ -266,7 +394,7 @@ class ImageRoundHandler:
             
         try:
             # Try to get text dimensions with emojis
-            bbox = draw.textbbox((0, 0), text, font=font)
+            self._text_bbox(text, font)
             # If this succeeds without error, emojis should render fine
             logger.debug("Emoji rendering test passed")
             return text
@@ -338,7 +466,7 @@ class ImageRoundHandler:
         try:
             # Sample text to measure
             sample = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 "
-            bbox = font.getbbox(sample)
+            bbox = self._text_bbox(sample, font)
             width = bbox[2] - bbox[0]
             return max(1, width / len(sample))
         except Exception:
@@ -347,7 +475,7 @@ class ImageRoundHandler:
     def _get_line_height(self, font: ImageFont.ImageFont) -> int:
         """Get line height for the font"""
         try:
-            bbox = font.getbbox("Ay")
+            bbox = self._text_bbox("Ay", font)
             return (bbox[3] - bbox[1]) + 2  # Less padding for tighter fit
         except Exception:
             return 18  # Smaller fallback value
@@ -364,11 +492,11 @@ class ImageRoundHandler:
                           remaining_players: int = 12) -> Optional[discord.File]:
         """Create debug image showing positioning guides"""
         try:
-            if not self.template_path.exists():
-                logger.warning(f"Template image not found at {self.template_path}")
+            base = self._get_template()
+            if base is None:
                 return None
             
-            template = Image.open(self.template_path).convert("RGBA")
+            template = base.copy()
             draw = ImageDraw.Draw(template)
             
             # Draw positioning guides
@@ -408,12 +536,7 @@ class ImageRoundHandler:
             self._draw_centered_text(draw, str(remaining_players), self.players_position,
                                    self.players_font, self.players_color, use_outline=False)
             
-            # Convert to Discord file
-            img_buffer = io.BytesIO()
-            template.save(img_buffer, format='PNG', optimize=True)
-            img_buffer.seek(0)
-            
-            return discord.File(img_buffer, filename="debug_round_display.png")
+            return self._to_file(self._encode(template), "debug_round_display")
             
         except Exception as e:
             logger.error(f"Error creating debug image: {e}")
@@ -232,6 +232,7 @@ class PollSystem:
                 member = ctx.guild.get_member(user_id)
                 if member:
                     game["players"][str(user_id)] = {
+                        "id": str(user_id),
                         "name": member.display_name,
                         "title": get_random_player_title(),
                         "alive": True,
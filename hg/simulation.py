@@ -0,0 +1,283 @@
+# simulation.py
+"""
+Pure, seeded simulation of Hunger Games rounds
+
+Rounds are resolved here on a compact player table without any Discord I/O;
+GameEngine turns the resulting events into messages and stat updates.
+"""
+
+from __future__ import annotations
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+try:
+    from .constants import MIDGAME_DEADLY_EVENT_TYPES
+except ImportError:
+    from constants import MIDGAME_DEADLY_EVENT_TYPES
+
+
+# Minimum weights so conditions never starve the non-lethal events
+MIN_EVENT_WEIGHTS = {"survival": 15, "sponsor": 10, "alliance": 10, "crate": 10}
+
+# Endgame weights, keyed by the highest alive count they apply to
+ENDGAME_EVENT_WEIGHTS = [
+    (2, {"death": 70, "survival": 10, "sponsor": 10, "alliance": 5, "crate": 5}),
+    (5, {"death": 45, "survival": 20, "sponsor": 15, "alliance": 10, "crate": 10}),
+]
+
+# Chance that a midgame round gets one of MIDGAME_DEADLY_EVENT_TYPES
+SPECIAL_EVENT_CHANCE = 0.15
+
+
+class PlayerTable:
+    """Compact player state: parallel arrays indexed by player slot"""
+
+    __slots__ = ("ids", "alive", "kills", "revives", "sponsored", "eliminated", "alive_count", "_alive_cache")
+
+    def __init__(self, ids: List[str]):
+        self.ids = list(ids)
+        self.alive = bytearray(b"\x01" * len(self.ids))
+        self.kills = [0] * len(self.ids)
+        self.revives = [0] * len(self.ids)
+        self.sponsored = bytearray(len(self.ids))  # Already revived by a sponsor
+        self.eliminated: List[int] = []  # Slots in order of elimination
+        self.alive_count = len(self.ids)
+        self._alive_cache: Optional[List[int]] = None
+
+    @classmethod
+    def from_game(cls, game: Dict) -> "PlayerTable":
+        """Build a table from a live game dict (players keyed by member ID)"""
+        table = cls(list(game["players"]))
+        slots = {player_id: slot for slot, player_id in enumerate(table.ids)}
+
+        for slot, player_id in enumerate(table.ids):
+            player = game["players"][player_id]
+            if not player["alive"]:
+                table.alive[slot] = 0
+                table.alive_count -= 1
+            table.kills[slot] = player.get("kills", 0)
+            table.revives[slot] = player.get("revives", 0)
+
+        table.eliminated = [slots[player_id] for player_id in game["eliminated"] if player_id in slots]
+        for player_id in game.get("sponsor_used", []):
+            if player_id in slots:
+                table.sponsored[slots[player_id]] = 1
+        return table
+
+    def alive_slots(self) -> List[int]:
+        if self._alive_cache is None:
+            alive = self.alive
+            self._alive_cache = [slot for slot in range(len(alive)) if alive[slot]]
+        return self._alive_cache
+
+    def dead_count(self) -> int:
+        return len(self.ids) - self.alive_count
+
+    def eliminate(self, slot: int):
+        self.alive[slot] = 0
+        self.alive_count -= 1
+        self.eliminated.append(slot)
+        self._alive_cache = None
+
+    def revive(self, slot: int):
+        self.alive[slot] = 1
+        self.alive_count += 1
+        self.revives[slot] += 1
+        self.sponsored[slot] = 1
+        self._alive_cache = None
+
+
+@dataclass
+class RoundEvent:
+    """One resolved event, referring to players by table slot"""
+    kind: str  # "death", "survival", "sponsor", "alliance", "crate" or a MIDGAME_DEADLY_EVENT_TYPES entry
+    outcome: str = "ok"  # Special events: "death", "survive", "scare", "hallucination", "announcement", ...
+    players: List[int] = field(default_factory=list)  # Featured (surviving) players
+    victims: List[int] = field(default_factory=list)
+    killer: Optional[int] = None
+    revived: Optional[int] = None
+
+
+def condition_event_weights(base_weights: Dict[str, int]) -> Dict[str, int]:
+    """Apply the minimum non-lethal weights to condition-adjusted weights"""
+    weights = dict(base_weights)
+    for event_type, minimum in MIN_EVENT_WEIGHTS.items():
+        weights[event_type] = max(weights.get(event_type, 0), minimum)
+    return weights
+
+
+def roll_event_count(alive_count: int, rng: random.Random) -> int:
+    """Number of regular events in a round, based on how many players remain"""
+    if alive_count <= 3:
+        return rng.randint(1, 2)
+    elif alive_count <= 6:
+        return rng.randint(2, 3)
+    elif alive_count <= 12:
+        return rng.randint(2, 4)
+    return rng.randint(3, 5)
+
+
+def _pick_victims(table: PlayerTable, rng: random.Random, multi_chance: float, min_alive: int) -> List[int]:
+    """One victim, or 2-3 if enough players remain and the multi-kill roll hits"""
+    alive = table.alive_slots()
+    if len(alive) >= min_alive and rng.random() < multi_chance:
+        return rng.sample(alive, min(rng.randint(2, 3), len(alive) - 1))
+    return [rng.choice(alive)]
+
+
+def death_event(table: PlayerTable, rng: random.Random) -> Optional[RoundEvent]:
+    """Kill one or more players, usually at the hands of another"""
+    if table.alive_count < 2:
+        return None
+
+    victims = _pick_victims(table, rng, 0.15, 6)
+
+    killer = None
+    if rng.random() < 0.6 and table.alive_count > len(victims):
+        potential_killers = [slot for slot in table.alive_slots() if slot not in victims]
+        killer = rng.choice(potential_killers)
+        table.kills[killer] += len(victims)
+
+    for victim in victims:
+        table.eliminate(victim)
+
+    return RoundEvent("death", victims=victims, killer=killer)
+
+
+def survival_event(table: PlayerTable, rng: random.Random) -> Optional[RoundEvent]:
+    if not table.alive_count:
+        return None
+    alive = table.alive_slots()
+    return RoundEvent("survival", players=rng.sample(alive, min(rng.randint(1, 3), len(alive))))
+
+
+def sponsor_event(table: PlayerTable, rng: random.Random, sponsor_chance: int) -> Optional[RoundEvent]:
+    """Revive the most recently eliminated player if a sponsor steps in"""
+    if not table.dead_count() or rng.randint(1, 100) > sponsor_chance or not table.eliminated:
+        return None
+
+    slot = table.eliminated[-1]
+    if table.alive[slot] or table.sponsored[slot]:
+        return None
+
+    table.revive(slot)
+    return RoundEvent("sponsor", revived=slot)
+
+
+def alliance_event(table: PlayerTable, rng: random.Random) -> Optional[RoundEvent]:
+    if table.alive_count < 2:
+        return None
+    return RoundEvent("alliance", players=rng.sample(table.alive_slots(), 2))
+
+
+def crate_event(table: PlayerTable, rng: random.Random) -> Optional[RoundEvent]:
+    if not table.alive_count:
+        return None
+    alive = table.alive_slots()
+    return RoundEvent("crate", players=rng.sample(alive, min(rng.randint(1, 2), len(alive))))
+
+
+def special_event(table: PlayerTable, rng: random.Random, kind: str) -> Optional[RoundEvent]:
+    """Resolve one of MIDGAME_DEADLY_EVENT_TYPES"""
+    if not table.alive_count:
+        return None
+
+    def kill(victims: List[int], outcome: str = "death") -> RoundEvent:
+        for victim in victims:
+            table.eliminate(victim)
+        return RoundEvent(kind, outcome, victims=victims)
+
+    alive = table.alive_slots()
+
+    if kind == "cannon_malfunction":
+        if rng.random() < 0.3:
+            return kill([rng.choice(alive)])
+        return RoundEvent(kind, "scare")
+
+    if kind == "toxic_fog":
+        if rng.random() >= 0.4:
+            return RoundEvent(kind, "survive")
+        if len(alive) >= 4 and rng.random() < 0.3:
+            return kill(rng.sample(alive, min(rng.randint(2, 3), len(alive) - 1)), "multi_death")
+        return kill([rng.choice(alive)])
+
+    if kind == "tracker_jackers":
+        if rng.random() < 0.35:
+            return kill([rng.choice(alive)])
+        if rng.random() < 0.6:
+            return RoundEvent(kind, "hallucination", players=[rng.choice(alive)])
+        return RoundEvent(kind, "avoid")
+
+    if kind == "arena_trap":
+        player = rng.choice(alive)
+        if rng.random() < 0.4:
+            return kill([player])
+        return RoundEvent(kind, "escape", players=[player])
+
+    if kind in ("muttation_attack", "environmental_hazard"):
+        death_chance = 0.3 if kind == "muttation_attack" else 0.35
+        if rng.random() < death_chance:
+            return kill([rng.choice(alive)])
+        return RoundEvent(kind, "survive")
+
+    if kind == "gamemaker_test":
+        test = rng.choice(["courage", "announcement", "loyalty"])
+        if test != "courage":
+            return RoundEvent(kind, test)
+        player = rng.choice(alive)
+        if rng.random() < 0.2:
+            return kill([player])
+        return RoundEvent(kind, "survive", players=[player])
+
+    return None
+
+
+def simulate_round(table: PlayerTable, rng: random.Random, round_num: int, weights: Dict[str, int],
+                   sponsor_chance: int, event_count: Optional[int] = None) -> List[RoundEvent]:
+    """Resolve one round: an optional midgame special event followed by weighted regular events.
+
+    ``weights`` are the condition-adjusted event weights and ``sponsor_chance``
+    the condition-adjusted sponsor percentage.
+    """
+    events: List[RoundEvent] = []
+    weights = condition_event_weights(weights)
+
+    if event_count is None:
+        event_count = roll_event_count(table.alive_count, rng)
+
+    # Midgame special events (not too early, not too late)
+    if round_num >= 3 and table.alive_count > 3 and rng.random() <= SPECIAL_EVENT_CHANCE:
+        event = special_event(table, rng, rng.choice(MIDGAME_DEADLY_EVENT_TYPES))
+        if event:
+            events.append(event)
+
+    for _ in range(event_count):
+        if table.alive_count <= 1:
+            break
+
+        # Adjust weights based on game state; the change sticks for the rest of the round
+        for max_alive, endgame_weights in ENDGAME_EVENT_WEIGHTS:
+            if table.alive_count <= max_alive:
+                weights.update(endgame_weights)
+                break
+
+        event_type = rng.choices(list(weights), weights=list(weights.values()))[0]
+
+        if event_type == "death":
+            event = death_event(table, rng)
+        elif event_type == "survival":
+            event = survival_event(table, rng)
+        elif event_type == "sponsor":
+            event = sponsor_event(table, rng, sponsor_chance)
+        elif event_type == "alliance":
+            event = alliance_event(table, rng)
+        elif event_type == "crate":
+            event = crate_event(table, rng)
+        else:
+            event = None
+
+        if event:
+            events.append(event)
+
+    return events
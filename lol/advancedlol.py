@@ -7,10 +7,8 @@ Simplified version with graceful error handling and optional features.
 import discord
 import asyncio
 import json
-import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any, Tuple
-from collections import defaultdict
 import logging
 
 from redbot.core import commands, Config, checks
@@ -44,6 +42,8 @@ except ImportError as e:
     HAS_COMMUNITY = False
     CommunityManager = None
 
+from .riot_client import RiotClient
+
 try:
     from .embeds import EnhancedEmbedBuilder
     HAS_EMBEDS = True
@@ -63,22 +63,6 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
-class RateLimiter:
-    """Rate limiter for Riot API requests"""
-    def __init__(self):
-        self.requests = defaultdict(list)
-        
-    def can_make_request(self, endpoint: str, limit: int, window: int) -> bool:
-        now = time.time()
-        # Clean old requests
-        self.requests[endpoint] = [req_time for req_time in self.requests[endpoint] 
-                                  if now - req_time < window]
-        return len(self.requests[endpoint]) < limit
-    
-    def add_request(self, endpoint: str):
-        self.requests[endpoint].append(time.time())
-
-
 class AdvancedLoLv2(commands.Cog):
     """Enhanced League of Legends integration with optional advanced features"""
     
@@ -114,7 +98,7 @@ class AdvancedLoLv2(commands.Cog):
         
         # Basic components
         self.session = None
-        self.rate_limiter = RateLimiter()
+        self.riot_client = None
         self.champion_data = {}
         self.live_game_tasks = {}
         
@@ -148,6 +132,7 @@ class AdvancedLoLv2(commands.Cog):
             # Initialize HTTP session if aiohttp is available
             if HAS_AIOHTTP:
                 self.session = aiohttp.ClientSession()
+                self.riot_client = RiotClient(self.session, self.regions)
                 await self.load_champion_data()
             else:
                 logger.warning("HTTP features disabled - aiohttp not installed")
@@ -187,6 +172,10 @@ class AdvancedLoLv2(commands.Cog):
             if self.lcu_client:
                 await self.lcu_client.disconnect()
             
+            # Close the community database connection
+            if self.community_manager:
+                await self.community_manager.close()
+            
             # Cancel all live game monitoring tasks
             for task in self.live_game_tasks.values():
                 if not task.done():
@@ -252,44 +241,15 @@ class AdvancedLoLv2(commands.Cog):
         return f"{self.champion_icon_base}/{champion_id}.png"
     
     async def make_riot_request(self, endpoint: str, region: str = "na1") -> Optional[Dict]:
-        """Make a rate-limited request to Riot API"""
-        if not HAS_AIOHTTP or not self.session:
+        """Make a rate-limited, cached request to Riot API"""
+        if not HAS_AIOHTTP or not self.riot_client:
             return None
             
         api_key = await self.config.riot_api_key()
         if not api_key:
             return None
         
-        # Check rate limits
-        if not self.rate_limiter.can_make_request("global", 20, 1):
-            await asyncio.sleep(1)
-        
-        if not self.rate_limiter.can_make_request(endpoint, 100, 120):
-            await asyncio.sleep(60)
-        
-        base_url = self.regions.get(region, "na1.api.riotgames.com")
-        url = f"https://{base_url}{endpoint}"
-        
-        headers = {"X-Riot-Token": api_key}
-        
-        try:
-            async with self.session.get(url, headers=headers) as resp:
-                self.rate_limiter.add_request("global")
-                self.rate_limiter.add_request(endpoint)
-                
-                if resp.status == 200:
-                    return await resp.json()
-                elif resp.status == 429:
-                    # Rate limited
-                    retry_after = int(resp.headers.get('Retry-After', 60))
-                    await asyncio.sleep(retry_after)
-                    return await self.make_riot_request(endpoint, region)
-                else:
-                    logger.warning(f"API request failed: {resp.status} for {url}")
-                    return None
-        except Exception as e:
-            logger.error(f"API request error: {e}")
-            return None
+        return await self.riot_client.request(endpoint, region, api_key)
     
     # =============================================================================
     # COMMAND GROUPS
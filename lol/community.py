@@ -7,9 +7,11 @@ Simplified version with graceful error handling and minimal dependencies.
 import sqlite3
 import asyncio
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Any
+from typing import Callable, List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
+from functools import lru_cache
 from collections import defaultdict
 import logging
 
@@ -48,9 +50,16 @@ class UserProfile:
 class AchievementManager:
     """Manages achievement definitions and checking logic"""
     
+    # Stats a checker reads besides the one named by its requirement action
+    STAT_DEPENDENCIES = {
+        "profile_linked": ("profiles_linked",),
+        "regions_explored": ("regions_used",),
+    }
+    
     def __init__(self):
         self.achievements = self._load_achievements()
         self.achievement_checkers = self._setup_achievement_checkers()
+        self.achievements_by_stat = self._index_achievements()
     
     def _load_achievements(self) -> List[Achievement]:
         """Load all achievement definitions"""
@@ -216,6 +225,39 @@ class AchievementManager:
             "aram_games_found": self._check_count_achievement,
         }
     
+    def _index_achievements(self) -> Dict[str, List[Achievement]]:
+        """Group achievements by every stat their outcome depends on"""
+        index = defaultdict(list)
+        for achievement in self.achievements:
+            req_action = achievement.requirements.get('action')
+            for stat in (req_action, *self.STAT_DEPENDENCIES.get(req_action, ())):
+                index[stat].append(achievement)
+        return dict(index)
+    
+    def get_achievements_for_action(self, action: str) -> List[Achievement]:
+        """Achievements that an action can possibly unlock"""
+        return self.achievements_by_stat.get(action, [])
+    
+    def get_stat_dependencies(self, achievements: List[Achievement]) -> set:
+        """All stat names needed to evaluate the given achievements"""
+        stats = set()
+        for achievement in achievements:
+            req_action = achievement.requirements.get('action')
+            stats.add(req_action)
+            stats.update(self.STAT_DEPENDENCIES.get(req_action, ()))
+        return stats
+    
+    def is_unlocked(self, achievement: Achievement, action: str, user_stats: Dict) -> bool:
+        """Decide whether an achievement is earned after ``action``"""
+        req_action = achievement.requirements.get('action')
+        if req_action == action:
+            # Count achievements need the threshold, the rest are instant triggers
+            if 'count' in achievement.requirements:
+                return user_stats.get(action, 0) >= achievement.requirements['count']
+            return True
+        checker = self.achievement_checkers.get(req_action)
+        return bool(checker and checker(user_stats, achievement.requirements))
+    
     def get_achievement_by_id(self, achievement_id: str) -> Optional[Achievement]:
         """Get achievement by ID"""
         return next((a for a in self.achievements if a.id == achievement_id), None)
@@ -258,120 +300,277 @@ class AchievementManager:
         return user_stats.get('consecutive_days', 0) >= requirement.get('count', 30)
 
 
+class CommunityDatabase:
+    """Long-lived SQLite connection served by a dedicated worker thread.
+
+    Every query runs on the same thread, so the connection is never shared
+    between threads and the event loop never waits on disk I/O. Each call to
+    ``run`` is committed as a single transaction.
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lol-community-db")
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Open the connection on first use (always on the worker thread)"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+        return self._conn
+    
+    def _call(self, func: Callable, args: tuple):
+        conn = self._connection()
+        try:
+            result = func(conn, *args)
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            raise
+    
+    def submit(self, func: Callable, *args) -> Future:
+        """Queue ``func(conn, *args)`` without waiting for it"""
+        return self._executor.submit(self._call, func, args)
+    
+    async def run(self, func: Callable, *args):
+        """Run ``func(conn, *args)`` on the database thread and return its result"""
+        return await asyncio.wrap_future(self.submit(func, *args))
+    
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    async def close(self):
+        """Finish queued work, close the connection and stop the worker"""
+        await asyncio.wrap_future(self._executor.submit(self._close))
+        self._executor.shutdown(wait=False)
+
+
+# Statements used on hot paths; sqlite3 keeps them compiled in its statement cache
+SQL_SELECT_PROFILE = "SELECT * FROM user_profiles WHERE discord_id = ?"
+SQL_ENSURE_PROFILE = '''
+    INSERT OR IGNORE INTO user_profiles
+    (discord_id, summoner_name, region, total_points, level, xp, created_at, last_active, achievements_count)
+    VALUES (?, '', '', 0, 1, 0, ?, ?, 0)
+'''
+SQL_TOUCH_PROFILE = "UPDATE user_profiles SET last_active = ? WHERE discord_id = ?"
+SQL_TRACK_DAILY = '''
+    INSERT INTO daily_activity (discord_id, date, commands_used) VALUES (?, ?, 1)
+    ON CONFLICT(discord_id, date) DO UPDATE SET commands_used = commands_used + 1
+'''
+SQL_SET_STAT = '''
+    INSERT OR REPLACE INTO user_stats (discord_id, stat_name, stat_value, updated_at)
+    VALUES (?, ?, ?, ?)
+'''
+SQL_SELECT_STAT = "SELECT stat_value FROM user_stats WHERE discord_id = ? AND stat_name = ?"
+SQL_SELECT_STATS = "SELECT stat_name, stat_value FROM user_stats WHERE discord_id = ?"
+SQL_BUMP_STAT = '''
+    INSERT INTO user_stats (discord_id, stat_name, stat_value, updated_at) VALUES (?, ?, '1', ?)
+    ON CONFLICT(discord_id, stat_name) DO UPDATE SET
+        stat_value = CAST(CAST(stat_value AS INTEGER) + 1 AS TEXT),
+        updated_at = excluded.updated_at
+'''
+SQL_SET_SERVER_STAT = '''
+    INSERT OR REPLACE INTO server_stats (guild_id, discord_id, stat_type, stat_value, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+'''
+SQL_SELECT_SERVER_STAT = '''
+    SELECT stat_value FROM server_stats WHERE guild_id = ? AND discord_id = ? AND stat_type = ?
+'''
+
+
+@lru_cache(maxsize=64)
+def _sql_stats_and_owned(stat_count: int, achievement_count: int) -> str:
+    """Single query returning the needed stats ('s') and already owned achievements ('a')"""
+    stat_marks = ", ".join("?" * stat_count)
+    achievement_marks = ", ".join("?" * achievement_count)
+    return f'''
+        SELECT 's', stat_name, stat_value FROM user_stats
+        WHERE discord_id = ? AND stat_name IN ({stat_marks})
+        UNION ALL
+        SELECT 'a', achievement_id, NULL FROM user_achievements
+        WHERE discord_id = ? AND achievement_id IN ({achievement_marks})
+    '''
+
+
 class CommunityManager:
     """Main community features manager - simplified version"""
     
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self.db = CommunityDatabase(db_path)
         self.achievement_manager = AchievementManager()
         self.active_challenges = {}
         self._init_database()
     
+    async def close(self):
+        """Close the database connection"""
+        await self.db.close()
+    
     def _init_database(self):
-        """Initialize community database with all necessary tables"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # User profiles table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_profiles (
-                    discord_id TEXT PRIMARY KEY,
-                    summoner_name TEXT,
-                    region TEXT,
-                    total_points INTEGER DEFAULT 0,
-                    level INTEGER DEFAULT 1,
-                    xp INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_active TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    achievements_count INTEGER DEFAULT 0,
-                    favorite_champion TEXT
-                )
-            ''')
-            
-            # User achievements table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_achievements (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    discord_id TEXT,
-                    achievement_id TEXT,
-                    earned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    progress INTEGER DEFAULT 100,
-                    FOREIGN KEY (discord_id) REFERENCES user_profiles (discord_id),
-                    UNIQUE(discord_id, achievement_id)
-                )
-            ''')
-            
-            # User statistics tracking
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_stats (
-                    discord_id TEXT,
-                    stat_name TEXT,
-                    stat_value TEXT,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    PRIMARY KEY (discord_id, stat_name),
-                    FOREIGN KEY (discord_id) REFERENCES user_profiles (discord_id)
-                )
-            ''')
-            
-            # Server leaderboards and statistics
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS server_stats (
-                    guild_id TEXT,
-                    discord_id TEXT,
-                    stat_type TEXT,
-                    stat_value REAL,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    PRIMARY KEY (guild_id, discord_id, stat_type)
-                )
-            ''')
-            
-            # Daily activity tracking
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS daily_activity (
-                    discord_id TEXT,
-                    date DATE,
-                    commands_used INTEGER DEFAULT 0,
-                    PRIMARY KEY (discord_id, date)
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
-            
+        """Queue schema creation as the first job on the database thread"""
+        future = self.db.submit(self._create_schema)
+        future.add_done_callback(self._log_schema_result)
+    
+    @staticmethod
+    def _log_schema_result(future: Future):
+        error = future.exception()
+        if error:
+            logger.error(f"Error initializing community database: {error}")
+        else:
             logger.info("Community database initialized successfully")
-            
-        except Exception as e:
-            logger.error(f"Error initializing community database: {e}")
+    
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        """Create all tables and indexes"""
+        cursor = conn.cursor()
+        
+        # User profiles table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_profiles (
+                discord_id TEXT PRIMARY KEY,
+                summoner_name TEXT,
+                region TEXT,
+                total_points INTEGER DEFAULT 0,
+                level INTEGER DEFAULT 1,
+                xp INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_active TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                achievements_count INTEGER DEFAULT 0,
+                favorite_champion TEXT
+            )
+        ''')
+        
+        # User achievements table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_achievements (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                discord_id TEXT,
+                achievement_id TEXT,
+                earned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                progress INTEGER DEFAULT 100,
+                FOREIGN KEY (discord_id) REFERENCES user_profiles (discord_id),
+                UNIQUE(discord_id, achievement_id)
+            )
+        ''')
+        
+        # User statistics tracking (primary key doubles as the (discord_id, stat_name) index)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_stats (
+                discord_id TEXT,
+                stat_name TEXT,
+                stat_value TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (discord_id, stat_name),
+                FOREIGN KEY (discord_id) REFERENCES user_profiles (discord_id)
+            )
+        ''')
+        
+        # Server leaderboards and statistics
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS server_stats (
+                guild_id TEXT,
+                discord_id TEXT,
+                stat_type TEXT,
+                stat_value REAL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (guild_id, discord_id, stat_type)
+            )
+        ''')
+        
+        # Daily activity tracking
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_activity (
+                discord_id TEXT,
+                date DATE,
+                commands_used INTEGER DEFAULT 0,
+                PRIMARY KEY (discord_id, date)
+            )
+        ''')
+        
+        # Leaderboard indexes
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_server_stats_board
+            ON server_stats (guild_id, stat_type, stat_value DESC)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_server_stats_member
+            ON server_stats (discord_id)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_user_profiles_points
+            ON user_profiles (total_points DESC, level DESC)
+        ''')
+    
+    @staticmethod
+    def _parse_stat_value(stat_value: str) -> Any:
+        """Convert a stored stat string back to its natural type"""
+        try:
+            if stat_value.isdigit():
+                return int(stat_value)
+            elif stat_value.replace('.', '').isdigit():
+                return float(stat_value)
+            elif stat_value.startswith('{') or stat_value.startswith('['):
+                return json.loads(stat_value)
+            return stat_value
+        except:
+            return stat_value
+    
+    @staticmethod
+    def _row_to_profile(result: tuple) -> UserProfile:
+        return UserProfile(
+            discord_id=result[0],
+            summoner_name=result[1] or "",
+            region=result[2] or "",
+            total_points=result[3],
+            level=result[4],
+            xp=result[5],
+            created_at=datetime.fromisoformat(result[6]) if result[6] else datetime.now(),
+            last_active=datetime.fromisoformat(result[7]) if result[7] else datetime.now(),
+            achievements_count=result[8],
+            favorite_champion=result[9]
+        )
+    
+    # -- Synchronous helpers, only ever called on the database thread --
+    
+    @staticmethod
+    def _ensure_profile(conn: sqlite3.Connection, discord_id: str):
+        now = datetime.now().isoformat()
+        conn.execute(SQL_ENSURE_PROFILE, (discord_id, now, now))
+    
+    @staticmethod
+    def _touch_activity(conn: sqlite3.Connection, discord_id: str):
+        now = datetime.now()
+        conn.execute(SQL_TOUCH_PROFILE, (now.isoformat(), discord_id))
+        conn.execute(SQL_TRACK_DAILY, (discord_id, now.date().isoformat()))
+    
+    @staticmethod
+    def _increment_stat(conn: sqlite3.Connection, discord_id: str, stat_name: str, increment: int) -> int:
+        result = conn.execute(SQL_SELECT_STAT, (discord_id, stat_name)).fetchone()
+        new_value = (int(result[0]) if result else 0) + increment
+        conn.execute(SQL_SET_STAT, (discord_id, stat_name, str(new_value), datetime.now().isoformat()))
+        return new_value
+    
+    def _fetch_stats(self, conn: sqlite3.Connection, discord_id: str) -> Dict[str, Any]:
+        return {
+            stat_name: self._parse_stat_value(stat_value)
+            for stat_name, stat_value in conn.execute(SQL_SELECT_STATS, (discord_id,))
+        }
+    
+    # -- Public async API --
     
     async def get_user_profile(self, discord_id: str) -> Optional[UserProfile]:
         """Get user community profile"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                "SELECT * FROM user_profiles WHERE discord_id = ?",
-                (discord_id,)
+            result = await self.db.run(
+                lambda conn: conn.execute(SQL_SELECT_PROFILE, (discord_id,)).fetchone()
             )
-            result = cursor.fetchone()
-            conn.close()
-            
-            if result:
-                return UserProfile(
-                    discord_id=result[0],
-                    summoner_name=result[1] or "",
-                    region=result[2] or "",
-                    total_points=result[3],
-                    level=result[4],
-                    xp=result[5],
-                    created_at=datetime.fromisoformat(result[6]) if result[6] else datetime.now(),
-                    last_active=datetime.fromisoformat(result[7]) if result[7] else datetime.now(),
-                    achievements_count=result[8],
-                    favorite_champion=result[9]
-                )
-            
-            return None
+            return self._row_to_profile(result) if result else None
             
         except Exception as e:
             logger.error(f"Error getting user profile: {e}")
@@ -379,21 +578,18 @@ class CommunityManager:
     
     async def create_user_profile(self, discord_id: str, summoner_name: str = "", region: str = "") -> Optional[UserProfile]:
         """Create new user profile"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
+        def _create(conn):
             now = datetime.now().isoformat()
-            cursor.execute('''
+            conn.execute('''
                 INSERT OR REPLACE INTO user_profiles 
                 (discord_id, summoner_name, region, total_points, level, xp, created_at, last_active, achievements_count)
                 VALUES (?, ?, ?, 0, 1, 0, ?, ?, 0)
             ''', (discord_id, summoner_name, region, now, now))
-            
-            conn.commit()
-            conn.close()
-            
-            return await self.get_user_profile(discord_id)
+            return conn.execute(SQL_SELECT_PROFILE, (discord_id,)).fetchone()
+        
+        try:
+            result = await self.db.run(_create)
+            return self._row_to_profile(result) if result else None
             
         except Exception as e:
             logger.error(f"Error creating user profile: {e}")
@@ -402,69 +598,29 @@ class CommunityManager:
     async def update_user_activity(self, discord_id: str):
         """Update user's last activity timestamp"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            now = datetime.now()
-            cursor.execute(
-                "UPDATE user_profiles SET last_active = ? WHERE discord_id = ?",
-                (now.isoformat(), discord_id)
-            )
-            
-            # Track daily activity
-            today = now.date()
-            cursor.execute('''
-                INSERT OR REPLACE INTO daily_activity (discord_id, date, commands_used)
-                VALUES (?, ?, COALESCE((SELECT commands_used FROM daily_activity WHERE discord_id = ? AND date = ?), 0) + 1)
-            ''', (discord_id, today, discord_id, today))
-            
-            conn.commit()
-            conn.close()
-            
+            await self.db.run(self._touch_activity, discord_id)
         except Exception as e:
             logger.error(f"Error updating user activity: {e}")
     
     async def update_user_stat(self, discord_id: str, stat_name: str, value: Any):
         """Update user statistic"""
+        def _update(conn):
+            self._ensure_profile(conn, discord_id)
+            conn.execute(SQL_SET_STAT, (discord_id, stat_name, str(value), datetime.now().isoformat()))
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Ensure user profile exists
-            await self.get_or_create_user_profile(discord_id)
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO user_stats (discord_id, stat_name, stat_value, updated_at)
-                VALUES (?, ?, ?, ?)
-            ''', (discord_id, stat_name, str(value), datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
-            
+            await self.db.run(_update)
         except Exception as e:
             logger.error(f"Error updating user stat: {e}")
     
     async def increment_user_stat(self, discord_id: str, stat_name: str, increment: int = 1):
         """Increment a user statistic"""
+        def _increment(conn):
+            self._ensure_profile(conn, discord_id)
+            return self._increment_stat(conn, discord_id, stat_name, increment)
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get current value
-            cursor.execute(
-                "SELECT stat_value FROM user_stats WHERE discord_id = ? AND stat_name = ?",
-                (discord_id, stat_name)
-            )
-            result = cursor.fetchone()
-            current_value = int(result[0]) if result else 0
-            
-            # Update with incremented value
-            new_value = current_value + increment
-            await self.update_user_stat(discord_id, stat_name, new_value)
-            
-            conn.close()
-            return new_value
-            
+            return await self.db.run(_increment)
         except Exception as e:
             logger.error(f"Error incrementing user stat: {e}")
             return 0
@@ -472,33 +628,7 @@ class CommunityManager:
     async def get_user_stats(self, discord_id: str) -> Dict[str, Any]:
         """Get all user statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                "SELECT stat_name, stat_value FROM user_stats WHERE discord_id = ?",
-                (discord_id,)
-            )
-            results = cursor.fetchall()
-            conn.close()
-            
-            stats = {}
-            for stat_name, stat_value in results:
-                try:
-                    # Try to convert to appropriate type
-                    if stat_value.isdigit():
-                        stats[stat_name] = int(stat_value)
-                    elif stat_value.replace('.', '').isdigit():
-                        stats[stat_name] = float(stat_value)
-                    elif stat_value.startswith('{') or stat_value.startswith('['):
-                        stats[stat_name] = json.loads(stat_value)
-                    else:
-                        stats[stat_name] = stat_value
-                except:
-                    stats[stat_name] = stat_value
-            
-            return stats
-            
+            return await self.db.run(self._fetch_stats, discord_id)
         except Exception as e:
             logger.error(f"Error getting user stats: {e}")
             return {}
@@ -513,86 +643,64 @@ class CommunityManager:
     async def check_achievements(self, discord_id: str, action: str, data: Dict = None) -> List[Achievement]:
         """Check and award achievements for user actions"""
         try:
-            earned_achievements = []
-            
-            # Ensure user profile exists
-            await self.get_or_create_user_profile(discord_id)
-            await self.update_user_activity(discord_id)
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get user's current achievements
-            cursor.execute(
-                "SELECT achievement_id FROM user_achievements WHERE discord_id = ?",
-                (discord_id,)
-            )
-            current_achievements = {row[0] for row in cursor.fetchall()}
-            
-            # Get user statistics for checking
-            user_stats = await self.get_user_stats(discord_id)
-            
-            # Update the specific action stat
-            if action:
-                new_count = await self.increment_user_stat(discord_id, action, 1)
-                user_stats[action] = new_count
-            
-            # Check each achievement
-            for achievement in self.achievement_manager.achievements:
-                if achievement.id in current_achievements:
-                    continue
-                
-                should_award = False
-                
-                # Handle different achievement types
-                req_action = achievement.requirements.get('action')
-                if req_action == action:
-                    # Check if this action triggers the achievement
-                    if 'count' in achievement.requirements:
-                        should_award = user_stats.get(action, 0) >= achievement.requirements['count']
-                    else:
-                        should_award = True
-                elif req_action in self.achievement_manager.achievement_checkers:
-                    # Use custom checker
-                    checker = self.achievement_manager.achievement_checkers[req_action]
-                    should_award = checker(user_stats, achievement.requirements)
-                
-                # Special handling for specific achievements
-                if achievement.id == "challenger_found" and action == "challenger_found":
-                    should_award = True
-                elif achievement.id == "pentakill_found" and action == "pentakill_found":
-                    should_award = True
-                
-                if should_award:
-                    # Award the achievement
-                    cursor.execute('''
-                        INSERT INTO user_achievements (discord_id, achievement_id, earned_at)
-                        VALUES (?, ?, ?)
-                    ''', (discord_id, achievement.id, datetime.now().isoformat()))
-                    
-                    # Update user points and achievement count
-                    cursor.execute('''
-                        UPDATE user_profiles 
-                        SET total_points = total_points + ?, achievements_count = achievements_count + 1
-                        WHERE discord_id = ?
-                    ''', (achievement.points, discord_id))
-                    
-                    # Check for level up
-                    await self._check_level_up(discord_id, cursor)
-                    
-                    earned_achievements.append(achievement)
-                    logger.info(f"User {discord_id} earned achievement: {achievement.name}")
-            
-            conn.commit()
-            conn.close()
-            
-            return earned_achievements
-            
+            return await self.db.run(self._check_achievements_sync, discord_id, action)
         except Exception as e:
             logger.error(f"Error checking achievements: {e}")
             return []
     
-    async def _check_level_up(self, discord_id: str, cursor):
+    def _check_achievements_sync(self, conn: sqlite3.Connection, discord_id: str, action: str) -> List[Achievement]:
+        """Record the action and grant newly earned achievements in one transaction"""
+        self._ensure_profile(conn, discord_id)
+        self._touch_activity(conn, discord_id)
+        if action:
+            conn.execute(SQL_BUMP_STAT, (discord_id, action, datetime.now().isoformat()))
+        
+        # Only achievements that depend on this action can change state
+        candidates = self.achievement_manager.get_achievements_for_action(action)
+        if not candidates:
+            return []
+        
+        stat_names = sorted(self.achievement_manager.get_stat_dependencies(candidates))
+        candidate_ids = [a.id for a in candidates]
+        rows = conn.execute(
+            _sql_stats_and_owned(len(stat_names), len(candidate_ids)),
+            (discord_id, *stat_names, discord_id, *candidate_ids)
+        ).fetchall()
+        
+        user_stats = {}
+        owned = set()
+        for kind, name, value in rows:
+            if kind == "s":
+                user_stats[name] = self._parse_stat_value(value)
+            else:
+                owned.add(name)
+        
+        earned_achievements = [
+            achievement for achievement in candidates
+            if achievement.id not in owned
+            and self.achievement_manager.is_unlocked(achievement, action, user_stats)
+        ]
+        if not earned_achievements:
+            return []
+        
+        now = datetime.now().isoformat()
+        conn.executemany(
+            "INSERT OR IGNORE INTO user_achievements (discord_id, achievement_id, earned_at) VALUES (?, ?, ?)",
+            [(discord_id, achievement.id, now) for achievement in earned_achievements]
+        )
+        cursor = conn.execute('''
+            UPDATE user_profiles 
+            SET total_points = total_points + ?, achievements_count = achievements_count + ?
+            WHERE discord_id = ?
+        ''', (sum(a.points for a in earned_achievements), len(earned_achievements), discord_id))
+        self._check_level_up(discord_id, cursor)
+        
+        for achievement in earned_achievements:
+            logger.info(f"User {discord_id} earned achievement: {achievement.name}")
+        
+        return earned_achievements
+    
+    def _check_level_up(self, discord_id: str, cursor):
         """Check if user should level up based on points"""
         try:
             cursor.execute(
@@ -627,16 +735,10 @@ class CommunityManager:
     async def get_user_achievements(self, discord_id: str) -> List[Tuple[Achievement, datetime]]:
         """Get user's earned achievements with timestamps"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            results = await self.db.run(lambda conn: conn.execute('''
                 SELECT achievement_id, earned_at FROM user_achievements 
                 WHERE discord_id = ? ORDER BY earned_at DESC
-            ''', (discord_id,))
-            
-            results = cursor.fetchall()
-            conn.close()
+            ''', (discord_id,)).fetchall())
             
             achievements = []
             for achievement_id, earned_at in results:
@@ -653,13 +755,10 @@ class CommunityManager:
     
     async def get_server_leaderboard(self, guild_id: str, stat_type: str, limit: int = 10) -> List[Tuple]:
         """Get server leaderboard for specific stat"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
+        def _query(conn):
             if stat_type == "total_points":
                 # Special handling for total points
-                cursor.execute('''
+                return conn.execute('''
                     SELECT up.discord_id, up.summoner_name, up.total_points, up.level, up.achievements_count
                     FROM user_profiles up
                     WHERE up.discord_id IN (
@@ -667,23 +766,19 @@ class CommunityManager:
                     )
                     ORDER BY up.total_points DESC, up.level DESC
                     LIMIT ?
-                ''', (guild_id, limit))
-            else:
-                # Regular server stats
-                cursor.execute('''
-                    SELECT ss.discord_id, up.summoner_name, ss.stat_value, up.total_points, up.level
-                    FROM server_stats ss
-                    JOIN user_profiles up ON ss.discord_id = up.discord_id
-                    WHERE ss.guild_id = ? AND ss.stat_type = ?
-                    ORDER BY ss.stat_value DESC
-                    LIMIT ?
-                ''', (guild_id, stat_type, limit))
-            
-            results = cursor.fetchall()
-            conn.close()
-            
-            return results
-            
+                ''', (guild_id, limit)).fetchall()
+            # Regular server stats
+            return conn.execute('''
+                SELECT ss.discord_id, up.summoner_name, ss.stat_value, up.total_points, up.level
+                FROM server_stats ss
+                JOIN user_profiles up ON ss.discord_id = up.discord_id
+                WHERE ss.guild_id = ? AND ss.stat_type = ?
+                ORDER BY ss.stat_value DESC
+                LIMIT ?
+            ''', (guild_id, stat_type, limit)).fetchall()
+        
+        try:
+            return await self.db.run(_query)
         except Exception as e:
             logger.error(f"Error getting server leaderboard: {e}")
             return []
@@ -691,41 +786,26 @@ class CommunityManager:
     async def update_server_stat(self, guild_id: str, discord_id: str, stat_type: str, value: float):
         """Update server-specific user statistic"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO server_stats (guild_id, discord_id, stat_type, stat_value, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (guild_id, discord_id, stat_type, value, datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
-            
+            await self.db.run(lambda conn: conn.execute(
+                SQL_SET_SERVER_STAT,
+                (guild_id, discord_id, stat_type, value, datetime.now().isoformat())
+            ))
         except Exception as e:
             logger.error(f"Error updating server stat: {e}")
     
     async def increment_server_stat(self, guild_id: str, discord_id: str, stat_type: str, increment: float = 1.0):
         """Increment server-specific statistic"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get current value
-            cursor.execute(
-                "SELECT stat_value FROM server_stats WHERE guild_id = ? AND discord_id = ? AND stat_type = ?",
-                (guild_id, discord_id, stat_type)
+        def _increment(conn):
+            result = conn.execute(SQL_SELECT_SERVER_STAT, (guild_id, discord_id, stat_type)).fetchone()
+            new_value = (result[0] if result else 0.0) + increment
+            conn.execute(
+                SQL_SET_SERVER_STAT,
+                (guild_id, discord_id, stat_type, new_value, datetime.now().isoformat())
             )
-            result = cursor.fetchone()
-            current_value = result[0] if result else 0.0
-            
-            # Update with incremented value
-            new_value = current_value + increment
-            await self.update_server_stat(guild_id, discord_id, stat_type, new_value)
-            
-            conn.close()
             return new_value
-            
+        
+        try:
+            return await self.db.run(_increment)
         except Exception as e:
             logger.error(f"Error incrementing server stat: {e}")
             return 0.0
@@ -0,0 +1,271 @@
+"""
+Riot API client for Advanced LoL Cog
+
+Rate limiting uses token buckets per region (application limits) and per
+region + method (method limits), sized from the ``X-App-Rate-Limit`` and
+``X-Method-Rate-Limit`` headers Riot returns. Identical concurrent lookups
+share one HTTP call, and summoner/ranked/mastery responses are kept in a
+short TTL cache.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+# Riot's documented development-key limits, used until the first response tells us the real ones
+DEFAULT_APP_LIMITS = "20:1,100:120"
+
+# Seconds to keep successful responses, keyed by method prefix (0 = never cache)
+CACHE_TTLS = {
+    "/riot/account/v1/accounts": 600,
+    "/lol/summoner/v4/summoners": 600,
+    "/lol/league/v4/entries": 120,
+    "/lol/champion-mastery/v4/champion-masteries": 600,
+    "/lol/spectator/v5/active-games": 0,
+}
+
+MAX_RETRIES = 3
+MAX_CACHE_ENTRIES = 2048
+
+
+def parse_rate_limits(header: Optional[str]) -> List[Tuple[int, int]]:
+    """Parse a Riot rate limit header like ``"20:1,100:120"`` into (limit, window) pairs"""
+    limits = []
+    if not header:
+        return limits
+    for part in header.split(","):
+        try:
+            limit, window = part.split(":")
+            limits.append((int(limit), int(window)))
+        except ValueError:
+            continue
+    return limits
+
+
+def method_key(endpoint: str) -> str:
+    """Collapse an endpoint to its Riot method, dropping path parameters and query"""
+    path = endpoint.split("?", 1)[0]
+    return "/".join(path.split("/")[:6])
+
+
+class TokenBucket:
+    """Token bucket holding ``limit`` tokens that refill over ``window`` seconds"""
+
+    def __init__(self, limit: int, window: int):
+        self.limit = limit
+        self.window = window
+        self.tokens = float(limit)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        rate = self.limit / self.window
+        self.tokens = min(self.limit, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until one token is available"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) * self.window / self.limit
+
+    def consume(self):
+        self.tokens -= 1
+
+    def sync(self, used: int):
+        """Align with the server's own count for the current window"""
+        self.tokens = min(self.tokens, float(max(self.limit - used, 0)))
+
+
+class RateLimit:
+    """All buckets of one Riot limit scope (an application or a method in a region)"""
+
+    def __init__(self, header: Optional[str] = None):
+        self.buckets: List[TokenBucket] = []
+        self.header = None
+        self.blocked_until = 0.0
+        if header:
+            self.update(header)
+
+    def update(self, header: Optional[str], count_header: Optional[str] = None):
+        """Resize buckets from a limit header and sync them with its count header"""
+        if header and header != self.header:
+            self.header = header
+            self.buckets = [TokenBucket(limit, window) for limit, window in parse_rate_limits(header)]
+
+        if count_header:
+            counts = {window: used for used, window in parse_rate_limits(count_header)}
+            for bucket in self.buckets:
+                if bucket.window in counts:
+                    bucket.sync(counts[bucket.window])
+
+    def block(self, seconds: float):
+        """Stop issuing requests for ``seconds`` (after a 429)"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def delay(self, now: float) -> float:
+        wait = max(self.blocked_until - now, 0.0)
+        for bucket in self.buckets:
+            wait = max(wait, bucket.delay(now))
+        return wait
+
+    def consume(self):
+        for bucket in self.buckets:
+            bucket.consume()
+
+
+class RiotClient:
+    """Rate-limited, coalescing and caching Riot API client"""
+
+    def __init__(
+        self,
+        session,
+        regions: Dict[str, str],
+        default_region: str = "na1.api.riotgames.com",
+        scheme: str = "https",
+    ):
+        self.session = session
+        self.regions = regions
+        self.default_region = default_region
+        self.scheme = scheme
+        self.app_limits: Dict[str, RateLimit] = {}
+        self.method_limits: Dict[Tuple[str, str], RateLimit] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+
+    def _host(self, region: str) -> str:
+        return self.regions.get(region, self.default_region)
+
+    def _limits_for(self, host: str, method: str) -> Tuple[RateLimit, RateLimit]:
+        app = self.app_limits.get(host)
+        if app is None:
+            app = self.app_limits[host] = RateLimit(DEFAULT_APP_LIMITS)
+        key = (host, method)
+        meth = self.method_limits.get(key)
+        if meth is None:
+            meth = self.method_limits[key] = RateLimit()
+        return app, meth
+
+    def _cache_ttl(self, method: str) -> int:
+        for prefix, ttl in CACHE_TTLS.items():
+            if method.startswith(prefix):
+                return ttl
+        return 0
+
+    def _cache_get(self, key: Tuple[str, str]) -> Any:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, data = entry
+        if expires < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return data
+
+    def _cache_put(self, key: Tuple[str, str], data: Any, ttl: int):
+        self._cache[key] = (time.monotonic() + ttl, data)
+        self._cache.move_to_end(key)
+        while len(self._cache) > MAX_CACHE_ENTRIES:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    async def request(self, endpoint: str, region: str, api_key: str) -> Optional[Dict]:
+        """GET an endpoint, sharing in-flight calls and cached results"""
+        host = self._host(region)
+        key = (host, endpoint)
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            # No caller owns the fetch, so one caller being cancelled can't cancel it for the rest
+            task = asyncio.create_task(self._fetch_and_cache(key, host, endpoint, api_key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._fetch_done(key, t))
+        return await asyncio.shield(task)
+
+    async def _fetch_and_cache(self, key: Tuple[str, str], host: str, endpoint: str, api_key: str) -> Optional[Dict]:
+        data = await self._fetch(host, endpoint, api_key)
+        ttl = self._cache_ttl(method_key(endpoint))
+        if data is not None and ttl:
+            self._cache_put(key, data, ttl)
+        return data
+
+    def _fetch_done(self, key: Tuple[str, str], task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark failures as retrieved, in case every waiter was cancelled before it finished
+        if not task.cancelled():
+            task.exception()
+
+    async def _acquire(self, app: RateLimit, meth: RateLimit):
+        """Wait until both the application and method buckets have a token"""
+        while True:
+            now = time.monotonic()
+            wait = max(app.delay(now), meth.delay(now))
+            if wait <= 0:
+                app.consume()
+                meth.consume()
+                return
+            await asyncio.sleep(wait)
+
+    async def _fetch(self, host: str, endpoint: str, api_key: str) -> Optional[Dict]:
+        method = method_key(endpoint)
+        app, meth = self._limits_for(host, method)
+        url = f"{self.scheme}://{host}{endpoint}"
+        headers = {"X-Riot-Token": api_key}
+
+        for attempt in range(MAX_RETRIES + 1):
+            await self._acquire(app, meth)
+            try:
+                async with self.session.get(url, headers=headers) as resp:
+                    app.update(resp.headers.get("X-App-Rate-Limit"), resp.headers.get("X-App-Rate-Limit-Count"))
+                    meth.update(resp.headers.get("X-Method-Rate-Limit"), resp.headers.get("X-Method-Rate-Limit-Count"))
+
+                    if resp.status == 200:
+                        return await resp.json()
+
+                    if resp.status == 429:
+                        retry_after = float(resp.headers.get("Retry-After", 1))
+                        # Riot omits the type header when the 429 comes from the underlying service
+                        scope = resp.headers.get("X-Rate-Limit-Type", "service")
+                        logger.warning(f"Rate limited ({scope}) on {method}, retrying in {retry_after}s")
+                        if scope == "application":
+                            app.block(retry_after)
+                        elif scope == "method":
+                            meth.block(retry_after)
+                        else:
+                            # Service limits aren't our quota: back off only this request
+                            await asyncio.sleep(retry_after)
+                        continue
+
+                    if resp.status >= 500 and attempt < MAX_RETRIES:
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+
+                    logger.warning(f"API request failed: {resp.status} for {url}")
+                    return None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"API request error: {e}")
+                return None
+
+        logger.warning(f"Giving up on {url} after {MAX_RETRIES} retries")
+        return None
@@ -0,0 +1,199 @@
+"""RiotClient against a local fake Riot server (aiohttp.test_utils).
+
+The fake server answers every GET with JSON and Riot's rate-limit headers,
+and can be scripted to return 429s, so pacing, back-off and coalescing are
+checked end to end without a real API key.
+
+Run with ``python -m pytest lol/tests``.
+"""
+
+import asyncio
+import importlib.util
+import time
+from pathlib import Path
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# Load the module on its own: the cog package imports Red, which tests don't need
+_spec = importlib.util.spec_from_file_location("riot_client", Path(__file__).parents[1] / "riot_client.py")
+riot_client = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(riot_client)
+RiotClient = riot_client.RiotClient
+
+SUMMONER = "/lol/summoner/v4/summoners/by-puuid/"
+LEAGUE = "/lol/league/v4/entries/by-puuid/"
+
+
+class FakeRiot:
+    """Fake Riot API recording every hit; ``script`` maps a path to queued (status, headers) replies"""
+
+    def __init__(self, app_limit="100:1", method_limit="100:1", delay=0.0):
+        self.app_limit = app_limit
+        self.method_limit = method_limit
+        self.delay = delay
+        self.script = {}
+        self.hits = []  # (path, monotonic time)
+
+    async def handle(self, request):
+        path = request.path
+        self.hits.append((path, time.monotonic()))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        headers = {
+            "X-App-Rate-Limit": self.app_limit,
+            "X-Method-Rate-Limit": self.method_limit,
+        }
+        queued = self.script.get(path)
+        if queued:
+            status, extra = queued.pop(0)
+            headers.update(extra)
+            return web.json_response({"status": {"status_code": status}}, status=status, headers=headers)
+
+        used = sum(1 for p, _ in self.hits if p.startswith(path.rsplit("/", 1)[0]))
+        headers["X-App-Rate-Limit-Count"] = f"{len(self.hits)}:1"
+        headers["X-Method-Rate-Limit-Count"] = f"{used}:1"
+        return web.json_response({"path": path}, headers=headers)
+
+    def hits_for(self, path):
+        return [t for p, t in self.hits if p == path]
+
+
+async def _with_client(fake, body):
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", fake.handle)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            client = RiotClient(session, {"test": f"{server.host}:{server.port}"}, scheme="http")
+            return await body(client)
+    finally:
+        await server.close()
+
+
+def run(fake, body):
+    return asyncio.run(_with_client(fake, body))
+
+
+def test_concurrent_identical_requests_share_one_call():
+    fake = FakeRiot(delay=0.1)
+
+    async def body(client):
+        return await asyncio.gather(*(client.request(SUMMONER + "abc", "test", "key") for _ in range(5)))
+
+    results = run(fake, body)
+    assert results == [{"path": SUMMONER + "abc"}] * 5
+    assert len(fake.hits_for(SUMMONER + "abc")) == 1
+
+
+def test_cancelling_one_waiter_does_not_cancel_the_others():
+    fake = FakeRiot(delay=0.2)
+
+    async def body(client):
+        first = asyncio.create_task(client.request(SUMMONER + "abc", "test", "key"))
+        second = asyncio.create_task(client.request(SUMMONER + "abc", "test", "key"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        result = await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return result
+
+    assert run(fake, body) == {"path": SUMMONER + "abc"}
+    assert len(fake.hits_for(SUMMONER + "abc")) == 1
+
+
+def test_successful_responses_are_cached():
+    fake = FakeRiot()
+
+    async def body(client):
+        await client.request(SUMMONER + "abc", "test", "key")
+        return await client.request(SUMMONER + "abc", "test", "key")
+
+    assert run(fake, body) == {"path": SUMMONER + "abc"}
+    assert len(fake.hits_for(SUMMONER + "abc")) == 1
+
+
+def test_requests_are_paced_to_the_method_limit():
+    # 5 per second: after the burst, the remaining requests are spaced out
+    fake = FakeRiot(method_limit="5:1")
+
+    async def body(client):
+        await client.request(SUMMONER + "0", "test", "key")
+        await asyncio.gather(*(client.request(SUMMONER + str(i), "test", "key") for i in range(1, 10)))
+
+    run(fake, body)
+    times = sorted(t for _, t in fake.hits)
+    assert len(times) == 10
+    assert times[-1] - times[0] >= 0.9
+
+
+def test_application_429_blocks_every_method():
+    fake = FakeRiot()
+    fake.script[SUMMONER + "abc"] = [(429, {"Retry-After": "1", "X-Rate-Limit-Type": "application"})]
+
+    async def body(client):
+        first = asyncio.create_task(client.request(SUMMONER + "abc", "test", "key"))
+        await asyncio.sleep(0.1)
+        other = await client.request(LEAGUE + "abc", "test", "key")
+        return await first, other
+
+    summoner, league = run(fake, body)
+    assert summoner == {"path": SUMMONER + "abc"}
+    assert league == {"path": LEAGUE + "abc"}
+    throttled, retried = fake.hits_for(SUMMONER + "abc")
+    assert retried - throttled >= 0.95
+    assert fake.hits_for(LEAGUE + "abc")[0] - throttled >= 0.95
+
+
+def test_method_429_blocks_only_that_method():
+    fake = FakeRiot()
+    fake.script[SUMMONER + "abc"] = [(429, {"Retry-After": "1", "X-Rate-Limit-Type": "method"})]
+
+    async def body(client):
+        first = asyncio.create_task(client.request(SUMMONER + "abc", "test", "key"))
+        await asyncio.sleep(0.1)
+        await client.request(LEAGUE + "abc", "test", "key")
+        await client.request(SUMMONER + "def", "test", "key")
+        return await first
+
+    assert run(fake, body) == {"path": SUMMONER + "abc"}
+    throttled, retried = fake.hits_for(SUMMONER + "abc")
+    assert retried - throttled >= 0.95
+    assert fake.hits_for(LEAGUE + "abc")[0] - throttled < 0.5
+    assert fake.hits_for(SUMMONER + "def")[0] - throttled >= 0.95
+
+
+def test_service_429_retries_only_the_affected_request():
+    fake = FakeRiot()
+    # No X-Rate-Limit-Type header: Riot's marker for a service-level 429
+    fake.script[SUMMONER + "abc"] = [(429, {"Retry-After": "1"})]
+
+    async def body(client):
+        first = asyncio.create_task(client.request(SUMMONER + "abc", "test", "key"))
+        await asyncio.sleep(0.1)
+        await client.request(SUMMONER + "def", "test", "key")
+        await client.request(LEAGUE + "abc", "test", "key")
+        return await first
+
+    assert run(fake, body) == {"path": SUMMONER + "abc"}
+    throttled, retried = fake.hits_for(SUMMONER + "abc")
+    assert retried - throttled >= 0.95
+    assert fake.hits_for(SUMMONER + "def")[0] - throttled < 0.5
+    assert fake.hits_for(LEAGUE + "abc")[0] - throttled < 0.5
+
+
+def test_429s_give_up_after_max_retries():
+    fake = FakeRiot()
+    fake.script[SUMMONER + "abc"] = [(429, {"Retry-After": "0"})] * (riot_client.MAX_RETRIES + 1)
+
+    async def body(client):
+        return await client.request(SUMMONER + "abc", "test", "key")
+
+    assert run(fake, body) is None
+    assert len(fake.hits_for(SUMMONER + "abc")) == riot_client.MAX_RETRIES + 1
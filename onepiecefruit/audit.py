@@ -0,0 +1,220 @@
+"""Append-only, guild-partitioned audit store for the OnePieceFruit cog.
+
+Each guild's entries are appended in time order to JSONL segments under
+``audit/<guild_id>/``. A segment is closed once it passes SEGMENT_MAX_BYTES
+or spans SEGMENT_MAX_AGE, and only the newest MAX_SEGMENTS are kept. Every
+segment indexes its lines by member (actor or target), so "last N" — for the
+guild or for one member — reads just those lines from the tail.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import typing as t
+from datetime import datetime
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+from .models import AuditEntry
+
+log = logging.getLogger("red.onepiecefruit.audit")
+
+SEGMENT_MAX_BYTES = 256 * 1024
+SEGMENT_MAX_AGE = 30 * 24 * 60 * 60
+MAX_SEGMENTS = 20
+
+
+def _timestamp(entry: AuditEntry) -> float:
+    return datetime.fromisoformat(entry.timestamp).timestamp()
+
+
+class _Segment:
+    __slots__ = ("path", "offsets", "members", "first_ts", "size", "torn")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.offsets: list[int] = []               # byte offset of each line
+        self.members: dict[int, list[int]] = {}    # actor/target id → line numbers
+        self.first_ts: t.Optional[float] = None
+        self.size = 0
+        self.torn = False                          # ends mid-line; never appended to again
+
+    def add(self, entry: AuditEntry, length: int) -> None:
+        # Parsed first, so a bad timestamp leaves the index untouched
+        first_ts = _timestamp(entry) if self.first_ts is None else self.first_ts
+        line = len(self.offsets)
+        self.offsets.append(self.size)
+        self.members.setdefault(entry.actor_id, []).append(line)
+        if entry.target_id is not None and entry.target_id != entry.actor_id:
+            self.members.setdefault(entry.target_id, []).append(line)
+        self.first_ts = first_ts
+        self.size += length
+
+    @classmethod
+    def load(cls, path: Path) -> "_Segment":
+        segment = cls(path)
+        corrupt = 0
+        with open(path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    segment.torn = True
+                    break
+                try:
+                    segment.add(AuditEntry.model_validate_json(raw), len(raw))
+                except ValueError:
+                    # Skipped, but still counted so later offsets stay right
+                    segment.size += len(raw)
+                    corrupt += 1
+        if corrupt:
+            log.warning("OnePieceFruit: skipped %d corrupt line(s) in %s.", corrupt, path)
+        return segment
+
+    def read(self, lines: t.Iterable[int]) -> list[AuditEntry]:
+        entries = []
+        with open(self.path, "rb") as f:
+            for line in lines:
+                f.seek(self.offsets[line])
+                entries.append(AuditEntry.model_validate_json(f.readline()))
+        return entries
+
+
+class AuditStore:
+    """Audit entries per guild, newest last, with a member index."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._guilds: dict[int, list[_Segment]] = {}
+        self._files: dict[int, t.BinaryIO] = {}
+        self._counters: dict[int, int] = {}  # next segment number per guild
+
+    async def load(self, legacy: t.Optional[Path] = None) -> None:
+        """Create the store, importing a legacy ``audit.json`` list if one is given and exists."""
+        self._path.mkdir(parents=True, exist_ok=True)
+        if legacy is None or not legacy.exists():
+            return
+        try:
+            entries = await asyncio.to_thread(
+                lambda: TypeAdapter(list[AuditEntry]).validate_json(legacy.read_bytes())
+            )
+        except Exception as exc:
+            log.error("OnePieceFruit: failed to read legacy audit log; leaving it in place.", exc_info=exc)
+            return
+        for entry in sorted(entries, key=lambda e: e.timestamp):
+            self.append(entry)
+        os.replace(legacy, legacy.with_suffix(".json.migrated"))
+        log.info("OnePieceFruit: moved %d audit entries to the audit store.", len(entries))
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    # -----------------------------------------------------------------------
+    # Guild partitions
+    # -----------------------------------------------------------------------
+    def _guild_dir(self, guild_id: int) -> Path:
+        return self._path / str(guild_id)
+
+    def _load_guild(self, guild_id: int) -> tuple[list[_Segment], int]:
+        """Index a guild's segments; returns them and the next segment number."""
+        directory = self._guild_dir(guild_id)
+        paths = sorted(directory.glob("segment-*.jsonl")) if directory.exists() else []
+        segments = [_Segment.load(path) for path in paths]
+        return segments, int(paths[-1].stem.split("-")[1]) + 1 if paths else 0
+
+    def _adopt(self, guild_id: int, loaded: tuple[list[_Segment], int]) -> list[_Segment]:
+        if guild_id not in self._guilds:
+            self._guilds[guild_id], self._counters[guild_id] = loaded
+        return self._guilds[guild_id]
+
+    def _segments(self, guild_id: int) -> list[_Segment]:
+        """Sync access for appends; a guild not yet indexed is read on the spot."""
+        segments = self._guilds.get(guild_id)
+        if segments is None:
+            segments = self._adopt(guild_id, self._load_guild(guild_id))
+        return segments
+
+    async def _segments_async(self, guild_id: int) -> list[_Segment]:
+        if guild_id not in self._guilds:
+            return self._adopt(guild_id, await asyncio.to_thread(self._load_guild, guild_id))
+        return self._guilds[guild_id]
+
+    # -----------------------------------------------------------------------
+    # Writing
+    # -----------------------------------------------------------------------
+    def append(self, entry: AuditEntry) -> None:
+        guild_id = entry.guild_id
+        segments = self._segments(guild_id)
+        tail = segments[-1] if segments else None
+        if tail is None or tail.torn or tail.size >= SEGMENT_MAX_BYTES or (
+            tail.first_ts is not None and _timestamp(entry) - tail.first_ts >= SEGMENT_MAX_AGE
+        ):
+            tail = self._rotate(guild_id, segments)
+
+        f = self._files.get(guild_id)
+        if f is None:
+            f = self._files[guild_id] = open(tail.path, "ab")
+        raw = (entry.model_dump_json() + "\n").encode("utf-8")
+        f.write(raw)
+        f.flush()
+        tail.add(entry, len(raw))
+
+    def _rotate(self, guild_id: int, segments: list[_Segment]) -> _Segment:
+        f = self._files.pop(guild_id, None)
+        if f is not None:
+            f.close()
+
+        directory = self._guild_dir(guild_id)
+        directory.mkdir(exist_ok=True)
+        number = self._counters.get(guild_id, 0)
+        self._counters[guild_id] = number + 1
+        segment = _Segment(directory / f"segment-{number:08d}.jsonl")
+        segments.append(segment)
+
+        while len(segments) > MAX_SEGMENTS:
+            segments.pop(0).path.unlink(missing_ok=True)
+        return segment
+
+    def clear(self, guild_id: int) -> None:
+        """Delete every audit entry for a guild."""
+        f = self._files.pop(guild_id, None)
+        if f is not None:
+            f.close()
+        self._guilds.pop(guild_id, None)
+        self._counters.pop(guild_id, None)
+        shutil.rmtree(self._guild_dir(guild_id), ignore_errors=True)
+
+    # -----------------------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------------------
+    async def recent(
+        self,
+        guild_id: int,
+        limit: int,
+        member_id: t.Optional[int] = None,
+    ) -> list[AuditEntry]:
+        """The newest ``limit`` entries, most recent first, optionally where *member_id* is actor or target."""
+        picks: list[tuple[_Segment, list[int]]] = []
+        need = limit
+        for segment in reversed(await self._segments_async(guild_id)):
+            if need <= 0:
+                break
+            if member_id is None:
+                lines = range(len(segment.offsets))
+            else:
+                lines = segment.members.get(member_id, [])
+            chosen = list(lines[-need:])[::-1] if lines else []
+            if chosen:
+                picks.append((segment, chosen))
+                need -= len(chosen)
+
+        return await asyncio.to_thread(
+            lambda: [entry for segment, lines in picks for entry in segment.read(lines)]
+        )
+
+    async def count(self, guild_id: int) -> int:
+        return sum(len(segment.offsets) for segment in await self._segments_async(guild_id))
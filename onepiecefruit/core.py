@@ -22,7 +22,6 @@ import random
 import typing as t
 from contextlib import suppress
 from datetime import datetime, timezone
-from pathlib import Path
 
 import discord
 from redbot.core import commands, Config
@@ -40,8 +39,10 @@ from .fruits import (
     REROLL_COST_SCALE_FACTOR,
     SEASONAL_EVENTS,
 )
-from .models import AuditEntry, DB, GuildData, UserFruitData
+from .audit import AuditStore
+from .models import AuditEntry, GuildData, UserFruitData
 from .piraterep import RepTracker, RANK_LADDER
+from .storage import FruitStore
 
 log = logging.getLogger("red.onepiecefruit")
 
@@ -68,6 +69,11 @@ RARITY_EMOJIS: dict[str, str] = {
 
 AWAKENING_LABELS = {0: "Base Form", 1: "Awakening — Stage 1", 2: "Full Awakening"}
 
+# Messages the rep worker handles before yielding to the event loop
+REP_BATCH_SIZE = 100
+# Seconds cog_unload waits for in-flight announcements and stipends
+REP_FOLLOWUP_GRACE = 10
+
 
 # ---------------------------------------------------------------------------
 # Helper — weighted random fruit draw
@@ -193,10 +199,16 @@ class OnePieceFruit(commands.Cog):
 
     def __init__(self, bot: Red) -> None:
         self.bot = bot
-        self.db = DB()
-        self._io_lock = asyncio.Lock()
-        self._settings_file: t.Optional[Path] = None
+        self.db = FruitStore(cog_data_path(self))
+        self.audit = AuditStore(cog_data_path(self) / "audit")
         self.rep_tracker: t.Optional[RepTracker] = None
+        # None is the worker's stop signal, queued by cog_unload
+        self._rep_queue: asyncio.Queue[t.Optional[discord.Message]] = asyncio.Queue()
+        self._rep_worker: t.Optional[asyncio.Task] = None
+        self._rep_closing = False
+        # Announcement/stipend tasks, kept apart so slow Discord or bank calls never hold up rep
+        self._rep_followups: set[asyncio.Task] = set()
+        self._stipend_pending: set[tuple[int, int]] = set()
 
         self.config = Config.get_conf(self, identifier=0x99ac92bc1d2e3f44, force_registration=True)
         self.config.register_guild(rank_announcement_channel=None, active_event=None)
@@ -206,34 +218,36 @@ class OnePieceFruit(commands.Cog):
     # -----------------------------------------------------------------------
     async def cog_load(self) -> None:
         data_path = cog_data_path(self)
-
-        self._settings_file = data_path / "onepiecefruit.json"
-        if self._settings_file.exists():
-            try:
-                self.db = await asyncio.to_thread(DB.from_file, self._settings_file)
-                log.info("OnePieceFruit: config loaded.")
-            except Exception as exc:
-                log.error("OnePieceFruit: failed to load config.", exc_info=exc)
+        await self.db.load()
+        await self.audit.load(self.db.legacy_audit_file)
 
         self.rep_tracker = RepTracker(data_path / "piraterep.json")
         await self.rep_tracker.load()
+        self._rep_worker = asyncio.create_task(self._rep_queue_worker())
 
     async def cog_unload(self) -> None:
-        await self._save()
+        # Stop queueing, let the worker finish everything already queued, then stop it
+        self._rep_closing = True
+        if self._rep_worker is not None and not self._rep_worker.done():
+            self._rep_queue.put_nowait(None)
+            await self._rep_worker
+        while not self._rep_queue.empty():
+            message = self._rep_queue.get_nowait()
+            if message is not None:
+                self._process_rep_message(message)
+        if self._rep_followups:
+            await asyncio.wait(set(self._rep_followups), timeout=REP_FOLLOWUP_GRACE)
         if self.rep_tracker:
             await self.rep_tracker.save()
+        await self.db.close()
+        self.audit.close()
 
     # -----------------------------------------------------------------------
     # Persistence
     # -----------------------------------------------------------------------
-    async def _save(self) -> None:
-        if self._settings_file is None:
-            return
-        async with self._io_lock:
-            try:
-                await asyncio.to_thread(self.db.to_file, self._settings_file)
-            except Exception as exc:
-                log.error("OnePieceFruit: failed to save config.", exc_info=exc)
+    def _save(self) -> None:
+        """Queue a debounced write of the guilds changed since the last save."""
+        self.db.schedule_save()
 
     # -----------------------------------------------------------------------
     # Currency adapter factory
@@ -288,21 +302,24 @@ class OnePieceFruit(commands.Cog):
             "Legendary": 250,
         }.get(rarity, 0)
 
-    async def _maybe_grant_daily_stipend(self, message: discord.Message) -> None:
+    def _stipend_due(self, message: discord.Message) -> int:
+        """The daily stipend the author is owed right now, or 0."""
         if message.guild is None or self.db is None:
-            return
-        guild_data = self.db.get_guild(message.guild.id)
-        user_data = guild_data.get_user(message.author.id)
+            return 0
+        user_data = self.db.get_guild(message.guild.id).get_user(message.author.id)
         if user_data is None or not user_data.fruit_name:
-            return
+            return 0
+        if user_data.last_daily_stipend == _utc_today().isoformat():
+            return 0
+        return max(self._daily_stipend_amount(user_data.fruit_type), 0)
 
-        amount = self._daily_stipend_amount(user_data.fruit_type)
+    async def _maybe_grant_daily_stipend(self, message: discord.Message) -> None:
+        amount = self._stipend_due(message)
         if amount <= 0:
             return
-
+        guild_data = self.db.get_guild(message.guild.id)
+        user_data = guild_data.get_user(message.author.id)
         today = _utc_today().isoformat()
-        if user_data.last_daily_stipend == today:
-            return
 
         try:
             await self._currency(message.guild).deposit(
@@ -315,7 +332,7 @@ class OnePieceFruit(commands.Cog):
 
         user_data.last_daily_stipend = today
         guild_data.set_user(message.author.id, user_data)
-        await self._save()
+        self._save()
 
         with suppress(discord.HTTPException):
             await message.channel.send(
@@ -403,15 +420,32 @@ class OnePieceFruit(commands.Cog):
         target_id: t.Optional[int] = None,
         details: str = "",
     ) -> None:
-        self.db.add_audit(
-            AuditEntry(
-                guild_id=guild_id,
-                actor_id=actor_id,
-                action=action,
-                target_id=target_id,
-                details=details,
+        # The action already happened; a broken audit log must not fail the command
+        try:
+            self.audit.append(
+                AuditEntry(
+                    guild_id=guild_id,
+                    actor_id=actor_id,
+                    action=action,
+                    target_id=target_id,
+                    details=details,
+                )
             )
-        )
+        except Exception as exc:
+            log.error("OnePieceFruit: failed to record audit entry %r in guild %s.", action, guild_id, exc_info=exc)
+
+    async def _recent_audit(
+        self,
+        guild_id: int,
+        limit: int,
+        member_id: t.Optional[int] = None,
+    ) -> list[AuditEntry]:
+        """``AuditStore.recent``, returning nothing if the audit log can't be read."""
+        try:
+            return await self.audit.recent(guild_id, limit, member_id=member_id)
+        except Exception as exc:
+            log.error("OnePieceFruit: failed to read the audit log for guild %s.", guild_id, exc_info=exc)
+            return []
 
     async def _send_audit_entries(
         self,
@@ -470,36 +504,76 @@ class OnePieceFruit(commands.Cog):
         with suppress(discord.HTTPException):
             await channel.send(embed=embed)
 
-    async def _process_rep_message(self, message: discord.Message) -> None:
+    def _process_rep_message(self, message: discord.Message) -> None:
+        """Record rep now; anything that talks to Discord or the bank runs in its own task."""
         if message.author.bot or message.guild is None or self.rep_tracker is None:
             return
 
-        result = await self.rep_tracker.record_message(message.guild.id, message.author.id)
-        if result is None:
-            await self._maybe_grant_daily_stipend(message)
+        result = self.rep_tracker.record_message(message.guild.id, message.author.id)
+
+        stipend_key = (message.guild.id, message.author.id)
+        stipend = stipend_key not in self._stipend_pending and self._stipend_due(message) > 0
+        if result is None and not stipend:
             return
+        if stipend:
+            # One grant in flight per member, so a burst of messages can't pay twice
+            self._stipend_pending.add(stipend_key)
 
-        promotion, decay_amount, decay_days = result
-        if decay_amount > 0:
-            with suppress(discord.HTTPException):
-                await message.channel.send(
-                    f"💨 {message.author.mention}, your Pirate Rep decayed by **{decay_amount:,}** "
-                    f"after {decay_days} days of inactivity. Keep chatting to recover!"
-                )
+        task = asyncio.create_task(self._rep_followup(message, result, stipend))
+        self._rep_followups.add(task)
+        task.add_done_callback(self._rep_followups.discard)
 
-        if promotion is not None:
-            old_title, old_emoji, new_title, new_emoji, rep = promotion
-            await self._send_rank_announcement(
-                message.guild,
-                message.author,
-                old_title,
-                old_emoji,
-                new_title,
-                new_emoji,
-                rep,
-            )
+    async def _rep_followup(
+        self,
+        message: discord.Message,
+        result: t.Optional[tuple[t.Optional[tuple[str, str, str, str, int]], int, int]],
+        stipend: bool,
+    ) -> None:
+        try:
+            if result is not None:
+                promotion, decay_amount, decay_days = result
+                if decay_amount > 0:
+                    with suppress(discord.HTTPException):
+                        await message.channel.send(
+                            f"💨 {message.author.mention}, your Pirate Rep decayed by **{decay_amount:,}** "
+                            f"after {decay_days} days of inactivity. Keep chatting to recover!"
+                        )
+
+                if promotion is not None:
+                    old_title, old_emoji, new_title, new_emoji, rep = promotion
+                    await self._send_rank_announcement(
+                        message.guild,
+                        message.author,
+                        old_title,
+                        old_emoji,
+                        new_title,
+                        new_emoji,
+                        rep,
+                    )
+
+            if stipend:
+                await self._maybe_grant_daily_stipend(message)
+        except Exception as exc:
+            log.error("OnePieceFruit: rep follow-up failed for message %s.", message.id, exc_info=exc)
+        finally:
+            if stipend:
+                self._stipend_pending.discard((message.guild.id, message.author.id))
 
-        await self._maybe_grant_daily_stipend(message)
+    async def _rep_queue_worker(self) -> None:
+        """Drain on_message's queue in batches, so a busy chat costs one task rather than one per message."""
+        while True:
+            batch = [await self._rep_queue.get()]
+            while len(batch) < REP_BATCH_SIZE and not self._rep_queue.empty():
+                batch.append(self._rep_queue.get_nowait())
+            for message in batch:
+                if message is None:
+                    return  # Stop signal from cog_unload; everything before it is recorded
+                try:
+                    self._process_rep_message(message)
+                except Exception as exc:
+                    log.error("OnePieceFruit: failed to record rep for message %s.", message.id, exc_info=exc)
+            # Let other handlers run between batches when the queue never empties
+            await asyncio.sleep(0)
 
     async def _resolve_profile_target(self, ctx: commands.Context) -> discord.Member:
         target = ctx.kwargs.get("member")
@@ -530,9 +604,9 @@ class OnePieceFruit(commands.Cog):
     async def on_message(self, message: discord.Message) -> None:
         if message.author.bot or message.guild is None:
             return
-        if self.rep_tracker is None:
+        if self.rep_tracker is None or self._rep_closing:
             return
-        asyncio.create_task(self._process_rep_message(message))
+        self._rep_queue.put_nowait(message)
 
     @commands.Cog.listener("on_command_completion")
     async def on_command_completion(self, ctx: commands.Context) -> None:
@@ -592,7 +666,7 @@ class OnePieceFruit(commands.Cog):
                 awakening_stage=0,
             )
             guild_data.set_user(member.id, user_data)
-            await self._save()
+            self._save()
 
             embed = _build_fruit_embed(member, user_data, title_prefix="🍎 Devil Fruit Obtained! ")
             embed.description = (
@@ -615,7 +689,7 @@ class OnePieceFruit(commands.Cog):
         if level == AWAKENING_STAGE1_LEVEL and user_data is not None and user_data.awakening_stage == 0:
             user_data.awakening_stage = 1
             guild_data.set_user(member.id, user_data)
-            await self._save()
+            self._save()
 
             embed = _build_fruit_embed(member, user_data, title_prefix="⚡ Awakening — Stage 1! ")
             embed.description = (
@@ -629,7 +703,7 @@ class OnePieceFruit(commands.Cog):
         if level == AWAKENING_STAGE2_LEVEL and user_data is not None and user_data.awakening_stage == 1:
             user_data.awakening_stage = 2
             guild_data.set_user(member.id, user_data)
-            await self._save()
+            self._save()
 
             embed = _build_fruit_embed(member, user_data, title_prefix="🌟 Full Awakening! ")
             embed.description = (
@@ -696,7 +770,7 @@ class OnePieceFruit(commands.Cog):
                 )
 
         guild_data.set_user(ctx.author.id, user_data)
-        await self._save()
+        self._save()
 
         status = "enabled" if user_data.profile_visible else "disabled"
         await ctx.send(
@@ -711,21 +785,12 @@ class OnePieceFruit(commands.Cog):
             return await ctx.send("⚠️ Pirate Rep tracker is not initialised yet.")
         target = member or ctx.author
 
-        weekly_lb = self.rep_tracker.weekly_leaderboard(ctx.guild.id)
-        streak_lb = self.rep_tracker.streak_leaderboard(ctx.guild.id)
-        rep_lb = self.rep_tracker.rep_leaderboard(ctx.guild.id)
-
-        uid_str = str(target.id)
-        weekly_rank = next((i + 1 for i, (uid, _) in enumerate(weekly_lb) if uid == uid_str), None)
-        streak_rank = next((i + 1 for i, (uid, _) in enumerate(streak_lb) if uid == uid_str), None)
-        rep_rank = next((i + 1 for i, (uid, _) in enumerate(rep_lb) if uid == uid_str), None)
-
         embed = self.rep_tracker.full_rep_embed(
             target,
             ctx.guild.id,
-            weekly_rank=weekly_rank,
-            streak_rank=streak_rank,
-            rep_rank=rep_rank,
+            weekly_rank=self.rep_tracker.weekly_rank(ctx.guild.id, target.id),
+            streak_rank=self.rep_tracker.streak_rank(ctx.guild.id, target.id),
+            rep_rank=self.rep_tracker.rep_rank(ctx.guild.id, target.id),
         )
         await ctx.send(embed=embed)
 
@@ -858,7 +923,7 @@ class OnePieceFruit(commands.Cog):
 
         from .piraterep import _week_key, _weekly_badge
 
-        lb = self.rep_tracker.weekly_leaderboard(ctx.guild.id)
+        lb = self.rep_tracker.weekly_leaderboard(ctx.guild.id, limit=15)
         embed = discord.Embed(
             title=f"📅 Weekly Active Pirates — {_week_key()}",
             colour=discord.Colour.blurple(),
@@ -872,7 +937,7 @@ class OnePieceFruit(commands.Cog):
 
         lines = []
         medals = ["🥇", "🥈", "🥉"]
-        for i, (uid_str, count) in enumerate(lb[:15]):
+        for i, (uid_str, count) in enumerate(lb):
             m = ctx.guild.get_member(int(uid_str))
             name = m.mention if m else f"<@{uid_str}>"
             badge = _weekly_badge(count)
@@ -893,7 +958,7 @@ class OnePieceFruit(commands.Cog):
         from .piraterep import _utc_today
         from datetime import date
 
-        lb = self.rep_tracker.streak_leaderboard(ctx.guild.id)
+        lb = self.rep_tracker.streak_leaderboard(ctx.guild.id, limit=15)
         embed = discord.Embed(title="🔥 Pirate Streak Leaderboard", colour=discord.Colour.orange())
         if ctx.guild.icon:
             embed.set_thumbnail(url=ctx.guild.icon.url)
@@ -905,7 +970,7 @@ class OnePieceFruit(commands.Cog):
         today = _utc_today()
         lines = []
         medals = ["🥇", "🥈", "🥉"]
-        for i, (uid_str, streak) in enumerate(lb[:15]):
+        for i, (uid_str, streak) in enumerate(lb):
             m = ctx.guild.get_member(int(uid_str))
             name = m.mention if m else f"<@{uid_str}>"
             u = self.rep_tracker.get_user(ctx.guild.id, int(uid_str))
@@ -998,7 +1063,7 @@ class OnePieceFruit(commands.Cog):
         user_data.reroll_count += 1
         user_data.last_reroll_cost = cost
         guild_data.set_user(ctx.author.id, user_data)
-        await self._save()
+        self._save()
         self._log_audit(
             ctx.guild.id,
             ctx.author.id,
@@ -1233,7 +1298,7 @@ class OnePieceFruit(commands.Cog):
             awakening_stage=0,
         )
         guild_data.set_user(member.id, user_data)
-        await self._save()
+        self._save()
         self._log_audit(
             ctx.guild.id, ctx.author.id, "assign",
             target_id=member.id, details=f"{fruit['name']} ({rarity})",
@@ -1247,7 +1312,7 @@ class OnePieceFruit(commands.Cog):
         """Remove a member's Devil Fruit data entirely."""
         guild_data = self.db.get_guild(ctx.guild.id)
         guild_data.remove_user(member.id)
-        await self._save()
+        self._save()
         self._log_audit(ctx.guild.id, ctx.author.id, "reset", target_id=member.id)
         await ctx.send(f"🗑️ Devil Fruit data cleared for **{member.display_name}**.")
 
@@ -1265,7 +1330,7 @@ class OnePieceFruit(commands.Cog):
         old_stage = user_data.awakening_stage
         user_data.awakening_stage = stage
         guild_data.set_user(member.id, user_data)
-        await self._save()
+        self._save()
         self._log_audit(
             ctx.guild.id, ctx.author.id, "awaken",
             target_id=member.id, details=f"stage: {old_stage} → {stage}",
@@ -1283,7 +1348,7 @@ class OnePieceFruit(commands.Cog):
         user_data.reroll_count = 0
         user_data.last_reroll_cost = 0
         guild_data.set_user(member.id, user_data)
-        await self._save()
+        self._save()
         self._log_audit(
             ctx.guild.id, ctx.author.id, "resetrerolls",
             target_id=member.id, details=f"count was {old_count}",
@@ -1298,9 +1363,7 @@ class OnePieceFruit(commands.Cog):
         if rep < 0:
             return await ctx.send("❌ Rep must be 0 or greater.")
 
-        user_data = self.rep_tracker.get_user(ctx.guild.id, member.id)
-        old_rep = user_data.rep
-        user_data.rep = rep
+        old_rep = self.rep_tracker.set_rep(ctx.guild.id, member.id, rep)
         await self.rep_tracker.save()
         self._log_audit(ctx.guild.id, ctx.author.id, "setrep", target_id=member.id, details=f"{old_rep} → {rep}")
         await ctx.send(f"✅ Set **{member.display_name}**'s Pirate Rep to **{rep:,}**.")
@@ -1326,9 +1389,7 @@ class OnePieceFruit(commands.Cog):
             return await ctx.send(embed=embed)
 
         min_rep, title, emoji = matched_entry
-        user_data = self.rep_tracker.get_user(ctx.guild.id, member.id)
-        old_rep = user_data.rep
-        user_data.rep = min_rep
+        old_rep = self.rep_tracker.set_rep(ctx.guild.id, member.id, min_rep)
         await self.rep_tracker.save()
         self._log_audit(
             ctx.guild.id, ctx.author.id, "setrank",
@@ -1349,11 +1410,9 @@ class OnePieceFruit(commands.Cog):
         """Reset a member's Pirate Rep data (streak, messages, rep score)."""
         if self.rep_tracker is None:
             return await ctx.send("⚠️ Pirate Rep tracker is not initialised.")
-        g = self.rep_tracker._db.get_guild(ctx.guild.id)
-        uid_str = str(member.id)
-        if uid_str in g.users:
-            old_rep = g.users[uid_str].rep
-            del g.users[uid_str]
+        removed = self.rep_tracker.reset_user(ctx.guild.id, member.id)
+        if removed is not None:
+            old_rep = removed.rep
             await self.rep_tracker.save()
             self._log_audit(ctx.guild.id, ctx.author.id, "resetrep", target_id=member.id, details=f"rep was {old_rep}")
             await ctx.send(f"🗑️ Pirate Rep data cleared for **{member.display_name}** (had {old_rep:,} rep).")
@@ -1507,11 +1566,7 @@ class OnePieceFruit(commands.Cog):
             return await ctx.send("❌ Limit must be greater than 0.")
         limit = min(limit, 100)
 
-        entries = self.db.audit_for_guild(ctx.guild.id)
-        if member is not None:
-            entries = [e for e in entries if e.actor_id == member.id or e.target_id == member.id]
-
-        entries = sorted(entries, key=lambda e: e.timestamp, reverse=True)[:limit]
+        entries = await self._recent_audit(ctx.guild.id, limit, member_id=member.id if member else None)
         if not entries:
             return await ctx.send("ℹ️ No matching audit records found.")
 
@@ -1546,8 +1601,11 @@ class OnePieceFruit(commands.Cog):
         if str(reaction.emoji) == "❌":
             return await ctx.send("❌ Audit clear cancelled.")
 
-        self.db.clear_audit(ctx.guild.id)
-        await self._save()
+        try:
+            self.audit.clear(ctx.guild.id)
+        except Exception as exc:
+            log.error("OnePieceFruit: failed to clear the audit log for guild %s.", ctx.guild.id, exc_info=exc)
+            return await ctx.send("❌ Could not clear the audit log; check the bot logs.")
         await ctx.send("🧹 Audit log cleared for this server.")
 
     @df_admin.command(name="bulkassign")
@@ -1620,7 +1678,7 @@ class OnePieceFruit(commands.Cog):
                 log.warning(f"OnePieceFruit bulkassign: error processing {member.id}", exc_info=exc)
                 errors += 1
 
-        await self._save()
+        self._save()
         self._log_audit(
             ctx.guild.id, ctx.author.id, "bulkassign",
             details=f"assigned={assigned}, awakened={awakening_updated}, skipped={skipped}, errors={errors}",
@@ -1697,12 +1755,7 @@ class OnePieceFruit(commands.Cog):
         else:
             embed.add_field(name="⚓ Pirate Rep", value="*Rep tracker not initialised*", inline=False)
 
-        entries = self.db.audit_for_guild(ctx.guild.id)
-        member_entries = sorted(
-            [e for e in entries if e.actor_id == member.id or e.target_id == member.id],
-            key=lambda e: e.timestamp,
-            reverse=True,
-        )[:3]
+        member_entries = await self._recent_audit(ctx.guild.id, 3, member_id=member.id)
         if member_entries:
             embed.add_field(
                 name="🧾 Recent Audit (last 3)",
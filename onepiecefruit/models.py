@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class UserFruitData(BaseModel):
@@ -45,6 +45,9 @@ class GuildData(BaseModel):
 
     users: dict[str, UserFruitData] = Field(default_factory=dict)
 
+    # Set by every mutation; FruitStore only writes guilds that are dirty
+    _dirty: bool = PrivateAttr(default=False)
+
     # -----------------------------------------------------------------------
     # Convenience helpers
     # -----------------------------------------------------------------------
@@ -53,9 +56,11 @@ class GuildData(BaseModel):
 
     def set_user(self, user_id: int, data: UserFruitData) -> None:
         self.users[str(user_id)] = data
+        self._dirty = True
 
     def remove_user(self, user_id: int) -> None:
-        self.users.pop(str(user_id), None)
+        if self.users.pop(str(user_id), None) is not None:
+            self._dirty = True
 
 
 class AuditEntry(BaseModel):
@@ -73,6 +78,7 @@ class DB(BaseModel):
     """Top-level DB: maps guild_id (str) → GuildData."""
 
     guilds: dict[str, GuildData] = Field(default_factory=dict)
+    # Legacy: audit entries now live in AuditStore; only read when migrating old files
     audit_log: list[AuditEntry] = Field(default_factory=list)
 
     # -----------------------------------------------------------------------
@@ -82,15 +88,6 @@ class DB(BaseModel):
             self.guilds[key] = GuildData()
         return self.guilds[key]
 
-    def add_audit(self, entry: AuditEntry) -> None:
-        self.audit_log.append(entry)
-
-    def audit_for_guild(self, guild_id: int) -> list[AuditEntry]:
-        return [entry for entry in self.audit_log if entry.guild_id == guild_id]
-
-    def clear_audit(self, guild_id: int) -> None:
-        self.audit_log = [entry for entry in self.audit_log if entry.guild_id != guild_id]
-
     # -----------------------------------------------------------------------
     # File I/O (sync, run via asyncio.to_thread)
     # -----------------------------------------------------------------------
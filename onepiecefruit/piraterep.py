@@ -14,7 +14,8 @@ This module is self-contained. OnePieceFruit's core.py imports it and:
   1. Calls RepTracker.record_message(guild_id, user_id) inside on_message.
   2. Calls RepTracker.rep_embed_fields(guild_id, user_id) to append fields
      to the [p]df info embed.
-  3. Provides rep leaderboard helpers for [p]df rep/weekly/streak.
+  3. Provides rep leaderboard helpers for [p]df rep/weekly/streak, backed by
+     per-guild sorted boards that record_message keeps current.
 
 MIT License — feel free to use and modify.
 """
@@ -25,6 +26,7 @@ import asyncio
 import json
 import logging
 import math
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field, asdict
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
@@ -82,6 +84,11 @@ INACTIVITY_DECAY_DAYS = 7
 INACTIVITY_DECAY_RATE = 0.05
 INACTIVITY_DECAY_MIN = 10
 
+# Sorted thresholds for bisect lookups in the per-message path
+_RANK_MINS: list[int] = [min_rep for min_rep, _, _ in RANK_LADDER]
+_MSG_THRESHOLDS: list[int] = sorted(MSG_MILESTONES)
+_STREAK_THRESHOLDS: list[int] = sorted(STREAK_MILESTONES)
+
 # Weekly activity badges (weekly msg count → badge label)
 WEEKLY_BADGES: list[tuple[int, str]] = [
     (500, "🌊 Tidal Force"),
@@ -105,23 +112,27 @@ def _week_key(d: Optional[date] = None) -> str:
     return f"{y}-W{w:02d}"
 
 
+def _rank_index(rep: int) -> int:
+    """Index into RANK_LADDER of the rank held at a rep total."""
+    return max(bisect_right(_RANK_MINS, rep) - 1, 0)
+
+
 def _rank_for_rep(rep: int) -> tuple[str, str]:
     """Return (title, emoji) for a rep total."""
-    title, emoji = RANK_LADDER[0][1], RANK_LADDER[0][2]
-    for min_rep, t, e in RANK_LADDER:
-        if rep >= min_rep:
-            title, emoji = t, e
-        else:
-            break
+    _, title, emoji = RANK_LADDER[_rank_index(rep)]
     return title, emoji
 
 
 def _next_rank(rep: int) -> Optional[tuple[int, str, str]]:
     """Return the next rank entry (min_rep, title, emoji) or None if max rank."""
-    for min_rep, t, e in RANK_LADDER:
-        if rep < min_rep:
-            return min_rep, t, e
-    return None
+    i = bisect_right(_RANK_MINS, rep)
+    return RANK_LADDER[i] if i < len(RANK_LADDER) else None
+
+
+def _next_unawarded(thresholds: list[int], awarded: list[int]) -> float:
+    """Smallest threshold not yet awarded, or inf when all are."""
+    done = set(awarded)
+    return next((m for m in thresholds if m not in done), math.inf)
 
 
 def _calculate_inactivity_decay(rep: int, days_inactive: int) -> int:
@@ -156,6 +167,15 @@ class UserRepData:
     awarded_msg_milestones: list[int] = field(default_factory=list)
     awarded_streak_milestones: list[int] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        # Not dataclass fields, so never persisted: the lowest milestone still
+        # to award, so record_message only walks the tables when one is reached
+        self.refresh_cursors()
+
+    def refresh_cursors(self) -> None:
+        self.next_msg_milestone = _next_unawarded(_MSG_THRESHOLDS, self.awarded_msg_milestones)
+        self.next_streak_milestone = _next_unawarded(_STREAK_THRESHOLDS, self.awarded_streak_milestones)
+
     def to_dict(self) -> dict:
         return asdict(self)
 
@@ -219,6 +239,81 @@ class RepDB:
         return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
 
 
+# ---------------------------------------------------------------------------
+# Leaderboards — kept sorted as record_message changes users
+# ---------------------------------------------------------------------------
+
+class _Board:
+    """Users ranked by one score, highest first; users at 0 are left out."""
+
+    __slots__ = ("_keys", "_scores")
+
+    def __init__(self, scores: Optional[dict[str, int]] = None) -> None:
+        self._scores: dict[str, int] = {uid: s for uid, s in (scores or {}).items() if s > 0}
+        self._keys: list[tuple[int, str]] = sorted((-s, uid) for uid, s in self._scores.items())
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def update(self, uid: str, score: int) -> None:
+        old = self._scores.get(uid)
+        if old == score or (old is None and score <= 0):
+            return
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old, uid))]
+        if score > 0:
+            self._scores[uid] = score
+            insort(self._keys, (-score, uid))
+        else:
+            del self._scores[uid]
+
+    def rank(self, uid: str) -> Optional[int]:
+        """1-based position, or None if the user isn't on the board."""
+        score = self._scores.get(uid)
+        if score is None:
+            return None
+        return bisect_left(self._keys, (-score, uid)) + 1
+
+    def top(self, limit: Optional[int] = None) -> list[tuple[str, int]]:
+        keys = self._keys if limit is None else self._keys[:limit]
+        return [(uid, -neg) for neg, uid in keys]
+
+
+class _GuildBoards:
+    """Rep, streak and weekly boards for one guild.
+
+    The weekly board belongs to a single week key and is swapped for an empty
+    one the first time it's touched in a new week.
+    """
+
+    __slots__ = ("rep", "streak", "weekly", "week")
+
+    def __init__(self, g: GuildRepData) -> None:
+        self.rep = _Board({uid: u.rep for uid, u in g.users.items()})
+        self.streak = _Board({uid: u.streak for uid, u in g.users.items()})
+        self.week = _week_key()
+        self.weekly = _Board(
+            {uid: u.weekly_messages for uid, u in g.users.items() if u.current_week == self.week}
+        )
+
+    def weekly_for(self, week: str) -> _Board:
+        if week != self.week:
+            self.week = week
+            self.weekly = _Board()
+        return self.weekly
+
+    def update(self, uid: str, u: UserRepData) -> None:
+        self.rep.update(uid, u.rep)
+        self.streak.update(uid, u.streak)
+        if u.current_week:
+            self.weekly_for(u.current_week).update(uid, u.weekly_messages)
+
+    def remove(self, uid: str) -> None:
+        self.rep.update(uid, 0)
+        self.streak.update(uid, 0)
+        self.weekly.update(uid, 0)
+
+
 # ---------------------------------------------------------------------------
 # Core tracker — owns the RepDB and all mutation logic
 # ---------------------------------------------------------------------------
@@ -233,8 +328,8 @@ class RepTracker:
         self.rep_tracker = RepTracker(cog_data_path(self) / "piraterep.json")
         await self.rep_tracker.load()
 
-        # in on_message:
-        await self.rep_tracker.record_message(guild.id, author.id)
+        # for each message (the cog feeds these from a batched queue):
+        self.rep_tracker.record_message(guild.id, author.id)
 
         # in cog_unload:
         await self.rep_tracker.save()
@@ -243,6 +338,7 @@ class RepTracker:
     def __init__(self, path: Path) -> None:
         self._path = path
         self._db = RepDB()
+        self._boards: dict[int, _GuildBoards] = {}  # built on first leaderboard use
         self._io_lock = asyncio.Lock()
         self._dirty = False
         self._save_task: Optional[asyncio.Task] = None
@@ -251,6 +347,7 @@ class RepTracker:
         if self._path.exists():
             try:
                 self._db = await asyncio.to_thread(RepDB.from_file, self._path)
+                self._boards.clear()
                 log.info("PirateRep: loaded from %s", self._path)
             except Exception as exc:
                 log.error("PirateRep: failed to load — starting fresh.", exc_info=exc)
@@ -275,14 +372,15 @@ class RepTracker:
 
     # ── Message recording ───────────────────────────────────────────────────
 
-    async def record_message(
+    def record_message(
         self,
         guild_id: int,
         user_id: int,
     ) -> Optional[tuple[Optional[tuple[str, str, str, str, int]], int, int]]:
         """
         Record one message for a user. Updates total, weekly, streak, rep.
-        Saves automatically (debounced via asyncio — fire-and-forget in the cog).
+        Saves automatically (debounced via asyncio). Synchronous and cheap in
+        the common case: no milestone is due, so no rank lookup is needed.
 
         Returns a tuple with:
             - rank promotion details if the user advances rank
@@ -296,7 +394,7 @@ class RepTracker:
         g = self._db.get_guild(guild_id)
         u = g.get_user(user_id)
 
-        old_title, old_emoji = _rank_for_rep(u.rep)
+        old_rep = u.rep
         decay_amount = 0
         inactive_days = 0
 
@@ -331,20 +429,34 @@ class RepTracker:
             u.longest_streak = u.streak
 
         # ── Rep awards ────────────────────────────────────────────────────
-        for milestone, award in MSG_MILESTONES.items():
-            if u.total_messages >= milestone and milestone not in u.awarded_msg_milestones:
-                u.rep += award
-                u.awarded_msg_milestones.append(milestone)
-
-        for streak_days, award in STREAK_MILESTONES.items():
-            if u.streak >= streak_days and streak_days not in u.awarded_streak_milestones:
-                u.rep += award
-                u.awarded_streak_milestones.append(streak_days)
+        # The cursors hold the lowest unawarded milestone; below it there is nothing to do
+        if u.total_messages >= u.next_msg_milestone or u.streak >= u.next_streak_milestone:
+            for milestone in _MSG_THRESHOLDS:
+                if milestone > u.total_messages:
+                    break
+                if milestone not in u.awarded_msg_milestones:
+                    u.rep += MSG_MILESTONES[milestone]
+                    u.awarded_msg_milestones.append(milestone)
+
+            for streak_days in _STREAK_THRESHOLDS:
+                if streak_days > u.streak:
+                    break
+                if streak_days not in u.awarded_streak_milestones:
+                    u.rep += STREAK_MILESTONES[streak_days]
+                    u.awarded_streak_milestones.append(streak_days)
+            u.refresh_cursors()
 
-        new_title, new_emoji = _rank_for_rep(u.rep)
         promotion: Optional[tuple[str, str, str, str, int]] = None
-        if (old_title, old_emoji) != (new_title, new_emoji):
-            promotion = (old_title, old_emoji, new_title, new_emoji, u.rep)
+        if u.rep != old_rep:
+            old_index, new_index = _rank_index(old_rep), _rank_index(u.rep)
+            if old_index != new_index:
+                _, old_title, old_emoji = RANK_LADDER[old_index]
+                _, new_title, new_emoji = RANK_LADDER[new_index]
+                promotion = (old_title, old_emoji, new_title, new_emoji, u.rep)
+
+        boards = self._boards.get(guild_id)
+        if boards is not None:
+            boards.update(str(user_id), u)
 
         # save is deferred and debounced to avoid excessive disk writes
         self._dirty = True
@@ -359,31 +471,52 @@ class RepTracker:
     def get_user(self, guild_id: int, user_id: int) -> UserRepData:
         return self._db.get_guild(guild_id).get_user(user_id)
 
-    def weekly_leaderboard(self, guild_id: int) -> list[tuple[str, int]]:
+    def set_rep(self, guild_id: int, user_id: int, rep: int) -> int:
+        """Overwrite a user's rep (admin commands); returns the old value."""
+        u = self.get_user(guild_id, user_id)
+        old_rep, u.rep = u.rep, rep
+        boards = self._boards.get(guild_id)
+        if boards is not None:
+            boards.rep.update(str(user_id), rep)
+        return old_rep
+
+    def reset_user(self, guild_id: int, user_id: int) -> Optional[UserRepData]:
+        """Drop a user's rep data; returns what was removed, or None if there was none."""
+        uid = str(user_id)
+        removed = self._db.get_guild(guild_id).users.pop(uid, None)
+        boards = self._boards.get(guild_id)
+        if removed is not None and boards is not None:
+            boards.remove(uid)
+        return removed
+
+    # ── Leaderboards ────────────────────────────────────────────────────────
+
+    def _guild_boards(self, guild_id: int) -> _GuildBoards:
+        boards = self._boards.get(guild_id)
+        if boards is None:
+            boards = self._boards[guild_id] = _GuildBoards(self._db.get_guild(guild_id))
+        return boards
+
+    def weekly_leaderboard(self, guild_id: int, limit: Optional[int] = None) -> list[tuple[str, int]]:
         """Return [(user_id_str, weekly_msgs), ...] sorted desc for current week."""
-        week = _week_key()
-        g = self._db.get_guild(guild_id)
-        results = []
-        for uid, u in g.users.items():
-            count = u.weekly_messages if u.current_week == week else 0
-            if count > 0:
-                results.append((uid, count))
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results
-
-    def streak_leaderboard(self, guild_id: int) -> list[tuple[str, int]]:
+        return self._guild_boards(guild_id).weekly_for(_week_key()).top(limit)
+
+    def streak_leaderboard(self, guild_id: int, limit: Optional[int] = None) -> list[tuple[str, int]]:
         """Return [(user_id_str, streak), ...] sorted desc."""
-        g = self._db.get_guild(guild_id)
-        results = [(uid, u.streak) for uid, u in g.users.items() if u.streak > 0]
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results
+        return self._guild_boards(guild_id).streak.top(limit)
 
-    def rep_leaderboard(self, guild_id: int) -> list[tuple[str, int]]:
+    def rep_leaderboard(self, guild_id: int, limit: Optional[int] = None) -> list[tuple[str, int]]:
         """Return [(user_id_str, rep), ...] sorted desc."""
-        g = self._db.get_guild(guild_id)
-        results = [(uid, u.rep) for uid, u in g.users.items() if u.rep > 0]
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results
+        return self._guild_boards(guild_id).rep.top(limit)
+
+    def weekly_rank(self, guild_id: int, user_id: int) -> Optional[int]:
+        return self._guild_boards(guild_id).weekly_for(_week_key()).rank(str(user_id))
+
+    def streak_rank(self, guild_id: int, user_id: int) -> Optional[int]:
+        return self._guild_boards(guild_id).streak.rank(str(user_id))
+
+    def rep_rank(self, guild_id: int, user_id: int) -> Optional[int]:
+        return self._guild_boards(guild_id).rep.rank(str(user_id))
 
     # ── Embed helpers ───────────────────────────────────────────────────────
 
@@ -0,0 +1,141 @@
+"""Sharded on-disk storage for the OnePieceFruit DB.
+
+Each guild's GuildData lives in ``guilds/<guild_id>.json`` and is only read
+the first time that guild is used (the audit log has its own store, see
+audit.py). Mutations mark their guild dirty (GuildData.set_user / remove_user), and a
+debounced save writes just the dirty shards, each through a temp file and
+``os.replace`` so a crash never leaves a half-written file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import typing as t
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+from .models import AuditEntry, DB, GuildData
+
+log = logging.getLogger("red.onepiecefruit.storage")
+
+# Seconds to wait after the first change before writing, so bursts coalesce
+SAVE_DELAY = 5
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class FruitStore:
+    """Drop-in for the DB model's get_guild, backed by per-guild shards."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._guild_dir = path / "guilds"
+        # Where a migrated legacy audit log is handed off to AuditStore
+        self.legacy_audit_file = path / "audit.json"
+        self._db = DB()
+        self._on_disk: set[str] = set()
+        self._io_lock = asyncio.Lock()
+        self._save_task: t.Optional[asyncio.Task] = None
+
+    # -----------------------------------------------------------------------
+    # Loading
+    # -----------------------------------------------------------------------
+    async def load(self) -> None:
+        self._guild_dir.mkdir(parents=True, exist_ok=True)
+        legacy = self._path / "onepiecefruit.json"
+        if legacy.exists():
+            await self._migrate(legacy)
+
+        # Only the shard names are read here; guilds load when first used
+        self._on_disk = {p.stem for p in self._guild_dir.glob("*.json")}
+        log.info("OnePieceFruit: %d guild shard(s) available.", len(self._on_disk))
+
+    async def _migrate(self, legacy: Path) -> None:
+        """Split the old single-file DB into guild shards."""
+        try:
+            db = await asyncio.to_thread(DB.from_file, legacy)
+        except Exception as exc:
+            log.error("OnePieceFruit: failed to read legacy config; leaving it in place.", exc_info=exc)
+            return
+
+        def write() -> None:
+            for key, guild in db.guilds.items():
+                _write_atomic(self._guild_dir / f"{key}.json", guild.model_dump_json(indent=2))
+            if db.audit_log:
+                _write_atomic(
+                    self.legacy_audit_file,
+                    TypeAdapter(list[AuditEntry]).dump_json(db.audit_log).decode("utf-8"),
+                )
+            os.replace(legacy, legacy.with_suffix(".json.migrated"))
+
+        await asyncio.to_thread(write)
+        log.info("OnePieceFruit: migrated %d guild(s) to per-guild files.", len(db.guilds))
+
+    def get_guild(self, guild_id: int) -> GuildData:
+        key = str(guild_id)
+        guild = self._db.guilds.get(key)
+        if guild is not None:
+            return guild
+
+        if key in self._on_disk:
+            # First use since load: one small shard read
+            path = self._guild_dir / f"{key}.json"
+            try:
+                guild = GuildData.model_validate_json(path.read_text(encoding="utf-8"))
+            except Exception as exc:
+                log.error("OnePieceFruit: shard for guild %s is unreadable; keeping a copy.", key, exc_info=exc)
+                os.replace(path, path.with_suffix(".json.corrupt"))
+                guild = GuildData()
+        else:
+            guild = GuildData()
+        self._db.guilds[key] = guild
+        return guild
+
+    # -----------------------------------------------------------------------
+    # Saving
+    # -----------------------------------------------------------------------
+    async def save(self) -> None:
+        """Write every dirty guild shard."""
+        async with self._io_lock:
+            # Serialise here, on the loop, so the snapshot can't race a mutation
+            shards: dict[str, str] = {}
+            for key, guild in self._db.guilds.items():
+                if guild._dirty:
+                    shards[key] = guild.model_dump_json(indent=2)
+                    guild._dirty = False
+            if not shards:
+                return
+
+            def write() -> None:
+                for key, text in shards.items():
+                    _write_atomic(self._guild_dir / f"{key}.json", text)
+
+            try:
+                await asyncio.to_thread(write)
+                self._on_disk.update(shards)
+            except Exception as exc:
+                log.error("OnePieceFruit: failed to save config.", exc_info=exc)
+                for key in shards:
+                    self._db.guilds[key]._dirty = True
+
+    async def _debounced_save(self) -> None:
+        await asyncio.sleep(SAVE_DELAY)
+        self._save_task = None
+        await self.save()
+
+    def schedule_save(self) -> None:
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._debounced_save())
+
+    async def close(self) -> None:
+        if self._save_task is not None:
+            self._save_task.cancel()
+            self._save_task = None
+        await self.save()
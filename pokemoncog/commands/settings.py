@@ -6,6 +6,7 @@ from redbot.core.config import Config
 import asyncio
 
 from ..constants import SPAWN_CHANCE, MIN_SPAWN_COOLDOWN
+from ..utils.api import prefetch_pokemon
 
 async def setup(bot: Red):
     """This is called when the cog is loaded via load_extension"""
@@ -180,4 +181,17 @@ class SettingsCommands:
         """Clear the Pokemon data cache (bot owner only)."""
         await self.config.pokemon_cache.clear()
         await self.config.form_cache.clear()
-        await ctx.send("Pokemon data cache has been cleared.")
\ No newline at end of file
+        await self.poke_cache.clear()
+        await ctx.send("Pokemon data cache has been cleared.")
+        
+    @pokemon_settings.command(name="prefetch")
+    @commands.is_owner()
+    async def prefetch_cache(self, ctx: commands.Context):
+        """Download data for every spawnable Pokemon into the cache (bot owner only)."""
+        await ctx.send("Prefetching Pokemon data from PokeAPI. This can take a few minutes...")
+        async with ctx.typing():
+            cached, fetched, failed = await prefetch_pokemon(self.session, self.config)
+        message = f"Prefetch complete: {fetched} fetched, {cached} already cached."
+        if failed:
+            message += f" {failed} failed; run the command again to retry them."
+        await ctx.send(message)
\ No newline at end of file
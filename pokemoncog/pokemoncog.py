@@ -9,6 +9,7 @@ import discord
 import aiohttp
 from redbot.core import Config, commands
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
 
 from .constants import (
     SPAWN_CHANCE, 
@@ -25,7 +26,8 @@ from .commands.info import InfoCommands
 
 # Import utility functions
 from .utils.formatting.spawn import spawn_pokemon, expire_spawn, add_pokemon_to_user, spawn_legendary, is_correct_catch
-from .utils.api import fetch_pokemon, fetch_all_forms, get_random_pokemon_id
+from .utils.api import fetch_pokemon, fetch_all_forms, get_random_pokemon_id, set_cache
+from .utils.cache import PokeCache
 from .utils.formatters import format_pokemon_name
 
 log = logging.getLogger("red.pokemon")
@@ -66,8 +68,9 @@ class PokemonCog(
         }
         
         default_global = {
-            "pokemon_cache": {},  # Cache for Pokemon data from API
-            "form_cache": {},    # Cache for Pokemon form data
+            # Legacy API caches; moved into PokeCache on load and left empty
+            "pokemon_cache": {},
+            "form_cache": {},
         }
         
         self.config.register_guild(**default_guild)
@@ -75,6 +78,7 @@ class PokemonCog(
         self.config.register_global(**default_global)
         
         self.session = aiohttp.ClientSession()
+        self.poke_cache = PokeCache(cog_data_path(self) / "pokeapi.sqlite3")
         self.spawns_active = {}  # {guild_id: {"pokemon": pokemon_data, "expiry": timestamp}}
         self.pokemon_locks = {}  # {guild_id: asyncio.Lock}
         
@@ -94,18 +98,35 @@ class PokemonCog(
     
     async def cog_load(self):
         """Load the cog and start background tasks."""
+        await self.poke_cache.open()
+        await self._migrate_config_cache()
+        set_cache(self.poke_cache)
+        
         self.bg_tasks.append(self.bot.loop.create_task(self.initialize()))
         self.bg_tasks.append(self.bot.loop.create_task(self.check_temporary_forms()))
         self.bg_tasks.append(self.bot.loop.create_task(self.check_expired_spawns()))
     
+    async def _migrate_config_cache(self):
+        """Move API data cached in Config by older versions into the SQLite cache."""
+        pokemon_cache = await self.config.pokemon_cache()
+        form_cache = await self.config.form_cache()
+        if not pokemon_cache and not form_cache:
+            return
+        await self.poke_cache.set_many({**pokemon_cache, **form_cache})
+        await self.config.pokemon_cache.clear()
+        await self.config.form_cache.clear()
+        log.info(f"Moved {len(pokemon_cache) + len(form_cache)} cached PokeAPI entries to {self.poke_cache.path.name}")
+    
     def cog_unload(self):
         """Clean up when the cog is unloaded."""
         # Cancel all background tasks
         for task in self.bg_tasks:
             task.cancel()
         
-        # Close the aiohttp session
+        # Close the aiohttp session and the API cache
         asyncio.create_task(self.session.close())
+        set_cache(None)
+        self.poke_cache.close()
         
         # Clean up any active spawns
         for guild_id, spawn_data in self.spawns_active.items():
@@ -3,6 +3,7 @@
 This package contains various utility functions used by the Pokemon cog:
 
 - api.py: Functions for interacting with the PokeAPI
+- cache.py: SQLite-backed cache of PokeAPI data
 - formatters.py: Functions for formatting Pokemon data for display
 - formatting/spawn.py: Functions for Pokemon spawning mechanics
 """
@@ -1,15 +1,39 @@
 """API utility functions for the Pokemon cog."""
+import asyncio
+import copy
 import logging
 import random
-from typing import Dict, Optional, List, Union, Any
+from typing import Dict, Iterable, Optional, List, Tuple, Union, Any
 
 import aiohttp
 from redbot.core import Config
 
 from ..constants import MEGA_CAPABLE_POKEMON, GMAX_CAPABLE_POKEMON, REGIONAL_FORM_POKEMON
+from .cache import PokeCache
 
 log = logging.getLogger("red.pokemon")
 
+API_BASE = "https://pokeapi.co/api/v2"
+
+# Requests in flight during a bulk prefetch
+PREFETCH_CONCURRENCY = 8
+
+# Set by the cog on load; see set_cache
+_cache: Optional[PokeCache] = None
+# Fetches in progress, by cache key, so concurrent misses share one request chain
+_inflight: Dict[str, "asyncio.Future[Optional[Dict[str, Any]]]"] = {}
+
+def set_cache(cache: Optional[PokeCache]) -> None:
+    """Point fetch_pokemon at the cog's on-disk cache (None while unloaded)."""
+    global _cache
+    _cache = cache
+
+async def _get_json(session: aiohttp.ClientSession, url: str) -> Optional[Dict[str, Any]]:
+    async with session.get(url) as response:
+        if response.status != 200:
+            return None
+        return await response.json()
+
 async def fetch_pokemon(
     session: aiohttp.ClientSession, 
     config: Config, 
@@ -18,222 +42,247 @@ async def fetch_pokemon(
 ) -> Optional[Dict[str, Any]]:
     """Fetch Pokemon data from PokeAPI with support for alternate forms.
     
+    Cached entries come from the cog's PokeCache (see set_cache); concurrent
+    requests for the same uncached Pokemon/form share a single fetch.
+    
     Args:
         session: The aiohttp ClientSession to use for requests
-        config: The Red Config object for caching
+        config: The Red Config object (the API cache itself lives in PokeCache)
         pokemon_id: Base Pokemon ID
         form_key: Optional form identifier (e.g., 'mega', 'mega-x', 'alola', 'galar', 'gmax')
         
     Returns:
         Dict containing Pokemon data or None if not found
     """
-    # Check cache first
-    pokemon_cache = await config.pokemon_cache()
-    form_cache = await config.form_cache()
-    
     str_id = str(pokemon_id)
     cache_key = f"{str_id}-{form_key}" if form_key else str_id
     
-    # Check if form exists in cache
-    if cache_key in form_cache:
-        return form_cache[cache_key]
+    if _cache is not None:
+        cached = await _cache.get(cache_key)
+        if cached is not None:
+            return cached
     
-    # Check if base Pokemon exists in cache
-    if str_id in pokemon_cache and not form_key:
-        return pokemon_cache[str_id]
+    future = _inflight.get(cache_key)
+    if future is None:
+        future = asyncio.ensure_future(_fetch_uncached(session, config, pokemon_id, form_key))
+        _inflight[cache_key] = future
+        future.add_done_callback(lambda _: _inflight.pop(cache_key, None))
     
-    # If not in cache, fetch from API
+    # Shielded so one caller being cancelled doesn't abort the fetch for the others
+    result = await asyncio.shield(future)
+    return copy.deepcopy(result) if result else result
+
+async def _fetch_uncached(
+    session: aiohttp.ClientSession,
+    config: Config,
+    pokemon_id: int,
+    form_key: Optional[str],
+) -> Optional[Dict[str, Any]]:
     try:
-        # Fetch base Pokemon data first
-        async with session.get(f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}") as response:
-            if response.status == 200:
-                base_data = await response.json()
-                
-                # Also get species data for evolution details
-                async with session.get(base_data["species"]["url"]) as species_response:
-                    if species_response.status == 200:
-                        species_data = await species_response.json()
-                    else:
-                        species_data = {}
-                
-                # Extract only needed info to reduce cache size
-                pokemon_info = {
-                    "id": base_data["id"],
-                    "name": base_data["name"],
-                    "types": [t["type"]["name"] for t in base_data["types"]],
-                    "height": base_data["height"],
-                    "weight": base_data["weight"],
-                    "sprite": base_data["sprites"]["front_default"],
-                    "base_experience": base_data["base_experience"],
-                    "stats": {s["stat"]["name"]: s["base_stat"] for s in base_data["stats"]},
-                    "evolution_chain_url": species_data.get("evolution_chain", {}).get("url", None),
-                    "evolves_at_level": None,  # Will be populated if this Pokemon evolves
-                    "evolves_to": None,  # Will be populated if this Pokemon evolves
-                    "forms": [],  # List of available forms
-                    "mega_evolution": False,  # Whether this Pokemon can Mega Evolve
-                    "primal_reversion": False,  # Whether this Pokemon has a Primal form
-                    "gigantamax": False,  # Whether this Pokemon can Gigantamax
-                    "form_details": {},  # Details for alternate forms
-                }
-                
-                # Get forms data if available
-                if base_data.get("forms", []):
-                    for form in base_data["forms"]:
-                        if form["name"] != base_data["name"]:  # Skip the default form
-                            pokemon_info["forms"].append(form["name"])
-                
-                # Check for varieties in species data (mega, regional forms, etc.)
-                if species_data.get("varieties", []):
-                    for variety in species_data["varieties"]:
-                        if not variety["is_default"]:
-                            variety_name = variety["pokemon"]["name"]
-                            pokemon_info["forms"].append(variety_name)
-                            
-                            # Check if this is a mega evolution or other special form
-                            if "mega" in variety_name:
-                                pokemon_info["mega_evolution"] = True
-                            elif "primal" in variety_name:
-                                pokemon_info["primal_reversion"] = True
-                            elif "gmax" in variety_name or "gigantamax" in variety_name:
-                                pokemon_info["gigantamax"] = True
-                
-                # Fetch data for each form if requested
-                if form_key and (form_key in pokemon_info["forms"] or f"{pokemon_info['name']}-{form_key}" in pokemon_info["forms"]):
-                    form_name = form_key
-                    if not form_key.startswith(pokemon_info["name"]):
-                        form_name = f"{pokemon_info['name']}-{form_key}"
-                        
-                    # Fetch this specific form
-                    async with session.get(f"https://pokeapi.co/api/v2/pokemon/{form_name}") as form_response:
-                        if form_response.status == 200:
-                            form_data = await form_response.json()
-                            
-                            # Create form-specific info
-                            form_info = {
-                                "id": form_data["id"],
-                                "name": form_data["name"],
-                                "types": [t["type"]["name"] for t in form_data["types"]],
-                                "height": form_data["height"],
-                                "weight": form_data["weight"],
-                                "sprite": form_data["sprites"]["front_default"],
-                                "base_experience": form_data["base_experience"],
-                                "stats": {s["stat"]["name"]: s["base_stat"] for s in form_data["stats"]},
-                                "base_pokemon": pokemon_id,
-                                "form_type": form_key,
-                            }
-                            
-                            # Add to form cache
-                            form_cache[cache_key] = form_info
-                            await config.form_cache.set(form_cache)
-                            
-                            return form_info
-                
-                # Get evolution data if available
-                if pokemon_info["evolution_chain_url"]:
-                    async with session.get(pokemon_info["evolution_chain_url"]) as evo_response:
-                        if evo_response.status == 200:
-                            evo_data = await evo_response.json()
-                            
-                            # Process evolution chain
-                            current = evo_data["chain"]
-                            chain = []
-                            
-                            while current:
-                                species_name = current["species"]["name"]
-                                # Get the numeric ID from the URL
-                                species_url = current["species"]["url"]
-                                species_id = int(species_url.split("/")[-2])
-                                
-                                # Get evolution details
-                                evolves_to = []
-                                for evolution in current["evolves_to"]:
-                                    evo_name = evolution["species"]["name"]
-                                    evo_url = evolution["species"]["url"]
-                                    evo_id = int(evo_url.split("/")[-2])
-                                    
-                                    # Extract level trigger if it exists
-                                    level = None
-                                    item = None
-                                    condition = None
-                                    
-                                    for detail in evolution["evolution_details"]:
-                                        # Check for level-up evolution
-                                        if detail["trigger"]["name"] == "level-up":
-                                            level = detail.get("min_level")
-                                            
-                                            # Check for special conditions
-                                            if detail.get("time_of_day"):
-                                                condition = f"level-up during {detail['time_of_day']}"
-                                            elif detail.get("known_move"):
-                                                condition = f"level-up knowing {detail['known_move']['name']}"
-                                            elif detail.get("location"):
-                                                condition = f"level-up at {detail['location']['name']}"
-                                            elif detail.get("min_happiness"):
-                                                condition = f"level-up with happiness ≥ {detail['min_happiness']}"
-                                            elif detail.get("held_item"):
-                                                condition = f"level-up holding {detail['held_item']['name']}"
-                                        
-                                        # Check for item-based evolution
-                                        elif detail["trigger"]["name"] == "use-item":
-                                            item = detail.get("item", {}).get("name")
-                                            condition = f"use {item}"
-                                        
-                                        # Check for trade evolution
-                                        elif detail["trigger"]["name"] == "trade":
-                                            condition = "trade"
-                                            if detail.get("held_item"):
-                                                condition += f" while holding {detail['held_item']['name']}"
-                                    
-                                    evolves_to.append({
-                                        "id": evo_id,
-                                        "name": evo_name,
-                                        "level": level,
-                                        "item": item,
-                                        "condition": condition
-                                    })
-                                
-                                chain.append({
-                                    "id": species_id,
-                                    "name": species_name,
-                                    "evolves_to": evolves_to
-                                })
-                                
-                                # Move to the next in chain
-                                if current["evolves_to"]:
-                                    current = current["evolves_to"][0]
-                                else:
-                                    current = None
-                            
-                            # Find this Pokemon in the chain
-                            for i, stage in enumerate(chain):
-                                if stage["id"] == pokemon_id:
-                                    if stage["evolves_to"]:
-                                        # This Pokemon evolves
-                                        for evo in stage["evolves_to"]:
-                                            pokemon_info["evolves_to"] = evo["id"]
-                                            pokemon_info["evolves_at_level"] = evo["level"]
-                                            pokemon_info["evolution_item"] = evo["item"]
-                                            pokemon_info["evolution_condition"] = evo["condition"]
-                                    break
-                
-                # Save to cache
-                pokemon_cache[str_id] = pokemon_info
-                await config.pokemon_cache.set(pokemon_cache)
-                
-                return pokemon_info
-            else:
-                log.error(f"Error fetching Pokemon {pokemon_id}: HTTP {response.status}")
-                return None
+        if form_key:
+            return await _fetch_form(session, config, pokemon_id, form_key)
+        return await _fetch_base(session, pokemon_id)
     except Exception as e:
         log.error(f"Error fetching Pokemon {pokemon_id}: {e}")
         return None
 
+async def _fetch_form(
+    session: aiohttp.ClientSession,
+    config: Config,
+    pokemon_id: int,
+    form_key: str,
+) -> Optional[Dict[str, Any]]:
+    # The base entry (usually cached) says which forms exist
+    pokemon_info = await fetch_pokemon(session, config, pokemon_id)
+    if not pokemon_info:
+        return None
+    
+    if not (form_key in pokemon_info["forms"] or f"{pokemon_info['name']}-{form_key}" in pokemon_info["forms"]):
+        # Unknown form: fall back to the base Pokemon, as before
+        return pokemon_info
+    
+    form_name = form_key
+    if not form_key.startswith(pokemon_info["name"]):
+        form_name = f"{pokemon_info['name']}-{form_key}"
+    
+    form_data = await _get_json(session, f"{API_BASE}/pokemon/{form_name}")
+    if form_data is None:
+        return pokemon_info
+    
+    # Create form-specific info
+    form_info = {
+        "id": form_data["id"],
+        "name": form_data["name"],
+        "types": [t["type"]["name"] for t in form_data["types"]],
+        "height": form_data["height"],
+        "weight": form_data["weight"],
+        "sprite": form_data["sprites"]["front_default"],
+        "base_experience": form_data["base_experience"],
+        "stats": {s["stat"]["name"]: s["base_stat"] for s in form_data["stats"]},
+        "base_pokemon": pokemon_id,
+        "form_type": form_key,
+    }
+    if _cache is not None:
+        await _cache.set(f"{pokemon_id}-{form_key}", form_info)
+    return form_info
+
+async def _fetch_base(session: aiohttp.ClientSession, pokemon_id: int) -> Optional[Dict[str, Any]]:
+    # National Dex IDs share their species ID, so both requests go out together
+    base_data, species_data = await asyncio.gather(
+        _get_json(session, f"{API_BASE}/pokemon/{pokemon_id}"),
+        _get_json(session, f"{API_BASE}/pokemon-species/{pokemon_id}"),
+    )
+    if base_data is None:
+        log.error(f"Error fetching Pokemon {pokemon_id}: not found")
+        return None
+    
+    species_url = base_data["species"]["url"]
+    if not species_url.rstrip("/").endswith(f"/{pokemon_id}"):
+        # Not a species default (e.g. a form ID): use the species it points to
+        species_data = await _get_json(session, species_url)
+    species_data = species_data or {}
+    
+    # Extract only needed info to reduce cache size
+    pokemon_info = {
+        "id": base_data["id"],
+        "name": base_data["name"],
+        "types": [t["type"]["name"] for t in base_data["types"]],
+        "height": base_data["height"],
+        "weight": base_data["weight"],
+        "sprite": base_data["sprites"]["front_default"],
+        "base_experience": base_data["base_experience"],
+        "stats": {s["stat"]["name"]: s["base_stat"] for s in base_data["stats"]},
+        "evolution_chain_url": species_data.get("evolution_chain", {}).get("url", None),
+        "evolves_at_level": None,  # Will be populated if this Pokemon evolves
+        "evolves_to": None,  # Will be populated if this Pokemon evolves
+        "forms": [],  # List of available forms
+        "mega_evolution": False,  # Whether this Pokemon can Mega Evolve
+        "primal_reversion": False,  # Whether this Pokemon has a Primal form
+        "gigantamax": False,  # Whether this Pokemon can Gigantamax
+        "form_details": {},  # Details for alternate forms
+    }
+    
+    # Get forms data if available
+    if base_data.get("forms", []):
+        for form in base_data["forms"]:
+            if form["name"] != base_data["name"]:  # Skip the default form
+                pokemon_info["forms"].append(form["name"])
+    
+    # Check for varieties in species data (mega, regional forms, etc.)
+    if species_data.get("varieties", []):
+        for variety in species_data["varieties"]:
+            if not variety["is_default"]:
+                variety_name = variety["pokemon"]["name"]
+                pokemon_info["forms"].append(variety_name)
+                
+                # Check if this is a mega evolution or other special form
+                if "mega" in variety_name:
+                    pokemon_info["mega_evolution"] = True
+                elif "primal" in variety_name:
+                    pokemon_info["primal_reversion"] = True
+                elif "gmax" in variety_name or "gigantamax" in variety_name:
+                    pokemon_info["gigantamax"] = True
+    
+    # Get evolution data if available
+    if pokemon_info["evolution_chain_url"]:
+        evo_data = await _get_json(session, pokemon_info["evolution_chain_url"])
+        if evo_data is not None:
+            _apply_evolution_chain(pokemon_info, evo_data, pokemon_id)
+    
+    if _cache is not None:
+        await _cache.set(str(pokemon_id), pokemon_info)
+    return pokemon_info
+
+def _apply_evolution_chain(pokemon_info: Dict[str, Any], evo_data: Dict[str, Any], pokemon_id: int) -> None:
+    """Fill in pokemon_info's evolution fields from an evolution-chain response."""
+    # Process evolution chain
+    current = evo_data["chain"]
+    chain = []
+
+    while current:
+        species_name = current["species"]["name"]
+        # Get the numeric ID from the URL
+        species_url = current["species"]["url"]
+        species_id = int(species_url.split("/")[-2])
+
+        # Get evolution details
+        evolves_to = []
+        for evolution in current["evolves_to"]:
+            evo_name = evolution["species"]["name"]
+            evo_url = evolution["species"]["url"]
+            evo_id = int(evo_url.split("/")[-2])
+
+            # Extract level trigger if it exists
+            level = None
+            item = None
+            condition = None
+
+            for detail in evolution["evolution_details"]:
+                # Check for level-up evolution
+                if detail["trigger"]["name"] == "level-up":
+                    level = detail.get("min_level")
+
+                    # Check for special conditions
+                    if detail.get("time_of_day"):
+                        condition = f"level-up during {detail['time_of_day']}"
+                    elif detail.get("known_move"):
+                        condition = f"level-up knowing {detail['known_move']['name']}"
+                    elif detail.get("location"):
+                        condition = f"level-up at {detail['location']['name']}"
+                    elif detail.get("min_happiness"):
+                        condition = f"level-up with happiness ≥ {detail['min_happiness']}"
+                    elif detail.get("held_item"):
+                        condition = f"level-up holding {detail['held_item']['name']}"
+
+                # Check for item-based evolution
+                elif detail["trigger"]["name"] == "use-item":
+                    item = detail.get("item", {}).get("name")
+                    condition = f"use {item}"
+
+                # Check for trade evolution
+                elif detail["trigger"]["name"] == "trade":
+                    condition = "trade"
+                    if detail.get("held_item"):
+                        condition += f" while holding {detail['held_item']['name']}"
+
+            evolves_to.append({
+                "id": evo_id,
+                "name": evo_name,
+                "level": level,
+                "item": item,
+                "condition": condition
+            })
+
+        chain.append({
+            "id": species_id,
+            "name": species_name,
+            "evolves_to": evolves_to
+        })
+
+        # Move to the next in chain
+        if current["evolves_to"]:
+            current = current["evolves_to"][0]
+        else:
+            current = None
+
+    # Find this Pokemon in the chain
+    for i, stage in enumerate(chain):
+        if stage["id"] == pokemon_id:
+            if stage["evolves_to"]:
+                # This Pokemon evolves
+                for evo in stage["evolves_to"]:
+                    pokemon_info["evolves_to"] = evo["id"]
+                    pokemon_info["evolves_at_level"] = evo["level"]
+                    pokemon_info["evolution_item"] = evo["item"]
+                    pokemon_info["evolution_condition"] = evo["condition"]
+            break
+
 async def fetch_all_forms(session: aiohttp.ClientSession, config: Config, pokemon_id: int) -> List[Dict[str, Any]]:
     """Fetch all available forms for a Pokemon.
     
     Args:
         session: The aiohttp ClientSession to use for requests
-        config: The Red Config object for caching
+        config: The Red Config object
         pokemon_id: The Pokemon ID to fetch forms for
         
     Returns:
@@ -243,19 +292,41 @@ async def fetch_all_forms(session: aiohttp.ClientSession, config: Config, pokemo
     base_pokemon = await fetch_pokemon(session, config, pokemon_id)
     if not base_pokemon:
         return []
+    
+    # Extract form keys (e.g., 'mega', 'alola', etc.) and fetch them concurrently
+    form_keys = [name.split("-", 1)[1] for name in base_pokemon.get("forms", []) if "-" in name]
+    forms = await asyncio.gather(*(fetch_pokemon(session, config, pokemon_id, key) for key in form_keys))
+    
+    return [base_pokemon] + [form_data for form_data in forms if form_data]
+
+async def prefetch_pokemon(
+    session: aiohttp.ClientSession,
+    config: Config,
+    pokemon_ids: Iterable[int] = range(1, 899),
+    concurrency: int = PREFETCH_CONCURRENCY,
+) -> Tuple[int, int, int]:
+    """Warm the cache with base data for many Pokemon ahead of time.
+    
+    Args:
+        session: The aiohttp ClientSession to use for requests
+        config: The Red Config object
+        pokemon_ids: IDs to fetch (defaults to the National Dex range used for spawns)
+        concurrency: Maximum number of Pokemon fetched at once
         
-    all_forms = [base_pokemon]  # Start with base form
+    Returns:
+        Tuple of (already cached, fetched, failed)
+    """
+    cached = await _cache.keys() if _cache is not None else set()
+    missing = [pokemon_id for pokemon_id in pokemon_ids if str(pokemon_id) not in cached]
+    semaphore = asyncio.Semaphore(concurrency)
     
-    # Fetch all the additional forms
-    for form_name in base_pokemon.get("forms", []):
-        # Extract form key (e.g., 'mega', 'alola', etc.)
-        if "-" in form_name:
-            form_key = form_name.split("-", 1)[1]
-            form_data = await fetch_pokemon(session, config, pokemon_id, form_key)
-            if form_data:
-                all_forms.append(form_data)
+    async def fetch_one(pokemon_id: int) -> bool:
+        async with semaphore:
+            return await fetch_pokemon(session, config, pokemon_id) is not None
     
-    return all_forms
+    results = await asyncio.gather(*(fetch_one(pokemon_id) for pokemon_id in missing))
+    fetched = sum(results)
+    return len(cached), fetched, len(missing) - fetched
 
 def get_random_pokemon_id(
     include_mega: bool = False, 
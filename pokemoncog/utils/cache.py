@@ -0,0 +1,113 @@
+"""On-disk PokeAPI cache for the Pokemon cog.
+
+Entries live in a small SQLite file keyed like the old Config caches: the
+Pokemon ID for base data ("25") and "<id>-<form>" for forms ("6-mega").
+Lookups are single-row reads, with an in-memory LRU in front so the hot
+Pokemon never touch the disk.
+"""
+import asyncio
+import copy
+import json
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+log = logging.getLogger("red.pokemon")
+
+# Number of decoded entries kept in memory
+LRU_SIZE = 256
+
+
+class PokeCache:
+    """SQLite-backed cache of trimmed PokeAPI responses."""
+
+    def __init__(self, path: Path, lru_size: int = LRU_SIZE):
+        self.path = path
+        self._lru_size = lru_size
+        self._lru: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        # sqlite3 connections aren't safe to share between to_thread workers at once
+        self._db_lock = threading.Lock()
+
+    async def open(self):
+        """Open (and create if needed) the cache file."""
+        def connect() -> sqlite3.Connection:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS pokemon (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            conn.commit()
+            return conn
+
+        self._conn = await asyncio.to_thread(connect)
+
+    def close(self):
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.close()
+            self._conn = None
+        self._lru.clear()
+
+    def _remember(self, key: str, data: Dict[str, Any]):
+        self._lru[key] = data
+        self._lru.move_to_end(key)
+        while len(self._lru) > self._lru_size:
+            self._lru.popitem(last=False)
+
+    def _execute(self, sql: str, params: Iterable = (), *, many: bool = False, fetch: bool = False):
+        with self._db_lock:
+            if many:
+                self._conn.executemany(sql, params)
+            else:
+                cursor = self._conn.execute(sql, params)
+                if fetch:
+                    return cursor.fetchall()
+            self._conn.commit()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached entry, or None."""
+        data = self._lru.get(key)
+        if data is None:
+            if self._conn is None:
+                return None
+            rows = await asyncio.to_thread(
+                self._execute, "SELECT data FROM pokemon WHERE key = ?", (key,), fetch=True
+            )
+            if not rows:
+                return None
+            data = json.loads(rows[0][0])
+        self._remember(key, data)
+        # Callers are free to modify what they get back
+        return copy.deepcopy(data)
+
+    async def set(self, key: str, data: Dict[str, Any]):
+        self._remember(key, copy.deepcopy(data))
+        if self._conn is not None:
+            await asyncio.to_thread(
+                self._execute,
+                "INSERT OR REPLACE INTO pokemon (key, data) VALUES (?, ?)",
+                (key, json.dumps(data)),
+            )
+
+    async def set_many(self, entries: Dict[str, Dict[str, Any]]):
+        """Write many entries in one transaction (used when importing the old Config caches)."""
+        if self._conn is None or not entries:
+            return
+        rows = [(key, json.dumps(data)) for key, data in entries.items()]
+        await asyncio.to_thread(
+            self._execute, "INSERT OR REPLACE INTO pokemon (key, data) VALUES (?, ?)", rows, many=True
+        )
+
+    async def keys(self) -> Set[str]:
+        if self._conn is None:
+            return set(self._lru)
+        rows = await asyncio.to_thread(self._execute, "SELECT key FROM pokemon", fetch=True)
+        return {row[0] for row in rows}
+
+    async def clear(self):
+        self._lru.clear()
+        if self._conn is not None:
+            await asyncio.to_thread(self._execute, "DELETE FROM pokemon")
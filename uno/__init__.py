@@ -139,7 +139,8 @@ __setup_info__ = {
         "assets/",           # Card image files
         "backups/",          # Game state backups
         "temp/",            # Temporary files
-        "persistent_games.json",  # Active game states
+        "games/",            # Per-game snapshots and action journals
+        "persistent_games.json.migrated",  # Legacy full save, after moving into games/
         "statistics.json"    # Player statistics (if file-based)
     ]
 }
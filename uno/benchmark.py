@@ -0,0 +1,124 @@
+"""
+Headless AI benchmark for the Uno cog
+
+Plays seeded AI-vs-AI games on the integer simulation model and reports win
+rates per difficulty plus raw simulator throughput. Runs without Discord:
+
+    python uno/benchmark.py --games 200 --players expert hard medium easy
+"""
+import argparse
+import random
+import time
+
+try:
+    from .simulation import (
+        SimState, FULL_DECK, random_policy, aggressive_policy, heuristic_policy, run_game, search_move
+    )
+except ImportError:
+    from simulation import (
+        SimState, FULL_DECK, random_policy, aggressive_policy, heuristic_policy, run_game, search_move
+    )
+
+
+def search_policy(budget: float):
+    """Policy that runs the same search the hard/expert AIs use, seeing only public information"""
+    def policy(state: SimState, player: int, legal):
+        card, color, _ = search_move(
+            player, state.hands[player], [len(h) for h in state.hands], state.discard,
+            state.color, state.direction, state.draw_count, state.stacking,
+            budget, seed=state.rng.random()
+        )
+        return card, color
+    return policy
+
+
+def make_policies(names, budgets):
+    policies = []
+    for name in names:
+        if name == "easy":
+            policies.append(random_policy)
+        elif name == "medium":
+            policies.append(aggressive_policy)
+        elif name == "hard" and budgets["hard"] <= 0:
+            policies.append(heuristic_policy)
+        else:
+            policies.append(search_policy(budgets[name]))
+    return policies
+
+
+def deal(players: int, rng: random.Random, stacking: bool = True, hand_size: int = 7) -> SimState:
+    """Deal a fresh game; the starting card is re-drawn until it is a number, like UnoDeck"""
+    deck = list(FULL_DECK)
+    rng.shuffle(deck)
+    hands = [[deck.pop() for _ in range(hand_size)] for _ in range(players)]
+    while deck[-1] & 15 >= 10:
+        deck.insert(0, deck.pop())
+    top = deck.pop()
+    return SimState(hands, deck, [top], top >> 4, 0, 1, 0, stacking, rng)
+
+
+def tournament(names, games: int, seed: int, budgets) -> dict:
+    rng = random.Random(seed)
+    policies = make_policies(names, budgets)
+    wins = [0] * len(names)
+    moves = 0
+    unfinished = 0
+    start = time.perf_counter()
+
+    for game in range(games):
+        # Rotate seats so nobody keeps the first-move advantage
+        offset = game % len(names)
+        seats = [(i + offset) % len(names) for i in range(len(names))]
+        state = deal(len(names), rng)
+        winner, played = run_game(state, [policies[s] for s in seats])
+        moves += played
+        if winner < 0:
+            unfinished += 1
+        else:
+            wins[seats[winner]] += 1
+
+    elapsed = time.perf_counter() - start
+    return {"wins": wins, "moves": moves, "unfinished": unfinished, "elapsed": elapsed}
+
+
+def playout_throughput(seconds: float, players: int, seed: int) -> float:
+    """Random-policy moves simulated per second"""
+    rng = random.Random(seed)
+    moves = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        _, played = run_game(deal(players, rng), [random_policy] * players)
+        moves += played
+    return moves / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Uno AI difficulties")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--players", nargs="+", default=["expert", "hard", "medium", "easy"],
+                        choices=["easy", "medium", "hard", "expert"])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--hard-budget", type=float, default=0.0,
+                        help="Search seconds per move for hard (0 = classic heuristics)")
+    parser.add_argument("--expert-budget", type=float, default=0.05,
+                        help="Search seconds per move for expert")
+    args = parser.parse_args(argv)
+
+    rate = playout_throughput(1.0, len(args.players), args.seed)
+    print(f"Simulator: {rate:,.0f} random moves/sec")
+
+    budgets = {"hard": args.hard_budget, "expert": args.expert_budget}
+    result = tournament(args.players, args.games, args.seed, budgets)
+    finished = args.games - result["unfinished"]
+    print(f"Played {args.games} games ({result['moves']} moves) in {result['elapsed']:.1f}s, "
+          f"{result['moves'] / result['elapsed']:,.0f} moves/sec")
+    for seat, name in enumerate(args.players):
+        rate = result["wins"][seat] / finished if finished else 0.0
+        print(f"  seat {seat} {name:<7} {result['wins'][seat]:>5} wins  {rate:6.1%}")
+    if result["unfinished"]:
+        print(f"  {result['unfinished']} games hit the turn cap")
+
+
+if __name__ == "__main__":
+    main()
@@ -102,6 +102,7 @@ class UnoDeck:
         self.draw_pile: List[UnoCard] = []
         self.discard_pile: List[UnoCard] = []
         self.current_color: Optional[UnoColor] = None  # For wild cards
+        self.reshuffles = 0  # Lets persistence notice when the draw pile order changed
         self._create_deck()
         self.shuffle()
     
@@ -151,6 +152,7 @@ class UnoDeck:
         self.draw_pile = self.discard_pile[:-1]
         self.discard_pile = [top_card]
         self.shuffle()
+        self.reshuffles += 1
     
     def play_card(self, card: UnoCard, declared_color: Optional[UnoColor] = None):
         """Play a card to the discard pile"""
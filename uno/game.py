@@ -2,12 +2,16 @@
 Enhanced Uno Game Session Management with Fixed Turn Logic
 """
 import asyncio
+import logging
 import random
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from enum import Enum
 import discord
 from datetime import datetime, timedelta
 from .cards import UnoDeck, PlayerHand, UnoCard, UnoColor, UnoCardType
+from .simulation import search_move_async
+
+log = logging.getLogger("red.uno")
 
 
 class GameState(Enum):
@@ -59,9 +63,12 @@ class PlayerStats:
 class AIPlayer:
     """AI player for filling games"""
     
+    # Seconds of Monte-Carlo search per move for the search-based difficulties
+    SEARCH_BUDGETS = {"hard": 0.25, "expert": 1.0}
+    
     def __init__(self, name: str, difficulty: str = "medium"):
         self.name = name
-        self.difficulty = difficulty  # easy, medium, hard
+        self.difficulty = difficulty  # easy, medium, hard, expert
         self.player_id = f"ai_{name.lower()}_{random.randint(1000, 9999)}"
         self.is_ai = True
     
@@ -82,7 +89,7 @@ class AIPlayer:
                 return random.choice(action_cards)
             return random.choice(playable)
         
-        elif self.difficulty == "hard":
+        else:
             # Strategic play: save wilds, play high numbers, prefer matching colors
             # This is a simplified strategy
             
@@ -118,6 +125,27 @@ class AIPlayer:
         
         # Choose color with most cards
         return max(color_counts, key=color_counts.get)
+    
+    async def choose_move(self, game: "UnoGameSession") -> Tuple[Optional[UnoCard], Optional[UnoColor]]:
+        """Choose a card and wild color, searching off the event loop when the difficulty allows
+        
+        Returns (None, None) when the AI should draw instead.
+        """
+        hand = game.hands[self.player_id]
+        budget = self.SEARCH_BUDGETS.get(self.difficulty)
+        if budget:
+            try:
+                return await search_move_async(game, self.player_id, budget)
+            except Exception:
+                log.exception("AI search failed, falling back to heuristics")
+        
+        if game.draw_count > 0:
+            return None, None
+        card = self.choose_card(hand, game.deck.top_card, game.deck.current_color)
+        if card is None:
+            return None, None
+        declared_color = self.choose_wild_color(hand) if card.color == UnoColor.WILD else None
+        return card, declared_color
 
 
 class UnoGameSession:
@@ -151,6 +179,13 @@ class UnoGameSession:
         self.last_draw4_card: Optional[UnoCard] = None
         self.challenge_window_open = False
         
+        # Called whenever the turn moves, so AI turns can be scheduled immediately
+        self.turn_listener: Optional[Callable[['UnoGameSession'], None]] = None
+        self.ai_turn_task: Optional[asyncio.Task] = None
+        
+        # Called after every logged action, used to journal the change to disk
+        self.action_listener: Optional[Callable[['UnoGameSession', str], None]] = None
+        
         # Settings with defaults
         self.settings = {
             "starting_cards": 7,
@@ -163,6 +198,7 @@ class UnoGameSession:
             "ai_players": True,
             "max_ai_players": 3,
             "persistent_games": True,
+            "ai_think_delay": 2,
             **( settings or {})
         }
     
@@ -178,6 +214,7 @@ class UnoGameSession:
         self.uno_called[player_id] = False
         self.pending_uno_penalty[player_id] = False
         self.last_activity = discord.utils.utcnow()
+        self._log_action("player_joined", {"player": player_id})
         return True
     
     def add_ai_player(self, difficulty: str = "medium") -> Optional[AIPlayer]:
@@ -201,6 +238,7 @@ class UnoGameSession:
         self.hands[ai_player.player_id] = PlayerHand(ai_player.player_id)
         self.uno_called[ai_player.player_id] = False
         
+        self._log_action("ai_added", {"player": ai_player.player_id, "difficulty": difficulty})
         return ai_player
     
     def remove_player(self, player_id: int) -> bool:
@@ -236,6 +274,8 @@ class UnoGameSession:
             self.state = GameState.FINISHED
         
         self.last_activity = discord.utils.utcnow()
+        self._log_action("player_removed", {"player": player_id})
+        self._notify_turn_change()
         return True
     
     def start_game(self) -> bool:
@@ -267,6 +307,7 @@ class UnoGameSession:
         
         self.last_activity = discord.utils.utcnow()
         self._log_action("game_started", {"players": len(self.players), "ai_players": len(self.ai_players)})
+        self._notify_turn_change()
         return True
     
     def call_uno(self, player_id: int) -> Tuple[bool, str]:
@@ -589,6 +630,12 @@ class UnoGameSession:
             self.current_player_index = (self.current_player_index + 1) % len(self.players)
         else:
             self.current_player_index = (self.current_player_index - 1) % len(self.players)
+        self._notify_turn_change()
+    
+    def _notify_turn_change(self):
+        """Tell the turn listener (if any) that the current player may have changed"""
+        if self.turn_listener and self.state == GameState.PLAYING:
+            self.turn_listener(self)
     
     def get_current_player(self) -> int:
         """Get the current player's ID"""
@@ -619,6 +666,8 @@ class UnoGameSession:
             "action": action_type,
             "data": data
         })
+        if self.action_listener:
+            self.action_listener(self, action_type)
     
     def get_game_status(self) -> Dict:
         """Get current game status for display"""
@@ -680,12 +729,28 @@ class UnoGameSession:
     
     def cleanup(self):
         """Clean up game resources"""
+        self.turn_listener = None
+        self.action_listener = None
+        self.cancel_ai_turn()
         self.state = GameState.FINISHED
         self.players.clear()
         self.ai_players.clear()
         self.hands.clear()
         self.game_message = None
     
+    def cancel_ai_turn(self):
+        """Cancel a pending AI turn, unless we are running inside it"""
+        task = self.ai_turn_task
+        self.ai_turn_task = None
+        if not task or task.done():
+            return
+        try:
+            if task is asyncio.current_task():
+                return
+        except RuntimeError:
+            pass  # No running loop
+        task.cancel()
+    
     def get_player_hand(self, player_id: int) -> Optional[PlayerHand]:
         """Get a player's hand"""
         return self.hands.get(player_id)
@@ -4,106 +4,455 @@ Handles saving and restoring game states across bot restarts
 """
 import json
 import asyncio
+import os
 import pickle
+from collections import Counter
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import discord
 from redbot.core.data_manager import cog_data_path
 
-from .game import UnoGameSession, GameState, AIPlayer
+from .game import UnoGameSession, GameState, GameDirection, AIPlayer
 from .cards import UnoCard, UnoColor, UnoCardType, UnoDeck, PlayerHand
 
 
+# Compact card codes used in journal records, e.g. "Red:number:5"
+def _card_code(card: UnoCard) -> str:
+    return f"{card.color.value}:{card.card_type.value}:{'' if card.value is None else card.value}"
+
+
+def _card_from_code(code: str) -> UnoCard:
+    color, card_type, value = code.split(":")
+    return UnoCard(UnoColor(color), UnoCardType(card_type), int(value) if value else None)
+
+
+def _player_key(key: str):
+    """JSON object keys are strings; human IDs are ints, AI IDs stay strings"""
+    return int(key) if key.isdigit() else key
+
+
+class JournalCursor:
+    """What has already been written for one game, so records only carry changes"""
+    
+    def __init__(self, seq: int = 0):
+        self.seq = seq
+        self.records_since_snapshot = 0
+        self.hands: Dict[Any, tuple] = {}
+        self.players: tuple = ()
+        self.ai_players: tuple = ()
+        self.discard_len = 0
+        self.reshuffles = 0
+    
+    def sync(self, game: UnoGameSession):
+        self.hands = {pid: tuple(_card_code(c) for c in hand.cards) for pid, hand in game.hands.items()}
+        self.players = tuple(game.players)
+        self.ai_players = tuple((ai.player_id, ai.name, ai.difficulty) for ai in game.ai_players)
+        self.discard_len = len(game.deck.discard_pile)
+        self.reshuffles = game.deck.reshuffles
+
+
 class PersistenceManager:
-    """Manages persistent storage of game states"""
+    """Manages persistent storage of game states
     
-    def __init__(self, cog_data_path: Path):
+    Each game has a snapshot file plus an append-only journal. Every logged
+    game action appends one compact record holding only what changed, and
+    after ``compact_every`` records the game is compacted into a fresh
+    snapshot. All file I/O happens on a writer task off the event loop.
+    """
+    
+    def __init__(self, cog_data_path: Path, compact_every: int = 50):
         self.data_path = cog_data_path
-        self.persistence_file = self.data_path / "persistent_games.json"
-        self.backup_file = self.data_path / "persistent_games_backup.json"
+        # Single-file saves from before the journal; migrated once on load
+        self.legacy_file = self.data_path / "persistent_games.json"
+        self.legacy_backup_file = self.data_path / "persistent_games_backup.json"
+        self.games_dir = self.data_path / "games"
+        self.compact_every = compact_every
+        
+        self._cursors: Dict[int, JournalCursor] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
         
         # Ensure directory exists
         self.data_path.mkdir(parents=True, exist_ok=True)
+        self.games_dir.mkdir(parents=True, exist_ok=True)
     
-    async def save_games(self, games: Dict[int, UnoGameSession]) -> bool:
-        """Save all active games to persistent storage"""
+    # -- Journal --------------------------------------------------------
+    
+    def _snapshot_path(self, channel_id: int) -> Path:
+        return self.games_dir / f"{channel_id}.snapshot.json"
+    
+    def _journal_path(self, channel_id: int) -> Path:
+        return self.games_dir / f"{channel_id}.journal.jsonl"
+    
+    def _enqueue(self, item: tuple):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._writer_loop())
+        self._queue.put_nowait(item)
+    
+    def record(self, game: UnoGameSession, action: str):
+        """Journal the effect of an action (installed as the game's action listener)"""
         try:
-            persistent_data = {
-                "version": "1.0",
-                "saved_at": datetime.now().isoformat(),
-                "games": {}
-            }
-            
-            for channel_id, game in games.items():
-                if game.settings.get("persistent_games", True) and game.state != GameState.FINISHED:
-                    try:
-                        game_data = self._serialize_game(game)
-                        persistent_data["games"][str(channel_id)] = game_data
-                    except Exception as e:
-                        print(f"Error serializing game {channel_id}: {e}")
-                        continue
-            
-            # Create backup of existing file
-            if self.persistence_file.exists():
-                self.persistence_file.rename(self.backup_file)
-            
-            # Write new data
-            with open(self.persistence_file, 'w') as f:
-                json.dump(persistent_data, f, indent=2)
-            
-            print(f"Saved {len(persistent_data['games'])} persistent games")
-            return True
-            
+            channel_id = game.channel_id
+            if game.state == GameState.FINISHED or not game.settings.get("persistent_games", True):
+                self.forget(channel_id)
+                return
+            
+            cursor = self._cursors.get(channel_id)
+            if (cursor is None or action == "game_started"
+                    or cursor.records_since_snapshot >= self.compact_every):
+                self._snapshot(game, cursor.seq + 1 if cursor else 1)
+                return
+            
+            cursor.seq += 1
+            cursor.records_since_snapshot += 1
+            entry = self._build_delta(game, cursor, action)
+            self._enqueue(("append", channel_id, json.dumps(entry, separators=(",", ":"))))
         except Exception as e:
-            print(f"Error saving persistent games: {e}")
-            # Restore backup if available
-            if self.backup_file.exists():
-                self.backup_file.rename(self.persistence_file)
+            print(f"Error journaling game {game.channel_id}: {e}")
+    
+    def _snapshot(self, game: UnoGameSession, seq: int):
+        """Compact a game into a full snapshot, superseding its journal"""
+        data = self._serialize_game(game)
+        data["seq"] = seq
+        cursor = JournalCursor(seq)
+        cursor.sync(game)
+        self._cursors[game.channel_id] = cursor
+        self._enqueue(("snapshot", game.channel_id, json.dumps(data, separators=(",", ":"), default=str)))
+    
+    def _build_delta(self, game: UnoGameSession, cursor: JournalCursor, action: str) -> Dict[str, Any]:
+        """Record scalar state plus only the hands, seats and piles that changed"""
+        deck = game.deck
+        entry = {
+            "q": cursor.seq,
+            "a": action,
+            "s": game.state.value,
+            "i": game.current_player_index,
+            "d": game.direction.value,
+            "n": game.draw_count,
+            "c": deck.current_color.value if deck.current_color else None,
+            "u": game.uno_called,
+            "pu": game.pending_uno_penalty,
+            "cw": game.challenge_window_open,
+            "l4": game.last_draw4_player,
+            "t": game.last_activity.isoformat() if game.last_activity else None,
+        }
+        
+        hands = {}
+        for pid, hand in game.hands.items():
+            codes = tuple(_card_code(c) for c in hand.cards)
+            if cursor.hands.get(pid) != codes:
+                hands[pid] = codes
+                cursor.hands[pid] = codes
+        removed = [pid for pid in cursor.hands if pid not in game.hands]
+        for pid in removed:
+            del cursor.hands[pid]
+        if hands:
+            entry["h"] = hands
+        if removed:
+            entry["hr"] = removed
+        
+        players = tuple(game.players)
+        if players != cursor.players:
+            entry["p"] = players
+            cursor.players = players
+        ai_players = tuple((ai.player_id, ai.name, ai.difficulty) for ai in game.ai_players)
+        if ai_players != cursor.ai_players:
+            entry["ai"] = ai_players
+            cursor.ai_players = ai_players
+        
+        if deck.reshuffles != cursor.reshuffles or len(deck.discard_pile) < cursor.discard_len:
+            # Pile order changed; record both piles in full (rare)
+            entry["df"] = [_card_code(c) for c in deck.discard_pile]
+            entry["dr"] = [_card_code(c) for c in deck.draw_pile]
+            cursor.reshuffles = deck.reshuffles
+        else:
+            entry["dp"] = [_card_code(c) for c in deck.discard_pile[cursor.discard_len:]]
+            entry["dl"] = len(deck.draw_pile)
+        cursor.discard_len = len(deck.discard_pile)
+        return entry
+    
+    def _apply_delta(self, game: UnoGameSession, entry: Dict[str, Any]):
+        """Replay one journal record onto a restored game"""
+        deck = game.deck
+        game.state = GameState(entry["s"])
+        game.current_player_index = entry["i"]
+        game.direction = GameDirection(entry["d"])
+        game.draw_count = entry["n"]
+        deck.current_color = UnoColor(entry["c"]) if entry["c"] else None
+        game.uno_called = {_player_key(k): v for k, v in entry["u"].items()}
+        game.pending_uno_penalty = {_player_key(k): v for k, v in entry["pu"].items()}
+        game.challenge_window_open = entry["cw"]
+        game.last_draw4_player = entry["l4"]
+        if entry.get("t"):
+            game.last_activity = datetime.fromisoformat(entry["t"])
+        
+        if "p" in entry:
+            game.players = list(entry["p"])
+        if "ai" in entry:
+            game.ai_players = []
+            for player_id, name, difficulty in entry["ai"]:
+                ai_player = AIPlayer(name, difficulty)
+                ai_player.player_id = player_id
+                game.ai_players.append(ai_player)
+        for pid_str, codes in entry.get("h", {}).items():
+            pid = _player_key(pid_str)
+            hand = PlayerHand(pid)
+            hand.cards = [_card_from_code(code) for code in codes]
+            game.hands[pid] = hand
+        for pid in entry.get("hr", []):
+            game.hands.pop(pid, None)
+        
+        if "df" in entry:
+            deck.discard_pile = [_card_from_code(code) for code in entry["df"]]
+            deck.draw_pile = [_card_from_code(code) for code in entry["dr"]]
+        else:
+            deck.discard_pile.extend(_card_from_code(code) for code in entry["dp"])
+            del deck.draw_pile[entry["dl"]:]
+        
+        game.action_history.append({
+            "timestamp": entry.get("t"),
+            "round": game.round_number,
+            "action": entry["a"],
+            "data": {}
+        })
+    
+    def forget(self, channel_id: int):
+        """Stop journaling a game and delete its files"""
+        if self._cursors.pop(channel_id, None) is not None:
+            self._enqueue(("delete", channel_id, None))
+    
+    def prune(self, active_channel_ids):
+        """Delete journals of games that are no longer tracked"""
+        for channel_id in [cid for cid in self._cursors if cid not in active_channel_ids]:
+            self.forget(channel_id)
+    
+    async def _writer_loop(self):
+        """Drain queued journal operations in batches and write them in a thread"""
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                print(f"Error writing game journal: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _write_batch(self, batch: List[tuple]):
+        """Apply queued operations in order (runs in a worker thread)"""
+        appends: Dict[int, List[str]] = {}
+        
+        def flush(channel_id):
+            lines = appends.pop(channel_id, None)
+            if lines:
+                with open(self._journal_path(channel_id), "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+        
+        for op, channel_id, payload in batch:
+            if op == "append":
+                appends.setdefault(channel_id, []).append(payload)
+                continue
+            
+            # Snapshots and deletes supersede everything journaled before them
+            appends.pop(channel_id, None)
+            if op == "snapshot":
+                snapshot = self._snapshot_path(channel_id)
+                tmp = snapshot.with_suffix(".tmp")
+                tmp.write_text(payload, encoding="utf-8")
+                os.replace(tmp, snapshot)
+                self._journal_path(channel_id).unlink(missing_ok=True)
+            elif op == "delete":
+                self._snapshot_path(channel_id).unlink(missing_ok=True)
+                self._journal_path(channel_id).unlink(missing_ok=True)
+        
+        for channel_id in list(appends):
+            flush(channel_id)
+    
+    async def flush(self):
+        """Wait until every queued journal operation is on disk"""
+        if self._queue is not None and self._writer and not self._writer.done():
+            await self._queue.join()
+    
+    async def close(self):
+        """Flush pending writes and stop the writer task"""
+        await self.flush()
+        if self._writer:
+            self._writer.cancel()
+            self._writer = None
+    
+    def _load_journaled_games(self) -> Dict[int, tuple]:
+        """Restore every snapshot and replay its journal (runs in a worker thread)
+        
+        Returns ``{channel_id: (game, last_seq, records_replayed)}``. Files of
+        games that turn out to be finished are deleted here.
+        """
+        games = {}
+        for snapshot in self.games_dir.glob("*.snapshot.json"):
+            try:
+                channel_id = int(snapshot.name.split(".", 1)[0])
+                data = json.loads(snapshot.read_text(encoding="utf-8"))
+                game = self._deserialize_game(data)
+                if not game:
+                    continue
+                
+                seq = data.get("seq", 0)
+                replayed = 0
+                journal = self._journal_path(channel_id)
+                if journal.exists():
+                    with open(journal, "r", encoding="utf-8") as f:
+                        for line in f:
+                            try:
+                                entry = json.loads(line)
+                            except ValueError:
+                                break  # Torn final write
+                            if entry["q"] <= seq:
+                                continue  # Already folded into the snapshot
+                            self._apply_delta(game, entry)
+                            seq = entry["q"]
+                            replayed += 1
+                
+                if game.state == GameState.FINISHED:
+                    snapshot.unlink(missing_ok=True)
+                    journal.unlink(missing_ok=True)
+                else:
+                    games[channel_id] = (game, seq, replayed)
+            except Exception as e:
+                print(f"Error loading game journal {snapshot.name}: {e}")
+        return games
+    
+    def _write_legacy_snapshots(self, games_data: Dict[str, Any]) -> int:
+        """Write a seq-0 snapshot for each unfinished game that has none yet; returns how many"""
+        written = 0
+        for channel_id_str, game_data in games_data.items():
+            snapshot = self._snapshot_path(int(channel_id_str))
+            if snapshot.exists():
+                continue  # The journal already has a newer copy
+            if game_data.get("state") == GameState.FINISHED.value:
+                continue
+            game_data["seq"] = 0
+            tmp = snapshot.with_suffix(".tmp")
+            tmp.write_text(json.dumps(game_data, separators=(",", ":"), default=str), encoding="utf-8")
+            os.replace(tmp, snapshot)
+            written += 1
+        return written
+    
+    def _snapshot_from_config_save(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a game stored by the old cog (``UnoGameSession.to_dict`` in Config) to snapshot form"""
+        def card(card_data):
+            return {"color": card_data["color"], "card_type": card_data["type"], "value": card_data.get("value")}
+        
+        hands = {str(pid): [card(c) for c in cards] for pid, cards in data.get("hands", {}).items()}
+        discard = [card(c) for c in data.get("deck_discard", [])]
+        
+        # The old save had no draw pile: deal it from a fresh shuffled deck minus the cards in play
+        in_play = Counter(
+            _card_code(self._deserialize_card(c)) for cards in [discard, *hands.values()] for c in cards
+        )
+        draw_pile = []
+        for deck_card in UnoDeck().draw_pile:
+            code = _card_code(deck_card)
+            if in_play[code]:
+                in_play[code] -= 1
+            else:
+                draw_pile.append(code)
+        
+        return {
+            "channel_id": data["channel_id"],
+            "host_id": data["host_id"],
+            "state": data["state"],
+            "players": data["players"],
+            "ai_players": data.get("ai_players", []),
+            "hands": hands,
+            "deck": {
+                "discard_pile": discard,
+                "current_color": data.get("current_color"),
+                "draw_pile_count": len(draw_pile),
+                "draw_pile": draw_pile,
+                "reshuffles": 0
+            },
+            "game_state": {
+                "current_player_index": data.get("current_player_index", 0),
+                "direction": data.get("direction", GameDirection.CLOCKWISE.value),
+                "draw_count": data.get("draw_count", 0),
+                "round_number": 0
+            },
+            "uno_tracking": {"uno_called": data.get("uno_called", {})},
+            "timestamps": {"game_start_time": data.get("game_start_time")},
+            "settings": data.get("settings", {}),
+            "action_history": data.get("action_history", [])[-50:]
+        }
+    
+    def _migrate_config_save(self, persistent_games: Dict[str, Any]) -> int:
+        """Snapshot the games the old cog kept in Config (runs in a worker thread)"""
+        converted = {}
+        for channel_id_str, game_data in persistent_games.items():
+            try:
+                converted[channel_id_str] = self._snapshot_from_config_save(game_data)
+            except Exception as e:
+                print(f"Error converting saved game {channel_id_str}; skipping it: {e}")
+        return self._write_legacy_snapshots(converted)
+    
+    async def import_config_save(self, persistent_games: Dict[str, Any]) -> bool:
+        """Turn the old cog's Config save into per-game snapshots
+        
+        Returns True once it is safe to clear the Config copy.
+        """
+        try:
+            migrated = await asyncio.to_thread(self._migrate_config_save, persistent_games)
+        except Exception as e:
+            print(f"Error migrating saved games from Config; leaving them in place: {e}")
             return False
+        print(f"Migrated {migrated} games from Config to per-game journals")
+        return True
+    
+    def _migrate_legacy_save(self):
+        """Turn the old single-file save into per-game snapshots, once (runs in a worker thread)"""
+        if not self.legacy_file.exists():
+            return
+        try:
+            persistent_data = json.loads(self.legacy_file.read_text(encoding="utf-8"))
+        except Exception as e:
+            print(f"Error reading legacy persistent games; leaving the file in place: {e}")
+            return
+        
+        migrated = 0
+        if persistent_data.get("version") != "1.0":
+            print("Warning: Incompatible persistence version; legacy games not migrated")
+        else:
+            migrated = self._write_legacy_snapshots(persistent_data.get("games", {}))
+        
+        os.replace(self.legacy_file, self.legacy_file.with_suffix(".json.migrated"))
+        self.legacy_backup_file.unlink(missing_ok=True)
+        print(f"Migrated {migrated} games from {self.legacy_file.name} to per-game journals")
     
     async def load_games(self) -> Dict[int, UnoGameSession]:
-        """Load saved games from persistent storage"""
-        games = {}
+        """Load saved games from their snapshots and journals
         
+        Loaded games get a journal cursor, so their next action appends to the
+        existing journal and finishing them deletes their files.
+        """
         try:
-            if not self.persistence_file.exists():
-                return games
-            
-            with open(self.persistence_file, 'r') as f:
-                persistent_data = json.load(f)
-            
-            if persistent_data.get("version") != "1.0":
-                print("Warning: Incompatible persistence version")
-                return games
-            
-            for channel_id_str, game_data in persistent_data.get("games", {}).items():
-                try:
-                    channel_id = int(channel_id_str)
-                    game = self._deserialize_game(game_data)
-                    if game:
-                        games[channel_id] = game
-                except Exception as e:
-                    print(f"Error loading game {channel_id_str}: {e}")
-                    continue
-            
-            print(f"Loaded {len(games)} persistent games")
-            
+            await asyncio.to_thread(self._migrate_legacy_save)
         except Exception as e:
-            print(f"Error loading persistent games: {e}")
-            
-            # Try backup file
-            if self.backup_file.exists():
-                try:
-                    with open(self.backup_file, 'r') as f:
-                        persistent_data = json.load(f)
-                    print("Loaded from backup file")
-                    # Process backup data...
-                except Exception as backup_error:
-                    print(f"Backup file also corrupted: {backup_error}")
+            print(f"Error migrating legacy persistent games: {e}")
         
+        games = {}
+        for channel_id, (game, seq, replayed) in (await asyncio.to_thread(self._load_journaled_games)).items():
+            cursor = JournalCursor(seq)
+            cursor.sync(game)
+            cursor.records_since_snapshot = replayed
+            self._cursors[channel_id] = cursor
+            games[channel_id] = game
+        print(f"Loaded {len(games)} persistent games")
         return games
     
+    # -- Serialization --------------------------------------------------
+    
     def _serialize_game(self, game: UnoGameSession) -> Dict[str, Any]:
         """Serialize a game session to JSON-compatible format"""
         return {
@@ -140,7 +489,10 @@ class PersistenceManager:
                     for card in game.deck.discard_pile
                 ],
                 "current_color": game.deck.current_color.value if game.deck.current_color else None,
-                "draw_pile_count": len(game.deck.draw_pile)  # Don't save full draw pile for security
+                "draw_pile_count": len(game.deck.draw_pile),
+                # Full order is needed so journal replay lands on the exact same draws
+                "draw_pile": [_card_code(card) for card in game.deck.draw_pile],
+                "reshuffles": game.deck.reshuffles
             },
             "game_state": {
                 "current_player_index": game.current_player_index,
@@ -178,7 +530,7 @@ class PersistenceManager:
             game.state = GameState(data["state"])
             game.players = data["players"]
             game.current_player_index = data["game_state"]["current_player_index"]
-            game.direction = data["game_state"]["direction"]
+            game.direction = GameDirection(data["game_state"]["direction"])
             game.draw_count = data["game_state"]["draw_count"]
             game.round_number = data["game_state"].get("round_number", 0)
             
@@ -192,7 +544,7 @@ class PersistenceManager:
             # Restore hands
             game.hands = {}
             for pid_str, hand_data in data["hands"].items():
-                pid = int(pid_str)
+                pid = _player_key(pid_str)
                 hand = PlayerHand(pid)
                 
                 for card_data in hand_data:
@@ -217,6 +569,11 @@ class PersistenceManager:
             if deck_data["current_color"]:
                 game.deck.current_color = UnoColor(deck_data["current_color"])
             
+            # Restore the exact draw pile when it was saved
+            if "draw_pile" in deck_data:
+                game.deck.draw_pile = [_card_from_code(code) for code in deck_data["draw_pile"]]
+                game.deck.reshuffles = deck_data.get("reshuffles", 0)
+            
             # Remove cards from draw pile that are in hands or discard
             # This is a simplified approach - in production you'd want more sophisticated deck restoration
             used_cards = []
@@ -226,8 +583,8 @@ class PersistenceManager:
             
             # Restore UNO tracking
             uno_data = data.get("uno_tracking", {})
-            game.uno_called = {int(k): v for k, v in uno_data.get("uno_called", {}).items()}
-            game.pending_uno_penalty = {int(k): v for k, v in uno_data.get("pending_uno_penalty", {}).items()}
+            game.uno_called = {_player_key(k): v for k, v in uno_data.get("uno_called", {}).items()}
+            game.pending_uno_penalty = {_player_key(k): v for k, v in uno_data.get("pending_uno_penalty", {}).items()}
             
             # Restore challenge system
             challenge_data = data.get("challenge_system", {})
@@ -262,23 +619,6 @@ class PersistenceManager:
         except Exception as e:
             print(f"Error deserializing card: {e}")
             return None
-    
-    async def cleanup_old_saves(self, max_age_days: int = 7):
-        """Clean up old save files"""
-        try:
-            import time
-            current_time = time.time()
-            max_age_seconds = max_age_days * 24 * 3600
-            
-            for file_path in [self.persistence_file, self.backup_file]:
-                if file_path.exists():
-                    file_age = current_time - file_path.stat().st_mtime
-                    if file_age > max_age_seconds:
-                        file_path.unlink()
-                        print(f"Cleaned up old save file: {file_path.name}")
-        
-        except Exception as e:
-            print(f"Error during save cleanup: {e}")
 
 
 class ViewPersistenceManager:
@@ -0,0 +1,313 @@
+"""
+Fast Uno simulation core used by the search-based AI difficulties
+
+Cards are plain ints (``color << 4 | kind``) and game state is a handful of
+lists, so thousands of random playouts can run per move without touching
+``UnoCard`` objects or Enums. Searches run in worker threads under a
+per-move time budget, at most MAX_CONCURRENT_SEARCHES at a time, so the event
+loop only shares the GIL with them for a bounded time.
+"""
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+try:
+    from .cards import UnoCard, UnoColor, UnoCardType
+except ImportError:
+    from cards import UnoCard, UnoColor, UnoCardType
+
+
+# Card encoding -------------------------------------------------------------
+
+RED, GREEN, YELLOW, BLUE, WILD_COLOR = range(5)
+SKIP, REVERSE, DRAW2, WILD, WILD4 = 10, 11, 12, 13, 14
+
+COLOR_CODES = {UnoColor.RED: RED, UnoColor.GREEN: GREEN, UnoColor.YELLOW: YELLOW,
+               UnoColor.BLUE: BLUE, UnoColor.WILD: WILD_COLOR}
+COLORS_BY_CODE = {code: color for color, code in COLOR_CODES.items()}
+KIND_CODES = {UnoCardType.SKIP: SKIP, UnoCardType.REVERSE: REVERSE, UnoCardType.DRAW2: DRAW2,
+              UnoCardType.WILD: WILD, UnoCardType.WILD_DRAW4: WILD4}
+
+
+def encode_card(card: UnoCard) -> int:
+    """Encode an ``UnoCard`` as ``color << 4 | kind`` (kind 0-9 are number values)"""
+    kind = card.value if card.card_type == UnoCardType.NUMBER else KIND_CODES[card.card_type]
+    return COLOR_CODES[card.color] << 4 | kind
+
+
+def _build_deck() -> Tuple[int, ...]:
+    deck = []
+    for color in (RED, GREEN, YELLOW, BLUE):
+        deck.append(color << 4)
+        for kind in list(range(1, 10)) + [SKIP, REVERSE, DRAW2]:
+            deck.extend((color << 4 | kind, color << 4 | kind))
+    deck.extend([WILD_COLOR << 4 | WILD] * 4 + [WILD_COLOR << 4 | WILD4] * 4)
+    return tuple(deck)
+
+
+FULL_DECK = _build_deck()
+
+
+# Rules ---------------------------------------------------------------------
+
+class SimState:
+    """Mutable game state in integer form (draw stacking, reshuffles and turn effects as in live games)"""
+
+    __slots__ = ("hands", "draw", "discard", "color", "turn", "direction", "draw_count", "stacking", "rng")
+
+    def __init__(self, hands, draw, discard, color, turn, direction, draw_count, stacking, rng):
+        self.hands: List[List[int]] = hands
+        self.draw: List[int] = draw
+        self.discard: List[int] = discard
+        self.color = color
+        self.turn = turn
+        self.direction = direction
+        self.draw_count = draw_count
+        self.stacking = stacking
+        self.rng = rng
+
+    def legal_cards(self, player: int) -> List[int]:
+        """Cards the player may play now (empty means they must draw)"""
+        top = self.discard[-1]
+        hand = self.hands[player]
+        if self.draw_count:
+            if not self.stacking:
+                return []
+            kind = top & 15
+            return [c for c in hand if c & 15 == kind]
+        kind = top & 15
+        color = self.color
+        return [c for c in hand if c >> 4 == WILD_COLOR or c >> 4 == color or c & 15 == kind]
+
+    def play(self, player: int, card: int, color: int) -> bool:
+        """Play a card; returns True if the player has just won"""
+        hand = self.hands[player]
+        hand.remove(card)
+        self.discard.append(card)
+        self.color = color if card >> 4 == WILD_COLOR else card >> 4
+        if not hand:
+            return True
+
+        kind = card & 15
+        n = len(self.hands)
+        if kind == SKIP:
+            self.turn = (self.turn + 2 * self.direction) % n
+            return False
+        if kind == REVERSE:
+            self.direction = -self.direction
+        elif kind == DRAW2:
+            self.draw_count += 2
+        elif kind == WILD4:
+            self.draw_count += 4
+        self.turn = (self.turn + self.direction) % n
+        return False
+
+    def draw_cards(self, player: int):
+        """Draw the pending penalty (or one card) and pass the turn"""
+        hand = self.hands[player]
+        for _ in range(self.draw_count or 1):
+            if not self.draw:
+                if len(self.discard) <= 1:
+                    break
+                self.draw = self.discard[:-1]
+                self.discard = self.discard[-1:]
+                self.rng.shuffle(self.draw)
+            hand.append(self.draw.pop())
+        self.draw_count = 0
+        self.turn = (self.turn + self.direction) % len(self.hands)
+
+
+def best_color(hand: List[int]) -> int:
+    """Color the player holds most of (for wild declarations)"""
+    counts = [0, 0, 0, 0, 0]
+    for c in hand:
+        counts[c >> 4] += 1
+    return max(range(4), key=counts.__getitem__)
+
+
+# Policies ------------------------------------------------------------------
+
+def random_policy(state: SimState, player: int, legal: List[int]) -> Tuple[int, int]:
+    card = state.rng.choice(legal)
+    return card, best_color(state.hands[player])
+
+
+def aggressive_policy(state: SimState, player: int, legal: List[int]) -> Tuple[int, int]:
+    """Prefer action cards, mirroring the medium AI"""
+    actions = [c for c in legal if c & 15 >= SKIP]
+    card = state.rng.choice(actions or legal)
+    return card, best_color(state.hands[player])
+
+
+def heuristic_policy(state: SimState, player: int, legal: List[int]) -> Tuple[int, int]:
+    """Save wilds, disrupt with actions, dump high numbers (the original hard AI)"""
+    hand = state.hands[player]
+    if len(hand) == 1:
+        return legal[0], best_color(hand)
+    non_wilds = [c for c in legal if c >> 4 != WILD_COLOR]
+    if non_wilds:
+        legal = non_wilds
+    actions = [c for c in legal if SKIP <= c & 15 <= DRAW2]
+    if actions and len(hand) > 3:
+        return state.rng.choice(actions), best_color(hand)
+    numbers = [c for c in legal if c & 15 < SKIP]
+    if numbers:
+        return max(numbers, key=lambda c: c & 15), best_color(hand)
+    return state.rng.choice(legal), best_color(hand)
+
+
+def run_game(state: SimState, policies, max_turns: int = 1000) -> Tuple[int, int]:
+    """Play until someone wins; returns (winner, moves) — winner -1 if the turn cap hit"""
+    moves = 0
+    while moves < max_turns:
+        player = state.turn
+        legal = state.legal_cards(player)
+        moves += 1
+        if not legal:
+            state.draw_cards(player)
+            continue
+        card, color = policies[player](state, player, legal)
+        if state.play(player, card, color):
+            return player, moves
+    return -1, moves
+
+
+def _playout(state: SimState, max_turns: int) -> int:
+    """Random playout (inlined hot loop); returns the winner or -1"""
+    rng = state.rng
+    hands = state.hands
+    for _ in range(max_turns):
+        player = state.turn
+        legal = state.legal_cards(player)
+        if not legal:
+            state.draw_cards(player)
+            continue
+        card = rng.choice(legal)
+        color = best_color(hands[player]) if card >> 4 == WILD_COLOR else 0
+        if state.play(player, card, color):
+            return player
+    return -1
+
+
+# Search --------------------------------------------------------------------
+
+def _determinize(me: int, my_hand: List[int], hand_counts: List[int], discard: List[int], rng) -> Tuple[List[List[int]], List[int]]:
+    """Deal the unseen cards into opponents' hands and the draw pile at random"""
+    unseen = Counter(FULL_DECK)
+    unseen.subtract(my_hand)
+    unseen.subtract(discard)
+    pool = list(unseen.elements())
+    rng.shuffle(pool)
+
+    hands = []
+    for player, count in enumerate(hand_counts):
+        if player == me:
+            hands.append(list(my_hand))
+        else:
+            hands.append(pool[:count])
+            del pool[:count]
+    return hands, pool
+
+
+def search_move(me: int, my_hand: List[int], hand_counts: List[int], discard: List[int],
+                color: int, direction: int, draw_count: int, stacking: bool,
+                budget: float, max_playouts: int = 20000, seed: Optional[int] = None,
+                max_turns: int = 300) -> Tuple[Optional[int], int, int]:
+    """Pick a move by determinized Monte-Carlo playouts (UCB1 over root moves)
+
+    Returns ``(card, color, playouts)``; ``card`` is None when the player has
+    to draw.
+    """
+    rng = random.Random(seed)
+    root = SimState([list(my_hand) if p == me else [] for p in range(len(hand_counts))],
+                    [], list(discard), color, me, direction, draw_count, stacking, rng)
+    legal = sorted(set(root.legal_cards(me)))
+    if not legal:
+        return None, color, 0
+
+    candidates = []
+    for card in legal:
+        if card >> 4 == WILD_COLOR:
+            candidates.extend((card, c) for c in (RED, GREEN, YELLOW, BLUE))
+        else:
+            candidates.append((card, card >> 4))
+    if len(candidates) == 1:
+        return candidates[0][0], candidates[0][1], 0
+
+    visits = [0] * len(candidates)
+    wins = [0.0] * len(candidates)
+    deadline = time.perf_counter() + budget
+    playouts = 0
+
+    while playouts < max_playouts and (playouts & 15 or time.perf_counter() < deadline):
+        total_log = math.log(playouts + 1)
+        best, best_score = 0, -1.0
+        for i in range(len(candidates)):
+            if not visits[i]:
+                best = i
+                break
+            score = wins[i] / visits[i] + 1.4 * math.sqrt(total_log / visits[i])
+            if score > best_score:
+                best, best_score = i, score
+
+        card, chosen_color = candidates[best]
+        hands, pool = _determinize(me, my_hand, hand_counts, discard, rng)
+        state = SimState(hands, pool, list(discard), color, me, direction, draw_count, stacking, rng)
+        if state.play(me, card, chosen_color):
+            result = 1.0
+        else:
+            winner = _playout(state, max_turns)
+            result = 1.0 if winner == me else (0.5 / len(hands) if winner == -1 else 0.0)
+
+        visits[best] += 1
+        wins[best] += result
+        playouts += 1
+
+    best = max(range(len(candidates)), key=lambda i: (visits[i], wins[i]))
+    card, chosen_color = candidates[best]
+    return card, chosen_color, playouts
+
+
+# Bridging to live games ----------------------------------------------------
+
+def search_args_from_game(game, player_id) -> tuple:
+    """Extract the information a player legitimately sees from an UnoGameSession"""
+    players = game.players
+    me = players.index(player_id)
+    return (
+        me,
+        [encode_card(c) for c in game.hands[player_id].cards],
+        [len(game.hands[p]) if p in game.hands else 0 for p in players],
+        [encode_card(c) for c in game.deck.discard_pile],
+        COLOR_CODES.get(game.deck.current_color, RED),
+        game.direction.value,
+        game.draw_count,
+        bool(game.settings.get("draw_stacking", True)),
+    )
+
+
+# Searches allowed to run at once; each holds the GIL for up to its budget
+MAX_CONCURRENT_SEARCHES = 2
+
+_search_slots = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+
+
+async def search_move_async(game, player_id, budget: float) -> Tuple[Optional[UnoCard], Optional[UnoColor]]:
+    """Run a search in a worker thread and map the result back to real objects
+
+    A thread rather than a process: forking the running bot is unsafe, and a
+    spawned worker would have to re-import the whole cog package. The search
+    stops itself at ``budget`` seconds.
+    """
+    args = search_args_from_game(game, player_id)
+    async with _search_slots:
+        card_code, color_code, _ = await asyncio.to_thread(search_move, *args, budget)
+    if card_code is None:
+        return None, None
+
+    card = next(c for c in game.hands[player_id].cards if encode_card(c) == card_code)
+    declared = COLORS_BY_CODE[color_code] if card.color == UnoColor.WILD else None
+    return card, declared
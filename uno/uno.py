@@ -16,6 +16,7 @@ from redbot.core.data_manager import cog_data_path
 from redbot.core.utils.predicates import MessagePredicate
 
 from .game import UnoGameSession, GameState, PlayerStats, AIPlayer
+from .persistence import PersistenceManager
 from .views import UnoGameView, LobbyView, StatsView, ConfigView
 from .utils import (
     setup_assets_directory, 
@@ -30,6 +31,9 @@ from .utils import (
 )
 from .cards import UnoColor, UnoCard, UnoCardType
 
+# Times an AI turn that made no move is retried (with backoff) before the runner gives up
+AI_TURN_RETRIES = 3
+
 
 class UnoCog(commands.Cog):
     """Enhanced Uno card game cog with advanced features"""
@@ -60,14 +64,17 @@ class UnoCog(commands.Cog):
             "statistics_enabled": True,
             "leaderboard_enabled": True,
             "visual_persistence": True,  # NEW: Keep game visible when people talk
-            "repost_threshold": 5  # NEW: Repost game after X messages
+            "repost_threshold": 5,  # NEW: Repost game after X messages
+            "ai_think_delay": 2  # seconds an AI "thinks" before playing
         }
         
         # Default global settings
         default_global = {
             "total_games": 0,
             "total_players": 0,
-            "maintenance_mode": False
+            "maintenance_mode": False,
+            # Games saved by older versions; moved to the journals on load, then cleared
+            "persistent_games": {}
         }
         
         # Player statistics
@@ -92,19 +99,26 @@ class UnoCog(commands.Cog):
         # Track message counts for visual persistence
         self.channel_message_counts: Dict[int, int] = {}
         
+        # Per-game journals; every logged action is appended off the event loop
+        self.persistence = PersistenceManager(cog_data_path(self))
+        
+        # AI turns are scheduled by the game itself whenever the turn changes
+        game_manager.turn_listener = self._schedule_ai_turn
+        game_manager.action_listener = self.persistence.record
+        
         # Start background tasks
         self.cleanup_task.start()
-        self.ai_task.start()
         self.statistics_task.start()
     
     def cog_unload(self):
         """Clean up when cog is unloaded"""
         self.cleanup_task.cancel()
-        self.ai_task.cancel()
         self.statistics_task.cancel()
+        game_manager.turn_listener = None
+        game_manager.action_listener = None
         
-        # Save all active games if persistence is enabled
-        asyncio.create_task(self._save_persistent_games())
+        # Journals are already up to date; just flush what is still queued
+        asyncio.create_task(self.persistence.close())
         
         # Clean up all games
         for game in list(game_manager.games.values()):
@@ -179,28 +193,21 @@ class UnoCog(commands.Cog):
         except Exception as e:
             print(f"Error reposting game embed: {e}")
     
-    async def _save_persistent_games(self):
-        """Save active games for persistence"""
-        try:
-            persistent_data = {}
-            for channel_id, game in game_manager.games.items():
-                if game.settings.get("persistent_games", True) and game.state != GameState.FINISHED:
-                    persistent_data[str(channel_id)] = game.to_dict()
-            
-            if persistent_data:
-                # Save to config or file
-                await self.config.persistent_games.set(persistent_data)
-        except Exception as e:
-            print(f"Error saving persistent games: {e}")
-    
     async def _load_persistent_games(self):
-        """Load saved games on startup"""
+        """Load saved games on startup by replaying their journals"""
         try:
-            persistent_data = await self.config.persistent_games()
-            for channel_id_str, game_data in persistent_data.items():
-                channel_id = int(channel_id_str)
-                game = UnoGameSession.from_dict(game_data)
+            legacy_games = await self.config.persistent_games()
+            if legacy_games and await self.persistence.import_config_save(legacy_games):
+                await self.config.persistent_games.clear()
+            
+            games = await self.persistence.load_games()
+            for channel_id, game in games.items():
+                if channel_id in game_manager.games:
+                    continue
+                game.turn_listener = self._schedule_ai_turn
+                game.action_listener = self.persistence.record
                 game_manager.games[channel_id] = game
+                self._schedule_ai_turn(game)
         except Exception as e:
             print(f"Error loading persistent games: {e}")
     
@@ -216,11 +223,9 @@ class UnoCog(commands.Cog):
             # Clean up temporary image files
             await cleanup_temp_files(self.assets_path)
             
-            # Save persistent games
-            await self._save_persistent_games()
-            
-            # Clean up message counts for inactive channels
+            # Clean up message counts and journals for inactive channels
             active_channels = set(game.channel_id for game in game_manager.games.values())
+            self.persistence.prune(active_channels)
             self.channel_message_counts = {
                 ch_id: count for ch_id, count in self.channel_message_counts.items() 
                 if ch_id in active_channels
@@ -234,28 +239,6 @@ class UnoCog(commands.Cog):
         except Exception as e:
             print(f"Error in cleanup task: {e}")
     
-    @tasks.loop(seconds=30)
-    async def ai_task(self):
-        """Handle AI player actions"""
-        try:
-            for game in game_manager.games.values():
-                if game.state != GameState.PLAYING:
-                    continue
-                
-                current_player = game.get_current_player()
-                if not game.is_ai_player(current_player):
-                    continue
-                
-                ai_player = game.get_ai_player(current_player)
-                if not ai_player:
-                    continue
-                
-                # AI makes a move
-                await self._handle_ai_turn(game, ai_player)
-                
-        except Exception as e:
-            print(f"Error in AI task: {e}")
-    
     @tasks.loop(hours=1)
     async def statistics_task(self):
         """Periodic statistics updates"""
@@ -270,7 +253,6 @@ class UnoCog(commands.Cog):
             print(f"Error in statistics task: {e}")
     
     @cleanup_task.before_loop
-    @ai_task.before_loop  
     @statistics_task.before_loop
     async def before_tasks(self):
         await self.bot.wait_until_ready()
@@ -321,54 +303,83 @@ class UnoCog(commands.Cog):
         
         return None
     
-    async def _handle_ai_turn(self, game: UnoGameSession, ai_player: AIPlayer):
-        """Handle an AI player's turn"""
+    def _schedule_ai_turn(self, game: UnoGameSession):
+        """Start the AI turn runner for a game if an AI now holds the turn"""
+        if game.ai_turn_task and not game.ai_turn_task.done():
+            return  # The running task picks up consecutive AI turns itself
+        if game.state != GameState.PLAYING or not game.is_ai_player(game.get_current_player()):
+            return
+        game.ai_turn_task = asyncio.create_task(self._run_ai_turns(game))
+    
+    async def _run_ai_turns(self, game: UnoGameSession):
+        """Play AI turns until a human holds the turn or the game ends
+        
+        A turn that raised or made no move is retried after 2, 4, 8... seconds,
+        up to AI_TURN_RETRIES times, since no turn change will wake the runner.
+        """
         try:
-            hand = game.hands.get(ai_player.player_id)
-            if not hand:
-                return
-            
-            # Check if AI needs to draw penalty cards
-            if game.draw_count > 0:
-                # AI always draws penalty (doesn't stack for now)
-                game.draw_card(ai_player.player_id)
-                await self.update_game_display(game)
-                return
-            
-            # Get playable cards
-            playable_cards = game.get_playable_cards(ai_player.player_id)
-            
-            if not playable_cards:
-                # Must draw a card
-                success, message, drawn = game.draw_card(ai_player.player_id)
-                if success:
-                    await self.update_game_display(game)
-                return
-            
-            # AI chooses a card
-            chosen_card = ai_player.choose_card(hand, game.deck.top_card, game.deck.current_color)
-            if not chosen_card:
-                return
-            
-            # Handle wild cards
-            declared_color = None
-            if chosen_card.color == UnoColor.WILD:
-                declared_color = ai_player.choose_wild_color(hand)
-            
+            failures = 0
+            while game.state == GameState.PLAYING:
+                ai_player = game.get_ai_player(game.get_current_player())
+                if not ai_player:
+                    return
+                
+                await asyncio.sleep(game.settings.get("ai_think_delay", 2))
+                if game.state != GameState.PLAYING or not game.is_current_player(ai_player.player_id):
+                    continue
+                
+                before = len(game.action_history)
+                try:
+                    await self._handle_ai_turn(game, ai_player)
+                except Exception as e:
+                    print(f"Error handling AI turn: {e}")
+                if len(game.action_history) != before:
+                    failures = 0
+                    continue
+                
+                failures += 1
+                if failures > AI_TURN_RETRIES:
+                    print(f"AI {ai_player.name} could not move in channel {game.channel_id}; giving up")
+                    return
+                await asyncio.sleep(2 ** failures)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error in AI turn runner: {e}")
+        finally:
+            if game.ai_turn_task is asyncio.current_task():
+                game.ai_turn_task = None
+    
+    async def _handle_ai_turn(self, game: UnoGameSession, ai_player: AIPlayer):
+        """Handle an AI player's turn (errors propagate to _run_ai_turns, which retries)"""
+        hand = game.hands.get(ai_player.player_id)
+        if not hand:
+            return
+        
+        # Let the AI pick a move; search-based difficulties may also stack on a penalty
+        chosen_card, declared_color = await ai_player.choose_move(game)
+        
+        # The game may have moved on while the AI was thinking
+        if not game.is_current_player(ai_player.player_id) or game.state != GameState.PLAYING:
+            return
+        
+        if chosen_card:
             # Call UNO if needed
             if hand.card_count == 2:  # Will have 1 after playing
                 game.call_uno(ai_player.player_id)
             
-            # Play the card
             success, message = game.play_card(ai_player.player_id, chosen_card, declared_color)
-            if success:
-                await self.update_game_display(game)
-                
-                # Add a small delay for realism
-                await asyncio.sleep(2)
-            
-        except Exception as e:
-            print(f"Error handling AI turn: {e}")
+            if not success:
+                # The chosen move was rejected; drawing keeps the game moving
+                print(f"AI {ai_player.name} move rejected ({message}); drawing instead")
+                chosen_card = None
+        
+        if not chosen_card:
+            # Draw the penalty or a single card
+            success, message, drawn = game.draw_card(ai_player.player_id)
+        
+        if success:
+            await self.update_game_display(game)
     
     # Hybrid commands (work with both prefix and slash)
     
@@ -490,11 +501,11 @@ class UnoCog(commands.Cog):
     async def add_ai(self, ctx, difficulty: str = "medium"):
         """Add an AI player to the current game
         
-        Difficulty levels: easy, medium, hard
+        Difficulty levels: easy, medium, hard, expert
         """
         try:
-            if difficulty not in ["easy", "medium", "hard"]:
-                await ctx.send("❌ Invalid difficulty. Choose: easy, medium, or hard")
+            if difficulty not in ["easy", "medium", "hard", "expert"]:
+                await ctx.send("❌ Invalid difficulty. Choose: easy, medium, hard, or expert")
                 return
             
             game = game_manager.get_game(ctx.channel.id)
@@ -954,6 +965,7 @@ class UnoCog(commands.Cog):
             embed.add_field(name="🤖 AI Players", value="✅" if settings["ai_players"] else "❌", inline=True)
             embed.add_field(name="🤖 Max AI Players", value=settings["max_ai_players"], inline=True)
             embed.add_field(name="⏰ Auto-start Delay", value=f"{settings['auto_start_delay']}s", inline=True)
+            embed.add_field(name="💭 AI Think Delay", value=f"{settings['ai_think_delay']}s", inline=True)
             
             # Feature settings
             embed.add_field(name="💾 Persistent Games", value="✅" if settings["persistent_games"] else "❌", inline=True)
@@ -991,6 +1003,7 @@ class UnoCog(commands.Cog):
         - leaderboard_enabled (true/false)
         - visual_persistence (true/false)
         - repost_threshold (1-10)
+        - ai_think_delay (0-10)
         """
         try:
             valid_settings = {
@@ -1007,7 +1020,8 @@ class UnoCog(commands.Cog):
                 "statistics_enabled": (bool, None, None),
                 "leaderboard_enabled": (bool, None, None),
                 "visual_persistence": (bool, None, None),
-                "repost_threshold": (int, 1, 10)
+                "repost_threshold": (int, 1, 10),
+                "ai_think_delay": (int, 0, 10)
             }
             
             if setting not in valid_settings:
@@ -441,6 +441,9 @@ class EnhancedGameManager:
             "peak_concurrent_games": 0
         }
         self.last_cleanup = datetime.now()
+        # Installed by the cog so new games schedule AI turns and journal their actions
+        self.turn_listener = None
+        self.action_listener = None
     
     def create_game(self, channel_id: int, host_id: int, settings: Dict[str, Any] = None) -> Optional['UnoGameSession']:
         """Create a new game session with enhanced tracking"""
@@ -453,6 +456,8 @@ class EnhancedGameManager:
         
         from .game import UnoGameSession  # Import here to avoid circular import
         game = UnoGameSession(channel_id, host_id, settings)
+        game.turn_listener = self.turn_listener
+        game.action_listener = self.action_listener
         self.games[channel_id] = game
         
         # Update performance stats
@@ -864,6 +864,10 @@ class AISelectionView(discord.ui.View):
     async def add_hard_ai(self, interaction: discord.Interaction, button: discord.ui.Button):
         await self._add_ai(interaction, "hard")
     
+    @discord.ui.button(label="🧠 Expert", style=discord.ButtonStyle.secondary)
+    async def add_expert_ai(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._add_ai(interaction, "expert")
+    
     async def _add_ai(self, interaction: discord.Interaction, difficulty: str):
         await interaction.response.defer()
         